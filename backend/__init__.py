@@ -0,0 +1,13 @@
+"""
+Personal Tracker - Backend Services
+
+This package holds the pure-Python services behind the Eel functions
+exposed by start.py. Everything in here uses only the standard library
+so it can be imported (and tested) without Eel, gevent or a browser.
+
+start.py owns the Eel wiring: it creates the service objects, exposes
+thin wrappers to JavaScript and pushes notifications back to the open
+windows.
+
+@module backend
+"""
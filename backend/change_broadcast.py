@@ -0,0 +1,168 @@
+"""
+Change Broadcast Between Open Windows
+
+Keeps track of the app windows (Eel clients) that are currently open and
+turns DataStore changes into one compact notification per save. The
+notification is pushed to every window; each window ignores notifications
+it caused itself (matched by client id) and updates only the sections
+listed in it.
+
+Notification shape (one per save):
+
+    {
+      "origin": "lq2x9k-a1b2c3",           // client id that saved
+      "changes": [
+        {
+          "section": "mood",
+          "storageKey": "mood-data",
+          "revision": 7,
+          "delta": {"upserts": {"Mon Dec 01 2024": {...}}, "removals": []}
+        }
+      ]
+    }
+
+"delta" is None when the change is too large to ship inline; the window
+then fetches that one section with get_section().
+
+@module backend.change_broadcast
+"""
+
+import threading
+import time
+
+from backend.data_store import record_map
+
+# Largest number of changed records shipped inline in a notification.
+# Anything bigger is sent as a bare revision bump.
+MAX_DELTA_RECORDS = 50
+
+
+def build_delta(change, max_records=MAX_DELTA_RECORDS):
+    """
+    Builds the inline delta for a SectionChange.
+
+    Dict sections ship {"upserts": {key: record}, "removals": [key]}.
+    List sections ship {"upserts": [record], "removals": [id]} so the
+    frontend can merge items by id.
+
+    Args:
+        change (SectionChange): The section change
+        max_records (int): Maximum records to ship inline
+
+    Returns:
+        dict|None: Delta, or None if the change is too large
+    """
+    if len(change.upserted) + len(change.removed) > max_records:
+        return None
+
+    records = record_map(change.new_value)
+    if isinstance(change.new_value, dict):
+        upserts = {key: records[key] for key in change.upserted}
+    elif all(not key.startswith("#") for key in change.upserted + change.removed):
+        upserts = [records[key] for key in change.upserted]
+    else:
+        # Items without ids can't be merged reliably - refetch instead
+        return None
+
+    return {"upserts": upserts, "removals": list(change.removed)}
+
+
+class ChangeBroadcaster:
+    """
+    Registry of connected windows plus the DataStore listener that
+    notifies them.
+
+    Args:
+        send (callable): Called with each notification payload. start.py
+            passes a function that calls the exposed JavaScript handler.
+        max_delta_records (int): Inline delta size limit
+
+    Example:
+        >>> broadcaster = ChangeBroadcaster(send=print)
+        >>> store.subscribe(broadcaster.on_changes)
+        >>> broadcaster.register_client("window-1")
+    """
+
+    def __init__(self, send, max_delta_records=MAX_DELTA_RECORDS):
+        self._send = send
+        self._max_delta_records = max_delta_records
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Client registry
+    # ------------------------------------------------------------------
+
+    def register_client(self, client_id):
+        """Records a window as connected."""
+        with self._lock:
+            self._clients[client_id] = time.time()
+
+    def unregister_client(self, client_id):
+        """Forgets a window (called when it closes)."""
+        with self._lock:
+            self._clients.pop(client_id, None)
+
+    def clients(self):
+        """Returns the ids of all connected windows."""
+        with self._lock:
+            return list(self._clients)
+
+    def primary_client(self):
+        """
+        Returns the id of the window that has been open longest.
+
+        Used for messages that only one window should act on, like a due
+        reminder. None if no window is connected.
+        """
+        with self._lock:
+            return next(iter(self._clients), None)
+
+    # ------------------------------------------------------------------
+    # Notifications
+    # ------------------------------------------------------------------
+
+    def build_notification(self, changes, origin):
+        """
+        Builds the notification payload for a list of SectionChange.
+
+        Args:
+            changes (list): SectionChange objects from the DataStore
+            origin (str): Client id that produced the changes (or None)
+
+        Returns:
+            dict: Notification payload
+        """
+        return {
+            "origin": origin,
+            "changes": [
+                {
+                    "section": change.section,
+                    "storageKey": change.storage_key,
+                    "revision": change.revision,
+                    "delta": build_delta(change, self._max_delta_records),
+                }
+                for change in changes
+            ],
+        }
+
+    def on_changes(self, changes, origin):
+        """
+        DataStore listener - pushes a notification to the other windows.
+
+        Nothing is sent when the saving window is the only one open.
+
+        Args:
+            changes (list): SectionChange objects from the DataStore
+            origin (str): Client id that produced the changes (or None)
+
+        Returns:
+            dict|None: The payload that was sent, or None if skipped
+        """
+        others = [client for client in self.clients() if client != origin]
+        if not others:
+            return None
+
+        payload = self.build_notification(changes, origin)
+        self._send(payload)
+        return payload
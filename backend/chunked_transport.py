@@ -0,0 +1,236 @@
+"""
+Chunked, Compressed Responses Over the Eel Channel
+
+Eel sends every return value as one websocket message, so
+load_all_data_from_file() on a large dataset produces a single huge
+frame followed by one long JSON.parse() in the window.
+
+This opt-in transport is used through call_chunked() in start.py and
+callChunked() in src/utils/chunkedTransport.js. If a result is larger
+than a threshold, it is not returned directly. Instead:
+
+1. The value is split into small "parts" (newline-delimited JSON), each
+   saying where it belongs in the result:
+
+       [path, "set", value]      put value at path
+       [path, "merge", {...}]    add these keys to the object at path
+       [path, "extend", [...]]   append these items to the list at path
+
+2. The part stream is deflate-compressed (zlib format, which the
+   browser's DecompressionStream('deflate') understands) and cut into
+   fixed-size chunks with sequence numbers.
+
+3. The window pulls the chunks one message at a time, decompresses them
+   as they arrive and parses one small part at a time.
+
+@module backend.chunked_transport
+"""
+
+import base64
+import itertools
+import json
+import threading
+import time
+import zlib
+
+# Results whose JSON is smaller than this are returned as usual
+CHUNK_THRESHOLD_BYTES = 256 * 1024
+
+# Bytes (before base64) per chunk message
+CHUNK_SIZE = 64 * 1024
+
+# Target size of one part - the unit the window parses at a time
+PART_SIZE = 32 * 1024
+
+# Transfers that aren't fully fetched within this time are dropped
+TRANSFER_TTL_SECONDS = 120
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def json_size_reaches(value, limit):
+    """
+    Whether the compact JSON of a value is at least limit characters.
+
+    The value is encoded incrementally and encoding stops as soon as the
+    limit is reached, so a large result isn't serialized just to find
+    out it's large.
+
+    Raises:
+        TypeError: If the value isn't JSON-serializable
+        ValueError: If the value contains a circular reference
+    """
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    size = 0
+    for piece in encoder.iterencode(value):
+        size += len(piece)
+        if size >= limit:
+            return True
+    return False
+
+
+def iter_parts(value, part_size=PART_SIZE, path=()):
+    """
+    Splits a JSON value into parts of roughly part_size characters.
+
+    Objects and arrays larger than part_size are split into "merge" /
+    "extend" batches of their children; children that are themselves
+    too large are split recursively.
+
+    Args:
+        value: JSON-serializable value
+        part_size (int): Target characters per part
+        path (tuple): Location of value in the result (for recursion)
+
+    Yields:
+        str: One part per line (without the newline)
+    """
+    path_json = _dumps(list(path))
+    if isinstance(value, dict):
+        items = ((key, _dumps(child), child) for key, child in value.items())
+        op, empty, opener, closer = "merge", "{}", "{", "}"
+    elif isinstance(value, list):
+        items = ((None, _dumps(child), child) for child in value)
+        op, empty, opener, closer = "extend", "[]", "[", "]"
+    else:
+        yield f'[{path_json},"set",{_dumps(value)}]'
+        return
+
+    yield f'[{path_json},"set",{empty}]'
+    index = 0
+    batch, batch_size = [], 0
+    for key, text, child in items:
+        child_key = key if key is not None else index
+        index += 1
+        if len(text) > part_size and isinstance(child, (dict, list)):
+            # Flush what we have, then split the big child on its own. A
+            # list child is first added as a placeholder so its index
+            # exists; the recursion overwrites it.
+            if batch:
+                yield f'[{path_json},"{op}",{opener}{",".join(batch)}{closer}]'
+                batch, batch_size = [], 0
+            if key is None:
+                yield f'[{path_json},"extend",[null]]'
+            yield from iter_parts(child, part_size, path + (child_key,))
+            continue
+        batch.append(f"{_dumps(key)}:{text}" if key is not None else text)
+        batch_size += len(text)
+        if batch_size >= part_size:
+            yield f'[{path_json},"{op}",{opener}{",".join(batch)}{closer}]'
+            batch, batch_size = [], 0
+    if batch:
+        yield f'[{path_json},"{op}",{opener}{",".join(batch)}{closer}]'
+
+
+def encode_chunks(value, compress=True, chunk_size=CHUNK_SIZE, part_size=PART_SIZE):
+    """
+    Encodes a value as a list of base64 chunks of its part stream.
+
+    Compression is streamed: parts are fed to the compressor as they are
+    produced, and chunks are cut from its output.
+
+    Returns:
+        tuple: (chunks, raw_bytes, encoded_bytes)
+    """
+    compressor = zlib.compressobj(6) if compress else None
+    chunks = []
+    pending = bytearray()
+    raw_bytes = encoded_bytes = 0
+
+    def take_chunks(final=False):
+        nonlocal encoded_bytes
+        while len(pending) >= chunk_size or (final and pending):
+            piece = bytes(pending[:chunk_size])
+            del pending[:chunk_size]
+            encoded_bytes += len(piece)
+            chunks.append(base64.b64encode(piece).decode("ascii"))
+
+    for line in iter_parts(value, part_size):
+        data = (line + "\n").encode("utf-8")
+        raw_bytes += len(data)
+        pending += compressor.compress(data) if compressor else data
+        take_chunks()
+    if compressor:
+        pending += compressor.flush()
+    take_chunks(final=True)
+    return chunks, raw_bytes, encoded_bytes
+
+
+class TransferStore:
+    """
+    Holds encoded transfers until the window has fetched all chunks.
+
+    Example:
+        >>> transfers = TransferStore()
+        >>> header = transfers.create(big_result)   # None if small enough
+        >>> transfers.chunk(header["transferId"], 0)
+        {"transferId": "...", "seq": 0, "data": "eJzt...", "last": False}
+    """
+
+    def __init__(self, threshold=CHUNK_THRESHOLD_BYTES, chunk_size=CHUNK_SIZE,
+                 part_size=PART_SIZE, ttl=TRANSFER_TTL_SECONDS):
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.part_size = part_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._transfers = {}            # id -> (created, chunks)
+        self._ids = itertools.count(1)
+
+    def create(self, value, compress=True):
+        """
+        Encodes a value as a chunked transfer if it's over the threshold.
+
+        Args:
+            value: JSON-serializable result
+            compress (bool): Deflate-compress the part stream
+
+        Returns:
+            dict|None: Transfer header, or None if value should be sent as is
+        """
+        if not json_size_reaches(value, self.threshold):
+            return None
+
+        chunks, raw_bytes, encoded_bytes = encode_chunks(
+            value, compress, self.chunk_size, self.part_size)
+        transfer_id = f"t{next(self._ids)}"
+        with self._lock:
+            self._expire()
+            self._transfers[transfer_id] = (time.monotonic(), chunks)
+        return {
+            "chunked": True,
+            "transferId": transfer_id,
+            "chunks": len(chunks),
+            "encoding": "deflate" if compress else "identity",
+            "bytes": raw_bytes,
+            "encodedBytes": encoded_bytes,
+        }
+
+    def chunk(self, transfer_id, seq):
+        """
+        Returns one chunk of a transfer. The transfer is dropped after its
+        last chunk has been fetched.
+
+        Raises:
+            KeyError: If the transfer or chunk doesn't exist
+        """
+        with self._lock:
+            created, chunks = self._transfers[transfer_id]
+            if not 0 <= seq < len(chunks):
+                raise KeyError(f"{transfer_id} has no chunk {seq}")
+            last = seq == len(chunks) - 1
+            if last:
+                del self._transfers[transfer_id]
+        return {"transferId": transfer_id, "seq": seq, "data": chunks[seq], "last": last}
+
+    def cancel(self, transfer_id):
+        """Drops a transfer the window no longer needs."""
+        with self._lock:
+            self._transfers.pop(transfer_id, None)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        for transfer_id in [t for t, (created, _) in self._transfers.items() if created < cutoff]:
+            del self._transfers[transfer_id]
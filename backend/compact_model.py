@@ -0,0 +1,576 @@
+"""
+Compact In-Memory Model
+
+The DataStore used to keep every section exactly as json.loads() made
+it: one dict per day, one dict per habit entry of every day, one dict
+per mood, todo and goal. Each of those dicts carries its own hash table
+and its own copies of keys and small values, which dwarfs the data.
+
+The largest sections are kept in compact form instead:
+
+- habits: a column store. Habit definitions (everything except
+  "completed") are interned once. Each day holds a shared tuple of
+  definition refs and its completion flags in one array('b') column.
+  Weights live in an array('f') column, completion counts in
+  array('h') columns, and timestamps as epoch milliseconds in an
+  array('q') column.
+- mood, todos, goals: one __slots__ object per record. The known
+  fields are slots, and any other keys go to an "extra" dict that is
+  only allocated when needed.
+
+Compact sections are read-only snapshots, rebuilt whenever a save
+changes the section. They turn back into plain dicts only when a value
+leaves the backend (get_section(), get_record()). Every conversion is
+lossless: compact_section(name, value).to_value() == value. Values that
+don't fit a column exactly are kept in "extra" as they are.
+
+@module backend.compact_model
+"""
+
+import math
+import re
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+
+# Sections kept in compact form
+COMPACT_SECTIONS = ("habits", "mood", "todos", "goals")
+
+_MISSING = object()
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ISO_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$")
+_NO_TIMESTAMP = -(2 ** 63)
+_NO_COUNT = -1
+
+
+def _timestamp_ms(value):
+    """Returns an ISO timestamp ("...T10:30:00.000Z") as epoch ms, or None."""
+    if not isinstance(value, str) or not _ISO_TIMESTAMP.match(value):
+        return None
+    try:
+        moment = datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    ms = (moment - _EPOCH) // timedelta(milliseconds=1)
+    return ms if _format_timestamp(ms) == value else None
+
+
+def _format_timestamp(ms):
+    moment = _EPOCH + timedelta(milliseconds=ms)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+
+
+def _float32(value):
+    """
+    Returns value as it reads back from an array('f') column.
+
+    float32 keeps about 7 significant digits, so values are restored by
+    rounding to 7 digits - exact for weights like 150.3.
+    """
+    try:
+        stored = array("f", [value])[0]
+    except OverflowError:
+        return None
+    return float(f"{stored:.7g}")
+
+
+def _freeze(value):
+    """
+    Returns a hashable key that is equal only for identical JSON values.
+
+    Containers and non-string scalars are tagged with their type, so
+    True, 1 and 1.0 (equal in Python) don't share a key.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    if isinstance(value, list):
+        return (list, tuple(_freeze(item) for item in value))
+    return (type(value), value)
+
+
+def _short_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value < 2 ** 15
+
+
+# ----------------------------------------------------------------------
+# Slotted records
+# ----------------------------------------------------------------------
+
+class SlottedRecord:
+    """
+    Base for records stored as __slots__ objects.
+
+    Subclasses list their fields in FIELDS (and __slots__). Absent fields
+    hold a shared sentinel, and unknown keys go to "extra".
+    """
+
+    __slots__ = ("extra",)
+    FIELDS = ()
+    # Fields whose (short, repetitive) string values are interned
+    SHARED = ()
+
+    def __init__(self, values):
+        known = self.FIELDS
+        for name in known:
+            value = values.get(name, _MISSING)
+            if name in self.SHARED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+        extra = {key: value for key, value in values.items() if key not in known}
+        self.extra = extra or None
+
+    def to_dict(self):
+        """Materializes the record as a plain dict."""
+        values = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not _MISSING:
+                values[name] = value
+        if self.extra:
+            values.update(self.extra)
+        return values
+
+
+class MoodEntry(SlottedRecord):
+    """One day's mood (saveMood() in moodStorage.js)."""
+    __slots__ = ("date", "mood", "notes", "timestamp")
+    FIELDS = __slots__
+
+
+class Todo(SlottedRecord):
+    """One todo item (ToDoForm.jsx / todoStorage.js)."""
+    __slots__ = ("id", "title", "description", "priority", "timeCommitment", "dueDate",
+                 "linkedGoalId", "completed", "createdAt", "updatedAt", "completedAt",
+                 "timeToCompletion", "isRecurring", "recurrencePattern",
+                 "recurrenceInterval", "recurrenceEndDate")
+    FIELDS = __slots__
+    SHARED = ("priority", "timeCommitment", "recurrencePattern")
+
+
+class Goal(SlottedRecord):
+    """One goal (GoalForm.jsx / goalStorage.js)."""
+    __slots__ = ("id", "title", "description", "targetAmount", "unit", "emoji",
+                 "completedTodosCount", "createdAt", "updatedAt")
+    FIELDS = __slots__
+    SHARED = ("unit", "emoji")
+
+
+class CompactRecords:
+    """
+    Date-keyed section ({key: record}) of slotted records.
+
+    Records that aren't objects are kept as they are.
+    """
+
+    def __init__(self, value, record_class):
+        self._records = {}
+        for key, record in value.items():
+            if isinstance(record, dict):
+                entry = record_class(record)
+                if getattr(entry, "date", None) == key:
+                    entry.date = key        # share the key string
+                record = entry
+            self._records[key] = record
+
+    def __len__(self):
+        return len(self._records)
+
+    def keys(self):
+        return list(self._records)
+
+    def get(self, key):
+        record = self._records.get(key)
+        return record.to_dict() if isinstance(record, SlottedRecord) else record
+
+    def matches(self, key, record):
+        """True if the stored record of key equals record."""
+        return key in self._records and self.get(key) == record
+
+    def to_value(self):
+        return {key: self.get(key) for key in self._records}
+
+
+class CompactList:
+    """
+    List section (todos, goals) of slotted records.
+
+    Keys follow record_map() in data_store.py: the item's "id" as a
+    string, or "#<position>" for items without one.
+    """
+
+    def __init__(self, value, record_class):
+        self._items = [record_class(item) if isinstance(item, dict) else item for item in value]
+        self._positions = {}
+        for position, item in enumerate(value):
+            if isinstance(item, dict) and item.get("id") is not None:
+                self._positions[str(item["id"])] = position
+            else:
+                self._positions[f"#{position}"] = position
+
+    def __len__(self):
+        return len(self._items)
+
+    def keys(self):
+        return list(self._positions)
+
+    def get(self, key):
+        position = self._positions.get(key)
+        if position is None:
+            return None
+        item = self._items[position]
+        return item.to_dict() if isinstance(item, SlottedRecord) else item
+
+    def matches(self, key, record):
+        """True if the stored record of key equals record."""
+        return key in self._positions and self.get(key) == record
+
+    def to_value(self):
+        return [item.to_dict() if isinstance(item, SlottedRecord) else item
+                for item in self._items]
+
+
+# ----------------------------------------------------------------------
+# Habit days (column store)
+# ----------------------------------------------------------------------
+
+# Row flags
+_DATE_IS_KEY = 1        # "date" equals the row key
+_RAW = 2                # row isn't a day object - extras holds the value
+_WEIGHT_INT = 4         # weight was an integer
+_HAS_HABITS = 8         # habits are stored as refs + completion bits
+
+
+class HabitDays:
+    """
+    The habits section as columns, one row per day.
+
+    A save usually changes a day or two. Given the previous snapshot and
+    the keys that changed, every other row is copied from the previous
+    columns instead of being converted again; the interned definitions
+    are carried over too.
+
+    The definitions double as the data file's versioned definition table
+    (see habit_schema.py): a definition keeps its index for as long as
+    the data store runs, and a new definition of a habit gets the next
+    version for its id. Each day's normalized file record is cached on
+    its row and carried over with it, so writing the data file only
+    normalizes the days that changed.
+
+    Args:
+        value (dict): {date_key: day record}
+        previous (HabitDays): Snapshot of the section before the save
+        changed (iterable): Keys whose records differ from previous
+
+    Example:
+        >>> days = HabitDays({"Mon Dec 01 2024": {"date": "Mon Dec 01 2024", "habits": [...]}})
+        >>> days.get("Mon Dec 01 2024")
+        {"date": "Mon Dec 01 2024", "habits": [...]}
+    """
+
+    # Fields with a column of their own; everything else goes to extras
+    COLUMNS = ("date", "habits", "completedCount", "totalCount", "weight", "timestamp")
+
+    def __init__(self, value, previous=None, changed=None):
+        if previous is not None and changed is not None:
+            self.definitions = list(previous.definitions)
+            self.versions = list(previous.versions)
+            self._definition_refs = dict(previous._definition_refs)
+            self._latest_versions = dict(previous._latest_versions)
+            self._ref_tuples = dict(previous._ref_tuples)
+            changed = set(changed)
+        else:
+            self.definitions = []       # interned habit dicts without "completed"
+            self.versions = []          # ref -> version of the definition for its habit id
+            self._definition_refs = {}  # frozen definition -> ref
+            self._latest_versions = {}  # frozen habit id -> latest version
+            self._ref_tuples = {}       # shared tuples of refs
+            previous = None
+
+        self._rows = {}                 # key -> row
+        self.flags = array("B")
+        self.refs = []                  # row -> tuple of refs (or None)
+        self.offsets = array("l")       # row -> first completion bit
+        self.completions = array("b")
+        self.weights = array("f")
+        self.completed_counts = array("h")
+        self.total_counts = array("h")
+        self.timestamps = array("q")
+        self.extras = []                # row -> dict of other fields (or None)
+        self._normalized = []           # row -> cached normalized() record (or None)
+
+        for key, day in value.items():
+            row = previous._rows.get(key) if previous is not None and key not in changed else None
+            if row is None:
+                self._append(key, day)
+            else:
+                self._copy_row(key, previous, row)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def keys(self):
+        return list(self._rows)
+
+    def _intern(self, habit):
+        # Insertion order is kept in the key: the frontend always writes the
+        # same order, and a differently ordered copy only costs a duplicate
+        key = tuple((name, value if type(value) is str else _freeze(value))
+                    for name, value in habit.items() if name != "completed")
+        ref = self._definition_refs.get(key)
+        if ref is None:
+            ref = self._definition_refs[key] = len(self.definitions)
+            self.definitions.append({name: value for name, value in habit.items()
+                                     if name != "completed"})
+            habit_id = _freeze(habit.get("id"))
+            version = self._latest_versions[habit_id] = self._latest_versions.get(habit_id, 0) + 1
+            self.versions.append(version)
+        return ref
+
+    def _copy_row(self, key, previous, row):
+        self._rows[key] = len(self.flags)
+        self.offsets.append(len(self.completions))
+        refs = previous.refs[row]
+        if refs is not None:
+            start = previous.offsets[row]
+            self.completions.extend(previous.completions[start:start + len(refs)])
+        self.flags.append(previous.flags[row])
+        self.refs.append(refs)
+        self.weights.append(previous.weights[row])
+        self.completed_counts.append(previous.completed_counts[row])
+        self.total_counts.append(previous.total_counts[row])
+        self.timestamps.append(previous.timestamps[row])
+        self.extras.append(previous.extras[row])
+        self._normalized.append(previous._normalized[row])
+
+    def _append(self, key, day):
+        self._rows[key] = len(self.flags)
+        self.offsets.append(len(self.completions))
+        self._normalized.append(None)
+        if not isinstance(day, dict):
+            self.flags.append(_RAW)
+            self.refs.append(None)
+            self.weights.append(math.nan)
+            self.completed_counts.append(_NO_COUNT)
+            self.total_counts.append(_NO_COUNT)
+            self.timestamps.append(_NO_TIMESTAMP)
+            self.extras.append(day)
+            return
+
+        flags = 0
+        extra = {name: value for name, value in day.items() if name not in self.COLUMNS}
+
+        date_value = day.get("date", _MISSING)
+        if date_value == key:
+            flags |= _DATE_IS_KEY
+        elif date_value is not _MISSING:
+            extra["date"] = date_value
+
+        habits = day.get("habits", _MISSING)
+        if isinstance(habits, list) and all(
+                isinstance(habit, dict) and isinstance(habit.get("completed"), bool)
+                for habit in habits):
+            flags |= _HAS_HABITS
+            refs = tuple(self._intern(habit) for habit in habits)
+            self.refs.append(self._ref_tuples.setdefault(refs, refs))
+            self.completions.extend(1 if habit["completed"] else 0 for habit in habits)
+        else:
+            self.refs.append(None)
+            if habits is not _MISSING:
+                extra["habits"] = habits
+
+        weight = day.get("weight", _MISSING)
+        if (isinstance(weight, (int, float)) and not isinstance(weight, bool)
+                and math.isfinite(weight) and _float32(weight) == weight):
+            self.weights.append(weight)
+            if isinstance(weight, int):
+                flags |= _WEIGHT_INT
+        else:
+            self.weights.append(math.nan)
+            if weight is not _MISSING:
+                extra["weight"] = weight
+
+        for name, column in (("completedCount", self.completed_counts),
+                             ("totalCount", self.total_counts)):
+            count = day.get(name, _MISSING)
+            if _short_int(count):
+                column.append(count)
+            else:
+                column.append(_NO_COUNT)
+                if count is not _MISSING:
+                    extra[name] = count
+
+        timestamp = day.get("timestamp", _MISSING)
+        ms = _timestamp_ms(timestamp)
+        if ms is not None:
+            self.timestamps.append(ms)
+        else:
+            self.timestamps.append(_NO_TIMESTAMP)
+            if timestamp is not _MISSING:
+                extra["timestamp"] = timestamp
+
+        self.flags.append(flags)
+        self.extras.append(extra or None)
+
+    def get(self, key):
+        """Materializes one day record (None if there is no such day)."""
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        if self.flags[row] & _RAW:
+            return self.extras[row]
+        return self._day(key, row, habits=True)
+
+    def normalized(self, key):
+        """
+        Returns a day as the data file stores it (see habit_schema.py).
+
+        The habits become definition refs plus one completion bit each;
+        a day whose habits can't be stored that way is returned as it is.
+        The record is cached on the row, so a day is only converted once
+        per change. Callers must not modify it.
+        """
+        row = self._rows[key]
+        record = self._normalized[row]
+        if record is not None:
+            return record
+
+        flags = self.flags[row]
+        extras = self.extras[row] or {}
+        if flags & _RAW:
+            return self.extras[row]
+        if not flags & _HAS_HABITS or "refs" in extras or "done" in extras:
+            record = self._day(key, row, habits=True)
+        else:
+            record = self._day(key, row, habits=False)
+            start = self.offsets[row]
+            refs = self.refs[row]
+            record["refs"] = list(refs)
+            record["done"] = "".join("1" if bit else "0"
+                                     for bit in self.completions[start:start + len(refs)])
+        self._normalized[row] = record
+        return record
+
+    def _day(self, key, row, habits):
+        """Builds the day record of a row (with its habits if habits is True)."""
+        flags = self.flags[row]
+        day = {}
+        if flags & _DATE_IS_KEY:
+            day["date"] = key
+        if habits and flags & _HAS_HABITS:
+            start = self.offsets[row]
+            day["habits"] = [{**self.definitions[ref], "completed": self.completions[start + i] == 1}
+                             for i, ref in enumerate(self.refs[row])]
+        if self.completed_counts[row] != _NO_COUNT:
+            day["completedCount"] = self.completed_counts[row]
+        if self.total_counts[row] != _NO_COUNT:
+            day["totalCount"] = self.total_counts[row]
+        weight = self.weights[row]
+        if not math.isnan(weight):
+            weight = float(f"{weight:.7g}")
+            day["weight"] = int(weight) if flags & _WEIGHT_INT else weight
+        if self.timestamps[row] != _NO_TIMESTAMP:
+            day["timestamp"] = _format_timestamp(self.timestamps[row])
+        if self.extras[row]:
+            day.update(self.extras[row])
+        return day
+
+    def matches(self, key, day):
+        """
+        True if the stored day of key equals day.
+
+        Compares column by column without materializing the stored day,
+        so diffing a save against the snapshot stays cheap.
+        """
+        row = self._rows.get(key)
+        if row is None:
+            return False
+        flags = self.flags[row]
+        if flags & _RAW:
+            return self.extras[row] == day
+        if not isinstance(day, dict):
+            return False
+
+        fields = 0
+        if flags & _DATE_IS_KEY:
+            if day.get("date") != key:
+                return False
+            fields += 1
+        if flags & _HAS_HABITS:
+            habits = day.get("habits")
+            refs = self.refs[row]
+            if not isinstance(habits, list) or len(habits) != len(refs):
+                return False
+            start = self.offsets[row]
+            for i, (ref, habit) in enumerate(zip(refs, habits)):
+                definition = self.definitions[ref]
+                if (not isinstance(habit, dict) or len(habit) != len(definition) + 1
+                        or habit.get("completed") != (self.completions[start + i] == 1)
+                        or not definition.items() <= habit.items()):
+                    return False
+            fields += 1
+        for name, column in (("completedCount", self.completed_counts),
+                             ("totalCount", self.total_counts)):
+            if column[row] != _NO_COUNT:
+                if day.get(name) != column[row]:
+                    return False
+                fields += 1
+        if not math.isnan(self.weights[row]):
+            if day.get("weight") != float(f"{self.weights[row]:.7g}"):
+                return False
+            fields += 1
+        if self.timestamps[row] != _NO_TIMESTAMP:
+            if day.get("timestamp") != _format_timestamp(self.timestamps[row]):
+                return False
+            fields += 1
+        for name, value in (self.extras[row] or {}).items():
+            if day.get(name, _MISSING) != value:
+                return False
+            fields += 1
+        return len(day) == fields
+
+    def to_value(self):
+        return {key: self.get(key) for key in self._rows}
+
+
+# ----------------------------------------------------------------------
+# Section conversion
+# ----------------------------------------------------------------------
+
+def compact_section(name, value, previous=None, changed=None):
+    """
+    Returns the compact form of a section value.
+
+    Args:
+        name (str): Section name
+        value: Section value as parsed from JSON
+        previous: Stored compact value of the section before this save
+        changed (iterable): Record keys that differ from previous
+
+    Returns:
+        The compact section, or value itself for sections (and shapes)
+        that aren't compacted
+    """
+    if name == "habits" and isinstance(value, dict):
+        if not isinstance(previous, HabitDays):
+            previous = None
+        return HabitDays(value, previous, changed)
+    if name == "mood" and isinstance(value, dict):
+        return CompactRecords(value, MoodEntry)
+    if name == "todos" and isinstance(value, list):
+        return CompactList(value, Todo)
+    if name == "goals" and isinstance(value, list):
+        return CompactList(value, Goal)
+    return value
+
+
+def is_compact(value):
+    """True if a stored section value is a compact section."""
+    return isinstance(value, (HabitDays, CompactRecords, CompactList))
+
+
+def materialize(value):
+    """Returns a stored section value as plain JSON data."""
+    return value.to_value() if is_compact(value) else value
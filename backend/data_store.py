@@ -0,0 +1,458 @@
+"""
+In-Memory Data Store
+
+Keeps the most recently saved copy of every data-file section in memory
+together with a per-section revision counter and content digest. Saves
+arrive as a complete document (the same shape desktopStorage.js writes
+to personal-tracker-data.json):
+
+    {
+      "version": "1.0.0",
+      "lastUpdated": "2024-12-01T10:30:00.000Z",
+      "data": {
+        "habits": {...}, "todos": [...], "goals": [...], "goalSteps": [...],
+        "mood": {...}, "journals": {...}, "reminders": [...], "streaks": {...}
+      }
+    }
+
+Each save is diffed section by section, record by record. Only sections
+with added, changed or removed records (or reordered list items) get a
+new revision, and listeners are told which records changed so they can
+update incrementally instead of reprocessing the whole dataset.
+
+Digests are computed when they are first asked for (the checksum
+sidecar, a section's first read) and kept until the section changes, so
+a save only hashes the sections it changed and a load hashes nothing.
+
+The largest sections are held in compact form (see compact_model.py)
+and only turned back into dicts when read.
+
+@module backend.data_store
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+
+from backend.compact_model import compact_section, is_compact, materialize
+
+# Data file section name -> localStorage key used by the frontend.
+# Must stay in sync with STORAGE_KEYS in src/utils/desktopStorage.js.
+SECTION_STORAGE_KEYS = {
+    "habits": "habit-tracker-data",
+    "todos": "todos-data",
+    "goals": "goals-data",
+    "goalSteps": "goal-steps-data",
+    "mood": "mood-data",
+    "journals": "habit-tracker-journals",
+    "reminders": "habit-tracker-reminders",
+    "streaks": "habit-tracker-streaks",
+}
+
+SECTION_NAMES = tuple(SECTION_STORAGE_KEYS)
+
+
+def canonical_json(value):
+    """
+    Serializes a value to a stable JSON string.
+
+    Keys are sorted and whitespace is stripped so two equal values always
+    produce the same bytes, regardless of the key order the frontend used.
+
+    Args:
+        value: Any JSON-serializable value
+
+    Returns:
+        str: Canonical JSON text
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def section_digest(value):
+    """
+    Returns a short content digest for a section value.
+
+    Args:
+        value: Section value (dict or list)
+
+    Returns:
+        str: 32-character BLAKE2b hex digest of the canonical JSON
+    """
+    return hashlib.blake2b(canonical_json(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def record_map(value):
+    """
+    Maps a section value to {record_key: record}.
+
+    Dict sections (habits, mood, journals, streaks) are already keyed by
+    date string. List sections (todos, goals, goalSteps, reminders) are
+    keyed by each item's "id", falling back to the list position for
+    items without one.
+
+    Args:
+        value: Section value (dict or list)
+
+    Returns:
+        dict: Records keyed by string key
+    """
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, list):
+        records = {}
+        for index, item in enumerate(value):
+            if isinstance(item, dict) and item.get("id") is not None:
+                records[str(item["id"])] = item
+            else:
+                records[f"#{index}"] = item
+        return records
+    return {}
+
+
+def diff_records(old_value, new_value):
+    """
+    Compares two versions of a section record by record.
+
+    Args:
+        old_value: Previous section value, plain or compact (or None)
+        new_value: New section value
+
+    Returns:
+        tuple: (upserted_keys, removed_keys) as lists of record keys
+    """
+    new_records = record_map(new_value)
+    if is_compact(old_value):
+        # Compare against the snapshot without materializing it
+        upserted = [key for key, record in new_records.items()
+                    if not old_value.matches(key, record)]
+        removed = [key for key in old_value.keys() if key not in new_records]
+        return upserted, removed
+
+    old_records = record_map(old_value) if old_value is not None else {}
+    upserted = [key for key, record in new_records.items()
+                if key not in old_records or old_records[key] != record]
+    removed = [key for key in old_records if key not in new_records]
+    return upserted, removed
+
+
+def _reordered(old_value, new_value):
+    """
+    True if the items of a list section changed order.
+
+    Dict sections are keyed by date, so their key order carries no
+    meaning (canonical_json() sorts it away as well).
+    """
+    if not isinstance(new_value, list):
+        return False
+    old_keys = old_value.keys() if is_compact(old_value) else list(record_map(old_value))
+    return old_keys != list(record_map(new_value))
+
+
+@dataclass
+class SectionChange:
+    """
+    Describes how one section changed during a save.
+
+    Attributes:
+        section (str): Section name (e.g. "habits")
+        revision (int): New revision number of the section
+        previous: Stored section value before the save, possibly compact
+            (None if new)
+        new_value: Section value after the save
+        upserted (list): Keys of records that were added or changed
+        removed (list): Keys of records that were removed
+        stored: Stored section value after the save, possibly compact
+            (a read-only snapshot)
+    """
+    section: str
+    revision: int
+    previous: object
+    new_value: object
+    upserted: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    stored: object = None
+
+    @property
+    def old_value(self):
+        """Section value before the save (materialized on access)."""
+        return materialize(self.previous)
+
+    @property
+    def storage_key(self):
+        """The frontend localStorage key for this section."""
+        return SECTION_STORAGE_KEYS.get(self.section)
+
+
+class DataStore:
+    """
+    Thread-safe holder for the current dataset.
+
+    Listeners are called as listener(changes, origin) after every save
+    that changed at least one section, where changes is a list of
+    SectionChange and origin is the client id that made the save (or
+    None for changes that did not come from a window).
+
+    Example:
+        >>> store = DataStore()
+        >>> store.subscribe(lambda changes, origin: print([c.section for c in changes]))
+        >>> changes = store.apply_document({"data": {"mood": {}}})
+        ['mood']
+
+    Args:
+        compact (bool): Hold sections in compact form (see
+            compact_model.py) instead of as parsed JSON
+    """
+
+    def __init__(self, compact=True):
+        self.compact = compact
+        self._lock = threading.RLock()
+        self._sections = {}
+        self._revisions = {}
+        self._digests = {}          # section -> digest, once asked for
+        self._digest_stats = {"digested": 0, "seconds": 0.0}
+        self._listeners = []
+        self._read_hook = None
+        self._previews = {}         # section -> (value, stored, upserted, removed, compacted)
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+
+    def subscribe(self, listener):
+        """Registers a change listener. Returns the listener."""
+        with self._lock:
+            self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        """Removes a previously registered change listener."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def set_read_hook(self, hook):
+        """
+        Sets a function called as hook(section) before a section is read.
+
+        Called by get_section(), get_keys() and get_records(), so the
+        checksums can verify a section the first time it's read instead
+        of when it's loaded (see SectionChecksums.verify()).
+        """
+        with self._lock:
+            self._read_hook = hook
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _read(self, section):
+        """Stored value of a section, after the read hook has run."""
+        with self._lock:
+            hook = self._read_hook
+            known = section in self._sections
+        if hook is not None and known:
+            hook(section)
+        with self._lock:
+            return self._sections.get(section)
+
+    @property
+    def is_loaded(self):
+        """True once at least one section has been stored."""
+        with self._lock:
+            return bool(self._sections)
+
+    def get_section(self, section, hook=True):
+        """
+        Returns the current value of a section, or None if unknown.
+
+        Compact sections are materialized into a new value on every call;
+        use get_keys() / get_records() to read part of a section.
+
+        Args:
+            section (str): Section name
+            hook (bool): Run the read hook first (False for copies that
+                aren't reads of the data, like the binary snapshot)
+        """
+        if hook:
+            return materialize(self._read(section))
+        with self._lock:
+            value = self._sections.get(section)
+        return materialize(value)
+
+    def get_keys(self, section):
+        """Returns the record keys of a section (see record_map())."""
+        value = self._read(section)
+        if is_compact(value):
+            return value.keys()
+        return list(record_map(value))
+
+    def get_records(self, section, keys):
+        """
+        Returns the records of a section with the given keys.
+
+        Only these records are materialized. Keys without a record are
+        left out.
+
+        Returns:
+            dict: {key: record}
+        """
+        value = self._read(section)
+        if is_compact(value):
+            records = ((key, value.get(key)) for key in keys)
+            return {key: record for key, record in records if record is not None}
+        records = record_map(value)
+        return {key: records[key] for key in keys if key in records}
+
+    def get_record(self, section, key):
+        """Returns one record of a section, or None if there is none."""
+        return self.get_records(section, [key]).get(key)
+
+    def get_revision(self, section):
+        """Returns the current revision of a section (0 if never saved)."""
+        with self._lock:
+            return self._revisions.get(section, 0)
+
+    def get_digest(self, section):
+        """
+        Returns the content digest of a section, or None if unknown.
+
+        The digest is computed on the first call after the section
+        changed and kept until it changes again.
+        """
+        with self._lock:
+            digest = self._digests.get(section)
+            value = self._sections.get(section)
+            if digest is not None or value is None:
+                return digest
+            started = time.perf_counter()
+            digest = section_digest(materialize(value))
+            self._digests[section] = digest
+            self._digest_stats["digested"] += 1
+            self._digest_stats["seconds"] += time.perf_counter() - started
+            return digest
+
+    def digest_stats(self):
+        """
+        Returns how many section values were hashed and the time it took.
+
+        Only sections whose digest was asked for after they changed are
+        hashed (see get_digest()).
+
+        Returns:
+            dict: {"digested": count, "digestMs": total}
+        """
+        with self._lock:
+            return {
+                "digested": self._digest_stats["digested"],
+                "digestMs": round(self._digest_stats["seconds"] * 1000, 3),
+            }
+
+    def revisions(self):
+        """Returns a copy of {section: revision} for all known sections."""
+        with self._lock:
+            return dict(self._revisions)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def apply_document(self, document, origin=None, notify=True):
+        """
+        Stores a full data-file document and reports what changed.
+
+        Sections missing from the document are left untouched, matching
+        importAllData() in desktopStorage.js which only overwrites the
+        sections present in the file.
+
+        Args:
+            document (dict): Data file contents ({"data": {...}, ...})
+            origin (str): Client id that produced the save (optional)
+            notify (bool): Whether listeners should be called
+
+        Returns:
+            list: SectionChange objects for every changed section
+        """
+        data = document.get("data") if isinstance(document, dict) else None
+        if not isinstance(data, dict):
+            return []
+        return self.apply_sections(data, origin=origin, notify=notify)
+
+    def preview_section(self, section, value):
+        """
+        Returns the form a section value would be stored in if applied now.
+
+        The data file is written before a save is applied, and is written
+        from the compact form (see habit_schema.normalize_document()).
+        The result is remembered, so applying the same value object next
+        reuses it instead of diffing and compacting the section again.
+
+        Args:
+            section (str): Section name
+            value: New section value
+
+        Returns:
+            The compact (or, for sections that aren't compacted, plain)
+            value - the stored value itself if nothing changed
+        """
+        with self._lock:
+            stored = self._sections.get(section)
+            upserted, removed = diff_records(stored, value)
+            if stored is not None and not upserted and not removed \
+                    and not _reordered(stored, value):
+                return stored
+            compacted = compact_section(section, value, stored, upserted) if self.compact else value
+            self._previews[section] = (value, stored, upserted, removed, compacted)
+            return compacted
+
+    def apply_sections(self, sections, origin=None, notify=True):
+        """
+        Stores one or more section values and reports what changed.
+
+        Args:
+            sections (dict): {section_name: value}
+            origin (str): Client id that produced the save (optional)
+            notify (bool): Whether listeners should be called
+
+        Returns:
+            list: SectionChange objects for every changed section
+        """
+        changes = []
+        with self._lock:
+            for name, value in sections.items():
+                if name not in SECTION_STORAGE_KEYS or value is None:
+                    continue
+                stored = self._sections.get(name)
+                preview = self._previews.pop(name, None)
+                if preview is not None and preview[0] is value and preview[1] is stored:
+                    _, _, upserted, removed, compacted = preview
+                else:
+                    upserted, removed = diff_records(stored, value)
+                    compacted = None
+                if stored is not None and not upserted and not removed \
+                        and not _reordered(stored, value):
+                    continue
+                revision = self._revisions.get(name, 0) + 1
+
+                if compacted is not None:
+                    self._sections[name] = compacted
+                elif self.compact:
+                    # Unchanged records are carried over from the old snapshot
+                    self._sections[name] = compact_section(name, value, stored, upserted)
+                else:
+                    self._sections[name] = value
+                self._digests.pop(name, None)
+                self._revisions[name] = revision
+                changes.append(SectionChange(name, revision, stored, value, upserted, removed,
+                                             self._sections[name]))
+            listeners = list(self._listeners)
+
+        if notify and changes:
+            for listener in listeners:
+                try:
+                    listener(changes, origin)
+                except Exception as e:
+                    # A broken listener must never break saving
+                    print(f"Warning: data store listener failed: {e}")
+        return changes
@@ -0,0 +1,93 @@
+"""
+Date Key Helpers
+
+The frontend keys all daily data by JavaScript's Date.toDateString(),
+e.g. "Mon Dec 01 2024". These helpers convert between that format,
+datetime.date and the "YYYY-MM-DD" strings produced by <input type="date">.
+
+@module backend.dates
+"""
+
+from datetime import date, datetime
+
+# Same layout as Date.prototype.toDateString() ("Mon Dec 01 2024")
+DATE_KEY_FORMAT = "%a %b %d %Y"
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_MONTH_NUMBERS = {name: number for number, name in enumerate(_MONTHS, start=1)}
+
+
+def parse_date_key(key):
+    """
+    Parses a toDateString() key into a date.
+
+    Doesn't depend on the process locale (unlike strptime's %a/%b).
+
+    Args:
+        key (str): Date key like "Mon Dec 01 2024"
+
+    Returns:
+        date|None: The parsed date, or None if the key is malformed
+    """
+    try:
+        _, month, day, year = key.split()
+        return date(int(year), _MONTH_NUMBERS[month], int(day))
+    except (AttributeError, ValueError, KeyError):
+        return None
+
+
+def format_date_key(value):
+    """
+    Formats a date the way Date.toDateString() does.
+
+    Args:
+        value (date): Date to format
+
+    Returns:
+        str: Date key like "Mon Dec 01 2024"
+    """
+    return f"{_WEEKDAYS[value.weekday()]} {_MONTHS[value.month - 1]} {value.day:02d} {value.year}"
+
+
+def parse_date(value):
+    """
+    Parses any date value the frontend sends.
+
+    Accepts "YYYY-MM-DD", full ISO timestamps and toDateString() keys.
+
+    Args:
+        value (str|date|datetime): Value to parse
+
+    Returns:
+        date|None: The parsed date, or None if it can't be parsed
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return parse_date_key(value)
+
+
+def parse_timestamp(value):
+    """
+    Parses an ISO timestamp from the frontend (e.g. toISOString()).
+
+    Args:
+        value (str): Timestamp like "2024-12-01T10:30:00.000Z"
+
+    Returns:
+        datetime|None: The parsed datetime, or None if it can't be parsed
+    """
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
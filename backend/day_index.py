@@ -0,0 +1,189 @@
+"""
+Ordinal-Day Index
+
+All daily data is keyed by toDateString() strings ("Mon Dec 01 2024"),
+which don't sort chronologically. The browser's getAllDates(),
+getDateRange(), getMoodHistory() and getJournalsInRange() therefore parse
+every key and sort or filter the whole section on every call.
+
+DayIndex keeps, per date-keyed section, a sorted array of ordinal day
+numbers (date.toordinal()) with a parallel list of the record keys they
+belong to. A range query is two bisections plus a slice: O(log n + k).
+
+The indexes follow the DataStore: saves update only the keys that were
+added or removed, and an index whose section revision no longer matches
+the store is rebuilt on its next query.
+
+@module backend.day_index
+"""
+
+import bisect
+import threading
+from array import array
+
+from backend.dates import parse_date, parse_date_key
+
+# Sections keyed by date string
+DAY_INDEXED_SECTIONS = ("habits", "mood", "journals")
+
+
+class DayIndex:
+    """
+    Sorted ordinal days of one date-keyed section.
+
+    Attributes:
+        ordinals (array): Sorted ordinal day numbers
+        keys (list): Record key (date string) at the same position
+        revision (int|None): Section revision the index reflects
+    """
+
+    def __init__(self, revision=None):
+        self.ordinals = array("l")
+        self.keys = []
+        self.revision = revision
+
+    @classmethod
+    def build(cls, keys, revision=None):
+        """
+        Builds an index from the record keys of a section.
+
+        Keys that aren't valid date keys are left out.
+        """
+        index = cls(revision)
+        pairs = []
+        for key in keys or ():
+            day = parse_date_key(key)
+            if day is not None:
+                pairs.append((day.toordinal(), key))
+        pairs.sort()
+        index.ordinals = array("l", (ordinal for ordinal, _ in pairs))
+        index.keys = [key for _, key in pairs]
+        return index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _position(self, ordinal, key):
+        """Returns the position of key, or None if it isn't indexed."""
+        position = bisect.bisect_left(self.ordinals, ordinal)
+        while position < len(self.ordinals) and self.ordinals[position] == ordinal:
+            if self.keys[position] == key:
+                return position
+            position += 1
+        return None
+
+    def add(self, key):
+        """Adds a record key (no-op if it's already indexed or invalid)."""
+        day = parse_date_key(key)
+        if day is None:
+            return
+        ordinal = day.toordinal()
+        if self._position(ordinal, key) is not None:
+            return
+        position = bisect.bisect_right(self.ordinals, ordinal)
+        self.ordinals.insert(position, ordinal)
+        self.keys.insert(position, key)
+
+    def remove(self, key):
+        """Removes a record key (no-op if it isn't indexed)."""
+        day = parse_date_key(key)
+        if day is None:
+            return
+        position = self._position(day.toordinal(), key)
+        if position is not None:
+            del self.ordinals[position]
+            del self.keys[position]
+
+    def span(self, start=None, end=None):
+        """
+        Returns the [lo, hi) positions of the days in an inclusive range.
+
+        Args:
+            start (date): First day (None = from the earliest)
+            end (date): Last day (None = up to the latest)
+        """
+        lo = 0 if start is None else bisect.bisect_left(self.ordinals, start.toordinal())
+        hi = len(self.ordinals) if end is None else bisect.bisect_right(self.ordinals, end.toordinal())
+        return lo, max(lo, hi)
+
+    def keys_in_range(self, start=None, end=None):
+        """Returns the date keys in an inclusive range, oldest first."""
+        lo, hi = self.span(start, end)
+        return self.keys[lo:hi]
+
+
+class DayIndexes:
+    """
+    DayIndex for every date-keyed section of a DataStore.
+
+    Args:
+        store (DataStore): Store to index; the indexes subscribe to it
+
+    Example:
+        >>> indexes = DayIndexes(data_store)
+        >>> indexes.query_range("mood", "2024-12-01", "2024-12-31")
+        [("Sun Dec 01 2024", {...}), ("Mon Dec 02 2024", {...})]
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.Lock()
+        self._indexes = {}
+        store.subscribe(self.on_changes)
+
+    def on_changes(self, changes, origin):
+        """DataStore listener: applies added/removed keys to built indexes."""
+        with self._lock:
+            for change in changes:
+                index = self._indexes.get(change.section)
+                if index is None:
+                    continue
+                if not isinstance(change.new_value, dict) or index.revision != change.revision - 1:
+                    # Missed an update (or the section changed shape) - rebuild lazily
+                    del self._indexes[change.section]
+                    continue
+                for key in change.removed:
+                    index.remove(key)
+                for key in change.upserted:
+                    index.add(key)
+                index.revision = change.revision
+
+    def index(self, section):
+        """
+        Returns the up-to-date index of a section, building it if needed.
+
+        Raises:
+            ValueError: If the section isn't date-keyed
+        """
+        if section not in DAY_INDEXED_SECTIONS:
+            raise ValueError(f"Section is not keyed by date: {section}")
+        revision = self._store.get_revision(section)
+        with self._lock:
+            index = self._indexes.get(section)
+            if index is None or index.revision != revision:
+                index = DayIndex.build(self._store.get_keys(section), revision)
+                self._indexes[section] = index
+            return index
+
+    def query_range(self, section, start=None, end=None, descending=False):
+        """
+        Returns the records of a section within an inclusive date range.
+
+        Args:
+            section (str): "habits", "mood" or "journals"
+            start: First day - "YYYY-MM-DD", ISO timestamp, date key or date
+                   (None = from the earliest)
+            end: Last day, same formats (None = up to the latest)
+            descending (bool): Newest first instead of oldest first
+
+        Returns:
+            list: (date_key, record) pairs
+        """
+        index = self.index(section)
+        with self._lock:
+            keys = index.keys_in_range(parse_date(start), parse_date(end))
+        if descending:
+            keys.reverse()
+        # Only the records in range are materialized
+        records = self._store.get_records(section, keys)
+        return [(key, records[key]) for key in keys if key in records]
@@ -0,0 +1,324 @@
+"""
+Streaming Data Export
+
+Writes JSON and CSV exports straight to a file, one record at a time,
+instead of building the whole export as a single string first (which is
+what exportAllData()/convertToCSV() in src/utils/exportUtils.js do in the
+browser). Records are read from the data store a batch at a time, so
+compact sections are never turned into dicts all at once, and output is
+buffered and flushed in fixed-size chunks - memory use stays flat no
+matter how many years of data are exported.
+
+Both formats mirror the browser export:
+- JSON: {version, exportDate, data: {habits, todos, goals, goalSteps},
+  metadata: {...}}
+- CSV: the same "=== SECTION ===" blocks and columns, plus a mood block
+
+The optional date range ({"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"},
+inclusive) filters the date-keyed sections (habits, weight, mood), just
+like the browser export filters habits.
+
+The file is written to a temporary name and renamed into place, so a
+failed export never leaves a half-written file behind.
+
+@module backend.export_writer
+"""
+
+import csv
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from backend.dates import parse_date, parse_date_key, parse_timestamp
+
+EXPORT_VERSION = "1.0.0"
+
+# Size of each buffered write to disk
+CHUNK_SIZE = 64 * 1024
+
+# Records read from the data store at a time
+RECORD_BATCH_SIZE = 256
+
+EXPORT_FORMATS = ("json", "csv")
+
+
+def _in_range(date_key, start, end):
+    """True if a date key falls inside the (optional) inclusive range."""
+    if start is None and end is None:
+        return True
+    day = parse_date_key(date_key)
+    if day is None:
+        return False
+    return (start is None or day >= start) and (end is None or day <= end)
+
+
+def _locale_date(value):
+    """Formats an ISO timestamp like toLocaleDateString() (en-US)."""
+    parsed = parse_timestamp(value) if isinstance(value, str) else None
+    if parsed is None:
+        parsed_date = parse_date(value)
+        return f"{parsed_date.month}/{parsed_date.day}/{parsed_date.year}" if parsed_date else ""
+    return f"{parsed.month}/{parsed.day}/{parsed.year}"
+
+
+def iter_records(store, section, keys=None):
+    """
+    Yields (key, record) pairs of a data store section.
+
+    Records are read RECORD_BATCH_SIZE at a time with get_records(), so
+    only one batch of a compact section is materialized at once.
+
+    Args:
+        store: DataStore (anything with get_keys() and get_records())
+        section (str): Section name
+        keys (list): Record keys to read (optional - defaults to all,
+                     in stored order)
+
+    Yields:
+        tuple: (key, record)
+    """
+    if keys is None:
+        keys = list(store.get_keys(section))
+    for offset in range(0, len(keys), RECORD_BATCH_SIZE):
+        batch = keys[offset:offset + RECORD_BATCH_SIZE]
+        records = store.get_records(section, batch)
+        for key in batch:
+            if key in records:
+                yield key, records[key]
+
+
+def iter_days(store, section, date_range=None):
+    """
+    Yields (date_key, record) pairs of a date-keyed section in range.
+
+    The range is checked on the keys, so days outside it are never read.
+
+    Args:
+        store: DataStore (anything with get_keys() and get_records())
+        section (str): Date-keyed section name (habits, mood, ...)
+        date_range (dict): Optional {"start": ..., "end": ...}
+
+    Yields:
+        tuple: (date_key, record)
+    """
+    start = parse_date(date_range.get("start")) if date_range else None
+    end = parse_date(date_range.get("end")) if date_range else None
+    keys = [date_key for date_key in store.get_keys(section)
+            if _in_range(date_key, start, end)]
+    return iter_records(store, section, keys)
+
+
+class _ChunkedWriter:
+    """Text sink that buffers small writes and flushes them in chunks."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+        self.bytes_written = 0
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._parts:
+            data = "".join(self._parts).encode("utf-8")
+            self._f.write(data)
+            self.bytes_written += len(data)
+            self._parts = []
+            self._size = 0
+
+
+def _indent(text, level):
+    """Re-indents a json.dumps(indent=2) block for nesting at level."""
+    return text.replace("\n", "\n" + "  " * level)
+
+
+def _write_json_object(out, items, level):
+    """Streams {key: value} pairs as a pretty-printed JSON object."""
+    count = 0
+    out.write("{")
+    for key, value in items:
+        out.write("," if count else "")
+        out.write("\n" + "  " * (level + 1) + json.dumps(key, ensure_ascii=False) + ": ")
+        out.write(_indent(json.dumps(value, indent=2, ensure_ascii=False), level + 1))
+        count += 1
+    out.write(("\n" + "  " * level if count else "") + "}")
+    return count
+
+
+def _write_json_array(out, items, level):
+    """Streams values as a pretty-printed JSON array."""
+    count = 0
+    out.write("[")
+    for value in items:
+        out.write("," if count else "")
+        out.write("\n" + "  " * (level + 1))
+        out.write(_indent(json.dumps(value, indent=2, ensure_ascii=False), level + 1))
+        count += 1
+    out.write(("\n" + "  " * level if count else "") + "]")
+    return count
+
+
+def write_json_export(out, store, date_range=None):
+    """
+    Streams a JSON export.
+
+    Args:
+        out: Text sink with a write() method
+        store: DataStore to read the sections from
+        date_range (dict): Optional {"start": ..., "end": ...}
+
+    Returns:
+        dict: Row counts per section
+    """
+    counts = {}
+    out.write("{\n")
+    out.write(f'  "version": {json.dumps(EXPORT_VERSION)},\n')
+    out.write(f'  "exportDate": {json.dumps(datetime.now(timezone.utc).isoformat())},\n')
+    out.write('  "data": {\n    "habits": ')
+    counts["days"] = _write_json_object(out, iter_days(store, "habits", date_range), 2)
+    for name in ("todos", "goals", "goalSteps"):
+        out.write(f',\n    "{name}": ')
+        records = (record for _, record in iter_records(store, name))
+        counts[name] = _write_json_array(out, records, 2)
+    out.write("\n  },\n")
+
+    metadata = {
+        "totalDays": counts["days"],
+        "totalTodos": counts["todos"],
+        "totalGoals": counts["goals"],
+        "totalGoalSteps": counts["goalSteps"],
+    }
+    out.write('  "metadata": ' + _indent(json.dumps(metadata, indent=2), 1) + "\n}\n")
+    return counts
+
+
+def write_csv_export(out, store, date_range=None):
+    """
+    Streams a CSV export with the same blocks as convertToCSV().
+
+    Args:
+        out: Text sink with a write() method
+        store: DataStore to read the sections from
+        date_range (dict): Optional {"start": ..., "end": ...}
+
+    Returns:
+        dict: Row counts per block
+    """
+    writer = csv.writer(out, quoting=csv.QUOTE_ALL, lineterminator="\n")
+    counts = {"habitCompletions": 0, "todos": 0, "goals": 0, "goalSteps": 0,
+              "weights": 0, "mood": 0}
+
+    out.write("Personal Tracker Data Export\n")
+    out.write(f"Export Date: {datetime.now().strftime('%m/%d/%Y, %I:%M:%S %p')}\n\n")
+
+    out.write("=== HABITS ===\n")
+    out.write("Date,Habit Name,Emoji,Category,Completed\n")
+    for date_key, day in iter_days(store, "habits", date_range):
+        for habit in day.get("habits") or []:
+            category = (habit.get("category") or {}).get("name") or "Unknown"
+            writer.writerow([date_key, habit.get("name", ""), habit.get("emoji", ""),
+                             category, "Yes" if habit.get("completed") else "No"])
+            counts["habitCompletions"] += 1
+
+    out.write("\n=== TODOS ===\n")
+    out.write("Title,Description,Time Commitment,Urgency,Due Date,Created,Completed,"
+              "Time to Completion (hours)\n")
+    for _, todo in iter_records(store, "todos"):
+        time_to_completion = todo.get("timeToCompletion")
+        writer.writerow([
+            todo.get("title", ""), todo.get("description") or "",
+            todo.get("timeCommitment") or "", todo.get("urgency") or "",
+            _locale_date(todo.get("dueDate")), _locale_date(todo.get("createdAt")),
+            _locale_date(todo.get("completedAt")),
+            f"{time_to_completion:.2f}" if isinstance(time_to_completion, (int, float)) else "",
+        ])
+        counts["todos"] += 1
+
+    out.write("\n=== GOALS ===\n")
+    out.write("Title,Description,Target Amount,Unit,Emoji,Created\n")
+    for _, goal in iter_records(store, "goals"):
+        writer.writerow([goal.get("title", ""), goal.get("description") or "",
+                         goal.get("targetAmount") or "", goal.get("unit") or "",
+                         goal.get("emoji") or "", _locale_date(goal.get("createdAt"))])
+        counts["goals"] += 1
+
+    out.write("\n=== GOAL STEPS ===\n")
+    out.write("Goal ID,Step Title,Amount,Frequency,Created\n")
+    for _, step in iter_records(store, "goalSteps"):
+        writer.writerow([step.get("goalId", ""), step.get("title", ""),
+                         step.get("amount") or "", step.get("frequency") or "",
+                         _locale_date(step.get("createdAt"))])
+        counts["goalSteps"] += 1
+
+    out.write("\n=== WEIGHT TRACKING ===\n")
+    out.write("Date,Weight (lbs)\n")
+    for date_key, day in iter_days(store, "habits", date_range):
+        if day.get("weight"):
+            writer.writerow([date_key, day["weight"]])
+            counts["weights"] += 1
+
+    out.write("\n=== MOOD ===\n")
+    out.write("Date,Mood,Notes\n")
+    for date_key, entry in iter_days(store, "mood", date_range):
+        writer.writerow([date_key, entry.get("mood", ""), entry.get("notes") or ""])
+        counts["mood"] += 1
+
+    return counts
+
+
+def export_to_file(output_path, store, export_format="json", date_range=None,
+                   chunk_size=CHUNK_SIZE):
+    """
+    Streams an export to a file.
+
+    Args:
+        output_path (str): Destination file path
+        store: DataStore to read the sections from
+        export_format (str): "json" or "csv"
+        date_range (dict): Optional {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
+        chunk_size (int): Bytes buffered per write
+
+    Returns:
+        dict: {"path", "format", "counts", "bytes", "seconds"}
+
+    Raises:
+        ValueError: If export_format is not supported
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    started = time.perf_counter()
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = output_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            out = _ChunkedWriter(f, chunk_size)
+            if export_format == "json":
+                counts = write_json_export(out, store, date_range)
+            else:
+                counts = write_csv_export(out, store, date_range)
+            out.flush()
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return {
+        "path": output_path,
+        "format": export_format,
+        "counts": counts,
+        "bytes": out.bytes_written,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
@@ -0,0 +1,269 @@
+"""
+External Change Detection
+
+Notices when personal-tracker-data.json or a journal file is changed by
+something other than this app - typically Dropbox/iCloud syncing an edit
+made on another machine.
+
+Detection is layered so an idle poll costs only os.stat calls:
+1. Compare (size, mtime) with the last known values - unchanged files
+   are never opened.
+2. If the stat changed, read the bytes and compare a BLAKE2b digest -
+   touched-but-identical files (common with sync clients) are never
+   parsed.
+3. Only files whose content really changed are parsed and reported.
+
+The app's own writes are wrapped in own_write() so they are not reported
+back as external changes. The new content's digest is registered before
+the file is renamed into place, so a poll that runs in the middle of the
+write already knows it.
+
+@module backend.file_watcher
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from backend.journal_store import JournalStore
+
+
+def file_fingerprint(path):
+    """
+    Returns a cheap fingerprint of a file from os.stat.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        tuple|None: (size, mtime_ns), or None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def content_digest(content):
+    """
+    Returns the digest used to compare file contents.
+
+    Args:
+        content (bytes|str): File contents
+
+    Returns:
+        str: BLAKE2b hex digest
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class ChangeWatcher:
+    """
+    Polls the data file and the journals directory for external edits.
+
+    The watcher is passive: poll_data_file() and poll_journals() do one
+    check each and return what changed. start.py calls them from a
+    background loop.
+
+    Example:
+        >>> watcher = ChangeWatcher()
+        >>> watcher.watch_data_file("/Users/me/Desktop/personal-tracker-data.json")
+        >>> document = watcher.poll_data_file()   # None unless edited elsewhere
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data_path = None
+        self._journals_dir = None
+        # path -> (fingerprint, digest) for every file we know the content of
+        self._known = {}
+        # path -> digest of an own write in progress
+        self._writing = {}
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    @property
+    def data_path(self):
+        """Path of the watched data file (or None)."""
+        return self._data_path
+
+    @property
+    def journals_dir(self):
+        """Path of the watched journals directory (or None)."""
+        return self._journals_dir
+
+    def watch_data_file(self, path):
+        """
+        Starts watching a data file.
+
+        The current contents become the baseline, so only edits made
+        after this call are reported.
+
+        Args:
+            path (str): Full path to the data file
+        """
+        if not path:
+            return
+        path = os.path.abspath(path)
+        with self._lock:
+            if path == self._data_path:
+                return
+            self._data_path = path
+        self._remember(path)
+
+    def watch_journals_dir(self, journals_dir):
+        """
+        Starts watching a journals directory.
+
+        Args:
+            journals_dir (str): Journals directory (see backend/journal_store.py)
+        """
+        if not journals_dir:
+            return
+        journals_dir = os.path.abspath(journals_dir)
+        with self._lock:
+            if journals_dir == self._journals_dir:
+                return
+            self._journals_dir = journals_dir
+        for path in self._journal_paths():
+            self._remember(path)
+
+    @contextmanager
+    def own_write(self, path, content):
+        """
+        Wraps a write made by the app itself so it is never reported.
+
+        The content is known before the block runs, so a poll between the
+        rename and the end of the block doesn't mistake it for an
+        external edit.
+
+        Args:
+            path (str): Path about to be written
+            content (bytes|str): Exact contents that will be written
+
+        Example:
+            >>> with watcher.own_write(path, content):
+            ...     atomic_write(path, content)
+        """
+        path = os.path.abspath(path)
+        digest = content_digest(content)
+        with self._lock:
+            self._writing[path] = digest
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                self._writing.pop(path, None)
+            raise
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            self._writing.pop(path, None)
+            self._known[path] = (fingerprint, digest)
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def poll_data_file(self):
+        """
+        Checks the data file for an external change.
+
+        Returns:
+            dict|None: The parsed document if its contents changed,
+                       otherwise None
+        """
+        path = self._data_path
+        if path is None:
+            return None
+        content = self._changed_content(path)
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            # Probably a sync client mid-write - try again next poll
+            print(f"Warning: data file changed but could not be parsed: {e}")
+            with self._lock:
+                self._known.pop(path, None)
+            return None
+
+    def poll_journals(self):
+        """
+        Checks the journals directory for changed or new journal files.
+
+        Returns:
+            list: Parsed journal entries whose files changed
+        """
+        if self._journals_dir is None:
+            return []
+
+        entries = []
+        for path in self._journal_paths():
+            content = self._changed_content(path)
+            if content is None:
+                continue
+            try:
+                entries.append(json.loads(content))
+            except ValueError as e:
+                print(f"Warning: journal file changed but could not be parsed: {e}")
+                with self._lock:
+                    self._known.pop(path, None)
+        return entries
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _journal_paths(self):
+        # Loose files only - packed months are closed and not edited
+        return JournalStore(self._journals_dir).loose_paths()
+
+    def _remember(self, path):
+        """Records the current state of a file as the baseline."""
+        fingerprint = file_fingerprint(path)
+        digest = None
+        if fingerprint is not None:
+            try:
+                digest = content_digest(_read_bytes(path))
+            except OSError:
+                fingerprint = None
+        with self._lock:
+            self._known[path] = (fingerprint, digest)
+
+    def _changed_content(self, path):
+        """
+        Returns the file's bytes if its content changed, else None.
+
+        Unchanged stat -> no read. Changed stat but same digest -> the
+        new stat is remembered and nothing is reported.
+        """
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            known_fingerprint, known_digest = self._known.get(path, (None, None))
+        if fingerprint is None or fingerprint == known_fingerprint:
+            return None
+
+        try:
+            content = _read_bytes(path)
+        except OSError:
+            return None
+        digest = content_digest(content)
+
+        with self._lock:
+            self._known[path] = (fingerprint, digest)
+            writing = self._writing.get(path)
+        if digest in (known_digest, writing):
+            return None
+        return content
@@ -0,0 +1,47 @@
+"""
+File Writing Helpers
+
+@module backend.fileio
+"""
+
+import os
+import stat
+import tempfile
+
+
+def atomic_write(path, content):
+    """
+    Writes a file so readers only ever see the old or the new contents.
+
+    The data goes to a temporary file in the same directory, is flushed
+    to disk, and then renamed over the target. A crash or a sync client
+    reading mid-write can no longer observe a half-written file.
+
+    Args:
+        path (str): Destination file path
+        content (bytes|str): New file contents (str is UTF-8 encoded)
+
+    Returns:
+        bytes: The exact bytes that were written
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files - keep the permissions of the file we replace
+        mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return content
@@ -0,0 +1,217 @@
+"""
+Goal Progress Engine
+
+calculateGoalProgress() in goalStorage.js reads and filters every goal
+step for each goal it is asked about, and getGoalCompletedTodosCountSync()
+and recalculateGoalTodoCount() scan every todo for each goal. The goals
+page asks for every goal, so rendering it is goals x (steps + todos).
+
+GoalProgress keeps a dependency index instead - goal id -> its step keys
+and goal id -> its linked todo keys - and caches the progress of each
+goal. Saving a step or a todo only invalidates the goals it belonged to
+before and after the save (a step moved to another goal, or a todo
+linked to another goal, touches both), and only those goals are
+recomputed on the next request, from their own steps and todos.
+
+Whether a recurring step counts as completed depends on the current
+day (isStepCompleted()), so all cached progress is dropped when the
+date changes.
+
+@module backend.goal_progress
+"""
+
+import threading
+from datetime import date, timedelta
+
+from backend.data_store import record_map
+from backend.dates import format_date_key
+from backend.recurrence import local_day
+
+
+def week_start(day):
+    """Sunday that starts the week of a date (getDay() === 0)."""
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+def is_step_completed(step, today):
+    """
+    Whether a goal step counts as completed today, as isStepCompleted().
+
+    - daily: completed today
+    - weekly: completed this week (weeks start on Sunday)
+    - monthly: completed this calendar month
+    - one-time: completed at all
+
+    Args:
+        step (dict): Goal step
+        today (date): Current day
+
+    Returns:
+        bool: True if the step is completed
+    """
+    completions = step.get("completions") if isinstance(step, dict) else None
+    if not isinstance(completions, list) or not completions:
+        return False
+    frequency = step.get("frequency")
+    if frequency not in ("daily", "weekly", "monthly"):
+        return True
+    if frequency == "daily":
+        key = format_date_key(today)
+        return any(isinstance(c, dict) and c.get("date") == key for c in completions)
+    for completion in completions:
+        day = local_day(completion.get("date")) if isinstance(completion, dict) else None
+        if day is None:
+            continue
+        if frequency == "weekly" and week_start(day) == week_start(today):
+            return True
+        if frequency == "monthly" and (day.year, day.month) == (today.year, today.month):
+            return True
+    return False
+
+
+def _goal_key(goal_id):
+    return None if goal_id is None else str(goal_id)
+
+
+class GoalProgress:
+    """
+    Cached progress of every goal, kept up to date with a DataStore.
+
+    Args:
+        store (DataStore): Store holding the goals, goalSteps and todos
+        today (callable): Returns the current date (for tests)
+
+    Example:
+        >>> goals = GoalProgress(data_store)
+        >>> goals.progress(["1733000000000"])
+        {"1733000000000": {"progress": 2, "total": 3, "percentage": 67,
+                           "todos": 4, "completedTodos": 1}}
+    """
+
+    GOALS = "goals"
+    STEPS = "goalSteps"
+    TODOS = "todos"
+
+    # Section -> field that links a record to its goal
+    LINKS = {STEPS: "goalId", TODOS: "linkedGoalId"}
+
+    def __init__(self, store, today=date.today):
+        self._store = store
+        self._today = today
+        self._lock = threading.Lock()
+        self._revisions = {}        # section -> revision the index is at
+        self._records = {section: {} for section in self.LINKS}    # key -> record
+        self._links = {section: {} for section in self.LINKS}      # key -> goal key
+        self._members = {section: {} for section in self.LINKS}    # goal key -> set of keys
+        self._cache = {}            # goal key -> progress
+        self._day = None            # day the cached progress is for
+        self._stats = {"computed": 0}
+        store.subscribe(self.on_changes)
+
+    # ------------------------------------------------------------------
+    # Dependency index
+    # ------------------------------------------------------------------
+
+    def on_changes(self, changes, origin):
+        """DataStore listener: invalidates the goals of saved steps and todos."""
+        for change in changes:
+            if change.section not in self.LINKS:
+                continue
+            with self._lock:
+                if self._revisions.get(change.section) != change.revision - 1:
+                    continue    # Missed an update - _sync() rebuilds
+                records = record_map(change.new_value)
+                for key in list(change.upserted) + list(change.removed):
+                    self._relink(change.section, key, records.get(key))
+                self._revisions[change.section] = change.revision
+
+    def _relink(self, section, key, record):
+        """Re-indexes one step or todo and invalidates its old and new goal."""
+        old = self._links[section].pop(key, None)
+        if old is not None:
+            self._cache.pop(old, None)
+            keys = self._members[section][old]
+            keys.discard(key)
+            if not keys:
+                del self._members[section][old]
+        self._records[section].pop(key, None)
+
+        goal = _goal_key(record.get(self.LINKS[section])) if isinstance(record, dict) else None
+        if goal is None:
+            return
+        self._records[section][key] = record
+        self._links[section][key] = goal
+        self._members[section].setdefault(goal, set()).add(key)
+        self._cache.pop(goal, None)
+
+    def _sync(self):
+        """Rebuilds sections that missed a save; drops progress on a new day."""
+        today = self._today()
+        if today != self._day:
+            self._cache.clear()
+            self._day = today
+        for section in self.LINKS:
+            revision = self._store.get_revision(section)
+            if revision == self._revisions.get(section):
+                continue
+            for goal in self._members[section]:
+                self._cache.pop(goal, None)
+            self._records[section], self._links[section], self._members[section] = {}, {}, {}
+            for key, record in record_map(self._store.get_section(section)).items():
+                self._relink(section, key, record)
+            self._revisions[section] = revision
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+
+    def _compute(self, goal):
+        steps = [self._records[self.STEPS][key] for key in self._members[self.STEPS].get(goal, ())]
+        todos = [self._records[self.TODOS][key] for key in self._members[self.TODOS].get(goal, ())]
+        completed = sum(1 for step in steps if is_step_completed(step, self._day))
+        self._stats["computed"] += 1
+        return {
+            "progress": completed,
+            "total": len(steps),
+            # Math.round(completed / total * 100)
+            "percentage": int(completed * 100 / len(steps) + 0.5) if steps else 0,
+            "todos": len(todos),
+            "completedTodos": sum(1 for todo in todos if todo.get("completed")),
+        }
+
+    def progress(self, goal_ids=None):
+        """
+        Returns the progress of goals, recomputing only invalidated ones.
+
+        Args:
+            goal_ids (list): Goal ids (None = every goal in the goals section)
+
+        Returns:
+            dict: {goal id: {"progress": completed steps, "total": steps,
+                             "percentage", "todos": linked todos,
+                             "completedTodos"}}
+        """
+        if goal_ids is None:
+            goal_ids = [goal.get("id") for goal in self._store.get_section(self.GOALS) or ()
+                        if isinstance(goal, dict) and goal.get("id") is not None]
+        with self._lock:
+            self._sync()
+            result = {}
+            for goal_id in goal_ids:
+                goal = _goal_key(goal_id)
+                if goal is None:
+                    continue
+                if goal not in self._cache:
+                    self._cache[goal] = self._compute(goal)
+                result[goal] = dict(self._cache[goal])
+            return result
+
+    def stats(self):
+        """Returns index sizes and how many goal progresses were computed."""
+        with self._lock:
+            return {
+                "cached": len(self._cache),
+                "steps": len(self._records[self.STEPS]),
+                "linkedTodos": len(self._records[self.TODOS]),
+                "computed": self._stats["computed"],
+            }
@@ -0,0 +1,264 @@
+"""
+Normalized Habit Day Records
+
+saveDayData() stores a full copy of every habit on every day:
+
+    "Mon Dec 01 2024": {
+      "habits": [
+        {"id": 1, "name": "Meditate", "emoji": "🧘",
+         "category": {"name": "Health", "color": "#4caf50"},
+         "completed": true, "timeOfDay": "morning"},
+        ...
+      ],
+      ...
+    }
+
+With 50 habits over 5 years that is ~90,000 copies of the same few
+dozen definitions. In the data file the habits section is stored
+normalized instead:
+
+    "habits": {
+      "schema": "normalized/1",
+      "definitions": [
+        {"version": 1, "habit": {"id": 1, "name": "Meditate", ...}},
+        {"version": 2, "habit": {"id": 1, "name": "Meditate 20 min", ...}}
+      ],
+      "days": {
+        "Mon Dec 01 2024": {"refs": [0, 5, 7], "done": "101", "weight": 150.5, ...}
+      }
+    }
+
+Each distinct habit definition (everything except "completed") is
+stored once. When a habit is edited, its new definition gets the next
+version for its id, and days keep referring to the version they were
+recorded with. A day keeps its other fields as they are. It holds its
+habits as definition refs ("refs"), in their original order, plus one
+completion bit per habit ("done").
+
+The conversion is lossless: denormalize_habits(normalize_habits(x)) == x.
+Days that can't be normalized (a habit without a boolean "completed",
+say) are stored unchanged. A habits section that isn't normalized
+passes through denormalize_habits() untouched, so old files still load.
+
+Data files are written with DOCUMENT_VERSION 2.0.0: readers that only
+know the 1.x (denormalized) format must refuse them rather than read the
+normalized section as day records. Both import paths (import_data() and
+importData() in importUtils.js) denormalize before merging.
+
+The frontend and the DataStore keep using the denormalized shape. Days
+restored from the file share the nested definition values (category
+objects, strings) instead of holding copies of them.
+
+When the app saves, the section is written from the DataStore's compact
+HabitDays (normalize_habit_days()): its interned definitions are the
+definition table, kept and versioned across saves, and each day is
+normalized once and reused by later saves until it changes.
+
+@module backend.habit_schema
+"""
+
+from backend.compact_model import HabitDays
+from backend.data_store import canonical_json
+from backend.dates import parse_date_key
+
+NORMALIZED_SCHEMA = "normalized/1"
+
+# Version of data documents that may hold a normalized habits section
+DOCUMENT_VERSION = "2.0.0"
+
+
+def is_normalized(section):
+    """True if a habits section value is in the normalized format."""
+    return isinstance(section, dict) and section.get("schema") == NORMALIZED_SCHEMA
+
+
+def _normalizable(day):
+    """True if every habit of a day record can be stored as ref + bit."""
+    if not isinstance(day, dict) or not isinstance(day.get("habits"), list):
+        return False
+    if "refs" in day or "done" in day:
+        return False  # Would collide with the normalized fields
+    return all(isinstance(habit, dict) and isinstance(habit.get("completed"), bool)
+               for habit in day["habits"])
+
+
+class HabitDefinitions:
+    """
+    Interned, versioned habit definitions.
+
+    Example:
+        >>> definitions = HabitDefinitions()
+        >>> definitions.intern({"id": 1, "name": "Meditate", "completed": True})
+        0
+        >>> definitions.intern({"id": 1, "name": "Meditate", "completed": False})
+        0
+        >>> definitions.intern({"id": 1, "name": "Meditate daily", "completed": True})
+        1
+        >>> definitions.entries[1]["version"]
+        2
+    """
+
+    def __init__(self):
+        self.entries = []
+        self._refs = {}         # canonical definition -> ref
+        self._versions = {}     # canonical habit id -> latest version
+
+    def intern(self, habit):
+        """
+        Returns the ref of a habit's definition, adding it if it's new.
+
+        Args:
+            habit (dict): Habit as stored in a day record
+
+        Returns:
+            int: Index into entries
+        """
+        definition = {key: value for key, value in habit.items() if key != "completed"}
+        key = canonical_json(definition)
+        ref = self._refs.get(key)
+        if ref is None:
+            habit_id = canonical_json(definition.get("id"))
+            version = self._versions.get(habit_id, 0) + 1
+            self._versions[habit_id] = version
+            ref = self._refs[key] = len(self.entries)
+            self.entries.append({"version": version, "habit": definition})
+        return ref
+
+
+def _chronological(days):
+    """Day keys, oldest first (keys that aren't dates go last)."""
+    def sort_key(key):
+        day = parse_date_key(key)
+        return (0, day.toordinal()) if day is not None else (1, 0)
+    return sorted(days, key=sort_key)
+
+
+def normalize_habits(days):
+    """
+    Converts a habits section to the normalized format.
+
+    Args:
+        days (dict): {date_key: day record} as saved by the frontend
+
+    Returns:
+        dict: Normalized section (or the value unchanged if it isn't a
+              date-keyed dict or is already normalized)
+    """
+    if not isinstance(days, dict) or is_normalized(days):
+        return days
+
+    definitions = HabitDefinitions()
+    normalized = {}
+    # Oldest first, so version 1 is the earliest definition of a habit
+    for key in _chronological(days):
+        day = days[key]
+        if not _normalizable(day):
+            normalized[key] = day
+            continue
+        record = {name: value for name, value in day.items() if name != "habits"}
+        record["refs"] = [definitions.intern(habit) for habit in day["habits"]]
+        record["done"] = "".join("1" if habit["completed"] else "0" for habit in day["habits"])
+        normalized[key] = record
+
+    return {
+        "schema": NORMALIZED_SCHEMA,
+        "definitions": definitions.entries,
+        "days": normalized,
+    }
+
+
+def normalize_habit_days(days):
+    """
+    Converts a compact habits section to the normalized format.
+
+    Unlike normalize_habits(), nothing is interned or compared here: the
+    definitions are the ones HabitDays interned as days were saved, and
+    days unchanged since the last save reuse their cached records.
+
+    Args:
+        days (HabitDays): Habits section as held by the DataStore
+
+    Returns:
+        dict: Normalized section
+    """
+    return {
+        "schema": NORMALIZED_SCHEMA,
+        "definitions": [{"version": version, "habit": definition}
+                        for version, definition in zip(days.versions, days.definitions)],
+        "days": {key: days.normalized(key) for key in days.keys()},
+    }
+
+
+def denormalize_habits(section):
+    """
+    Converts a normalized habits section back to {date_key: day record}.
+
+    Args:
+        section: Habits section as read from the data file
+
+    Returns:
+        dict: The section in the shape the frontend uses (a section that
+              isn't normalized is returned unchanged)
+
+    Raises:
+        ValueError: If a day refers to a definition that doesn't exist
+    """
+    if not is_normalized(section):
+        return section
+
+    habits = [entry["habit"] for entry in section.get("definitions") or []]
+    days = {}
+    for key, record in (section.get("days") or {}).items():
+        if not isinstance(record, dict) or "refs" not in record:
+            days[key] = record
+            continue
+        refs, done = record["refs"], record.get("done", "")
+        if len(done) != len(refs):
+            raise ValueError(f"Habit completion bits don't match habits on {key}")
+        day = {}
+        for name, value in record.items():
+            if name == "refs":
+                try:
+                    day["habits"] = [{**habits[ref], "completed": bit == "1"}
+                                     for ref, bit in zip(refs, done)]
+                except (IndexError, TypeError):
+                    raise ValueError(f"Unknown habit definition on {key}") from None
+            elif name != "done":
+                day[name] = value
+        days[key] = day
+    return days
+
+
+def normalize_document(document, habits=None):
+    """
+    Returns a copy of a data document with its habits section normalized.
+
+    The copy is stamped with DOCUMENT_VERSION.
+
+    Args:
+        document (dict): {"version", "lastUpdated", "data": {...}}
+        habits: The document's habits section as the DataStore would
+                store it (DataStore.preview_section()). A HabitDays is
+                written with normalize_habit_days(); anything else falls
+                back to normalizing the section from scratch.
+    """
+    data = document.get("data")
+    if not isinstance(data, dict) or "habits" not in data:
+        return {**document, "version": DOCUMENT_VERSION}
+    if isinstance(habits, HabitDays):
+        section = normalize_habit_days(habits)
+    else:
+        section = normalize_habits(data["habits"])
+    return {**document, "version": DOCUMENT_VERSION, "data": {**data, "habits": section}}
+
+
+def denormalize_document(document):
+    """
+    Returns a data document with its habits section in the frontend shape.
+
+    Documents without a normalized habits section are returned unchanged.
+    """
+    data = document.get("data") if isinstance(document, dict) else None
+    if not isinstance(data, dict) or not is_normalized(data.get("habits")):
+        return document
+    return {**document, "data": {**data, "habits": denormalize_habits(data["habits"])}}
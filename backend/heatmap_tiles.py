@@ -0,0 +1,174 @@
+"""
+Yearly Calendar Heatmap Tiles
+
+getHeatmapData() in calendarUtils.js computes a month of the calendar
+heatmap by looking up every day in the whole habits section; with a
+habit filter it also scans each day's habits array. Every month
+navigation repeats that work.
+
+HeatmapTiles keeps one tile per year instead:
+
+- overall: 366 completion intensities (completedCount / totalCount,
+  the same value as getCompletionIntensity())
+- habits: per habit id, 366 completion flags (0 or 1, like
+  getHabitCompletionForDate()); habits never completed that year have
+  no row
+
+Slots follow the calendar of a leap year (slot 59 is always Feb 29 and
+slot 60 always Mar 1), so a date has the same slot in every year and the
+Feb 29 slot simply stays 0 in common years.
+
+Tiles are built on first request from the day index (only that year's
+days are read) and updated in place when a day is saved or removed. A
+tile that missed an update is rebuilt on its next request.
+
+@module backend.heatmap_tiles
+"""
+
+import threading
+from array import array
+from datetime import date
+
+from backend.dates import parse_date_key
+
+TILE_SLOTS = 366
+
+# Cumulative days before each month in a leap year
+_MONTH_OFFSETS = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+
+
+def tile_slot(day):
+    """Returns the tile slot (0-365) of a date."""
+    return _MONTH_OFFSETS[day.month - 1] + day.day - 1
+
+
+def habit_key(habit_id):
+    """Key of a habit's row in a tile (JSON object keys are strings)."""
+    return str(habit_id)
+
+
+def day_intensity(record):
+    """
+    Overall completion of a day record, as getCompletionIntensity().
+
+    Returns:
+        float: completedCount / totalCount (0 without habits)
+    """
+    # Same test as `!dayData.habits` in JavaScript (an empty list passes)
+    if not isinstance(record, dict) or record.get("habits") in (None, False, 0, ""):
+        return 0.0
+    total = record.get("totalCount") or 1
+    completed = record.get("completedCount") or 0
+    try:
+        return float(completed) / float(total)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class HeatmapTile:
+    """
+    Heatmap of one year.
+
+    Attributes:
+        year (int): Calendar year
+        overall (array): Completion intensity per slot
+        habits (dict): {habit key: array of 0/1 per slot}
+    """
+
+    def __init__(self, year):
+        self.year = year
+        self.overall = array("f", bytes(4 * TILE_SLOTS))
+        self.habits = {}
+
+    def set_day(self, day, record):
+        """Writes one day's record into the tile (None clears the day)."""
+        slot = tile_slot(day)
+        self.overall[slot] = day_intensity(record)
+
+        completed = set()
+        habits = record.get("habits") if isinstance(record, dict) else None
+        for habit in habits if isinstance(habits, list) else ():
+            if isinstance(habit, dict) and habit.get("completed"):
+                completed.add(habit_key(habit.get("id")))
+        for key in completed - self.habits.keys():
+            self.habits[key] = array("b", bytes(TILE_SLOTS))
+        for key, flags in self.habits.items():
+            flags[slot] = 1 if key in completed else 0
+
+    def to_dict(self):
+        return {
+            "year": self.year,
+            "overall": [round(value, 3) for value in self.overall],
+            "habits": {key: flags.tolist() for key, flags in self.habits.items()},
+        }
+
+
+class HeatmapTiles:
+    """
+    Heatmap tiles of the habits section, kept up to date with a DataStore.
+
+    Args:
+        store (DataStore): Store holding the habits section
+        day_indexes (DayIndexes): Used to read only one year's days
+
+    Example:
+        >>> tiles = HeatmapTiles(data_store, day_indexes)
+        >>> tiles.tile(2024)["overall"][tile_slot(date(2024, 12, 1))]
+        0.75
+    """
+
+    SECTION = "habits"
+
+    def __init__(self, store, day_indexes):
+        self._store = store
+        self._day_indexes = day_indexes
+        self._lock = threading.Lock()
+        self._tiles = {}
+        self._revision = None
+        store.subscribe(self.on_changes)
+
+    def on_changes(self, changes, origin):
+        """DataStore listener: updates the saved days in built tiles."""
+        for change in changes:
+            if change.section != self.SECTION:
+                continue
+            with self._lock:
+                if self._revision != change.revision - 1 or not isinstance(change.new_value, dict):
+                    # Missed an update - rebuild tiles on their next request
+                    self._tiles.clear()
+                    self._revision = None
+                    continue
+                for key in list(change.upserted) + list(change.removed):
+                    day = parse_date_key(key)
+                    tile = self._tiles.get(day.year) if day is not None else None
+                    if tile is not None:
+                        tile.set_day(day, change.new_value.get(key))
+                self._revision = change.revision
+
+    def tile(self, year):
+        """
+        Returns the heatmap of a year, building its tile if needed.
+
+        Returns:
+            dict: {"year", "revision", "overall": [366 floats],
+                   "habits": {habit id: [366 flags]}}
+        """
+        year = int(year)
+        revision = self._store.get_revision(self.SECTION)
+        with self._lock:
+            if self._revision != revision:
+                self._tiles.clear()
+                self._revision = revision
+            tile = self._tiles.get(year)
+            if tile is None:
+                tile = self._tiles[year] = self._build(year)
+            result = tile.to_dict()
+        result["revision"] = revision
+        return result
+
+    def _build(self, year):
+        tile = HeatmapTile(year)
+        keys = self._day_indexes.index(self.SECTION).keys_in_range(date(year, 1, 1), date(year, 12, 31))
+        for key, record in self._store.get_records(self.SECTION, keys).items():
+            tile.set_day(parse_date_key(key), record)
+        return tile
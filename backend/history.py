@@ -0,0 +1,405 @@
+"""
+Undo/Redo Edit History
+
+The only way back to an earlier state is createBackup() /
+restoreFromBackup() in importUtils.js, which copy the whole dataset per
+snapshot - far too much to keep one per edit.
+
+EditHistory records every save as a HistoryEntry holding only what the
+save changed: per section, the new versions of the upserted records and
+the keys of the removed ones (plus the key order, in the rare case the
+save reordered records). Upserted records are kept JSON-encoded, so an
+entry holds one bytes object per record instead of the parsed dicts.
+
+Checkpoints make any point in the history cheap to reconstruct: every
+CHECKPOINT_INTERVAL entries the stored value of each edited section is
+kept. Stored values are the DataStore's read-only snapshots - compact
+rows and columns for the large sections (see backend/compact_model.py) -
+so a checkpoint only holds references, and sections not edited between
+two checkpoints share the same snapshot. A point is reconstructed by
+replaying at most CHECKPOINT_INTERVAL - 1 entries on top of the nearest
+earlier checkpoint; only the records that are returned are decoded or
+materialized.
+
+Undo, redo and restoring a point all reconstruct the target state of the
+affected sections and save it back through the caller, so open windows
+are notified like for any other save. A new edit after undoing discards
+the undone entries. At most max_entries entries are kept; the oldest are
+dropped a checkpoint interval at a time.
+
+The history lives for the session (it isn't written to disk), and loading
+the data file at startup isn't an edit.
+
+@module backend.history
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+
+from backend.compact_model import is_compact
+from backend.data_store import record_map
+
+MAX_HISTORY_ENTRIES = 5000
+
+CHECKPOINT_INTERVAL = 100
+
+# Origin of the saves made by undo/redo/restore (not recorded as edits)
+HISTORY_ORIGIN = "history"
+
+
+def _keys(value):
+    """Record keys of a section value (plain or compact), in order."""
+    if is_compact(value):
+        return list(value.keys())
+    return list(record_map(value)) if value is not None else []
+
+
+def encode_record(record):
+    """A record as compact JSON bytes (key order is kept)."""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_record(data):
+    return json.loads(data)
+
+
+class SectionEdit:
+    """
+    What one save changed in one section.
+
+    Attributes:
+        section (str): Section name
+        upserts (dict): {key: encoded record} of added or changed records
+            (see encode_record())
+        removed (tuple): Keys of removed records
+        order (tuple|None): Key order after the save, only when it isn't
+            the old order minus removed keys plus new keys at the end
+    """
+
+    __slots__ = ("section", "upserts", "removed", "order")
+
+    def __init__(self, section, upserts, removed, order=None):
+        self.section = section
+        self.upserts = upserts
+        self.removed = removed
+        self.order = order
+
+    @classmethod
+    def from_change(cls, change):
+        records = record_map(change.new_value)
+        old_keys = _keys(change.previous)
+        new_keys = list(records)
+        removed = set(change.removed)
+        known = set(old_keys)
+        expected = [key for key in old_keys if key not in removed]
+        expected += [key for key in change.upserted if key not in known]
+        upserts = {key: encode_record(records[key]) for key in change.upserted}
+        return cls(change.section, upserts, tuple(change.removed),
+                   None if expected == new_keys else tuple(new_keys))
+
+    @property
+    def size(self):
+        """Bytes of encoded records held by the edit."""
+        return sum(len(data) for data in self.upserts.values())
+
+
+class SectionState:
+    """
+    A section at some point in the history: a stored value (from a
+    checkpoint) plus the edits replayed on top of it.
+
+    The base value is never copied. Until an edit is applied nothing is
+    built; after that only the key order and the encoded upserts are
+    kept, and records are decoded or materialized in records().
+    """
+
+    __slots__ = ("base", "_order", "_upserts", "_plain")
+
+    def __init__(self, base):
+        self.base = base
+        self._order = None          # {key: None} in order, once edited
+        self._upserts = {}          # key -> encoded record
+        self._plain = None          # record_map() of a plain base
+
+    def apply(self, edit):
+        """Applies a SectionEdit."""
+        if self._order is None:
+            self._order = dict.fromkeys(_keys(self.base))
+        for key in edit.removed:
+            self._order.pop(key, None)
+            self._upserts.pop(key, None)
+        for key, data in edit.upserts.items():
+            self._order[key] = None     # keeps the position of existing keys
+            self._upserts[key] = data
+        if edit.order is not None:
+            self._order = dict.fromkeys(key for key in edit.order if key in self._order)
+
+    def _base_record(self, key):
+        if is_compact(self.base):
+            return self.base.get(key)
+        if self._plain is None:
+            self._plain = record_map(self.base)
+        return self._plain.get(key)
+
+    def records(self):
+        """Returns the section as a new {key: record} map."""
+        keys = self._order if self._order is not None else _keys(self.base)
+        records = {}
+        for key in keys:
+            data = self._upserts.get(key)
+            records[key] = decode_record(data) if data is not None else self._base_record(key)
+        return records
+
+
+class HistoryEntry:
+    """
+    One recorded save.
+
+    Attributes:
+        id (int): Position in the history after this entry
+        time (str): When the save happened (ISO timestamp, UTC)
+        origin (str): Client id or origin that made the save
+        edits (tuple): SectionEdit per changed section
+    """
+
+    __slots__ = ("id", "time", "origin", "edits")
+
+    def __init__(self, entry_id, time, origin, edits):
+        self.id = entry_id
+        self.time = time
+        self.origin = origin
+        self.edits = edits
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "time": self.time,
+            "origin": self.origin,
+            "sections": {edit.section: {"upserted": len(edit.upserts), "removed": len(edit.removed)}
+                         for edit in self.edits},
+        }
+
+
+class EditHistory:
+    """
+    Bounded undo/redo history of DataStore saves.
+
+    Args:
+        store (DataStore): Store whose saves are recorded
+        max_entries (int): Most entries kept
+        checkpoint_interval (int): Entries between checkpoints
+        now (callable): Returns the current datetime (for tests)
+
+    Example:
+        >>> history = EditHistory(data_store)
+        >>> history.undo(save_sections)
+        ['todos']
+        >>> history.restore(120, save_sections)
+        ['habits', 'todos']
+    """
+
+    def __init__(self, store, max_entries=MAX_HISTORY_ENTRIES,
+                 checkpoint_interval=CHECKPOINT_INTERVAL, now=None):
+        self._store = store
+        self._max_entries = max(max_entries, checkpoint_interval)
+        self._interval = checkpoint_interval
+        self._now = now or (lambda: datetime.now(timezone.utc))
+        # Re-entrant: restoring saves into the store, which calls on_changes
+        self._lock = threading.RLock()
+        self._entries = []          # entries[i].id == self._start + 1 + i
+        self._start = 0             # position of the oldest checkpoint
+        self._cursor = 0            # position the data is at
+        self._checkpoints = {0: {}} # position -> {section: stored value}
+        self._current = {}          # section -> stored value now
+        self._kinds = {}            # section -> list or dict
+        store.subscribe(self.on_changes)
+
+    @property
+    def _end(self):
+        return self._start + len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def on_changes(self, changes, origin):
+        """DataStore listener: records a save as one history entry."""
+        # Sections seen for the first time (the initial load) aren't edits
+        changes = [change for change in changes if change.previous is not None]
+        if not changes:
+            return
+        with self._lock:
+            if origin == HISTORY_ORIGIN:
+                # Undo/redo/restore: not an entry, but the data moved
+                for change in changes:
+                    if change.section in self._current:
+                        self._current[change.section] = change.stored
+                return
+            self._truncate_redo()
+            for change in changes:
+                if change.section not in self._kinds:
+                    self._track(change)
+                self._current[change.section] = change.stored
+            entry = HistoryEntry(self._end + 1, self._now().isoformat(), origin,
+                                 tuple(SectionEdit.from_change(change) for change in changes))
+            self._entries.append(entry)
+            self._cursor = entry.id
+            if entry.id % self._interval == 0:
+                # The store is at this entry: its snapshots are the state
+                self._checkpoints[entry.id] = dict(self._current)
+            self._trim()
+
+    def _track(self, change):
+        """
+        Starts tracking a section at its first edit.
+
+        The section was unchanged since the oldest checkpoint, so its
+        stored value before this save belongs in every checkpoint.
+        """
+        self._kinds[change.section] = list if isinstance(change.new_value, list) else dict
+        for state in self._checkpoints.values():
+            state[change.section] = change.previous
+
+    def _truncate_redo(self):
+        """Drops the undone entries before a new edit is recorded."""
+        if self._cursor == self._end:
+            return
+        del self._entries[self._cursor - self._start:]
+        for position in [p for p in self._checkpoints if p > self._cursor]:
+            del self._checkpoints[position]
+
+    def _trim(self):
+        """Drops the oldest entries, up to a checkpoint, past max_entries."""
+        if len(self._entries) <= self._max_entries:
+            return
+        limit = min(self._end - self._max_entries + self._interval - 1, self._cursor)
+        start = max((p for p in self._checkpoints if p <= limit), default=self._start)
+        if start == self._start:
+            return
+        del self._entries[:start - self._start]
+        for position in [p for p in self._checkpoints if p < start]:
+            del self._checkpoints[position]
+        self._start = start
+
+    # ------------------------------------------------------------------
+    # Reconstruction
+    # ------------------------------------------------------------------
+
+    def _state_at(self, position):
+        """SectionState of every tracked section at a position."""
+        base = max(p for p in self._checkpoints if p <= position)
+        state = {section: SectionState(value) for section, value in self._checkpoints[base].items()}
+        for entry in self._entries[base - self._start:position - self._start]:
+            for edit in entry.edits:
+                state[edit.section].apply(edit)
+        return state
+
+    def _section_value(self, section, state):
+        records = state.records()
+        if self._kinds[section] is list:
+            return list(records.values())
+        return records
+
+    def _check_position(self, position):
+        position = int(position)
+        if not self._start <= position <= self._end:
+            raise ValueError(f"History position {position} is not between {self._start} and {self._end}")
+        return position
+
+    def state_at(self, position, sections=None):
+        """
+        Reconstructs sections as they were at a point in the history.
+
+        Args:
+            position (int): Entry id (the state right after that entry)
+            sections (list): Sections to return (None = every edited section)
+
+        Returns:
+            dict: {section: value}
+
+        Raises:
+            ValueError: If the position is no longer (or not yet) in the history
+        """
+        with self._lock:
+            state = self._state_at(self._check_position(position))
+            return {section: self._section_value(section, section_state)
+                    for section, section_state in state.items()
+                    if sections is None or section in sections}
+
+    def restore(self, position, save):
+        """
+        Moves the data to a point in the history.
+
+        Only sections edited between the current point and the target
+        are reconstructed and saved.
+
+        Args:
+            position (int): Entry id to move to (0 or the oldest kept
+                            position = before the first entry)
+            save (callable): Called with {section: value} to write the
+                             sections; must save with origin HISTORY_ORIGIN
+
+        Returns:
+            list: Names of the sections that were saved
+
+        Raises:
+            ValueError: If the position isn't in the history
+        """
+        with self._lock:
+            position = self._check_position(position)
+            low, high = sorted((position, self._cursor))
+            touched = {edit.section for entry in self._entries[low - self._start:high - self._start]
+                       for edit in entry.edits}
+            if touched:
+                state = self._state_at(position)
+                save({section: self._section_value(section, state[section]) for section in touched})
+            self._cursor = position
+            return sorted(touched)
+
+    def undo(self, save):
+        """Reverts the latest entry not undone yet. Returns the saved sections."""
+        with self._lock:
+            if self._cursor <= self._start:
+                raise ValueError("Nothing to undo")
+            return self.restore(self._cursor - 1, save)
+
+    def redo(self, save):
+        """Re-applies the latest undone entry. Returns the saved sections."""
+        with self._lock:
+            if self._cursor >= self._end:
+                raise ValueError("Nothing to redo")
+            return self.restore(self._cursor + 1, save)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def entries(self, limit=50):
+        """
+        Returns the newest entries and where the data currently is.
+
+        Returns:
+            dict: {"entries": [...] newest first, "cursor", "oldest",
+                   "canUndo", "canRedo"}
+        """
+        with self._lock:
+            newest = self._entries[-limit:] if limit else list(self._entries)
+            return {
+                "entries": [entry.to_dict() for entry in reversed(newest)],
+                "cursor": self._cursor,
+                "oldest": self._start,
+                "canUndo": self._cursor > self._start,
+                "canRedo": self._cursor < self._end,
+            }
+
+    def stats(self):
+        """Returns the history size, encoded record bytes and checkpoint count."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "recordBytes": sum(edit.size for entry in self._entries for edit in entry.edits),
+                "checkpoints": len(self._checkpoints),
+                "cursor": self._cursor,
+                "sections": sorted(self._kinds),
+            }
@@ -0,0 +1,275 @@
+"""
+Indexed Import Engine
+
+Validates and merges an imported backup/export file against the current
+dataset. The browser version (importData() in src/utils/importUtils.js)
+finds matching todos, goals and goal steps with findIndex() inside a
+loop, which is quadratic, and validateImportData() walks the data again
+separately.
+
+Here each section is handled in a single pass over the imported records:
+every record is validated and indexed (by date key for day sections, by
+id for list sections) in the same loop, and matched against a hash index
+of the existing records. Merging is O(existing + imported) per section.
+
+Modes:
+- "replace": imported sections replace the current ones
+- "merge": records are merged by date key / id
+
+Conflict policies (merge mode, when both sides have a record):
+- "theirs": the imported record wins (same as the browser merge)
+- "ours": the existing record is kept
+- "newest": the record with the later updatedAt/timestamp wins
+
+@module backend.import_engine
+"""
+
+import time
+
+from backend.data_store import SECTION_STORAGE_KEYS
+from backend.dates import parse_date_key
+from backend.habit_schema import DOCUMENT_VERSION
+
+CURRENT_VERSION = DOCUMENT_VERSION
+
+IMPORT_MODES = ("replace", "merge")
+CONFLICT_POLICIES = ("theirs", "ours", "newest")
+
+# Sections keyed by date string vs. lists of records with an "id"
+DATE_KEYED_SECTIONS = ("habits", "mood", "journals")
+ID_LIST_SECTIONS = ("todos", "goals", "goalSteps")
+
+# Stop collecting problem descriptions after this many (counts continue)
+MAX_REPORTED_PROBLEMS = 20
+
+# Fields checked (in order) to decide which record is newer
+_RECENCY_FIELDS = ("updatedAt", "timestamp", "completedAt", "createdAt")
+
+
+class ImportValidationError(ValueError):
+    """Raised when an import file can't be imported at all."""
+
+
+def _recency(record):
+    if isinstance(record, dict):
+        for name in _RECENCY_FIELDS:
+            value = record.get(name)
+            if isinstance(value, str) and value:
+                # toISOString() values compare correctly as strings
+                return value
+    return ""
+
+
+def _pick(existing, imported, policy):
+    """Resolves a conflict between two records. Returns (record, took_imported)."""
+    if policy == "ours":
+        return existing, False
+    if policy == "newest" and _recency(existing) > _recency(imported):
+        return existing, False
+    return imported, True
+
+
+class ImportReport:
+    """
+    Counts and problems collected while importing.
+
+    Attributes:
+        sections (dict): Per-section counts {"added", "updated", "kept", "invalid"}
+        problems (list): Human-readable descriptions of skipped records
+        timings (dict): Seconds spent per phase
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self.problems = []
+        self.invalid_total = 0
+        self.timings = {}
+
+    def counts(self, section):
+        return self.sections.setdefault(
+            section, {"added": 0, "updated": 0, "kept": 0, "invalid": 0})
+
+    def invalid(self, section, message):
+        self.counts(section)["invalid"] += 1
+        self.invalid_total += 1
+        if len(self.problems) < MAX_REPORTED_PROBLEMS:
+            self.problems.append(f"{section}: {message}")
+
+    def to_dict(self):
+        return {
+            "sections": self.sections,
+            "invalid": self.invalid_total,
+            "problems": self.problems,
+            "timings": {name: round(seconds, 4) for name, seconds in self.timings.items()},
+        }
+
+
+def _version_tuple(version):
+    """(major, minor, patch) of a version string; unparsable parts are 0."""
+    parts = []
+    for part in str(version).split(".")[:3]:
+        try:
+            parts.append(int(part))
+        except ValueError:
+            parts.append(0)
+    return tuple(parts + [0] * (3 - len(parts)))
+
+
+def check_document(document):
+    """
+    Checks the top-level structure of an import document.
+
+    Older versions import as they are (habits sections of data files must
+    be denormalized first, see backend/habit_schema.py). A newer major
+    version is refused, since its sections may not be in a shape this
+    version can read.
+
+    Args:
+        document: Parsed import file
+
+    Returns:
+        str|None: Version warning, if any
+
+    Raises:
+        ImportValidationError: If the document can't be imported
+    """
+    if not isinstance(document, dict):
+        raise ImportValidationError("Invalid data format")
+    if not isinstance(document.get("data"), dict):
+        raise ImportValidationError("Missing data object")
+    version = document.get("version")
+    if not version:
+        return None
+    imported, current = _version_tuple(version), _version_tuple(CURRENT_VERSION)
+    if imported[0] > current[0]:
+        raise ImportValidationError(f"Data version {version} is newer than this app "
+                                    f"supports ({CURRENT_VERSION})")
+    if imported > current:
+        return (f"Data version {version} may not be fully compatible with "
+                f"current version {CURRENT_VERSION}")
+    return None
+
+
+def _merge_date_keyed(name, existing, imported, mode, policy, report):
+    """One pass over imported day records: validate, index and merge."""
+    counts = report.counts(name)
+    if not isinstance(imported, dict):
+        report.invalid(name, "expected an object keyed by date")
+        return existing
+
+    merged = dict(existing) if (mode == "merge" and isinstance(existing, dict)) else {}
+    for date_key, record in imported.items():
+        if parse_date_key(date_key) is None:
+            report.invalid(name, f"bad date key {date_key!r}")
+            continue
+        if not isinstance(record, dict):
+            report.invalid(name, f"{date_key}: expected an object")
+            continue
+        if name == "habits" and not isinstance(record.get("habits", []), list):
+            report.invalid(name, f"{date_key}: habits must be a list")
+            continue
+
+        current = merged.get(date_key)
+        if current is None:
+            merged[date_key] = record
+            counts["added"] += 1
+        else:
+            merged[date_key], took_imported = _pick(current, record, policy)
+            counts["updated" if took_imported else "kept"] += 1
+    return merged
+
+
+def _merge_id_list(name, existing, imported, mode, policy, report):
+    """One pass over imported list records: validate, index and merge."""
+    counts = report.counts(name)
+    if not isinstance(imported, list):
+        report.invalid(name, "expected a list")
+        return existing
+
+    merged = list(existing) if (mode == "merge" and isinstance(existing, list)) else []
+    # Hash index: id -> position in merged
+    positions = {str(record.get("id")): index for index, record in enumerate(merged)
+                 if isinstance(record, dict) and record.get("id") is not None}
+
+    for record in imported:
+        if not isinstance(record, dict):
+            report.invalid(name, "record is not an object")
+            continue
+        record_id = record.get("id")
+        if record_id is None:
+            report.invalid(name, "record has no id")
+            continue
+
+        key = str(record_id)
+        index = positions.get(key)
+        if index is None:
+            positions[key] = len(merged)
+            merged.append(record)
+            counts["added"] += 1
+        else:
+            merged[index], took_imported = _pick(merged[index], record, policy)
+            counts["updated" if took_imported else "kept"] += 1
+    return merged
+
+
+def _merge_opaque(name, existing, imported, mode, policy, report):
+    """Sections without a fixed record shape (reminders, streaks)."""
+    counts = report.counts(name)
+    if isinstance(existing, dict) and isinstance(imported, dict) and mode == "merge":
+        merged = dict(existing)
+        for key, record in imported.items():
+            if key in merged:
+                merged[key], took_imported = _pick(merged[key], record, policy)
+                counts["updated" if took_imported else "kept"] += 1
+            else:
+                merged[key] = record
+                counts["added"] += 1
+        return merged
+    if mode == "merge" and existing is not None and policy == "ours":
+        counts["kept"] += 1
+        return existing
+    counts["updated" if existing is not None else "added"] += 1
+    return imported
+
+
+def merge_import(current_sections, document, mode="merge", policy="theirs"):
+    """
+    Merges an import document into the current sections.
+
+    Args:
+        current_sections (dict): {section_name: value} currently stored
+        document (dict): Parsed import file ({"version", "data": {...}})
+        mode (str): "replace" or "merge"
+        policy (str): "theirs", "ours" or "newest"
+
+    Returns:
+        tuple: (merged_sections, report_dict, warning)
+
+    Raises:
+        ImportValidationError: If the document or options are invalid
+    """
+    if mode not in IMPORT_MODES:
+        raise ImportValidationError(f"Unknown import mode: {mode}")
+    if policy not in CONFLICT_POLICIES:
+        raise ImportValidationError(f"Unknown conflict policy: {policy}")
+
+    report = ImportReport()
+    started = time.perf_counter()
+    warning = check_document(document)
+
+    merged = dict(current_sections)
+    for name, imported in document["data"].items():
+        if name not in SECTION_STORAGE_KEYS or imported is None:
+            continue
+        existing = current_sections.get(name)
+        if name in DATE_KEYED_SECTIONS:
+            value = _merge_date_keyed(name, existing, imported, mode, policy, report)
+        elif name in ID_LIST_SECTIONS:
+            value = _merge_id_list(name, existing, imported, mode, policy, report)
+        else:
+            value = _merge_opaque(name, existing, imported, mode, policy, report)
+        if value is not None:
+            merged[name] = value
+
+    report.timings["merge"] = time.perf_counter() - started
+    return merged, report.to_dict(), warning
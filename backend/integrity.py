@@ -0,0 +1,167 @@
+"""
+Per-Section Integrity Checksums
+
+load_all_data_from_file() used to trust whatever json.load() returned:
+a sync conflict or a hand edit that still parses went unnoticed, and
+there was no way to tell which part of the file was affected.
+
+Every save now also writes a small sidecar next to the data file
+(personal-tracker-data.json.sums) with one BLAKE2b digest per section.
+The digests are the DataStore's: a section is only hashed when its
+digest is first asked for after it changed, so writing the sidecar
+hashes the sections the save changed and nothing else.
+
+Verification is lazy and per section: loading the data file only reads
+the sidecar, and a section is compared with it the first time it is
+read (the DataStore calls verify() from its read hook) - which is also
+when it gets hashed. A mismatch points at the damaged section instead
+of the whole file.
+
+stats() reports the hashing time (digestMs) next to the comparison time
+(verifyMs), since hashing is what verification actually costs.
+
+@module backend.integrity
+"""
+
+import json
+import threading
+import time
+
+from backend.fileio import atomic_write
+
+CHECKSUM_SUFFIX = ".sums"
+CHECKSUM_VERSION = 1
+
+# Verification results
+STATUS_OK = "ok"
+STATUS_MISMATCH = "mismatch"
+STATUS_UNKNOWN = "unknown"      # no checksum recorded for the section
+
+
+def checksum_path(data_path):
+    """Returns the sidecar path for a data file."""
+    return data_path + CHECKSUM_SUFFIX
+
+
+class SectionChecksums:
+    """
+    Expected section digests of the data file, verified per section.
+
+    Args:
+        digest_of (callable): Returns the current digest of a section
+            (DataStore.get_digest)
+        digest_stats (callable): Returns {"digested", "digestMs"} of the
+            hashing behind digest_of (DataStore.digest_stats, optional)
+
+    Example:
+        >>> checksums = SectionChecksums(data_store.get_digest, data_store.digest_stats)
+        >>> data_store.set_read_hook(checksums.verify)
+        >>> checksums.load("/path/to/personal-tracker-data.json")
+        >>> checksums.verify("habits")
+        'ok'
+    """
+
+    def __init__(self, digest_of, digest_stats=None):
+        self._digest_of = digest_of
+        self._digest_stats = digest_stats
+        self._lock = threading.Lock()
+        self._expected = {}
+        self._verified = {}             # section -> (digest, status)
+        self._stats = {"verified": 0, "seconds": 0.0, "loadSeconds": 0.0}
+
+    def load(self, data_path):
+        """
+        Reads the sidecar of a data file. Sections are verified later.
+
+        Args:
+            data_path (str): Path of the data file
+
+        Returns:
+            bool: True if a sidecar was found
+        """
+        started = time.perf_counter()
+        try:
+            with open(checksum_path(data_path), "r", encoding="utf-8") as f:
+                sections = json.load(f).get("sections", {})
+            expected = {name: digest for name, digest in sections.items()
+                        if isinstance(digest, str)}
+            found = True
+        except (OSError, ValueError, AttributeError):
+            expected = {}
+            found = False
+        with self._lock:
+            self._expected = expected
+            self._verified = {}
+            self._stats["loadSeconds"] = time.perf_counter() - started
+        return found
+
+    def save(self, data_path, sections):
+        """
+        Records the digests of the sections just written to the data file.
+
+        Args:
+            data_path (str): Path of the data file
+            sections (iterable): Names of the sections in the file
+        """
+        with self._lock:
+            for name in sections:
+                digest = self._digest_of(name)
+                if digest is not None:
+                    self._expected[name] = digest
+                    # What we just wrote is correct by definition
+                    self._verified[name] = (digest, STATUS_OK)
+            manifest = {"version": CHECKSUM_VERSION, "algorithm": "blake2b-128",
+                        "sections": dict(self._expected)}
+        atomic_write(checksum_path(data_path), json.dumps(manifest, indent=2, sort_keys=True))
+
+    def verify(self, section):
+        """
+        Checks a section against its recorded checksum.
+
+        The result is cached until the section's digest changes. Hashes
+        the section if its digest isn't known yet.
+
+        Returns:
+            str: "ok", "mismatch" or "unknown"
+        """
+        started = time.perf_counter()
+        digest = self._digest_of(section)
+        with self._lock:
+            cached = self._verified.get(section)
+            if cached is not None and cached[0] == digest:
+                return cached[1]
+            expected = self._expected.get(section)
+            if expected is None or digest is None:
+                status = STATUS_UNKNOWN
+            else:
+                status = STATUS_OK if expected == digest else STATUS_MISMATCH
+            self._verified[section] = (digest, status)
+            self._stats["verified"] += 1
+            self._stats["seconds"] += time.perf_counter() - started
+        if status == STATUS_MISMATCH:
+            print(f"Warning: {section} doesn't match the data file's checksums")
+        return status
+
+    def damaged(self, sections):
+        """Verifies several sections. Returns the names that don't match."""
+        return [name for name in sections if self.verify(name) == STATUS_MISMATCH]
+
+    def stats(self):
+        """
+        Returns verification results and timings.
+
+        Returns:
+            dict: {"sections": {name: status}, "verified": count,
+                   "verifyMs": comparison time, "loadMs": sidecar read time,
+                   "digested": sections hashed, "digestMs": hashing time}
+        """
+        hashing = self._digest_stats() if self._digest_stats else {}
+        with self._lock:
+            return {
+                "sections": {name: status for name, (_, status) in self._verified.items()},
+                "verified": self._stats["verified"],
+                "verifyMs": round(self._stats["seconds"] * 1000, 3),
+                "loadMs": round(self._stats["loadSeconds"] * 1000, 3),
+                "digested": hashing.get("digested", 0),
+                "digestMs": hashing.get("digestMs", 0.0),
+            }
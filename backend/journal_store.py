@@ -0,0 +1,381 @@
+"""
+Time-Sharded Journal Storage
+
+Journal entries used to be one JSON file per day in a single flat
+directory, and loading them meant listing and opening every file. After
+a few years that is thousands of small files, which is slow on synced
+and networked folders.
+
+Entries are now sharded by month:
+
+    journals/
+        2024/
+            11.pack                  closed month, one packed segment
+            12/                      open month, one file per day
+                Sun_Dec_01_2024.json
+
+The open month keeps writable loose files (same names and contents as
+before). Once a month is over, compact() packs its files into a single
+segment and removes them. Old flat files are moved into their month on
+the next compaction.
+
+Segment layout (all offsets relative to the start of the file):
+
+    MAGIC | entry bytes ... | index JSON | trailer
+
+The index maps each file name to [offset, length] of its entry, and the
+fixed-size trailer at the end of the file holds the index offset and
+length. A single entry is read by seeking to it; its neighbours are
+never parsed.
+
+@module backend.journal_store
+"""
+
+import json
+import os
+import re
+import struct
+import threading
+from datetime import date
+
+from backend.dates import parse_date_key
+from backend.fileio import atomic_write
+
+SEGMENT_MAGIC = b"PTJSEG1\n"
+SEGMENT_SUFFIX = ".pack"
+
+# index offset, index length, magic
+_TRAILER = struct.Struct("<QQ8s")
+
+_YEAR_DIR = re.compile(r"^\d{4}$")
+_MONTH_NAME = re.compile(r"^(\d{2})(\.pack)?$")
+
+
+def entry_day(filename):
+    """
+    Returns the day a journal file belongs to.
+
+    Args:
+        filename (str): File name like "Mon_Dec_01_2024.json"
+
+    Returns:
+        date|None: The day, or None if the name isn't a date key
+    """
+    if not filename.endswith(".json"):
+        return None
+    return parse_date_key(filename[:-len(".json")].replace("_", " "))
+
+
+def write_segment(path, entries):
+    """
+    Writes a packed segment atomically.
+
+    Args:
+        path (str): Segment file to create or replace
+        entries (dict): {filename: entry bytes}
+
+    Returns:
+        int: Size of the segment in bytes
+    """
+    parts = [SEGMENT_MAGIC]
+    index = {}
+    offset = len(SEGMENT_MAGIC)
+    for name in sorted(entries):
+        content = entries[name]
+        index[name] = [offset, len(content)]
+        parts.append(content)
+        offset += len(content)
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    parts.append(index_bytes)
+    parts.append(_TRAILER.pack(offset, len(index_bytes), SEGMENT_MAGIC))
+    return len(atomic_write(path, b"".join(parts)))
+
+
+class Segment:
+    """
+    Read access to one packed segment.
+
+    Args:
+        path (str): Segment file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index = self._read_index()
+
+    def _read_index(self):
+        with open(self.path, "rb") as f:
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            index_offset, index_length, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != SEGMENT_MAGIC:
+                raise ValueError(f"{self.path} is not a journal segment")
+            f.seek(index_offset)
+            return json.loads(f.read(index_length))
+
+    def read(self, name):
+        """Returns one entry's bytes, or None if the segment doesn't have it."""
+        location = self.index.get(name)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def read_all(self):
+        """Returns {filename: entry bytes} for every entry (one file read)."""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        return {name: data[offset:offset + length]
+                for name, (offset, length) in self.index.items()}
+
+
+class JournalStore:
+    """
+    Month-sharded journal directory.
+
+    Args:
+        root (str): The journals directory
+
+    Example:
+        >>> store = JournalStore("/path/to/journals")
+        >>> store.save("Mon_Dec_01_2024.json", b'{"date": "Mon Dec 01 2024", ...}')
+        >>> store.compact()          # pack every month before the current one
+        >>> store.read_entry("Mon Dec 01 2024")
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def month_dir(self, day):
+        """Directory holding the loose files of a month."""
+        return os.path.join(self.root, f"{day.year:04d}", f"{day.month:02d}")
+
+    def segment_path(self, day):
+        """Packed segment of a month."""
+        return os.path.join(self.root, f"{day.year:04d}", f"{day.month:02d}{SEGMENT_SUFFIX}")
+
+    def entry_path(self, filename):
+        """Where a loose entry file is written."""
+        day = entry_day(filename)
+        if day is None:
+            # Not a date-named file - keep it in the flat directory
+            return os.path.join(self.root, filename)
+        return os.path.join(self.month_dir(day), filename)
+
+    def _months(self):
+        """Yields (year, month, has_dir, has_segment) for every stored month."""
+        try:
+            years = [entry.name for entry in os.scandir(self.root)
+                     if entry.is_dir() and _YEAR_DIR.match(entry.name)]
+        except OSError:
+            return
+        for year in sorted(years):
+            months = {}
+            with os.scandir(os.path.join(self.root, year)) as it:
+                for entry in it:
+                    match = _MONTH_NAME.match(entry.name)
+                    if not match:
+                        continue
+                    state = months.setdefault(int(match.group(1)), [False, False])
+                    state[1 if match.group(2) else 0] = True
+            for month in sorted(months):
+                has_dir, has_segment = months[month]
+                yield int(year), month, has_dir, has_segment
+
+    def loose_paths(self, since=None):
+        """
+        Lists every loose entry file (flat legacy files and open months).
+
+        Args:
+            since (date): Only list entries of this day or later, and only
+                          look into the month directories that can hold them
+                          (optional)
+
+        Returns:
+            list: File paths
+        """
+        paths = []
+        first = (since.year, since.month) if since else None
+        directories = [self.root]
+        directories += [os.path.join(self.root, f"{year:04d}", f"{month:02d}")
+                        for year, month, has_dir, _ in self._months()
+                        if has_dir and (first is None or (year, month) >= first)]
+        for directory in directories:
+            try:
+                with os.scandir(directory) as it:
+                    paths += [entry.path for entry in it
+                              if entry.name.endswith(".json") and entry.is_file()]
+            except OSError:
+                continue
+        if since is not None:
+            paths = [path for path in paths
+                     if (entry_day(os.path.basename(path)) or since) >= since]
+        return paths
+
+    # ------------------------------------------------------------------
+    # Reads and writes
+    # ------------------------------------------------------------------
+
+    def save(self, filename, content):
+        """
+        Writes one entry as a loose file in its month directory (atomically).
+
+        Args:
+            filename (str): File name like "Mon_Dec_01_2024.json"
+            content (bytes): Entry contents
+
+        Returns:
+            str: Path of the written file
+        """
+        path = self.entry_path(filename)
+        with self._lock:
+            # Temp file + rename: a reader or sync client never sees half an entry
+            atomic_write(path, content)
+        return path
+
+    def read_entry(self, date_key):
+        """
+        Reads a single entry by date key.
+
+        Args:
+            date_key (str): Date key like "Mon Dec 01 2024"
+
+        Returns:
+            dict|None: The entry, or None if there is none
+        """
+        filename = date_key.replace(" ", "_") + ".json"
+        day = entry_day(filename)
+        candidates = [self.entry_path(filename), os.path.join(self.root, filename)]
+        content = None
+        with self._lock:
+            for path in candidates:
+                try:
+                    with open(path, "rb") as f:
+                        content = f.read()
+                    break
+                except OSError:
+                    continue
+            else:
+                if day is not None and os.path.exists(self.segment_path(day)):
+                    content = Segment(self.segment_path(day)).read(filename)
+        return json.loads(content) if content is not None else None
+
+    def load_entries(self, since=None):
+        """
+        Reads every journal entry, or only the recent ones.
+
+        Each segment is read with one file read; loose files override
+        packed entries of the same day. Runs under the store lock, so a
+        compaction never moves files while they are being read.
+
+        Args:
+            since (date): Only read entries of this day or later - months
+                          before it aren't opened at all (optional)
+
+        Returns:
+            list: Parsed entries
+        """
+        contents = {}
+        first = (since.year, since.month) if since else None
+        # Compaction moves loose files into segments - don't read halfway through
+        with self._lock:
+            for year, month, _, has_segment in self._months():
+                if not has_segment or (first is not None and (year, month) < first):
+                    continue
+                path = self.segment_path(date(year, month, 1))
+                try:
+                    contents.update(Segment(path).read_all())
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Could not read journal segment {path}: {e}")
+            for path in self.loose_paths(since):
+                try:
+                    with open(path, "rb") as f:
+                        contents[os.path.basename(path)] = f.read()
+                except OSError as e:
+                    print(f"Warning: Could not read journal file {path}: {e}")
+
+        entries = []
+        for name, content in contents.items():
+            if since is not None and (entry_day(name) or since) < since:
+                continue
+            try:
+                entries.append(json.loads(content))
+            except ValueError as e:
+                # Skip files that can't be parsed
+                print(f"Warning: Could not parse journal file {name}: {e}")
+        return entries
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self, today=None):
+        """
+        Moves flat files into their months and packs every closed month.
+
+        A month is closed once today is in a later month. Its loose files
+        are merged with its existing segment (loose files win), the
+        segment is rewritten, and the loose files are removed.
+
+        Args:
+            today (date): Reference day (defaults to date.today())
+
+        Returns:
+            dict: {"moved": flat files moved, "months": months packed,
+                   "entries": entries packed}
+        """
+        today = today or date.today()
+        current_month = (today.year, today.month)
+        stats = {"moved": 0, "months": 0, "entries": 0}
+
+        with self._lock:
+            # Legacy flat layout -> month directories
+            try:
+                flat = [entry.name for entry in os.scandir(self.root)
+                        if entry.name.endswith(".json") and entry.is_file()]
+            except OSError:
+                return stats
+            for name in flat:
+                if entry_day(name) is None:
+                    continue
+                target = self.entry_path(name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(os.path.join(self.root, name), target)
+                stats["moved"] += 1
+
+            for year, month, has_dir, has_segment in list(self._months()):
+                if not has_dir or (year, month) >= current_month:
+                    continue
+                first_day = date(year, month, 1)
+                stats["entries"] += self._pack_month(first_day, has_segment)
+                stats["months"] += 1
+        return stats
+
+    def _pack_month(self, first_day, has_segment):
+        """Packs one closed month. Returns the number of entries packed."""
+        directory = self.month_dir(first_day)
+        segment_path = self.segment_path(first_day)
+        entries = Segment(segment_path).read_all() if has_segment else {}
+
+        loose = {}
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    with open(entry.path, "rb") as f:
+                        loose[entry.name] = f.read()
+        entries.update(loose)
+        write_segment(segment_path, entries)
+
+        for name in loose:
+            os.remove(os.path.join(directory, name))
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass  # Something else is still in there - leave it
+        return len(entries)
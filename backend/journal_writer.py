@@ -0,0 +1,157 @@
+"""
+Coalescing Journal Writer
+
+With the journaling timer running and autosave on, the frontend sends
+the same day's entry over and over. Writing each of those to disk is
+wasted work: only the latest content matters.
+
+JournalWriter keeps the latest content per journal file in memory and
+writes it at most once per interval. submit() only stores the content
+and returns; a background thread (run_journal_writer() in start.py)
+waits for the next flush and performs it. A flush happens early when an
+entry for a different day arrives (the user switched days, or midnight
+passed) and on shutdown via flush().
+
+@module backend.journal_writer
+"""
+
+import threading
+import time
+
+# Default seconds between writes of pending entries
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+
+
+class JournalWriter:
+    """
+    Latest-content-wins buffer of pending journal writes.
+
+    Args:
+        write (callable): Called as write(journals_dir, filename, content)
+            for each pending entry when flushing
+        interval (float): Minimum seconds between flushes
+        clock (callable): Monotonic clock (injectable for tests)
+
+    Example:
+        >>> writer = JournalWriter(write=lambda d, name, content: ...)
+        >>> writer.submit("/path/to/journals", "Mon_Dec_01_2024.json", b"{...}")
+        >>> writer.wait()      # background thread: blocks until a flush is due
+        >>> writer.flush()
+    """
+
+    def __init__(self, write, interval=DEFAULT_FLUSH_INTERVAL_SECONDS, clock=time.monotonic):
+        self._write = write
+        self.interval = interval
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._pending = {}              # (journals_dir, filename) -> content
+        self._pending_since = None      # clock() of the oldest unflushed submit
+        self._urgent = False
+        self._closed = False
+
+    def submit(self, journals_dir, filename, content):
+        """
+        Stores the latest content of a journal file. Never touches disk.
+
+        Args:
+            journals_dir (str): Journals directory
+            filename (str): File name like "Mon_Dec_01_2024.json"
+            content (bytes): Entry contents
+        """
+        key = (journals_dir, filename)
+        with self._cond:
+            if any(pending != key for pending in self._pending):
+                # A different day is being written - don't hold the old one back
+                self._urgent = True
+            self._pending[key] = content
+            if self._pending_since is None:
+                self._pending_since = self._clock()
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        """True once close() was called."""
+        with self._cond:
+            return self._closed
+
+    def pending(self):
+        """Returns {(journals_dir, filename): content} not yet written."""
+        with self._cond:
+            return dict(self._pending)
+
+    def seconds_until_flush(self):
+        """
+        Returns how long until pending entries are due to be written.
+
+        Returns:
+            float|None: Seconds (0 if due now), or None if nothing is pending
+        """
+        with self._cond:
+            return self._delay()
+
+    def _delay(self):
+        if not self._pending:
+            return None
+        if self._urgent or self._closed:
+            return 0.0
+        return max(0.0, self._pending_since + self.interval - self._clock())
+
+    def wait(self, timeout=None):
+        """
+        Blocks until a flush is due (or the writer is closed).
+
+        Args:
+            timeout (float): Give up after this many seconds (None = no limit)
+
+        Returns:
+            bool: True if a flush is due
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while True:
+                delay = self._delay()
+                if delay == 0.0 or self._closed:
+                    return bool(self._pending)
+                if deadline is not None:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        return False
+                    delay = remaining if delay is None else min(delay, remaining)
+                self._cond.wait(delay)
+
+    def flush(self):
+        """
+        Writes every pending entry now.
+
+        Entries whose write fails are kept pending (unless newer content
+        arrived meanwhile) and retried on the next flush.
+
+        Returns:
+            int: Number of entries written
+        """
+        with self._cond:
+            batch = self._pending
+            self._pending = {}
+            self._pending_since = None
+            self._urgent = False
+
+        written = 0
+        for (journals_dir, filename), content in batch.items():
+            try:
+                self._write(journals_dir, filename, content)
+                written += 1
+            except Exception as e:
+                print(f"Warning: could not write journal {filename}: {e}")
+                with self._cond:
+                    if (journals_dir, filename) not in self._pending:
+                        self._pending[(journals_dir, filename)] = content
+                        if self._pending_since is None:
+                            self._pending_since = self._clock()
+        return written
+
+    def close(self):
+        """Writes everything still pending and wakes any waiting thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return self.flush()
@@ -0,0 +1,294 @@
+"""
+Windowed Recurrence Expansion
+
+calculateNextOccurrence() and shouldGenerateNext() in recurrenceUtils.js
+evaluate a recurring todo's rule whenever they are asked about it, so
+answering "what's due between X and Y" means stepping through the rule
+of every recurring todo, every time.
+
+RecurrenceEngine expands every recurring todo into its occurrences over
+a rolling window (the next RECURRENCE_WINDOW_DAYS days) and keeps all of
+them in one sorted occurrence index. A range query inside the window is
+two bisections; only the part of a range outside the window still
+evaluates rules.
+
+Expansions are invalidated per todo: saving a todo (an edit, a
+completion) re-expands only that todo, and so does pausing or resuming
+it. When the day changes, the window rolls forward and is expanded again.
+
+Occurrences follow calculateNextOccurrence(): they are counted in whole
+intervals from the todo's last completion (or its due date), a monthly
+occurrence on a day the month doesn't have falls on the month's last day,
+and nothing recurs after recurrenceEndDate.
+
+@module backend.recurrence
+"""
+
+import bisect
+import calendar
+import threading
+from datetime import date, timedelta
+
+from backend.data_store import record_map
+from backend.dates import parse_date, parse_timestamp
+
+RECURRENCE_WINDOW_DAYS = 90
+
+PATTERNS = ("daily", "weekly", "monthly", "yearly")
+
+
+def local_day(value):
+    """
+    Returns the calendar day of a frontend date value.
+
+    Timestamps (toISOString()) are converted to local time, like
+    new Date(value) in the frontend; "YYYY-MM-DD" dates are taken as is.
+    """
+    if isinstance(value, str) and "T" in value:
+        stamp = parse_timestamp(value)
+        if stamp is not None:
+            return (stamp.astimezone() if stamp.tzinfo else stamp).date()
+    return parse_date(value)
+
+
+def is_recurring(todo):
+    """True for a recurring todo (a template, not a generated instance)."""
+    return (isinstance(todo, dict) and bool(todo.get("isRecurring"))
+            and not todo.get("isRecurringInstance")
+            and todo.get("recurrencePattern") in PATTERNS)
+
+
+def _interval(todo):
+    """recurrenceInterval as a positive int (`|| 1` in the frontend)."""
+    try:
+        return max(int(todo.get("recurrenceInterval") or 1), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _add_months(day, months):
+    """Adds months, ending on the month's last day if the day doesn't exist."""
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _add_years(day, years):
+    """Adds years; Feb 29 becomes Mar 1 in common years, like setFullYear()."""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return date(day.year + years, 3, 1)
+
+
+def _shift(anchor, pattern, units):
+    if pattern == "daily":
+        return anchor + timedelta(days=units)
+    if pattern == "weekly":
+        return anchor + timedelta(days=7 * units)
+    if pattern == "monthly":
+        return _add_months(anchor, units)
+    return _add_years(anchor, units)
+
+
+def occurrences(todo, start, end, today=None):
+    """
+    Returns the days a recurring todo occurs on within a range.
+
+    Args:
+        todo (dict): Recurring todo
+        start (date): First day of the range
+        end (date): Last day of the range (inclusive)
+        today (date): Anchor for todos never completed and without a
+                      due date (default: today)
+
+    Returns:
+        list: Dates, ascending (empty if the todo doesn't recur)
+    """
+    if not is_recurring(todo):
+        return []
+    pattern = todo["recurrencePattern"]
+    interval = _interval(todo)
+    anchor = (local_day(todo.get("completedAt")) or local_day(todo.get("dueDate"))
+              or today or date.today())
+    last = local_day(todo.get("recurrenceEndDate"))
+    if last is not None and last < end:
+        end = last
+    if end < start:
+        return []
+
+    # Skip straight to the first occurrence that can fall in the range
+    if pattern in ("daily", "weekly"):
+        days = interval * (7 if pattern == "weekly" else 1)
+        step = (start - anchor).days // days
+    else:
+        months = (start.year - anchor.year) * 12 + start.month - anchor.month
+        step = (months if pattern == "monthly" else months // 12) // interval - 1
+    step = max(step, 1)
+
+    days = []
+    while True:
+        day = _shift(anchor, pattern, step * interval)
+        if day > end:
+            return days
+        if day >= start:
+            days.append(day)
+        step += 1
+
+
+class RecurrenceEngine:
+    """
+    Occurrences of every recurring todo over a rolling window.
+
+    Args:
+        store (DataStore): Store holding the todos section
+        window_days (int): Days after today that are kept expanded
+        today (callable): Returns the current date (for tests)
+
+    Example:
+        >>> recurrence = RecurrenceEngine(data_store)
+        >>> recurrence.due("2024-12-01", "2024-12-07")
+        [{"id": "1733000000000", "title": "Water plants", "date": "2024-12-02"}, ...]
+    """
+
+    SECTION = "todos"
+
+    def __init__(self, store, window_days=RECURRENCE_WINDOW_DAYS, today=date.today):
+        self._store = store
+        self._window_days = window_days
+        self._today = today
+        self._lock = threading.Lock()
+        self._todos = {}            # todo key -> recurring todo (paused ones too)
+        self._expansions = {}       # todo key -> ordinals within the window
+        self._index = []            # sorted (ordinal, todo key) of all expansions
+        self._paused = frozenset()
+        self._window = None         # (first, last) date of the window
+        self._revision = None
+        self._stats = {"expanded": 0}
+        store.subscribe(self.on_changes)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def on_changes(self, changes, origin):
+        """DataStore listener: re-expands the todos that were saved."""
+        for change in changes:
+            if change.section != self.SECTION:
+                continue
+            with self._lock:
+                if self._revision != change.revision - 1:
+                    continue    # Missed an update - _sync() rebuilds
+                records = record_map(change.new_value)
+                for key in list(change.upserted) + list(change.removed):
+                    self._refresh(key, records.get(key))
+                self._revision = change.revision
+
+    def set_paused(self, todo_ids):
+        """
+        Sets the paused recurring todos (paused-recurring-todos).
+
+        Only todos that were paused or resumed are re-expanded.
+        """
+        paused = frozenset(str(todo_id) for todo_id in todo_ids or ())
+        with self._lock:
+            changed = paused ^ self._paused
+            self._paused = paused
+            if self._window is not None:
+                for key in changed:
+                    self._refresh(key, self._todos.get(key))
+
+    def _refresh(self, key, todo):
+        """Replaces the expansion of one todo."""
+        for ordinal in self._expansions.pop(key, ()):
+            position = bisect.bisect_left(self._index, (ordinal, key))
+            del self._index[position]
+        if not is_recurring(todo):
+            self._todos.pop(key, None)
+            return
+        self._todos[key] = todo
+        if self._window is None or key in self._paused:
+            return
+        first, last = self._window
+        ordinals = [day.toordinal() for day in occurrences(todo, first, last, first)]
+        if ordinals:
+            self._expansions[key] = ordinals
+            for ordinal in ordinals:
+                bisect.insort(self._index, (ordinal, key))
+        self._stats["expanded"] += 1
+
+    def _sync(self):
+        """Rebuilds after a missed save; rolls the window with the date."""
+        today = self._today()
+        revision = self._store.get_revision(self.SECTION)
+        if revision != self._revision:
+            todos = {key: todo for key, todo in record_map(self._store.get_section(self.SECTION)).items()
+                     if is_recurring(todo)}
+            self._revision = revision
+        elif self._window is None or self._window[0] != today:
+            todos = dict(self._todos)
+        else:
+            return
+        self._window = (today, today + timedelta(days=self._window_days))
+        self._todos, self._expansions, self._index = {}, {}, []
+        for key, todo in todos.items():
+            self._refresh(key, todo)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def due(self, start=None, end=None):
+        """
+        Returns the occurrences of recurring todos within a date range.
+
+        Args:
+            start: First day - "YYYY-MM-DD", ISO timestamp, date key or date
+                   (None = today)
+            end: Last day, same formats (None = the end of the window)
+
+        Returns:
+            list: [{"id", "title", "date": "YYYY-MM-DD"}], by date
+        """
+        with self._lock:
+            self._sync()
+            first, last = self._window
+            start = parse_date(start) or first
+            end = parse_date(end) or last
+            found = []
+
+            # Inside the window: straight from the index
+            if start <= last and end >= first:
+                lo = bisect.bisect_left(self._index, (max(start, first).toordinal(), ""))
+                hi = bisect.bisect_left(self._index, (min(end, last).toordinal() + 1, ""))
+                found.extend(self._index[lo:hi])
+
+            # Outside the window: evaluate the rules
+            outside = []
+            if start < first:
+                outside.append((start, min(end, first - timedelta(days=1))))
+            if end > last:
+                outside.append((max(start, last + timedelta(days=1)), end))
+            for key, todo in self._todos.items():
+                if key in self._paused:
+                    continue
+                for range_start, range_end in outside:
+                    found.extend((day.toordinal(), key)
+                                 for day in occurrences(todo, range_start, range_end, first))
+
+            found.sort()
+            return [{
+                "id": self._todos[key].get("id"),
+                "title": self._todos[key].get("title"),
+                "date": date.fromordinal(ordinal).isoformat(),
+            } for ordinal, key in found]
+
+    def stats(self):
+        """Returns the window and how many expansions were computed."""
+        with self._lock:
+            return {
+                "windowDays": self._window_days,
+                "todos": len(self._todos),
+                "occurrences": len(self._index),
+                "expanded": self._stats["expanded"],
+            }
@@ -0,0 +1,241 @@
+"""
+Heap-Based Reminder Scheduler
+
+Replaces the browser's once-a-minute polling (startReminderScheduler()
+in src/utils/reminderScheduler.js) with a min-heap of the next fire time
+of every enabled reminder. The backend loop sleeps until the earliest
+entry is due, so nothing runs between reminders.
+
+Entries are only recomputed when something relevant changes:
+- sync_reminders(): reminders that were added, edited or removed
+- set_completed(): habits completed today skip today's reminder
+
+Reminder shape (same as reminderStorage.js):
+
+    {"habitId": "123", "enabled": true, "time": "09:00", "days": [1, 2, 3, 4, 5]}
+
+"days" uses JavaScript's getDay() numbering (0 = Sunday ... 6 = Saturday).
+
+@module backend.reminder_scheduler
+"""
+
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+# Longest single sleep - lets the loop notice wall-clock jumps (sleep/wake,
+# DST, manual clock changes) without polling
+MAX_SLEEP_SECONDS = 3600
+
+
+def _js_weekday(day):
+    """Converts a date to JavaScript getDay() numbering (0 = Sunday)."""
+    return (day.weekday() + 1) % 7
+
+
+def next_fire_time(reminder, after):
+    """
+    Computes the next time a reminder should fire.
+
+    Mirrors getNextReminderTime() in reminderStorage.js.
+
+    Args:
+        reminder (dict): Reminder config
+        after (datetime): Only times strictly after this are returned
+
+    Returns:
+        datetime|None: Next fire time, or None if the reminder never fires
+    """
+    if not reminder or not reminder.get("enabled"):
+        return None
+    days = set(reminder.get("days") or [])
+    if not days:
+        return None
+    try:
+        hours, minutes = (int(part) for part in str(reminder.get("time", "09:00")).split(":")[:2])
+    except ValueError:
+        return None
+
+    candidate = after.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    for _ in range(7):
+        if _js_weekday(candidate) in days:
+            return candidate
+        candidate += timedelta(days=1)
+    return None
+
+
+class ReminderScheduler:
+    """
+    Min-heap of upcoming reminder fire times.
+
+    The heap uses lazy deletion: when a reminder is rescheduled its old
+    heap entry stays behind and is skipped when popped, because its
+    sequence number no longer matches the reminder's current entry.
+
+    Args:
+        fire (callable): Called as fire(reminder, fire_at) when a reminder
+            is due and its habit isn't completed yet
+        now (callable): Clock function (injectable for tests)
+
+    Example:
+        >>> scheduler = ReminderScheduler(fire=lambda r, at: print(r["habitId"]))
+        >>> scheduler.sync_reminders({"123": {"habitId": "123", "enabled": True,
+        ...                                   "time": "09:00", "days": [1, 2, 3, 4, 5]}})
+        >>> scheduler.seconds_until_next()   # sleep this long, then run_due()
+    """
+
+    def __init__(self, fire, now=datetime.now):
+        self._fire = fire
+        self._now = now
+        self._lock = threading.Lock()
+        self._heap = []                 # (fire_at, seq, habit_id)
+        self._entries = {}              # habit_id -> seq of the live heap entry
+        self._reminders = {}            # habit_id -> reminder config
+        self._completed = (None, set())  # (date, habit ids completed that day)
+        self._seq = itertools.count()
+        # Called whenever the earliest fire time may have changed, so the
+        # loop waiting in start.py can wake up and re-plan its sleep
+        self.on_change = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def sync_reminders(self, reminders):
+        """
+        Replaces the set of reminders, rescheduling only those that changed.
+
+        Args:
+            reminders (dict|list): {habitId: reminder} or a list of reminders
+        """
+        if isinstance(reminders, dict):
+            reminders = list(reminders.values())
+        incoming = {str(r.get("habitId")): r for r in reminders or []
+                    if isinstance(r, dict) and r.get("habitId") is not None}
+
+        with self._lock:
+            now = self._now()
+            for habit_id in list(self._reminders):
+                if habit_id not in incoming:
+                    del self._reminders[habit_id]
+                    self._entries.pop(habit_id, None)
+            for habit_id, reminder in incoming.items():
+                if self._reminders.get(habit_id) == reminder:
+                    continue
+                self._reminders[habit_id] = reminder
+                self._schedule(habit_id, now)
+        self._changed()
+
+    def set_completed(self, day, habit_ids):
+        """
+        Records which habits are completed on a day.
+
+        Reminders for habits completed today are moved to their next
+        occurrence instead of firing.
+
+        Args:
+            day (date): The day the completions belong to
+            habit_ids (iterable): Ids of completed habits
+        """
+        completed = {str(habit_id) for habit_id in habit_ids}
+        with self._lock:
+            previous_day, previous = self._completed
+            self._completed = (day, completed)
+            if day != self._now().date():
+                return
+            # Completed habits skip today; un-completed ones get today back
+            changed = completed ^ previous if previous_day == day else completed
+            now = self._now()
+            for habit_id in changed:
+                if habit_id in self._reminders:
+                    self._schedule(habit_id, now)
+        self._changed()
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def seconds_until_next(self):
+        """
+        Returns how long the loop can sleep before the next reminder.
+
+        Returns:
+            float|None: Seconds (capped at MAX_SLEEP_SECONDS), or None if
+                        there are no reminders at all
+        """
+        with self._lock:
+            self._drop_stale()
+            if not self._heap:
+                return None
+            delay = (self._heap[0][0] - self._now()).total_seconds()
+        return max(0.0, min(delay, MAX_SLEEP_SECONDS))
+
+    def run_due(self):
+        """
+        Fires every reminder whose time has come and reschedules it.
+
+        Returns:
+            list: habit ids that fired
+        """
+        due = []
+        with self._lock:
+            now = self._now()
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, seq, habit_id = heapq.heappop(self._heap)
+                if self._entries.get(habit_id) != seq:
+                    continue
+                reminder = self._reminders[habit_id]
+                if not self._is_completed(habit_id, fire_at.date()):
+                    due.append((reminder, fire_at))
+                self._schedule(habit_id, fire_at)
+
+        for reminder, fire_at in due:
+            try:
+                self._fire(reminder, fire_at)
+            except Exception as e:
+                print(f"Warning: reminder for habit {reminder.get('habitId')} failed: {e}")
+        return [str(reminder.get("habitId")) for reminder, _ in due]
+
+    def upcoming(self):
+        """Returns [(fire_at, habit_id)] for all scheduled reminders, soonest first."""
+        with self._lock:
+            live = [(fire_at, habit_id) for fire_at, seq, habit_id in self._heap
+                    if self._entries.get(habit_id) == seq]
+        return sorted(live)
+
+    # ------------------------------------------------------------------
+    # Internals (call with the lock held)
+    # ------------------------------------------------------------------
+
+    def _is_completed(self, habit_id, day):
+        completed_day, completed = self._completed
+        return completed_day == day and habit_id in completed
+
+    def _schedule(self, habit_id, after):
+        reminder = self._reminders.get(habit_id)
+        fire_at = next_fire_time(reminder, after)
+        # Skip today's occurrence if the habit is already done
+        while fire_at is not None and self._is_completed(habit_id, fire_at.date()):
+            fire_at = next_fire_time(reminder, fire_at)
+        if fire_at is None:
+            self._entries.pop(habit_id, None)
+            return
+        seq = next(self._seq)
+        self._entries[habit_id] = seq
+        heapq.heappush(self._heap, (fire_at, seq, habit_id))
+
+        # Compact once stale entries dominate the heap
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = [entry for entry in self._heap if self._entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self._heap)
+
+    def _drop_stale(self):
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
@@ -0,0 +1,511 @@
+"""
+Incremental Weekly and Monthly Reviews
+
+generateWeeklyReview() and generateMonthlyReview() in reviewUtils.js
+recompute a review from the raw habits, mood and todos every time it is
+opened, and there is no way to look back at a period unless its review
+was saved by hand back then.
+
+ReviewEngine summarizes periods (weeks starting on Sunday, calendar
+months) on the backend:
+
+- Closed periods (ended before today) are summarized once and kept in a
+  sidecar next to the data file (personal-tracker-data.json.reviews),
+  one positional array per period. Years of weekly reviews come back in
+  one batch without reading a single day record.
+- Open periods (the current week and month) are summarized from cached
+  per-day totals. Saving a day only recomputes that day's totals.
+- Saving a day of a closed period (or completing a todo on it) drops the
+  period's summary; it is summarized again on its next request.
+
+The sidecar records the digests of the sections it was computed from
+and is ignored when the data file changed without it (an edit made
+outside the app, say).
+
+Summaries only hold numbers. Highlights and insights are still worded by
+the frontend (buildWeeklyReview() / buildMonthlyReview()).
+
+@module backend.reviews
+"""
+
+import json
+import math
+import threading
+from datetime import date, timedelta
+
+from backend.data_store import record_map
+from backend.dates import format_date_key, parse_date, parse_date_key, parse_timestamp
+from backend.fileio import atomic_write
+
+REVIEW_SUFFIX = ".reviews"
+REVIEW_VERSION = 1
+
+PERIODS = ("week", "month")
+
+# Sections a summary is computed from
+SOURCE_SECTIONS = ("habits", "mood", "todos")
+
+# Positions in a packed summary
+(DAYS_TRACKED, COMPLETED, AVAILABLE, MOOD_SUM, MOOD_COUNT, TODOS,
+ BEST_DAY, WORST_DAY, MOST_CONSISTENT, WEEKS) = range(10)
+
+
+def review_path(data_path):
+    """Returns the review sidecar path for a data file."""
+    return data_path + REVIEW_SUFFIX
+
+
+def period_start(period, day):
+    """
+    Returns the first day of the week (Sunday) or month containing a day.
+
+    Raises:
+        ValueError: If period isn't "week" or "month"
+    """
+    if period == "week":
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    if period == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown review period: {period}")
+
+
+def period_end(period, start):
+    """Returns the last day of the period that starts on start."""
+    if period == "week":
+        return start + timedelta(days=6)
+    next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def _count(value):
+    """A count field as JavaScript's `value || 0` would sum it."""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _round(value):
+    """Math.round() (Python's round() rounds halves to even)."""
+    return math.floor(value + 0.5)
+
+
+def completion_day(todo):
+    """
+    Returns the local day a todo was completed on, or None.
+
+    Same day as new Date(todo.completedAt) in the frontend.
+    """
+    if not isinstance(todo, dict):
+        return None
+    stamp = parse_timestamp(todo.get("completedAt"))
+    if stamp is None:
+        return None
+    return (stamp.astimezone() if stamp.tzinfo else stamp).date()
+
+
+class DayTotals:
+    """
+    What one day contributes to a review.
+
+    Attributes:
+        key (str|None): Date key of the habits record (None if the day
+            wasn't tracked)
+        completed (int): completedCount of the day
+        available (int): totalCount of the day
+        habits (tuple): (id, name, completed) for each habit of the day
+        mood (float|None): Mood of the day
+    """
+
+    __slots__ = ("key", "completed", "available", "habits", "mood")
+
+    def __init__(self, key, habits_record, mood_record):
+        self.key = key if habits_record else None
+        record = habits_record if isinstance(habits_record, dict) else {}
+        self.completed = _count(record.get("completedCount"))
+        self.available = _count(record.get("totalCount"))
+        habits = record.get("habits")
+        self.habits = tuple(
+            (habit.get("id"), habit.get("name"), bool(habit.get("completed")))
+            for habit in (habits if isinstance(habits, list) else ())
+            if isinstance(habit, dict)
+        )
+        mood = mood_record.get("mood") if isinstance(mood_record, dict) else None
+        self.mood = float(mood) if _count(mood) is mood else None
+
+    @property
+    def rate(self):
+        """Completion rate in percent, as the frontend computes it."""
+        return self.completed / self.available * 100 if self.available > 0 else 0
+
+
+def summarize(period, days, todos):
+    """
+    Packs the totals of a period into one summary.
+
+    Mirrors the statistics of generateWeeklyReview() and
+    generateMonthlyReview(), including how the monthly breakdown groups
+    tracked days into weeks.
+
+    Args:
+        period (str): "week" or "month"
+        days (list): DayTotals of every day of the period, oldest first
+        todos (int): Todos completed during the period
+
+    Returns:
+        list: [daysTracked, completed, available, moodSum, moodCount,
+               todos, bestDay, worstDay, mostConsistent, weeks] where
+               bestDay/worstDay are [day offset, rate], mostConsistent is
+               [id, name, completed, total] and weeks (months only) holds
+               [completed, available, daysTracked] per week
+    """
+    tracked = [(offset, day) for offset, day in enumerate(days) if day.key is not None]
+    moods = [day.mood for day in days if day.mood is not None]
+    summary = [
+        len(tracked),
+        sum(day.completed for _, day in tracked),
+        sum(day.available for _, day in tracked),
+        sum(moods),
+        len(moods),
+        todos,
+        None, None, None, None,
+    ]
+    if not tracked:
+        return summary
+
+    # First best and first worst day, like the reduce() calls
+    best = worst = tracked[0]
+    habits = {}
+    for offset, day in tracked:
+        if day.rate > best[1].rate:
+            best = (offset, day)
+        if day.rate < worst[1].rate:
+            worst = (offset, day)
+        for habit_id, name, completed in day.habits:
+            stats = habits.setdefault(habit_id, [habit_id, name, 0, 0])
+            stats[2] += completed
+            stats[3] += 1
+    summary[BEST_DAY] = [best[0], best[1].rate]
+    summary[WORST_DAY] = [worst[0], worst[1].rate]
+    if habits:
+        # max() keeps the first of equally consistent habits, like a stable sort
+        summary[MOST_CONSISTENT] = max(habits.values(), key=lambda h: h[2] / h[3])
+
+    if period == "month":
+        weeks = []
+        for _, day in tracked:
+            # A tracked Sunday starts a new week
+            if not weeks or parse_date_key(day.key).weekday() == 6:
+                weeks.append([0, 0, 0])
+            weeks[-1][0] += day.completed
+            weeks[-1][1] += day.available
+            weeks[-1][2] += 1
+        summary[WEEKS] = weeks
+    return summary
+
+
+def review_report(period, start, end, summary, closed):
+    """
+    Expands a packed summary into the report the frontend reads.
+
+    Returns:
+        dict: {"period", "startDate", "endDate", "closed", "statistics",
+               "bestDay", "worstDay", "mostConsistent",
+               "weeklyBreakdown" (months only)}
+    """
+    available = summary[AVAILABLE]
+    statistics = {
+        "daysTracked": summary[DAYS_TRACKED],
+        "totalHabitsCompleted": summary[COMPLETED],
+        "totalHabitsAvailable": available,
+        "averageCompletionRate": _round(summary[COMPLETED] / available * 100) if available > 0 else 0,
+        "averageMood": summary[MOOD_SUM] / summary[MOOD_COUNT] if summary[MOOD_COUNT] else None,
+    }
+
+    def day(packed):
+        if packed is None:
+            return None
+        return {"date": format_date_key(start + timedelta(days=packed[0])), "rate": packed[1]}
+
+    consistent = summary[MOST_CONSISTENT]
+    report = {
+        "period": period,
+        "startDate": format_date_key(start),
+        "endDate": format_date_key(end),
+        "closed": closed,
+        "statistics": statistics,
+        "bestDay": day(summary[BEST_DAY]),
+        "worstDay": day(summary[WORST_DAY]),
+        "mostConsistent": None if consistent is None else dict(
+            zip(("id", "name", "completed", "total"), consistent)),
+    }
+    if period == "month":
+        statistics["todosCompleted"] = summary[TODOS]
+        report["weeklyBreakdown"] = [{
+            "week": number,
+            "completionRate": _round(completed / total * 100) if total > 0 else 0,
+            "daysTracked": tracked,
+        } for number, (completed, total, tracked) in enumerate(summary[WEEKS] or (), start=1)]
+    return report
+
+
+class ReviewEngine:
+    """
+    Weekly and monthly review summaries, kept up to date with a DataStore.
+
+    Args:
+        store (DataStore): Store holding the habits, mood and todos
+        day_indexes (DayIndexes): Used to find the first tracked day
+        today (callable): Returns the current date (for tests)
+
+    Example:
+        >>> reviews = ReviewEngine(data_store, day_indexes)
+        >>> reviews.attach("/path/to/personal-tracker-data.json")
+        >>> reviews.current("week")["statistics"]["averageCompletionRate"]
+        83
+        >>> len(reviews.history("week", "2022-01-01"))
+        156
+    """
+
+    def __init__(self, store, day_indexes, today=date.today):
+        self._store = store
+        self._day_indexes = day_indexes
+        self._today = today
+        self._lock = threading.RLock()
+        self._data_path = None
+        self._summaries = {period: {} for period in PERIODS}   # start ordinal -> summary
+        self._days = {}             # ordinal -> DayTotals of open periods
+        self._todo_days = {}        # todo key -> ordinal it was completed on
+        self._todo_counts = {}      # ordinal -> todos completed that day
+        self._revisions = {}        # section -> revision the caches reflect
+        self._dirty = False         # summaries not written to the sidecar yet
+        self._saved = None          # attached sidecar, not checked yet
+        store.subscribe(self.on_changes)
+
+    # ------------------------------------------------------------------
+    # Keeping up with saves
+    # ------------------------------------------------------------------
+
+    def on_changes(self, changes, origin):
+        """DataStore listener: drops the summaries of the changed days."""
+        with self._lock:
+            for change in changes:
+                if change.section not in SOURCE_SECTIONS:
+                    continue
+                if self._revisions.get(change.section) != change.revision - 1:
+                    continue    # Missed an update - _sync() starts over
+                if change.section == "todos":
+                    self._update_todos(change)
+                else:
+                    for key in list(change.upserted) + list(change.removed):
+                        day = parse_date_key(key)
+                        if day is not None:
+                            self._invalidate(day.toordinal())
+                self._revisions[change.section] = change.revision
+
+    def _update_todos(self, change):
+        records = record_map(change.new_value)
+        for key in list(change.upserted) + list(change.removed):
+            old = self._todo_days.pop(key, None)
+            day = completion_day(records.get(key))
+            new = day.toordinal() if day is not None else None
+            if old == new:
+                if new is not None:
+                    self._todo_days[key] = new
+                continue
+            if old is not None:
+                self._todo_counts[old] -= 1
+                self._invalidate(old)
+            if new is not None:
+                self._todo_days[key] = new
+                self._todo_counts[new] = self._todo_counts.get(new, 0) + 1
+                self._invalidate(new)
+
+    def _invalidate(self, ordinal):
+        """Drops everything computed from one day."""
+        self._days.pop(ordinal, None)
+        day = date.fromordinal(ordinal)
+        for period in PERIODS:
+            self._summaries[period].pop(period_start(period, day).toordinal(), None)
+
+    def _sync(self):
+        """
+        Starts over if a save was missed (or nothing was computed yet),
+        then uses the attached summaries if they're still unchecked.
+        """
+        revisions = {name: self._store.get_revision(name) for name in SOURCE_SECTIONS}
+        if revisions != self._revisions:
+            self._reset(revisions)
+        if self._saved is not None:
+            self._restore_saved()
+
+    def _reset(self, revisions):
+        for summaries in self._summaries.values():
+            summaries.clear()
+        self._days.clear()
+        self._dirty = True
+        self._todo_days, self._todo_counts = {}, {}
+        for key, todo in record_map(self._store.get_section("todos")).items():
+            day = completion_day(todo)
+            if day is not None:
+                self._todo_days[key] = day.toordinal()
+                self._todo_counts[day.toordinal()] = self._todo_counts.get(day.toordinal(), 0) + 1
+        self._revisions = revisions
+
+    # ------------------------------------------------------------------
+    # Sidecar
+    # ------------------------------------------------------------------
+
+    def attach(self, data_path):
+        """
+        Loads the summaries saved next to a data file.
+
+        Call after the data file was loaded into the store. The summaries
+        are only used if the sidecar was written for the same section
+        data; that is checked on the first request, so attaching doesn't
+        hash the sections.
+
+        Returns:
+            bool: True if a sidecar was found
+        """
+        try:
+            with open(review_path(data_path), "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = None
+        if not isinstance(saved, dict) or saved.get("version") != REVIEW_VERSION:
+            saved = None
+
+        with self._lock:
+            self._data_path = data_path
+            self._revisions = {}    # _sync() starts over on the next request
+            self._saved = saved
+            return saved is not None
+
+    def _restore_saved(self):
+        """Uses the attached summaries if they match the sections."""
+        saved, self._saved = self._saved, None
+        digests = {name: self._store.get_digest(name) for name in SOURCE_SECTIONS}
+        if saved.get("sections") != digests:
+            return False
+        for period in PERIODS:
+            for start, summary in (saved.get(period) or {}).items():
+                self._summaries[period][date.fromisoformat(start).toordinal()] = summary
+        self._dirty = False
+        return True
+
+    def save(self, data_path=None):
+        """
+        Writes the closed-period summaries next to the data file.
+
+        Args:
+            data_path (str): Data file (default: the attached one)
+
+        Returns:
+            bool: True if the sidecar was written
+        """
+        with self._lock:
+            data_path = data_path or self._data_path
+            if not data_path:
+                return False
+            self._sync()
+            self._data_path = data_path
+            digests = {name: self._store.get_digest(name) for name in SOURCE_SECTIONS}
+            manifest = {"version": REVIEW_VERSION, "sections": digests}
+            for period, summaries in self._summaries.items():
+                manifest[period] = {date.fromordinal(start).isoformat(): summary
+                                    for start, summary in sorted(summaries.items())}
+            content = json.dumps(manifest, separators=(",", ":"))
+            self._dirty = False
+        atomic_write(review_path(data_path), content)
+        return True
+
+    @property
+    def unsaved(self):
+        """True if closed periods were summarized since the last save."""
+        with self._lock:
+            return self._dirty
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _day_totals(self, first, last):
+        """DayTotals of the days first..last (ordinals, inclusive)."""
+        keys = [format_date_key(date.fromordinal(o)) for o in range(first, last + 1)]
+        habits = self._store.get_records("habits", keys)
+        moods = self._store.get_records("mood", keys)
+        return [DayTotals(key, habits.get(key), moods.get(key)) for key in keys]
+
+    def _todos(self, first, last):
+        return sum(self._todo_counts.get(o, 0) for o in range(first, last + 1))
+
+    def _report(self, period, start, today):
+        first = start.toordinal()
+        end = period_end(period, start)
+        if end < today:
+            summary = self._summaries[period].get(first)
+            if summary is None:
+                days = self._day_totals(first, end.toordinal())
+                summary = summarize(period, days, self._todos(first, end.toordinal()))
+                self._summaries[period][first] = summary
+                self._dirty = True
+            return review_report(period, start, end, summary, closed=True)
+
+        # Open period: up to today, from cached per-day totals
+        last = today.toordinal()
+        missing = [o for o in range(first, last + 1) if o not in self._days]
+        if missing:
+            for offset, totals in enumerate(self._day_totals(missing[0], missing[-1])):
+                self._days.setdefault(missing[0] + offset, totals)
+        days = [self._days[o] for o in range(first, last + 1)]
+        summary = summarize(period, days, self._todos(first, last))
+        return review_report(period, start, today, summary, closed=False)
+
+    def current(self, period):
+        """
+        Returns the review of the period containing today (up to today).
+
+        Raises:
+            ValueError: If period isn't "week" or "month"
+        """
+        today = self._today()
+        start = period_start(period, today)
+        with self._lock:
+            self._sync()
+            # Days of periods that have closed since are no longer needed
+            oldest = min(period_start(name, today) for name in PERIODS).toordinal()
+            for ordinal in [o for o in self._days if o < oldest]:
+                del self._days[ordinal]
+            return self._report(period, start, today)
+
+    def history(self, period, start=None, end=None):
+        """
+        Returns the reviews of every period overlapping a date range.
+
+        Closed periods come from saved summaries; only periods that were
+        never summarized (or changed since) read their days.
+
+        Args:
+            period (str): "week" or "month"
+            start: First day - "YYYY-MM-DD", ISO timestamp, date key or date
+                   (None = from the first tracked day)
+            end: Last day, same formats (None = today)
+
+        Returns:
+            list: Reports, oldest first
+
+        Raises:
+            ValueError: If period isn't "week" or "month"
+        """
+        today = self._today()
+        end = min(parse_date(end) or today, today)
+        start = parse_date(start)
+        if start is None:
+            index = self._day_indexes.index("habits")
+            start = date.fromordinal(index.ordinals[0]) if len(index) else end
+        reports = []
+        with self._lock:
+            self._sync()
+            first = period_start(period, start)
+            while first <= end:
+                reports.append(self._report(period, first, today))
+                first = period_end(period, first) + timedelta(days=1)
+        return reports
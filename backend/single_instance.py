@@ -0,0 +1,209 @@
+"""
+Single-Instance Lock and Handoff
+
+Only one copy of the app may run at a time: a second server would fail
+to bind the fixed port or, worse, write the same data file as the first.
+
+The first launch takes an exclusive OS lock on instance.lock in the app
+data directory and opens a small loopback socket. Its port and a random
+token are published in instance.json. A later launch fails to take the
+lock, sends a one-line JSON command ({"token": ..., "command": "focus"})
+to that socket and exits - it never imports Eel or starts a server.
+
+The lock is released by the OS when the process exits, so a crash never
+leaves a stale lock behind.
+
+@module backend.single_instance
+"""
+
+import json
+import os
+import secrets
+import select
+import socket
+import sys
+import time
+
+from backend.fileio import atomic_write
+
+LOCK_FILE_NAME = "instance.lock"
+INFO_FILE_NAME = "instance.json"
+
+# How long a second launch waits for the running instance to answer
+HANDOFF_TIMEOUT_SECONDS = 2.0
+
+# Longest command line accepted from a client
+_MAX_MESSAGE_BYTES = 4096
+
+
+def _lock_file(f):
+    """Takes a non-blocking exclusive lock on an open file. Returns bool."""
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _read_line(conn, wait=None, timeout=None):
+    """
+    Reads one newline-terminated message from a socket.
+
+    With wait (a select() function), the socket is only read once wait
+    reports it readable, so a greenlet passing gevent's select() yields
+    to the others instead of blocking in recv().
+
+    Raises:
+        socket.timeout: If wait reports nothing within timeout seconds
+    """
+    data = b""
+    deadline = time.monotonic() + timeout if wait and timeout is not None else None
+    while b"\n" not in data and len(data) < _MAX_MESSAGE_BYTES:
+        if wait:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            readable, _, _ = wait([conn], [], [], remaining)
+            if not readable:
+                raise socket.timeout("timed out waiting for the command")
+        chunk = conn.recv(1024)
+        if not chunk:
+            break
+        data += chunk
+    return data.split(b"\n", 1)[0]
+
+
+class InstanceLock:
+    """
+    Lock plus command channel held by the running instance.
+
+    Args:
+        directory (str): App data directory (get_app_data_path())
+
+    Example:
+        >>> instance = InstanceLock(app_data_dir)
+        >>> if not instance.acquire():
+        ...     send_command(app_data_dir, "focus")
+        ...     sys.exit(0)
+        >>> instance.listen()
+        >>> command = instance.accept_command()   # when instance.listener is readable
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock_path = os.path.join(directory, LOCK_FILE_NAME)
+        self.info_path = os.path.join(directory, INFO_FILE_NAME)
+        self.listener = None
+        self._lock = None
+        self._token = None
+
+    def acquire(self):
+        """
+        Tries to become the running instance.
+
+        Returns:
+            bool: True if the lock was taken, False if another instance holds it
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        f = open(self.lock_path, "a+")
+        if not _lock_file(f):
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._lock = f
+        return True
+
+    def listen(self):
+        """
+        Opens the command socket and publishes its address in instance.json.
+
+        Returns:
+            socket.socket: The listening socket
+        """
+        self._token = secrets.token_hex(16)
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(4)
+        info = {"pid": os.getpid(), "port": self.listener.getsockname()[1],
+                "token": self._token}
+        atomic_write(self.info_path, json.dumps(info))
+        # The token is what keeps other local users out - keep it private
+        try:
+            os.chmod(self.info_path, 0o600)
+        except OSError:
+            pass
+        return self.listener
+
+    def accept_command(self, timeout=1.0, wait=select.select):
+        """
+        Accepts one connection and reads its command.
+
+        Call when the listener is readable; waits for up to timeout
+        seconds for the client's message.
+
+        Args:
+            timeout (float): Seconds to wait for the message
+            wait (callable): select() used to wait for the message - pass
+                             gevent.select.select when called from a greenlet
+
+        Returns:
+            dict|None: The command message, or None if it was invalid
+        """
+        conn, _ = self.listener.accept()
+        with conn:
+            conn.settimeout(timeout)
+            try:
+                message = json.loads(_read_line(conn, wait, timeout).decode("utf-8"))
+            except (OSError, ValueError):
+                return None
+            if not isinstance(message, dict) or message.get("token") != self._token:
+                conn.sendall(b'{"ok": false}\n')
+                return None
+            conn.sendall(b'{"ok": true}\n')
+            message.pop("token", None)
+            return message
+
+    def release(self):
+        """Closes the command socket and releases the lock."""
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+
+def send_command(directory, command, timeout=HANDOFF_TIMEOUT_SECONDS, **fields):
+    """
+    Sends a command to the running instance.
+
+    Args:
+        directory (str): App data directory
+        command (str): Command name, e.g. "focus"
+        timeout (float): Seconds to wait for the instance to answer
+        **fields: Extra JSON fields for the message
+
+    Returns:
+        bool: True if the running instance accepted the command
+    """
+    try:
+        with open(os.path.join(directory, INFO_FILE_NAME), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        message = dict(fields, command=command, token=info["token"])
+        with socket.create_connection(("127.0.0.1", info["port"]), timeout=timeout) as conn:
+            conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            reply = json.loads(_read_line(conn).decode("utf-8"))
+        return bool(reply.get("ok"))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return False
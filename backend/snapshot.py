@@ -0,0 +1,416 @@
+"""
+Binary Data Snapshots
+
+Reading anything from the data file means json.load() of the whole
+personal-tracker-data.json, so the first backend query after a cold
+start costs time linear in the whole history, even if it only wants
+the last week of mood entries.
+
+A binary snapshot next to the data file (personal-tracker-data.json.snap)
+answers such queries instead, including the app's startup load (the
+recent days of every section, see read_recent()). The snapshot is
+memory-mapped and decoded lazily: opening it reads the header and the
+section directory, and a query decodes only the sections - and for
+date-keyed sections only the days - it asks for.
+
+Layout (little-endian):
+
+    header      HEADER: magic, version, section count, and the size and
+                mtime of the data file the snapshot was written for
+    directory   one DIRECTORY_ENTRY per section: name, kind, record
+                count, and the offsets of its records and strings
+    sections    per section, its fixed-width records, then its string table
+
+Date-keyed sections (habits, mood, journals) have one DAY_RECORD per day,
+sorted by ordinal day: (ordinal, string offset, string length). The day's
+record is the JSON string at that place in the section's string table,
+and a date range is found by bisecting the fixed-width records in place.
+Keys that aren't toDateString() keys are kept in one JSON object at the
+end of the string table. Other sections have no records; their whole
+value is the one string in the string table.
+
+A snapshot is only used while the data file still has the size and
+mtime in its header; anything else (an external edit, a sync client)
+falls back to the JSON file.
+
+Every save writes the snapshot, and a load writes one if the data file
+has none that is valid, so the next process can start from it. Only
+sections that changed since they were last encoded are encoded again;
+after a load from a valid snapshot, its sections are copied as they
+are.
+
+@module backend.snapshot
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import date
+
+from backend.data_store import SECTION_NAMES
+from backend.dates import format_date_key, parse_date, parse_date_key
+from backend.day_index import DAY_INDEXED_SECTIONS
+from backend.fileio import atomic_write
+
+SNAPSHOT_SUFFIX = ".snap"
+SNAPSHOT_MAGIC = b"PTSNAP"
+SNAPSHOT_VERSION = 2
+
+# magic, version, section count, data file size, data file mtime (ns), reserved
+HEADER = struct.Struct("<6sHIqqI")
+# name, kind, record count, records offset, strings offset, strings length,
+# extras offset, extras length (offsets are absolute)
+DIRECTORY_ENTRY = struct.Struct("<16sB3xIQQQQI")
+# ordinal day, string offset, string length (relative to the string table)
+DAY_RECORD = struct.Struct("<iII")
+
+KIND_DAYS = 1
+KIND_VALUE = 2
+
+
+def snapshot_path(data_path):
+    """Returns the snapshot path for a data file."""
+    return data_path + SNAPSHOT_SUFFIX
+
+
+def _source_stamp(data_path):
+    """(size, mtime in ns) of the data file, or None if it's missing."""
+    try:
+        info = os.stat(data_path)
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
+
+
+def _encode(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_section(name, value):
+    """
+    Encodes one section for the snapshot.
+
+    Args:
+        name (str): Section name
+        value: Section value
+
+    Returns:
+        tuple: (kind, record count, records bytes, string table bytes,
+                extras offset, extras length) - offsets relative to the
+                string table
+    """
+    if name not in DAY_INDEXED_SECTIONS or not isinstance(value, dict):
+        strings = _encode(value)
+        return KIND_VALUE, 0, b"", strings, 0, 0
+
+    days, extras = [], {}
+    for key, record in value.items():
+        day = parse_date_key(key)
+        # Keys are rebuilt from the ordinal, so they must round-trip exactly
+        if day is None or format_date_key(day) != key:
+            extras[key] = record
+        else:
+            days.append((day.toordinal(), record))
+    days.sort(key=lambda item: item[0])
+
+    records, strings, offset = bytearray(), [], 0
+    for ordinal, record in days:
+        payload = _encode(record)
+        records += DAY_RECORD.pack(ordinal, offset, len(payload))
+        strings.append(payload)
+        offset += len(payload)
+    payload = _encode(extras) if extras else b""
+    strings.append(payload)
+    return KIND_DAYS, len(days), bytes(records), b"".join(strings), offset, len(payload)
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file.
+
+    Args:
+        path (str): Snapshot file
+        stamp (tuple): Expected (size, mtime in ns) of the data file
+            (None = don't check)
+
+    Raises:
+        ValueError: If the file isn't a snapshot or was written for
+            another version of the data file
+        OSError: If the file can't be read
+
+    Example:
+        >>> snapshot = Snapshot(snapshot_path(data_path), stamp)
+        >>> snapshot.days("mood", "2024-12-01", "2024-12-07")
+        [("Sun Dec 01 2024", {...}), ...]
+    """
+
+    def __init__(self, path, stamp):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, size, mtime, _ = HEADER.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"Not a data snapshot: {path}")
+            if stamp is not None and (size, mtime) != tuple(stamp):
+                raise ValueError(f"Snapshot is out of date: {path}")
+            self._sections = {}
+            for index in range(count):
+                entry = DIRECTORY_ENTRY.unpack_from(self._map, HEADER.size + index * DIRECTORY_ENTRY.size)
+                self._sections[entry[0].rstrip(b"\0").decode("ascii")] = entry[1:]
+        except (struct.error, ValueError):
+            self._map.close()
+            raise
+
+    def close(self):
+        self._map.close()
+
+    def sections(self):
+        """Names of the sections in the snapshot."""
+        return list(self._sections)
+
+    def encoded(self, name):
+        """A section as encode_section() returned it, copied from the file."""
+        kind, count, records, strings, length, extras, extras_length = self._sections[name]
+        return (kind, count, self._map[records:records + count * DAY_RECORD.size],
+                self._map[strings:strings + length], extras, extras_length)
+
+    def _string(self, start, length):
+        return json.loads(self._map[start:start + length].decode("utf-8")) if length else None
+
+    def _day(self, entry, index):
+        _, _, records, strings, _, _, _ = entry
+        ordinal, offset, length = DAY_RECORD.unpack_from(self._map, records + index * DAY_RECORD.size)
+        return ordinal, strings + offset, length
+
+    def _bisect(self, entry, ordinal):
+        """First day record index with an ordinal >= the given one."""
+        lo, hi = 0, entry[1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._day(entry, mid)[0] < ordinal:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def section(self, name):
+        """
+        Decodes a whole section.
+
+        Returns:
+            The section value, or None if the snapshot doesn't have it
+        """
+        entry = self._sections.get(name)
+        if entry is None:
+            return None
+        kind, count, _, strings, length, extras, extras_length = entry
+        if kind == KIND_VALUE:
+            return self._string(strings, length)
+        value = {}
+        for index in range(count):
+            ordinal, start, size = self._day(entry, index)
+            value[format_date_key(date.fromordinal(ordinal))] = self._string(start, size)
+        value.update(self._string(strings + extras, extras_length) or {})
+        return value
+
+    def days(self, name, start=None, end=None, descending=False):
+        """
+        Decodes the days of a date-keyed section within a range.
+
+        Args:
+            name (str): Section name
+            start: First day, inclusive - any format parse_date() accepts
+                   (None = the earliest day)
+            end: Last day, inclusive (None = the latest day)
+            descending (bool): Newest first
+
+        Returns:
+            list: [(date key, record)], or None if the snapshot doesn't
+                  have the section by day
+        """
+        entry = self._sections.get(name)
+        if entry is None or entry[0] != KIND_DAYS:
+            return None
+        first, last = parse_date(start), parse_date(end)
+        lo = self._bisect(entry, first.toordinal()) if first else 0
+        hi = self._bisect(entry, last.toordinal() + 1) if last else entry[1]
+        indexes = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        pairs = []
+        for index in indexes:
+            ordinal, offset, length = self._day(entry, index)
+            pairs.append((format_date_key(date.fromordinal(ordinal)), self._string(offset, length)))
+        return pairs
+
+
+def pack_snapshot(sections, stamp):
+    """
+    Builds a snapshot file.
+
+    Args:
+        sections (list): [(name, encode_section() result)]
+        stamp (tuple): (size, mtime in ns) of the data file
+
+    Returns:
+        bytes: File contents
+    """
+    offset = HEADER.size + len(sections) * DIRECTORY_ENTRY.size
+    directory, bodies = [], []
+    for name, (kind, count, records, strings, extras, extras_length) in sections:
+        directory.append(DIRECTORY_ENTRY.pack(
+            name.encode("ascii"), kind, count,
+            offset, offset + len(records), len(strings), extras, extras_length))
+        bodies += [records, strings]
+        offset += len(records) + len(strings)
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections), stamp[0], stamp[1], 0)
+    return b"".join([header] + directory + bodies)
+
+
+class SnapshotFiles:
+    """
+    Writes the snapshot of a DataStore next to its data file and answers
+    reads from it.
+
+    Args:
+        store (DataStore): Store whose sections are written
+
+    Example:
+        >>> snapshots = SnapshotFiles(data_store)
+        >>> snapshots.save("/path/to/personal-tracker-data.json")
+        True
+        >>> snapshots.read_days("/path/to/personal-tracker-data.json", "mood", "2024-12-01")
+        [("Sun Dec 01 2024", {...}), ...]
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.Lock()
+        self._encoded = {}          # section -> (revision, encode_section() result)
+        self._open = None           # ((snapshot path, data stamp, snapshot stamp), Snapshot)
+        self._stats = {"encoded": 0, "reused": 0}
+
+    def _snapshot(self, data_path):
+        """The valid snapshot of a data file (None if missing or stale)."""
+        path, stamp = snapshot_path(data_path), _source_stamp(data_path)
+        # The snapshot's own stamp notices a snapshot written by another process
+        key = (path, stamp, _source_stamp(path))
+        if self._open is not None and self._open[0] == key:
+            return self._open[1]
+        self._close()
+        if stamp is None or key[2] is None:
+            return None
+        try:
+            self._open = (key, Snapshot(path, stamp))
+        except (OSError, ValueError):
+            return None
+        return self._open[1]
+
+    def _close(self):
+        if self._open is not None:
+            self._open[1].close()
+            self._open = None
+
+    def save(self, data_path):
+        """
+        Writes the snapshot for the data file just written.
+
+        Sections that didn't change since they were last encoded are
+        reused as they are; the others are read from the store without
+        running its read hook (this isn't a read of the data).
+
+        Returns:
+            bool: True if the snapshot was written
+        """
+        stamp = _source_stamp(data_path)
+        if stamp is None:
+            return False
+        with self._lock:
+            sections = []
+            for name in SECTION_NAMES:
+                revision = self._store.get_revision(name)
+                if revision == 0:
+                    continue
+                cached = self._encoded.get(name)
+                if cached is not None and cached[0] == revision:
+                    self._stats["reused"] += 1
+                else:
+                    value = self._store.get_section(name, hook=False)
+                    if value is None:
+                        continue
+                    cached = (revision, encode_section(name, value))
+                    self._encoded[name] = cached
+                    self._stats["encoded"] += 1
+                sections.append((name, cached[1]))
+            content = pack_snapshot(sections, stamp)
+            # A mapped file can't be replaced on Windows
+            self._close()
+            atomic_write(snapshot_path(data_path), content)
+        return True
+
+    def ensure(self, data_path):
+        """
+        Makes sure the data file just loaded into the store has a snapshot.
+
+        A valid snapshot holds exactly what was loaded, so its sections
+        are kept for the next save instead of being encoded again;
+        otherwise the snapshot is written.
+
+        Returns:
+            bool: True if the snapshot was written
+        """
+        with self._lock:
+            snapshot = self._snapshot(data_path)
+            if snapshot is not None:
+                for name in snapshot.sections():
+                    revision = self._store.get_revision(name)
+                    if revision and self._encoded.get(name, (None,))[0] != revision:
+                        self._encoded[name] = (revision, snapshot.encoded(name))
+                return False
+        return self.save(data_path)
+
+    def read_days(self, data_path, section, start=None, end=None, descending=False):
+        """
+        Reads the days of a date-keyed section within a range.
+
+        Returns:
+            list: [(date key, record)], or None without a valid snapshot
+        """
+        with self._lock:
+            snapshot = self._snapshot(data_path)
+            return snapshot.days(section, start, end, descending) if snapshot else None
+
+    def read_section(self, data_path, section):
+        """Reads one whole section (None without a valid snapshot)."""
+        with self._lock:
+            snapshot = self._snapshot(data_path)
+            return snapshot.section(section) if snapshot else None
+
+    def read_recent(self, data_path, since):
+        """
+        Reads what the app needs at startup.
+
+        Date-keyed sections only have their days from since on (keys that
+        aren't dates are left out); every other section is read whole.
+
+        Args:
+            data_path (str): Data file
+            since: First day - any format parse_date() accepts
+
+        Returns:
+            dict: {section: value}, or None without a valid snapshot
+        """
+        with self._lock:
+            snapshot = self._snapshot(data_path)
+            if snapshot is None:
+                return None
+            sections = {}
+            for name in snapshot.sections():
+                days = snapshot.days(name, since)
+                sections[name] = dict(days) if days is not None else snapshot.section(name)
+            return sections
+
+    def stats(self):
+        """Returns how many sections were encoded and reused by saves."""
+        with self._lock:
+            return dict(self._stats, open=self._open is not None)
@@ -0,0 +1,268 @@
+"""
+Downsampled Time Series for Charts
+
+The weight and mood charts plot every raw daily point, and
+getAverageWeight() / getAverageMood() reduce over the whole range on
+every render. A multi-year chart therefore ships and draws thousands of
+points, most of which land on the same pixel column.
+
+Series keeps one numeric series in sorted arrays: ordinal days, values,
+and prefix sums of the values. With prefix sums, the mean of any range
+costs two bisections and one subtraction, whatever the range length.
+Moving averages over a window of days use two pointers over the same
+prefix sums, so the whole chart costs O(n).
+
+Charts are downsampled with Largest-Triangle-Three-Buckets (LTTB),
+which keeps the points that shape the line (peaks, dips, trend changes)
+instead of averaging them away.
+
+Series are built from the DayIndex of their section and rebuilt lazily
+when the section's revision changes.
+
+@module backend.time_series
+"""
+
+import bisect
+import threading
+from array import array
+from datetime import date
+
+from backend.dates import parse_date
+
+# Chartable series: name -> (section, field of the day record)
+SERIES_FIELDS = {
+    "weight": ("habits", "weight"),
+    "mood": ("mood", "mood"),
+}
+
+
+def _number(value):
+    """Returns value as a float, or None if it isn't a usable number."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if value == value and value not in (float("inf"), float("-inf")) else None
+
+
+def lttb(xs, ys, threshold):
+    """
+    Picks the points of a line that best preserve its shape.
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept.
+    The rest is split into threshold - 2 buckets, and from each bucket
+    the point is kept that forms the largest triangle with the point
+    kept from the previous bucket and the average of the next bucket.
+
+    Args:
+        xs (sequence): X values, ascending
+        ys (sequence): Y values
+        threshold (int): Number of points to keep
+
+    Returns:
+        list: Indexes of the kept points, ascending
+    """
+    n = len(xs)
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:max(threshold, 0)]
+
+    kept = [0]
+    every = (n - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        stop = int((bucket + 1) * every) + 1
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = stop
+        next_stop = min(int((bucket + 2) * every) + 1, n)
+        if next_start >= next_stop:
+            next_start, next_stop = n - 1, n
+        count = next_stop - next_start
+        avg_x = sum(xs[next_start:next_stop]) / count
+        avg_y = sum(ys[next_start:next_stop]) / count
+
+        px, py = xs[previous], ys[previous]
+        best, best_area = start, -1.0
+        for i in range(start, min(stop, n - 1)):
+            area = abs((px - avg_x) * (ys[i] - py) - (px - xs[i]) * (avg_y - py))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        previous = best
+    kept.append(n - 1)
+    return kept
+
+
+class Series:
+    """
+    One numeric series in sorted arrays with prefix sums.
+
+    Attributes:
+        ordinals (array): Sorted ordinal day numbers
+        values (array): Value of each day
+        prefix (array): prefix[i] = sum of values[:i] (len n + 1)
+        revision (int|None): Section revision the series reflects
+    """
+
+    def __init__(self, revision=None):
+        self.ordinals = array("l")
+        self.values = array("d")
+        self.prefix = array("d", [0.0])
+        self.revision = revision
+
+    @classmethod
+    def build(cls, index, records, field, revision=None):
+        """
+        Builds a series from the day index of a section.
+
+        Args:
+            index (DayIndex): Sorted day keys of the section
+            records (dict): {date_key: record} for the keys of the index
+            field (str): Numeric field to read from each record
+            revision (int): Section revision
+        """
+        series = cls(revision)
+        total = 0.0
+        for ordinal, key in zip(index.ordinals, index.keys):
+            record = records.get(key)
+            value = _number(record.get(field)) if isinstance(record, dict) else None
+            if value is None:
+                continue
+            series.ordinals.append(ordinal)
+            series.values.append(value)
+            total += value
+            series.prefix.append(total)
+        return series
+
+    def __len__(self):
+        return len(self.values)
+
+    def span(self, start=None, end=None):
+        """Returns the [lo, hi) positions of an inclusive date range."""
+        lo = 0 if start is None else bisect.bisect_left(self.ordinals, start.toordinal())
+        hi = len(self.ordinals) if end is None else bisect.bisect_right(self.ordinals, end.toordinal())
+        return lo, max(lo, hi)
+
+    def mean(self, lo, hi):
+        """Mean of the values at positions [lo, hi), or None if empty."""
+        if hi <= lo:
+            return None
+        return (self.prefix[hi] - self.prefix[lo]) / (hi - lo)
+
+    def moving_average(self, lo, hi, window_days):
+        """
+        Trailing moving average of the points at positions [lo, hi).
+
+        Each point averages the recorded values of the window_days days
+        ending on its own day (days without a value don't count).
+
+        Returns:
+            list: One average per point
+        """
+        averages = []
+        first = bisect.bisect_left(self.ordinals, self.ordinals[lo] - window_days + 1) if hi > lo else lo
+        for i in range(lo, hi):
+            oldest = self.ordinals[i] - window_days + 1
+            while self.ordinals[first] < oldest:
+                first += 1
+            averages.append((self.prefix[i + 1] - self.prefix[first]) / (i + 1 - first))
+        return averages
+
+
+class TimeSeries:
+    """
+    Chart data for every series in SERIES_FIELDS.
+
+    Args:
+        store (DataStore): Source of the section data
+        day_indexes (DayIndexes): Sorted day keys of the sections
+
+    Example:
+        >>> charts = TimeSeries(data_store, day_indexes)
+        >>> chart = charts.chart("weight", "2020-01-01", "2024-12-31", width=600)
+        >>> len(chart["points"]), chart["average"]
+        (600, 152.4)
+    """
+
+    def __init__(self, store, day_indexes):
+        self._store = store
+        self._day_indexes = day_indexes
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def series(self, name):
+        """
+        Returns the up-to-date Series for a name, building it if needed.
+
+        Raises:
+            ValueError: If there is no such series
+        """
+        if name not in SERIES_FIELDS:
+            raise ValueError(f"Unknown series: {name}")
+        section, field = SERIES_FIELDS[name]
+        revision = self._store.get_revision(section)
+        with self._lock:
+            series = self._series.get(name)
+            if series is None or series.revision != revision:
+                index = self._day_indexes.index(section)
+                records = self._store.get_records(section, index.keys)
+                series = Series.build(index, records, field, revision)
+                self._series[name] = series
+            return series
+
+    def average(self, name, start=None, end=None):
+        """Mean of a series over an inclusive date range (None if no values)."""
+        series = self.series(name)
+        return series.mean(*series.span(parse_date(start), parse_date(end)))
+
+    def chart(self, name, start=None, end=None, width=None, window=None):
+        """
+        Returns chart points for a date range, downsampled to a width.
+
+        Args:
+            name (str): "weight" or "mood"
+            start: First day - "YYYY-MM-DD", ISO timestamp, date key or date
+                   (None = from the earliest)
+            end: Last day, same formats (None = up to the latest)
+            width (int): Maximum points to return, e.g. the chart's width
+                         in pixels (None = every point)
+            window (int): Also return a trailing moving average over this
+                          many days
+
+        Returns:
+            dict: {"points": [["YYYY-MM-DD", value], ...],
+                   "movingAverage": [[...], ...] (if window),
+                   "count": points in range, "average": mean of the range,
+                   "min": ..., "max": ..., "revision": section revision}
+        """
+        series = self.series(name)
+        lo, hi = series.span(parse_date(start), parse_date(end))
+        ordinals = series.ordinals[lo:hi]
+        values = series.values[lo:hi]
+
+        if width is not None and int(width) < len(values):
+            kept = lttb(ordinals, values, max(int(width), 2))
+        else:
+            kept = range(len(values))
+
+        def point(i, value):
+            return [date.fromordinal(ordinals[i]).isoformat(), round(value, 3)]
+
+        result = {
+            "points": [point(i, values[i]) for i in kept],
+            "count": hi - lo,
+            "average": series.mean(lo, hi),
+            "min": min(values) if values else None,
+            "max": max(values) if values else None,
+            "revision": series.revision,
+        }
+        if window:
+            averages = series.moving_average(lo, hi, int(window))
+            # The smoothed line is downsampled on its own shape
+            if width is not None and int(width) < len(averages):
+                smoothed = lttb(ordinals, averages, max(int(width), 2))
+            else:
+                smoothed = range(len(averages))
+            result["movingAverage"] = [point(i, averages[i]) for i in smoothed]
+        return result
@@ -0,0 +1,283 @@
+"""
+Todo Query Indexes
+
+getTodosByPriority(), getOverdueTodos(), getTodosForGoal() and
+getCompletedTodosCountForGoal() in todoStorage.js parse, filter and
+sort the whole todos-data array on every call.
+
+TodoIndex keeps secondary indexes over the todos section instead:
+
+- buckets: one list per (completion state, priority), each sorted by
+  due date and then newest first. Concatenated in bucket order they are
+  exactly getTodosByPriority()'s order, so a page of any status/priority
+  view is sliced out of the buckets without sorting or scanning.
+- open due dates: incomplete todos sorted by due day, so the overdue
+  todos are a prefix found with one bisection.
+- goals: todo keys per linkedGoalId.
+
+The indexes are updated per todo from the DataStore's change events
+(saveTodo, deleteTodo and toggleTodoComplete all end in a save), and
+rebuilt when a save was missed.
+
+@module backend.todo_index
+"""
+
+import bisect
+import threading
+from datetime import date, datetime, timezone
+
+from backend.data_store import record_map
+from backend.dates import parse_timestamp
+from backend.recurrence import local_day
+
+# Priority ranks as in getTodosByPriority() (unknown priorities rank 0)
+PRIORITY_RANKS = {"now": 3, "next": 2, "later": 1}
+
+STATUSES = ("all", "active", "completed")
+
+DEFAULT_PAGE_SIZE = 50
+
+_NO_TIME = float("inf")
+
+
+def js_time(value):
+    """
+    Milliseconds since the epoch, as new Date(value).getTime().
+
+    Date-only strings ("YYYY-MM-DD") are UTC midnight, like in JavaScript.
+
+    Returns:
+        float: Milliseconds (inf if the value can't be parsed)
+    """
+    if not isinstance(value, str) or not value:
+        return _NO_TIME
+    if len(value) == 10:
+        value += "T00:00:00Z"
+    stamp = parse_timestamp(value)
+    if stamp is None:
+        return _NO_TIME
+    if stamp.tzinfo is None:
+        stamp = stamp.astimezone()
+    return (stamp - datetime(1970, 1, 1, tzinfo=timezone.utc)).total_seconds() * 1000
+
+
+def priority_rank(todo):
+    return PRIORITY_RANKS.get(todo.get("priority"), 0)
+
+
+class TodoIndex:
+    """
+    Secondary indexes over the todos section of a DataStore.
+
+    Args:
+        store (DataStore): Store holding the todos section
+        today (callable): Returns the current date (for tests)
+
+    Example:
+        >>> todos = TodoIndex(data_store)
+        >>> todos.query(status="active", priority="now", limit=20)["total"]
+        4
+        >>> todos.query(overdue=True)["todos"][0]["title"]
+        'File taxes'
+    """
+
+    SECTION = "todos"
+
+    def __init__(self, store, today=date.today):
+        self._store = store
+        self._today = today
+        self._lock = threading.Lock()
+        self._revision = None
+        self._reset()
+        store.subscribe(self.on_changes)
+
+    def _reset(self):
+        self._todos = {}            # key -> todo
+        self._entries = {}          # key -> (bucket, sort entry, open due entry)
+        self._buckets = {}          # (completed, -rank) -> sorted sort entries
+        self._open_due = []         # sorted (due ordinal, key) of incomplete todos
+        self._goals = {}            # linkedGoalId -> set of keys
+        self._sequence = 0          # array position, the final tie-break
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def on_changes(self, changes, origin):
+        """DataStore listener: re-indexes the todos that were saved."""
+        for change in changes:
+            if change.section != self.SECTION:
+                continue
+            with self._lock:
+                if self._revision != change.revision - 1:
+                    continue    # Missed an update - _sync() rebuilds
+                records = record_map(change.new_value)
+                for key in change.removed:
+                    self._remove(key)
+                for key in change.upserted:
+                    # An edited todo keeps its place in the array
+                    sequence = self._remove(key)
+                    self._add(key, records.get(key), sequence)
+                self._revision = change.revision
+
+    def _sync(self):
+        revision = self._store.get_revision(self.SECTION)
+        if revision == self._revision:
+            return
+        self._reset()
+        for key, todo in record_map(self._store.get_section(self.SECTION)).items():
+            self._add(key, todo)
+        self._revision = revision
+
+    def _add(self, key, todo, sequence=None):
+        if not isinstance(todo, dict):
+            return
+        if sequence is None:
+            sequence = self._sequence
+            self._sequence += 1
+        completed = bool(todo.get("completed"))
+        due = todo.get("dueDate")
+        # Todos with a due date first, soonest first; the rest newest
+        # first (equal values keep their array order, as the sort is stable)
+        if due:
+            entry = (0, js_time(due), 0, sequence, key)
+        else:
+            created = todo.get("createdAt")
+            entry = (1, 0, -js_time(created) if created else 0, sequence, key)
+        bucket = (completed, -priority_rank(todo))
+        bisect.insort(self._buckets.setdefault(bucket, []), entry)
+
+        open_due = None
+        day = local_day(due) if due and not completed else None
+        if day is not None:
+            open_due = (day.toordinal(), key)
+            bisect.insort(self._open_due, open_due)
+
+        goal_id = todo.get("linkedGoalId")
+        if goal_id is not None:
+            self._goals.setdefault(str(goal_id), set()).add(key)
+
+        self._todos[key] = todo
+        self._entries[key] = (bucket, entry, open_due)
+
+    def _remove(self, key):
+        """Un-indexes a todo. Returns its sequence number (None if absent)."""
+        todo = self._todos.pop(key, None)
+        if todo is None:
+            return None
+        bucket, entry, open_due = self._entries.pop(key)
+        entries = self._buckets[bucket]
+        del entries[bisect.bisect_left(entries, entry)]
+        if open_due is not None:
+            del self._open_due[bisect.bisect_left(self._open_due, open_due)]
+        goal_id = todo.get("linkedGoalId")
+        if goal_id is not None:
+            keys = self._goals.get(str(goal_id))
+            keys.discard(key)
+            if not keys:
+                del self._goals[str(goal_id)]
+        return entry[3]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _bucket_order(self, status, priority):
+        """Buckets of a view, in getTodosByPriority() order."""
+        states = {"all": (False, True), "active": (False,), "completed": (True,)}[status]
+        ranks = sorted({rank for _, rank in self._buckets})
+        if priority is not None:
+            ranks = [-PRIORITY_RANKS.get(priority, 0)]
+        return [(state, rank) for state in states for rank in ranks
+                if self._buckets.get((state, rank))]
+
+    def query(self, status="all", priority=None, goal_id=None, overdue=False,
+              offset=0, limit=DEFAULT_PAGE_SIZE):
+        """
+        Returns one page of a filtered view, in getTodosByPriority() order.
+
+        Args:
+            status (str): "all", "active" or "completed"
+            priority (str): Only todos of this priority (optional)
+            goal_id (str): Only todos linked to this goal (optional)
+            overdue (bool): Only incomplete todos due before today
+            offset (int): Todos to skip
+            limit (int): Page size (None = the rest)
+
+        Returns:
+            dict: {"todos": [...], "total": matching todos,
+                   "offset", "limit"}
+
+        Raises:
+            ValueError: If status isn't one of STATUSES
+        """
+        if status not in STATUSES:
+            raise ValueError(f"Unknown todo status: {status}")
+        offset = max(int(offset or 0), 0)
+        stop = None if limit is None else offset + max(int(limit), 0)
+
+        with self._lock:
+            self._sync()
+            if goal_id is not None or overdue:
+                # Small candidate sets - filter, then sort them
+                if overdue:
+                    end = bisect.bisect_left(self._open_due, (self._today().toordinal(), ""))
+                    keys = [key for _, key in self._open_due[:end]]
+                    if goal_id is not None:
+                        keys = [key for key in keys if key in self._goals.get(str(goal_id), ())]
+                else:
+                    keys = self._goals.get(str(goal_id), ())
+                wanted = set(self._bucket_order(status, priority))
+                matches = sorted((self._entries[key][0], self._entries[key][1]) for key in keys
+                                 if self._entries[key][0] in wanted)
+                total = len(matches)
+                page = [entry[-1] for _, entry in matches[offset:stop]]
+            else:
+                # Slice the page out of the buckets, skipping whole buckets
+                buckets = [self._buckets[bucket] for bucket in self._bucket_order(status, priority)]
+                total = sum(len(entries) for entries in buckets)
+                page, skip = [], offset
+                for entries in buckets:
+                    if skip >= len(entries):
+                        skip -= len(entries)
+                        continue
+                    want = None if stop is None else stop - offset - len(page)
+                    chunk = entries[skip:] if want is None else entries[skip:skip + want]
+                    page.extend(entry[-1] for entry in chunk)
+                    skip = 0
+                    if stop is not None and len(page) >= stop - offset:
+                        break
+            return {
+                "todos": [self._todos[key] for key in page],
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+            }
+
+    def counts(self):
+        """
+        Returns todo counts from the indexes.
+
+        Returns:
+            dict: {"total", "active", "completed", "overdue",
+                   "byPriority": {priority: active todos},
+                   "byGoal": {goal id: {"total", "completed"}}}
+        """
+        with self._lock:
+            self._sync()
+            completed = sum(len(entries) for (state, _), entries in self._buckets.items() if state)
+            ranks = {-rank: name for name, rank in PRIORITY_RANKS.items()}
+            today = bisect.bisect_left(self._open_due, (self._today().toordinal(), ""))
+            return {
+                "total": len(self._todos),
+                "active": len(self._todos) - completed,
+                "completed": completed,
+                "overdue": today,
+                "byPriority": {ranks.get(rank, "none"): len(entries)
+                               for (state, rank), entries in self._buckets.items()
+                               if not state and entries},
+                "byGoal": {goal_id: {
+                    "total": len(keys),
+                    "completed": sum(1 for key in keys if self._entries[key][0][0]),
+                } for goal_id, keys in self._goals.items()},
+            }
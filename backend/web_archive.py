@@ -0,0 +1,143 @@
+"""
+Single-File Web Archive
+
+Packaged onedir builds can ship the built React app (web/) as one
+uncompressed zip archive instead of hundreds of loose files. The archive
+is memory-mapped at startup and each request for index.html or assets/*
+is answered by slicing the mapping - no files are unpacked and nothing
+is decompressed. (Onefile builds unpack every bundled file on each
+launch anyway, so package.py only uses the archive for onedir.)
+
+Members are stored uncompressed (ZIP_STORED) on purpose: Vite's assets
+are already minified, and stored members can be served straight from
+the mapping.
+
+@module backend.web_archive
+"""
+
+import mimetypes
+import mmap
+import os
+import re
+import struct
+import zipfile
+
+# Name of the archive inside the packaged app
+WEB_ARCHIVE_NAME = "web.zip"
+
+# File types Eel scans for eel.expose(...) calls
+_SCANNED_EXTENSIONS = (".js", ".html", ".htm")
+
+# eel.expose(fn) or eel.expose(fn, "name") - also matches minified output
+_EXPOSE_PATTERN = re.compile(
+    rb"""eel\.expose\(\s*([\w$]+)\s*(?:,\s*["']([\w$]+)["']\s*)?\)""")
+
+# Fixed part of a zip local file header: signature ... extra field length
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def build_web_archive(web_dir, archive_path):
+    """
+    Packs a built web directory into an uncompressed zip archive.
+
+    Args:
+        web_dir (str): Directory with index.html and assets/
+        archive_path (str): Archive file to create
+
+    Returns:
+        dict: {"files": member count, "bytes": archive size}
+    """
+    count = 0
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for root, _, files in os.walk(web_dir):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                member = os.path.relpath(path, web_dir).replace(os.sep, "/")
+                archive.write(path, member)
+                count += 1
+    return {"files": count, "bytes": os.path.getsize(archive_path)}
+
+
+class WebArchive:
+    """
+    Read-only, memory-mapped view of a web archive.
+
+    Example:
+        >>> archive = WebArchive("/path/to/web.zip")
+        >>> body, content_type = archive.read("index.html"), archive.content_type("index.html")
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._members = self._index()
+
+    def _index(self):
+        """Maps member name -> (data offset, size) from the zip directory."""
+        members = {}
+        with zipfile.ZipFile(self._file) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"{info.filename} is compressed; rebuild the archive "
+                                     "with build_web_archive()")
+                header = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+                name_length, extra_length = header[-2], header[-1]
+                offset = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+                members[info.filename] = (offset, info.file_size)
+        return members
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def names(self):
+        """Returns all member names."""
+        return list(self._members)
+
+    def read(self, name):
+        """
+        Returns a member's bytes, or None if it doesn't exist.
+
+        Args:
+            name (str): Member path, e.g. "index.html" or "assets/index-abc.js"
+        """
+        entry = self._members.get(name)
+        if entry is None:
+            return None
+        offset, size = entry
+        return self._map[offset:offset + size]
+
+    @staticmethod
+    def content_type(name):
+        """Guesses the Content-Type for a member name."""
+        content_type, _ = mimetypes.guess_type(name)
+        if content_type is None:
+            return "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            return content_type + "; charset=UTF-8"
+        return content_type
+
+    def exposed_js_functions(self):
+        """
+        Finds the JavaScript functions exposed with eel.expose().
+
+        eel.init() normally discovers these by scanning the web directory
+        on disk; with an archive there is no directory, so the same scan is
+        done over the archive members instead.
+
+        Returns:
+            set: Exposed function names
+        """
+        names = set()
+        for member in self._members:
+            if member.endswith(_SCANNED_EXTENSIONS):
+                for function, alias in _EXPOSE_PATTERN.findall(self.read(member)):
+                    names.add((alias or function).decode("ascii"))
+        return names
+
+    def close(self):
+        """Releases the mapping and the file handle."""
+        self._map.close()
+        self._file.close()
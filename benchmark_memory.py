@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the backend's in-memory data model.
+
+Generates a synthetic dataset (default: 10 years of daily habits,
+weight and mood, plus todos and goals), then loads it into a DataStore
+twice - once as plain parsed JSON (the dict model) and once in compact
+form (backend/compact_model.py) - each in a fresh process, and reports
+resident memory (RSS), traced Python allocations and timings.
+
+The headline is what one running app pays: RSS after loading the data
+file once (parse pages included), load time, the cost of a one-day save
+and of get_section("habits"). RSS per additional store and the retained
+Python allocations show what holding the data costs on its own.
+
+Usage:
+    python benchmark_memory.py [--years=10] [--habits=20]
+"""
+
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+from backend.dates import format_date_key
+
+MODELS = ("dict", "compact")
+
+# Stores loaded per measurement; RSS is also reported per store after the first
+STORES_PER_RUN = 4
+
+# One-day saves timed per measurement
+SAVES_PER_RUN = 5
+
+CATEGORIES = [
+    {"name": "Health", "color": "#4caf50"},
+    {"name": "Mind", "color": "#2196f3"},
+    {"name": "Work", "color": "#ff9800"},
+]
+
+
+def synthetic_document(years=10, habit_count=20):
+    """
+    Builds a data document shaped like personal-tracker-data.json.
+
+    Habits are renamed every couple of years, so the dataset contains
+    several versions of their definitions like a real one would.
+    """
+    start = date.today() - timedelta(days=365 * years)
+    habits, mood = {}, {}
+    for offset in range(365 * years):
+        day = start + timedelta(days=offset)
+        key = format_date_key(day)
+        stamp = datetime(day.year, day.month, day.day, 21, 30, tzinfo=timezone.utc)
+        timestamp = stamp.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        entries = [{
+            "id": habit_id,
+            "name": f"Habit {habit_id}" + (" v2" if offset > 365 * years // 2 else ""),
+            "emoji": "✅",
+            "category": CATEGORIES[habit_id % len(CATEGORIES)],
+            "completed": (offset * 7 + habit_id * 3) % 5 < 3,
+            "timeOfDay": ("morning", "afternoon", "evening", "anytime")[habit_id % 4],
+        } for habit_id in range(1, habit_count + 1)]
+        habits[key] = {
+            "date": key,
+            "habits": entries,
+            "completedCount": sum(entry["completed"] for entry in entries),
+            "totalCount": habit_count,
+            "weight": round(150 + (offset % 90) / 10, 1),
+            "timestamp": timestamp,
+        }
+        mood[key] = {"date": key, "mood": offset % 5 + 1, "notes": "", "timestamp": timestamp}
+
+    todos = [{
+        "id": str(1700000000000 + i), "title": f"Todo {i}", "description": "",
+        "priority": ("now", "next", "later")[i % 3], "timeCommitment": "30min",
+        "dueDate": None, "linkedGoalId": str(i % 50) if i % 4 == 0 else None,
+        "completed": i % 2 == 0, "createdAt": "2024-01-01T10:00:00.000Z",
+        "updatedAt": "2024-01-02T10:00:00.000Z", "isRecurring": False,
+        "recurrencePattern": None, "recurrenceInterval": None, "recurrenceEndDate": None,
+    } for i in range(200 * years)]
+    goals = [{
+        "id": str(i), "title": f"Goal {i}", "description": "", "targetAmount": 100,
+        "unit": "km", "emoji": "🎯", "completedTodosCount": i,
+        "createdAt": "2024-01-01T10:00:00.000Z", "updatedAt": "2024-01-01T10:00:00.000Z",
+    } for i in range(50)]
+
+    return {
+        "version": "1.0.0",
+        "lastUpdated": datetime.now(timezone.utc).isoformat(),
+        "data": {"habits": habits, "todos": todos, "goals": goals, "goalSteps": [],
+                 "mood": mood, "journals": {}, "reminders": [], "streaks": {}},
+    }
+
+
+def current_rss_bytes():
+    """Resident set size of this process (peak RSS where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def release_free_memory():
+    """
+    Hands memory freed after parsing back to the OS where possible.
+
+    The parsed document is freed right after loading, but the C allocator
+    keeps the pages mapped, which would hide the difference between the
+    models in RSS. glibc's malloc_trim() releases them; elsewhere this is
+    a no-op.
+    """
+    gc.collect()
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def load_store(model, data_path):
+    """Loads the data file into a DataStore (one document, like a load)."""
+    from backend.data_store import DataStore
+
+    store = DataStore(compact=(model == "compact"))
+    with open(data_path, "r", encoding="utf-8") as f:
+        document = json.load(f)
+    store.apply_document(document, notify=False)
+    del document
+    release_free_memory()
+    return store
+
+
+def measure(model, data_path, trace=False):
+    """
+    Loads the dataset into a DataStore in this process.
+
+    RSS and timings are measured without tracing (tracemalloc slows
+    allocation down and adds its own memory); trace=True measures the
+    Python allocations the store retains instead.
+
+    The first load's RSS includes the parsed document, whose freed pages
+    the allocator keeps - that is what the app's process grows by. Later
+    loads reuse those pages, so the growth per additional store shows
+    what holding the data alone costs.
+    """
+    if trace:
+        tracemalloc.start()
+        store = load_store(model, data_path)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"retainedMB": round(retained / 2 ** 20, 1)}
+
+    release_free_memory()
+    rss_start = current_rss_bytes()
+    started = time.perf_counter()
+    stores = [load_store(model, data_path)]
+    load_seconds = time.perf_counter() - started
+    rss_first = current_rss_bytes()
+    for _ in range(STORES_PER_RUN - 1):
+        stores.append(load_store(model, data_path))
+    rss_per_store = (current_rss_bytes() - rss_first) / (STORES_PER_RUN - 1)
+    store = stores[0]
+
+    started = time.perf_counter()
+    habits = store.get_section("habits")
+    materialize_seconds = time.perf_counter() - started
+
+    # A save as the frontend sends it: the whole section, one day changed
+    save_seconds = 0.0
+    last = list(habits)[-1]
+    for i in range(SAVES_PER_RUN):
+        habits = {**habits, last: {**habits[last], "weight": 160 + i}}
+        started = time.perf_counter()
+        store.apply_sections({"habits": habits}, notify=False)
+        save_seconds += time.perf_counter() - started
+
+    return {
+        "model": model,
+        "firstLoadRssMB": round((rss_first - rss_start) / 2 ** 20, 1),
+        "rssMB": round(rss_per_store / 2 ** 20, 1),
+        "loadMs": round(load_seconds * 1000),
+        "saveMs": round(save_seconds * 1000 / SAVES_PER_RUN),
+        "habitsMaterializeMs": round(materialize_seconds * 1000),
+    }
+
+
+def parse_option(name, default):
+    prefix = f"--{name}="
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+
+def main():
+    model = parse_option("measure", None)
+    if model is not None:
+        print(json.dumps(measure(model, sys.argv[-1], trace="--trace" in sys.argv)))
+        return 0
+
+    years = int(parse_option("years", 10))
+    habit_count = int(parse_option("habits", 20))
+    print(f"Generating {years} years of data with {habit_count} habits...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "personal-tracker-data.json")
+        with open(data_path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_document(years, habit_count), f)
+        print(f"Data file: {os.path.getsize(data_path) / 2 ** 20:.1f} MB\n")
+
+        def run(*args):
+            # A fresh process per measurement, so no run reuses another's memory
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), *args, data_path],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True, text=True, check=True
+            ).stdout
+            return json.loads(output.strip().splitlines()[-1])
+
+        results = []
+        for name in MODELS:
+            result = run(f"--measure={name}")
+            result.update(run(f"--measure={name}", "--trace"))
+            results.append(result)
+
+    print(f"{'Model':<10}{'RSS (MB)':>10}{'Load (ms)':>11}{'Save (ms)':>11}"
+          f"{'get_section (ms)':>18}{'RSS/extra store':>17}{'Retained (MB)':>15}")
+    for result in results:
+        print(f"{result['model']:<10}{result['firstLoadRssMB']:>10}{result['loadMs']:>11}"
+              f"{result['saveMs']:>11}{result['habitsMaterializeMs']:>18}{result['rssMB']:>17}"
+              f"{result['retainedMB']:>15}")
+    print("\nRSS: process growth after loading the data file once (parse pages included)")
+    baseline, compact = results
+    if baseline["retainedMB"]:
+        print(f"Compact model retains {compact['retainedMB'] / baseline['retainedMB']:.0%} "
+              f"of the dict model's Python allocations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
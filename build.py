@@ -2,23 +2,46 @@
 """
 Build script for Personal Tracker Desktop Application
 Builds the React app and prepares the application for packaging.
+
+Steps are cached by content hash: each step records a hash of its inputs
+in .build-cache.json and is skipped on the next run if those inputs are
+unchanged (and its output still exists). Use --force to rebuild
+everything.
 """
 
 import os
 import sys
+import json
+import time
+import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Content hashes of each step's inputs from the last successful build
+CACHE_FILE = Path(".build-cache.json")
+
+# Inputs that affect each cached step
+STEP_INPUTS = {
+    "node_modules": ["package-lock.json"],
+    "python_env": ["requirements.txt"],
+    "react_build": ["src", "index.html", "vite.config.js", "package-lock.json"],
+}
+
+# Per-step durations for the summary at the end
+step_timings = []
+
 def print_step(step, message):
     """Prints a formatted step message."""
     print(f"\n{'='*60}")
     print(f"[{step}] {message}")
     print('='*60)
 
-def run_command(command, description, check=True):
+def run_command(command, description, check=True, quiet=False):
     """Runs a shell command and handles errors."""
-    print(f"\n> {description}")
-    print(f"  Running: {command}")
+    if not quiet:
+        print(f"\n> {description}")
+        print(f"  Running: {command}")
     
     try:
         result = subprocess.run(
@@ -28,7 +51,7 @@ def run_command(command, description, check=True):
             capture_output=True,
             text=True
         )
-        if result.stdout:
+        if result.stdout and not quiet:
             print(result.stdout)
         return result.returncode == 0
     except subprocess.CalledProcessError as e:
@@ -39,6 +62,79 @@ def run_command(command, description, check=True):
             print(f"STDERR: {e.stderr}")
         return False
 
+# ============================================================================
+# BUILD CACHE
+# ============================================================================
+
+def hash_inputs(paths):
+    """
+    Hashes the contents of files and directories (recursively).
+    
+    File paths and contents both go into the hash, so renames, edits,
+    additions and deletions all change it. Missing paths are hashed as
+    missing rather than ignored.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name in paths:
+        path = Path(name)
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.is_file())
+        elif path.is_file():
+            files = [path]
+        else:
+            digest.update(f"missing:{name}".encode())
+            continue
+        for file in files:
+            digest.update(file.as_posix().encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+def load_cache(force=False):
+    """
+    Loads the build cache (empty if missing or unreadable).
+    
+    With force=True the cache is ignored, so every step reruns.
+    """
+    if force:
+        return {}
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    """Writes the build cache."""
+    CACHE_FILE.write_text(json.dumps(cache, indent=2))
+
+def is_step_cached(cache, step, output=None):
+    """
+    True if a step's inputs are unchanged since its last successful run.
+    
+    Returns the current input hash as the second value, so the caller can
+    record it once the step succeeds.
+    """
+    current = hash_inputs(STEP_INPUTS[step])
+    cached = cache.get(step) == current and (output is None or Path(output).exists())
+    return cached, current
+
+def timed_step(name, func, *args):
+    """Runs a build step and records how long it took."""
+    started = time.perf_counter()
+    result = func(*args)
+    step_timings.append((name, time.perf_counter() - started))
+    return result
+
+def print_timings():
+    """Prints the per-step timing summary."""
+    print("\n  Step timings:")
+    for name, seconds in step_timings:
+        print(f"    - {name:<24} {seconds:6.2f}s")
+    print(f"    - {'Total':<24} {sum(s for _, s in step_timings):6.2f}s")
+
+# ============================================================================
+# BUILD STEPS
+# ============================================================================
+
 def check_requirements():
     """Checks if all required tools are installed."""
     print_step("CHECK", "Checking Requirements")
@@ -49,9 +145,16 @@ def check_requirements():
         "Python": "python3 --version",
     }
     
+    # The checks are independent, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(requirements)) as pool:
+        results = dict(zip(
+            requirements,
+            pool.map(lambda command: run_command(command, command, check=False, quiet=True),
+                     requirements.values())
+        ))
+    
     all_ok = True
-    for tool, command in requirements.items():
-        success = run_command(command, f"Checking {tool}", check=False)
+    for tool, success in results.items():
         if not success:
             print(f"  ❌ {tool} not found or not working")
             all_ok = False
@@ -60,24 +163,35 @@ def check_requirements():
     
     return all_ok
 
-def check_node_modules():
-    """Checks if node_modules exists, installs if missing."""
+def check_node_modules(cache):
+    """Checks if node_modules exists, installs if missing or outdated."""
     print_step("DEPENDENCIES", "Checking Node Dependencies")
     
+    cached, inputs_hash = is_step_cached(cache, "node_modules", "node_modules")
+    if cached:
+        print("  ✅ node_modules is up to date (package-lock.json unchanged)")
+        return True
+    
     if not Path("node_modules").exists():
         print("  node_modules not found. Installing dependencies...")
-        if not run_command("npm install", "Installing npm packages"):
-            return False
-        print("  ✅ Dependencies installed")
     else:
-        print("  ✅ node_modules exists")
+        print("  package-lock.json changed. Updating dependencies...")
+    if not run_command("npm install", "Installing npm packages"):
+        return False
+    print("  ✅ Dependencies installed")
     
+    cache["node_modules"] = inputs_hash
     return True
 
-def check_python_env():
+def check_python_env(cache):
     """Checks if Python virtual environment exists, creates if missing."""
     print_step("PYTHON ENV", "Checking Python Virtual Environment")
     
+    cached, inputs_hash = is_step_cached(cache, "python_env", "venv")
+    if cached:
+        print("  ✅ Virtual environment is up to date (requirements.txt unchanged)")
+        return True
+    
     venv_path = Path("venv")
     if not venv_path.exists():
         print("  Virtual environment not found. Creating...")
@@ -87,45 +201,30 @@ def check_python_env():
     else:
         print("  ✅ Virtual environment exists")
     
-    # Check if Eel is installed
-    print("  Checking Eel installation...")
-    eel_check = run_command(
-        "source venv/bin/activate && pip show eel",
-        "Checking for Eel package",
-        check=False
-    )
-    
-    if not eel_check:
-        print("  Eel not found. Installing from requirements.txt...")
-        if not run_command(
-            "source venv/bin/activate && pip install -r requirements.txt",
-            "Installing Python dependencies"
-        ):
-            return False
-        print("  ✅ Python dependencies installed")
-    else:
-        print("  ✅ Eel is installed")
+    # requirements.txt is new or changed (or the venv is): install all of
+    # it, so newly added packages get installed too
+    print("  Installing dependencies from requirements.txt...")
+    if not run_command(
+        "source venv/bin/activate && pip install -r requirements.txt",
+        "Installing Python dependencies"
+    ):
+        return False
+    print("  ✅ Python dependencies installed")
     
+    cache["python_env"] = inputs_hash
     return True
 
-def build_react_app():
+def build_react_app(cache):
     """Builds the React application."""
     print_step("BUILD", "Building React Application")
     
-    # Clean previous build if it exists
     web_dir = Path("web")
-    if web_dir.exists():
-        print("  Cleaning previous build...")
-        # Remove old files but keep the directory
-        for file in web_dir.iterdir():
-            if file.is_file():
-                file.unlink()
-            elif file.is_dir():
-                import shutil
-                shutil.rmtree(file)
-        print("  ✅ Previous build cleaned")
-    
-    # Build the React app
+    cached, inputs_hash = is_step_cached(cache, "react_build", web_dir / "index.html")
+    if cached:
+        print("  ✅ React build is up to date (sources unchanged)")
+        return True
+    
+    # Build the React app (Vite empties web/ itself - emptyOutDir: true)
     if not run_command("npm run build", "Building React app with Vite"):
         return False
     
@@ -154,6 +253,7 @@ def build_react_app():
     if len(asset_files) > 5:
         print(f"      ... and {len(asset_files) - 5} more")
     
+    cache["react_build"] = inputs_hash
     return True
 
 def verify_build():
@@ -183,33 +283,40 @@ def main():
     print("Personal Tracker - Desktop App Build Script")
     print("="*60)
     
-    # Step 1: Check requirements
-    if not check_requirements():
-        print("\n❌ Requirements check failed. Please install missing tools.")
+    # --force ignores the build cache and reruns every step
+    cache = load_cache(force="--force" in sys.argv)
+    
+    def fail(message):
+        save_cache(cache)  # keep the steps that did succeed
+        print_timings()
+        print(message)
         sys.exit(1)
     
+    # Step 1: Check requirements
+    if not timed_step("Check requirements", check_requirements):
+        fail("\n❌ Requirements check failed. Please install missing tools.")
+    
     # Step 2: Check/install Node dependencies
-    if not check_node_modules():
-        print("\n❌ Failed to install Node dependencies.")
-        sys.exit(1)
+    if not timed_step("Node dependencies", check_node_modules, cache):
+        fail("\n❌ Failed to install Node dependencies.")
     
     # Step 3: Check/install Python dependencies
-    if not check_python_env():
-        print("\n❌ Failed to set up Python environment.")
-        sys.exit(1)
+    if not timed_step("Python environment", check_python_env, cache):
+        fail("\n❌ Failed to set up Python environment.")
     
     # Step 4: Build React app
-    if not build_react_app():
-        print("\n❌ React app build failed.")
-        sys.exit(1)
+    if not timed_step("React build", build_react_app, cache):
+        fail("\n❌ React app build failed.")
     
     # Step 5: Verify build
-    if not verify_build():
-        print("\n❌ Build verification failed.")
-        sys.exit(1)
+    if not timed_step("Verify build", verify_build):
+        fail("\n❌ Build verification failed.")
+    
+    save_cache(cache)
     
     # Success!
     print_step("SUCCESS", "Build Complete!")
+    print_timings()
     print("\n✅ The application is ready to run!")
     print("\nTo start the desktop app:")
     print("  1. Activate virtual environment: source venv/bin/activate")
@@ -2,13 +2,71 @@
 """
 Packaging script for Personal Tracker Desktop Application
 Creates a standalone executable using PyInstaller.
+
+Options:
+    --web-archive   Bundle web/ as a single uncompressed archive (web.zip)
+                    that start.py memory-maps and serves from, instead of
+                    hundreds of loose files (onedir only - a onefile
+                    build would still unpack the archive on every launch)
+    --profile=NAME  Bundle layout: onefile (default), onedir or all
+                    - onefile: one executable that unpacks itself to a
+                      temp directory on every launch (dist/PersonalTracker)
+                    - onedir: an executable next to its already-unpacked
+                      libraries, no UPX (dist/onedir/PersonalTracker/)
+    --no-trim       Don't trace a real run to exclude unused modules
+    --no-timing     Skip the startup timing harness after packaging
 """
 
+import json
 import os
 import sys
 import subprocess
+import tempfile
+import time
 from pathlib import Path
 
+from backend.web_archive import WEB_ARCHIVE_NAME, build_web_archive
+
+APP_EXE_NAME = "PersonalTracker"
+PROFILES = ("onefile", "onedir")
+
+# Profiles that bundle web.zip with --web-archive. A onefile bundle
+# compresses its data files and unpacks them all to a temp directory on
+# every launch, so the archive couldn't be memory-mapped in place there.
+WEB_ARCHIVE_PROFILES = ("onedir",)
+
+# start.py writes a startup report here instead of opening a window
+READY_REPORT_ENV = "PERSONAL_TRACKER_READY_REPORT"
+
+# Longest wait for a run to report that its server is ready
+READY_TIMEOUT_SECONDS = 60
+
+# Modules that may be left out of the bundle when a traced run never
+# imports them. PyInstaller's analysis (and gevent's hook, which collects
+# every gevent submodule) pulls these in even though the app doesn't use
+# them. Anything a real run does import is kept.
+EXCLUDE_CANDIDATES = [
+    # Standard library
+    'tkinter', 'turtle', 'turtledemo', 'idlelib', 'pydoc', 'pydoc_data',
+    'doctest', 'unittest', 'test', 'lib2to3', 'distutils', 'ensurepip', 'venv',
+    'pdb', 'curses', 'sqlite3', 'dbm', 'xmlrpc', 'ftplib', 'imaplib',
+    'poplib', 'smtplib', 'nntplib', 'telnetlib', 'mailbox', 'multiprocessing',
+    'asyncio', 'concurrent', 'lzma', 'bz2', 'xml',
+    # gevent pieces the app doesn't use
+    'gevent.tests', 'gevent.testing', 'gevent.backdoor', 'gevent.libuv',
+    'gevent.resolver.ares', 'gevent.resolver.dnspython', 'gevent.resolver.blocking',
+    'gevent.subprocess', 'gevent.server', 'gevent.ares',
+]
+
+# Modules never excluded, even if a traced run didn't import them: they
+# are only imported on paths the trace may not reach before it reports
+# (a second launch handing off to the running instance, the instance
+# listener waiting on its socket).
+KEEP_MODULES = [
+    'socket', 'select', 'selectors', 'secrets',
+    'gevent.select', 'gevent.socket', 'gevent._socketcommon',
+]
+
 def print_step(step, message):
     """Prints a formatted step message."""
     print(f"\n{'='*60}")
@@ -30,9 +88,179 @@ def check_build():
     print("  ✅ Build files found")
     return True
 
-def create_spec_file():
-    """Creates a PyInstaller spec file for the application."""
-    print_step("SPEC", "Creating PyInstaller Spec File")
+def create_web_archive():
+    """Packs web/ into a single archive for --web-archive builds."""
+    print_step("ARCHIVE", "Packing Web Assets")
+    
+    info = build_web_archive("web", WEB_ARCHIVE_NAME)
+    print(f"  ✅ Packed {info['files']} file(s) into {WEB_ARCHIVE_NAME} "
+          f"({info['bytes'] / 1024:.1f} KB)")
+    return True
+
+# Final spec section per profile
+ONEFILE_BUNDLE = '''exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    [],
+    name='PersonalTracker',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    runtime_tmpdir=None,
+    console=False,  # Window Based - no console
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=None,  # Add icon path here if you have one: 'icon.ico'
+)
+'''
+
+ONEDIR_BUNDLE = '''exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='PersonalTracker',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,  # Libraries are loaded straight from disk - don't make each launch decompress them
+    console=False,  # Window Based - no console
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=None,  # Add icon path here if you have one: 'icon.ico'
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='PersonalTracker',
+)
+'''
+
+def bundle_path(profile):
+    """Returns the file (onefile) or directory (onedir) a profile produces."""
+    if profile == "onedir":
+        return Path("dist") / "onedir" / APP_EXE_NAME
+    suffix = ".exe" if sys.platform == "win32" else ""
+    return Path("dist") / f"{APP_EXE_NAME}{suffix}"
+
+def executable_path(profile):
+    """Returns the executable to launch for a profile."""
+    if profile == "onedir":
+        suffix = ".exe" if sys.platform == "win32" else ""
+        return bundle_path(profile) / f"{APP_EXE_NAME}{suffix}"
+    return bundle_path(profile)
+
+def wait_for_ready_report(command, cwd=None):
+    """
+    Launches the app with a startup report requested and waits for it.
+    
+    Args:
+        command (list): Command that starts the app
+        cwd (str): Working directory for the run
+    
+    Returns:
+        tuple: (report dict or None, seconds from launch to report)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "ready.json")
+        env = dict(os.environ, **{READY_REPORT_ENV: report_path})
+        
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while time.perf_counter() - started < READY_TIMEOUT_SECONDS:
+                # The report is written in full before the process exits
+                if process.poll() is not None:
+                    break
+                time.sleep(0.02)
+            elapsed = time.perf_counter() - started
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+        
+        if not os.path.exists(report_path):
+            return None, elapsed
+        with open(report_path, encoding="utf-8") as f:
+            return json.load(f), elapsed
+
+def trace_imports():
+    """
+    Records the modules a real run of start.py imports.
+    
+    Returns:
+        set|None: Imported module names, or None if the run failed
+    """
+    print_step("TRACE", "Tracing Imports of a Real Run")
+    
+    report, elapsed = wait_for_ready_report([sys.executable, "start.py"])
+    if report is None:
+        print("  ⚠️  Traced run didn't report ready; nothing will be excluded")
+        return None
+    
+    print(f"  ✅ {len(report['modules'])} modules imported (server ready in "
+          f"{report['readyMs']:.0f} ms)")
+    return set(report["modules"])
+
+def generate_excludes(traced_modules, candidates=EXCLUDE_CANDIDATES, keep=KEEP_MODULES):
+    """
+    Picks the exclude candidates a traced run never imported.
+    
+    A candidate is kept if it or any of its submodules was imported or is
+    in the allow-list.
+    
+    Args:
+        traced_modules (set): Module names from trace_imports()
+        candidates (list): Modules that may be excluded
+        keep (list): Modules that must stay in the bundle
+    
+    Returns:
+        list: Module names for the spec's excludes
+    """
+    needed = set(traced_modules) | set(keep)
+    excludes = []
+    for candidate in candidates:
+        prefix = candidate + "."
+        if candidate in needed:
+            continue
+        if any(name.startswith(prefix) for name in needed):
+            continue
+        excludes.append(candidate)
+    return excludes
+
+def create_spec_file(web_archive=False, profile="onefile", excludes=()):
+    """
+    Creates a PyInstaller spec file for the application.
+    
+    Args:
+        web_archive (bool): Bundle web.zip instead of web/
+        profile (str): "onefile" or "onedir"
+        excludes (list): Modules to leave out of the bundle
+    """
+    print_step("SPEC", f"Creating PyInstaller Spec File ({profile})")
+    
+    if web_archive:
+        web_datas = f"('{WEB_ARCHIVE_NAME}', '.'),  # web/ packed into one archive"
+    else:
+        web_datas = "('web', 'web'),  # Include the entire web directory"
     
     spec_content = '''# -*- mode: python ; coding: utf-8 -*-
 
@@ -43,7 +271,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[
-        ('web', 'web'),  # Include the entire web directory
+        {web_datas}
     ],
     hiddenimports=[
         'eel',
@@ -63,7 +291,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes={excludes},
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -72,52 +300,42 @@ a = Analysis(
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='PersonalTracker',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,  # Window Based - no console
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=None,  # Add icon path here if you have one: 'icon.ico'
-)
-'''
+{bundle}'''
+    bundle = ONEDIR_BUNDLE if profile == "onedir" else ONEFILE_BUNDLE
+    spec_content = (spec_content
+                    .replace('{web_datas}', web_datas)
+                    .replace('{excludes}', repr(sorted(excludes)))
+                    .replace('{bundle}', bundle))
     
     spec_file = Path("PersonalTracker.spec")
     spec_file.write_text(spec_content)
     print(f"  ✅ Created {spec_file}")
+    if excludes:
+        print(f"  ✅ Excluding {len(excludes)} unused module(s): {', '.join(sorted(excludes))}")
     return True
 
-def package_app():
+def package_app(profile="onefile"):
     """Packages the application using PyInstaller."""
-    print_step("PACKAGE", "Packaging Application")
+    print_step("PACKAGE", f"Packaging Application ({profile})")
     
     # Check if spec file exists, create if not
     spec_file = Path("PersonalTracker.spec")
     if not spec_file.exists():
         print("  Creating spec file...")
-        create_spec_file()
+        create_spec_file(profile=profile)
     
     # Run PyInstaller
     print("  Running PyInstaller...")
     print("  This may take a few minutes...")
     
+    # onedir output goes to its own folder so it doesn't collide with the
+    # onefile executable of the same name
+    dist_path = str(bundle_path(profile).parent)
+    
     try:
         result = subprocess.run(
-            ["pyinstaller", "--clean", "PersonalTracker.spec"],
+            ["pyinstaller", "--clean", "--noconfirm", "--distpath", dist_path,
+             "PersonalTracker.spec"],
             check=True,
             capture_output=True,
             text=True
@@ -144,27 +362,89 @@ def package_app():
         print("    source venv/bin/activate")
         return False
 
-def verify_package():
-    """Verifies that the package was created successfully."""
-    print_step("VERIFY", "Verifying Package")
+def bundle_stats(path):
+    """
+    Measures a packaged bundle.
     
-    dist_dir = Path("dist")
-    exe_name = "PersonalTracker"
+    Returns:
+        dict: {"bytes": total size, "files": file count}
+    """
+    if path.is_file():
+        return {"bytes": path.stat().st_size, "files": 1}
+    total = count = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+            count += 1
+    return {"bytes": total, "files": count}
+
+def verify_package(profile="onefile"):
+    """
+    Verifies that the package was created successfully.
     
-    if sys.platform == "win32":
-        exe_path = dist_dir / f"{exe_name}.exe"
-    else:
-        exe_path = dist_dir / exe_name
+    Returns:
+        dict|None: Bundle stats, or None if the executable is missing
+    """
+    print_step("VERIFY", f"Verifying Package ({profile})")
     
+    exe_path = executable_path(profile)
     if not exe_path.exists():
         print(f"  ❌ Executable not found at {exe_path}")
-        return False
+        return None
     
-    size_mb = exe_path.stat().st_size / (1024 * 1024)
+    stats = bundle_stats(bundle_path(profile))
     print(f"  ✅ Executable created: {exe_path}")
-    print(f"  ✅ Size: {size_mb:.1f} MB")
+    print(f"  ✅ Size: {stats['bytes'] / (1024 * 1024):.1f} MB in {stats['files']} file(s)")
     
-    return True
+    return stats
+
+def time_startup(profile):
+    """
+    Launches the packaged app and times how long until its server is ready.
+    
+    Uses the startup report hook in start.py (READY_REPORT_ENV), so no
+    browser window is opened. For onefile builds the time includes
+    unpacking the bundle.
+    
+    Returns:
+        float|None: Seconds from launch to server ready, or None on failure
+    """
+    print_step("TIMING", f"Timing Startup ({profile})")
+    
+    exe_path = executable_path(profile)
+    report, elapsed = wait_for_ready_report([str(exe_path.resolve())],
+                                            cwd=str(exe_path.parent))
+    if report is None:
+        print(f"  ❌ {exe_path} didn't report ready within {READY_TIMEOUT_SECONDS} s")
+        return None
+    
+    print(f"  ✅ Server ready after {elapsed * 1000:.0f} ms "
+          f"({report['readyMs']:.0f} ms inside Python)")
+    return elapsed
+
+def print_profile_report(results):
+    """Prints bundle size, file count and time-to-server-ready per profile."""
+    print_step("REPORT", "Packaging Profiles")
+    
+    print(f"  {'Profile':<10} {'Size (MB)':>10} {'Files':>7} {'Ready (ms)':>11}")
+    for profile, result in results.items():
+        ready = result.get("ready")
+        ready_text = f"{ready * 1000:.0f}" if ready is not None else "-"
+        print(f"  {profile:<10} {result['bytes'] / (1024 * 1024):>10.1f} "
+              f"{result['files']:>7} {ready_text:>11}")
+
+def parse_profiles(argv):
+    """Reads --profile=onefile|onedir|all from the command line."""
+    for arg in argv:
+        if arg.startswith("--profile="):
+            value = arg.split("=", 1)[1]
+            if value == "all":
+                return list(PROFILES)
+            if value not in PROFILES:
+                print(f"❌ Unknown profile '{value}' (choose from: {', '.join(PROFILES)}, all)")
+                sys.exit(1)
+            return [value]
+    return ["onefile"]
 
 def main():
     """Main packaging process."""
@@ -172,34 +452,59 @@ def main():
     print("Personal Tracker - Packaging Script")
     print("="*60)
     
+    profiles = parse_profiles(sys.argv[1:])
+    
     # Step 1: Check if app is built
     if not check_build():
         sys.exit(1)
     
-    # Step 2: Create spec file
-    if not create_spec_file():
-        print("\n❌ Failed to create spec file.")
-        sys.exit(1)
+    web_archive = "--web-archive" in sys.argv
+    if web_archive and any(profile not in WEB_ARCHIVE_PROFILES for profile in profiles):
+        print("\nNote: --web-archive only applies to onedir builds; "
+              "onefile builds bundle web/ as usual.")
+    if web_archive and any(profile in WEB_ARCHIVE_PROFILES for profile in profiles):
+        if not create_web_archive():
+            print("\n❌ Failed to pack web assets.")
+            sys.exit(1)
     
-    # Step 3: Package the app
-    if not package_app():
-        print("\n❌ Packaging failed.")
-        sys.exit(1)
+    # Step 2: Work out which modules a real run never touches
+    excludes = []
+    if "--no-trim" not in sys.argv:
+        traced_modules = trace_imports()
+        if traced_modules is not None:
+            excludes = generate_excludes(traced_modules)
     
-    # Step 4: Verify package
-    if not verify_package():
-        print("\n❌ Package verification failed.")
-        sys.exit(1)
+    results = {}
+    for profile in profiles:
+        # Step 3: Create spec file
+        archive_profile = web_archive and profile in WEB_ARCHIVE_PROFILES
+        if not create_spec_file(archive_profile, profile, excludes):
+            print("\n❌ Failed to create spec file.")
+            sys.exit(1)
+        
+        # Step 4: Package the app
+        if not package_app(profile):
+            print("\n❌ Packaging failed.")
+            sys.exit(1)
+        
+        # Step 5: Verify package
+        stats = verify_package(profile)
+        if stats is None:
+            print("\n❌ Package verification failed.")
+            sys.exit(1)
+        
+        # Step 6: Time startup
+        if "--no-timing" not in sys.argv:
+            stats["ready"] = time_startup(profile)
+        results[profile] = stats
+    
+    print_profile_report(results)
     
     # Success!
     print_step("SUCCESS", "Packaging Complete!")
     
-    if sys.platform == "win32":
-        exe_path = "dist/PersonalTracker.exe"
-    else:
-        exe_path = "dist/PersonalTracker"
-    
-    print(f"\n✅ Executable created: {exe_path}")
+    for profile in profiles:
+        print(f"\n✅ {profile}: {executable_path(profile)}")
     print(f"\nYou can now distribute this executable!")
     print(f"\nNote: The executable is platform-specific.")
     print(f"      To create for other platforms, run this script on that platform.")
@@ -207,4 +512,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
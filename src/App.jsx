@@ -156,6 +156,34 @@ function App() {
     }
   }, []) // Empty dependency array = run once on mount
 
+  /**
+   * Listen for data changes made in other app windows, then bring in the
+   * recent data from the desktop file.
+   * 
+   * Only runs in desktop mode (when Eel is available). Changes from
+   * other windows are applied per section to localStorage. The startup
+   * load only reads the recent days (from the data file's snapshot), plus
+   * the journal files of those days.
+   * 
+   * @effect
+   * @runs Once on mount
+   */
+  useEffect(() => {
+    if (typeof window === 'undefined' || !window.eel) {
+      return
+    }
+    import('./utils/desktopStorage').then(async module => {
+      await module.startChangeListener()
+      const result = await module.loadRecentDataFromDesktop()
+      if (result.success) {
+        const { loadJournalsFromFileSystem } = await import('./utils/journalStorage')
+        await loadJournalsFromFileSystem(result.since)
+      }
+    }).catch(() => {
+      // Desktop storage is optional
+    })
+  }, [])
+
   // ========================================================================
   // RENDER
   // ========================================================================
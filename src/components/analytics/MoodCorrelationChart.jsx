@@ -2,22 +2,25 @@ import { useMemo } from 'react'
 import { ScatterChart, Scatter, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, Cell } from 'recharts'
 import { getMoodVsHabitsCompleted, getTopMoodBoostingHabits, getTopMoodNegativeHabits } from '../../utils/moodCorrelations'
 import { getAllStoredData } from '../../utils/dataStorage'
+import { useDataChanges } from '../../hooks/useDataChanges'
 import './MoodCorrelationChart.css'
 
 const COLORS = ['#667eea', '#f59e0b', '#10b981', '#ef4444', '#8b5cf6']
 
 function MoodCorrelationChart() {
+  const changes = useDataChanges(['habits', 'mood'])
+
   const scatterData = useMemo(() => {
     return getMoodVsHabitsCompleted()
-  }, [])
+  }, [changes])
 
   const topBoosting = useMemo(() => {
     return getTopMoodBoostingHabits(5)
-  }, [])
+  }, [changes])
 
   const topNegative = useMemo(() => {
     return getTopMoodNegativeHabits(3)
-  }, [])
+  }, [changes])
 
   const allData = getAllStoredData()
   
@@ -1,6 +1,8 @@
-import { useMemo } from 'react'
+import { useMemo, useState, useEffect } from 'react'
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
 import { getMoodHistory, getAverageMood, getMoodEmoji } from '../../utils/moodStorage'
+import { getTimeSeries } from '../../utils/dataStorage'
+import { useDataChanges, useSyncChanges } from '../../hooks/useDataChanges'
 import './MoodHistory.css'
 
 function MoodHistory({ timeframe = 'month' }) {
@@ -19,11 +21,36 @@ function MoodHistory({ timeframe = 'month' }) {
     return { start, end: today }
   }, [timeframe])
 
-  const moodData = useMemo(() => {
-    const history = getMoodHistory(
+  const moodChanges = useDataChanges(['mood'])
+  const syncs = useSyncChanges()
+  // Downsampled points and range average from the desktop backend (null = compute locally)
+  const [series, setSeries] = useState(null)
+
+  useEffect(() => {
+    let cancelled = false
+    setSeries(null)
+    getTimeSeries('mood', dateRange.start.toDateString(), dateRange.end.toDateString()).then(result => {
+      if (!cancelled) setSeries(result)
+    })
+    return () => { cancelled = true }
+  }, [dateRange, moodChanges, syncs])
+
+  const history = useMemo(() => {
+    if (series) return null
+    return getMoodHistory(
       dateRange.start.toDateString(),
       dateRange.end.toDateString()
     )
+  }, [series, dateRange, timeframe, moodChanges])
+
+  const moodData = useMemo(() => {
+    if (series) {
+      return series.points.map(point => ({
+        date: point.date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
+        mood: point.value,
+        emoji: getMoodEmoji(Math.round(point.value))
+      }))
+    }
     
     return history.map(mood => ({
       date: new Date(mood.date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
@@ -31,14 +58,16 @@ function MoodHistory({ timeframe = 'month' }) {
       emoji: getMoodEmoji(mood.mood),
       notes: mood.notes
     }))
-  }, [dateRange, timeframe])
+  }, [series, history])
 
   const averageMood = useMemo(() => {
+    if (series) return series.average
     return getAverageMood(
       dateRange.start.toDateString(),
-      dateRange.end.toDateString()
+      dateRange.end.toDateString(),
+      history
     )
-  }, [dateRange, timeframe])
+  }, [series, history, dateRange])
 
   if (moodData.length === 0) {
     return (
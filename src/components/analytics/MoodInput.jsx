@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react'
 import { saveMood, getTodayMood, getMoodEmoji } from '../../utils/moodStorage'
 import { getTodayKey } from '../../utils/dataStorage'
+import { useDataChanges } from '../../hooks/useDataChanges'
 import './MoodInput.css'
 
 const MOOD_OPTIONS = [
@@ -16,14 +17,23 @@ function MoodInput() {
   const [notes, setNotes] = useState('')
   const [isEditing, setIsEditing] = useState(false)
 
-  useEffect(() => {
+  const loadTodayMood = () => {
     const todayMood = getTodayMood()
     if (todayMood) {
       setSelectedMood(todayMood.mood)
       setNotes(todayMood.notes || '')
     }
+  }
+
+  useEffect(() => {
+    loadTodayMood()
   }, [])
 
+  // Mood saved by another window (kept out of the way while typing notes)
+  useDataChanges(['mood'], () => {
+    if (!isEditing) loadTodayMood()
+  })
+
   const handleMoodSelect = (moodValue) => {
     setSelectedMood(moodValue)
     setIsEditing(true)
@@ -1,13 +1,16 @@
-import { useMemo } from 'react'
+import { useMemo, useState, useEffect } from 'react'
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell, ComposedChart } from 'recharts'
-import { getWeekData, getMonthData, calculateCompletionRate, calculatePercentageChange, getDateRange, getAllStoredData, getAverageWeight, calculateWeightChange } from '../../utils/dataStorage'
+import { getWeekData, getMonthData, calculateCompletionRate, calculatePercentageChange, getDateRange, getAllStoredData, getAverageWeight, calculateWeightChange, getTimeSeries } from '../../utils/dataStorage'
 import { HABIT_CATEGORIES } from '../../utils/habitCategories'
+import { useDataChanges, useSyncChanges } from '../../hooks/useDataChanges'
 import './StatsView.css'
 
 function StatsView({ viewType }) {
+  const habitChanges = useDataChanges(['habits'])
+
   const data = useMemo(() => {
     return viewType === 'weekly' ? getWeekData() : getMonthData()
-  }, [viewType])
+  }, [viewType, habitChanges])
 
   const chartData = useMemo(() => {
     return data.map(day => ({
@@ -21,17 +24,67 @@ function StatsView({ viewType }) {
     }))
   }, [data])
 
+  const previousRange = useMemo(() => {
+    if (!data || data.length === 0) return null
+    
+    const daysToGoBack = viewType === 'weekly' ? 7 : 30
+    const lastDay = new Date(data[data.length - 1].date)
+    lastDay.setHours(0, 0, 0, 0)
+    
+    // Get the previous period (e.g., previous week or month)
+    const periodEnd = new Date(lastDay)
+    periodEnd.setDate(periodEnd.getDate() - 1)
+    periodEnd.setHours(23, 59, 59, 999)
+    
+    const periodStart = new Date(periodEnd)
+    periodStart.setDate(periodStart.getDate() - daysToGoBack + 1)
+    periodStart.setHours(0, 0, 0, 0)
+    
+    return { start: periodStart, end: periodEnd }
+  }, [data, viewType])
+
+  const previousData = useMemo(() => {
+    if (!previousRange) return []
+    return getDateRange(previousRange.start, previousRange.end)
+  }, [previousRange])
+
+  const syncs = useSyncChanges()
+  // Weight points and averages from the desktop backend (null = compute locally)
+  const [weightSeries, setWeightSeries] = useState(null)
+
+  useEffect(() => {
+    let cancelled = false
+    setWeightSeries(null)
+    if (!previousRange) return undefined
+    Promise.all([
+      getTimeSeries('weight', data[0].date, data[data.length - 1].date),
+      // Only the average of the previous period is shown
+      getTimeSeries('weight', previousRange.start.toDateString(), previousRange.end.toDateString(), 2)
+    ]).then(([current, previous]) => {
+      if (!cancelled && current && previous) setWeightSeries({ current, previous })
+    })
+    return () => { cancelled = true }
+  }, [data, previousRange, syncs])
+
   const weightData = useMemo(() => {
+    if (weightSeries) {
+      return weightSeries.current.points.map(point => ({
+        date: point.date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
+        weight: point.value,
+      }))
+    }
     return chartData.filter(d => d.weight !== null && d.weight !== undefined)
-  }, [chartData])
+  }, [weightSeries, chartData])
 
   const averageWeight = useMemo(() => {
+    if (weightSeries) return weightSeries.current.average
     return getAverageWeight(data)
-  }, [data])
+  }, [weightSeries, data])
 
   const previousAverageWeight = useMemo(() => {
+    if (weightSeries) return weightSeries.previous.average
     return getAverageWeight(previousData)
-  }, [previousData])
+  }, [weightSeries, previousData])
 
   const weightChange = useMemo(() => {
     if (!averageWeight || !previousAverageWeight) return null
@@ -42,25 +95,6 @@ function StatsView({ viewType }) {
     return calculateCompletionRate(data) * 100
   }, [data])
 
-  const previousData = useMemo(() => {
-    if (!data || data.length === 0) return []
-    
-    const daysToGoBack = viewType === 'weekly' ? 7 : 30
-    const lastDay = new Date(data[data.length - 1].date)
-    lastDay.setHours(0, 0, 0, 0)
-    
-    // Get the previous period (e.g., previous week or month)
-    const periodEnd = new Date(lastDay)
-    periodEnd.setDate(periodEnd.getDate() - 1)
-    periodEnd.setHours(23, 59, 59, 999)
-    
-    const periodStart = new Date(periodEnd)
-    periodStart.setDate(periodStart.getDate() - daysToGoBack + 1)
-    periodStart.setHours(0, 0, 0, 0)
-    
-    return getDateRange(periodStart, periodEnd)
-  }, [data, viewType])
-
   const previousRate = useMemo(() => {
     return calculateCompletionRate(previousData) * 100
   }, [previousData])
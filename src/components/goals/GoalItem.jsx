@@ -3,24 +3,34 @@ import StepItem from './StepItem'
 import StepForm from './StepForm'
 import { getStepsForGoal, calculateGoalProgress, deleteGoalStep, saveGoalStep, getGoalCompletedTodosCountSync } from '../../utils/goalStorage'
 import { getTodosForGoal } from '../../utils/todoStorage'
+import { useDataChanges } from '../../hooks/useDataChanges'
 import './GoalItem.css'
 
-function GoalItem({ goal, onUpdate, onEdit, onDelete }) {
+function GoalItem({ goal, summary, onUpdate, onEdit, onDelete }) {
   const [steps, setSteps] = useState(getStepsForGoal(goal.id))
   const [showStepForm, setShowStepForm] = useState(false)
   const [editingStep, setEditingStep] = useState(null)
   const [expanded, setExpanded] = useState(true)
-  const [todoCount, setTodoCount] = useState(0)
-  const [completedTodoCount, setCompletedTodoCount] = useState(0)
+  const [localTodoCount, setLocalTodoCount] = useState(0)
+  const [localCompletedTodoCount, setLocalCompletedTodoCount] = useState(0)
   
-  const progress = calculateGoalProgress(goal)
+  // Steps saved by another window
+  useDataChanges(['goalSteps'], () => setSteps(getStepsForGoal(goal.id)))
+  
+  // Progress from the backend's bulk request when available
+  const progress = summary || calculateGoalProgress(goal)
+  const todoCount = summary ? summary.todos : localTodoCount
+  const completedTodoCount = summary ? summary.completedTodos : localCompletedTodoCount
+  const hasSummary = !!summary
   
   // Load todo counts for this goal
   useEffect(() => {
+    if (hasSummary) return
+    
     const loadTodoCounts = () => {
       const todos = getTodosForGoal(goal.id)
-      setTodoCount(todos.length)
-      setCompletedTodoCount(todos.filter(t => t.completed).length)
+      setLocalTodoCount(todos.length)
+      setLocalCompletedTodoCount(todos.filter(t => t.completed).length)
     }
     
     loadTodoCounts()
@@ -29,7 +39,7 @@ function GoalItem({ goal, onUpdate, onEdit, onDelete }) {
     const interval = setInterval(loadTodoCounts, 2000)
     
     return () => clearInterval(interval)
-  }, [goal.id])
+  }, [goal.id, hasSummary])
 
   const handleStepAdded = () => {
     setSteps(getStepsForGoal(goal.id))
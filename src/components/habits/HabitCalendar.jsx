@@ -1,20 +1,51 @@
 import { useState, useEffect } from 'react'
-import { getHeatmapData, getIntensityColor, formatMonthYear, getCalendarDays } from '../../utils/calendarUtils'
+import { getHeatmapData, getHeatmapTile, getHeatmapDataFromTile, getIntensityColor, formatMonthYear, getCalendarDays } from '../../utils/calendarUtils'
 import { getDayData } from '../../utils/dataStorage'
+import { DATA_CHANGED_EVENT, SYNC_STATE_EVENT } from '../../utils/desktopStorage'
 import './HabitCalendar.css'
 
 function HabitCalendar({ habitId = null, onDayClick }) {
   const [currentDate, setCurrentDate] = useState(new Date())
   const [heatmapData, setHeatmapData] = useState([])
   const [selectedDate, setSelectedDate] = useState(null)
+  // Yearly tile from the desktop backend (null = compute locally)
+  const [tile, setTile] = useState(null)
+  // Bumped when the habits change, so the tile is fetched again
+  const [habitsVersion, setHabitsVersion] = useState(0)
 
   const year = currentDate.getFullYear()
   const month = currentDate.getMonth()
 
+  // Local saves, their sync to the data file and other windows' saves
   useEffect(() => {
-    const data = getHeatmapData(year, month, habitId)
+    const handleChange = (event) => {
+      if (event.type === DATA_CHANGED_EVENT && event.detail.section !== 'habits') return
+      setHabitsVersion(version => version + 1)
+    }
+    window.addEventListener(DATA_CHANGED_EVENT, handleChange)
+    window.addEventListener(SYNC_STATE_EVENT, handleChange)
+    return () => {
+      window.removeEventListener(DATA_CHANGED_EVENT, handleChange)
+      window.removeEventListener(SYNC_STATE_EVENT, handleChange)
+    }
+  }, [])
+
+  // One backend call per year; months are read from the tile
+  useEffect(() => {
+    let cancelled = false
+    setTile(null)
+    getHeatmapTile(year).then(result => {
+      if (!cancelled) setTile(result)
+    })
+    return () => { cancelled = true }
+  }, [year, habitsVersion])
+
+  useEffect(() => {
+    const data = tile && tile.year === year
+      ? getHeatmapDataFromTile(tile, year, month, habitId)
+      : getHeatmapData(year, month, habitId)
     setHeatmapData(data)
-  }, [year, month, habitId])
+  }, [tile, year, month, habitId])
 
   const handlePrevMonth = () => {
     setCurrentDate(new Date(year, month - 1, 1))
@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { exportAllData, downloadData } from '../../utils/exportUtils'
+import { exportAllData, downloadData, canExportToFile, exportDataToFile } from '../../utils/exportUtils'
 import './DataExport.css'
 
 function DataExport({ onClose }) {
@@ -7,7 +7,7 @@ function DataExport({ onClose }) {
   const [dateRange, setDateRange] = useState({ enabled: false, start: '', end: '' })
   const [exporting, setExporting] = useState(false)
 
-  const handleExport = () => {
+  const handleExport = async () => {
     setExporting(true)
     
     try {
@@ -16,9 +16,18 @@ function DataExport({ onClose }) {
         end: dateRange.end
       } : null
       
-      const data = exportAllData(format, range)
-      const filename = `habit-tracker-export-${new Date().toISOString().split('T')[0]}`
-      downloadData(data, filename, format)
+      if (canExportToFile()) {
+        // Desktop mode: backend streams the export straight to disk
+        const result = await exportDataToFile(format, range)
+        if (!result.success) {
+          throw new Error(result.error || 'Export failed')
+        }
+        alert(`Data exported to ${result.path}`)
+      } else {
+        const data = exportAllData(format, range)
+        const filename = `habit-tracker-export-${new Date().toISOString().split('T')[0]}`
+        downloadData(data, filename, format)
+      }
       
       setTimeout(() => {
         setExporting(false)
@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { importData, validateImportData } from '../../utils/importUtils'
+import { importData, validateImportData, canImportToFile, importDataToFile } from '../../utils/importUtils'
 import './DataImport.css'
 
 function DataImport({ onClose, onSuccess }) {
@@ -29,6 +29,7 @@ function DataImport({ onClose, onSuccess }) {
         } else {
           setPreview({
             data: data,
+            text: text,
             warning: validation.warning
           })
         }
@@ -40,7 +41,7 @@ function DataImport({ onClose, onSuccess }) {
     reader.readAsText(selectedFile)
   }
 
-  const handleImport = () => {
+  const handleImport = async () => {
     if (!preview || !preview.data) {
       setError('Please select a valid file first')
       return
@@ -50,10 +51,14 @@ function DataImport({ onClose, onSuccess }) {
     setError(null)
 
     try {
-      const result = importData(preview.data, {
+      const options = {
         merge: importMode === 'merge',
         backup: true
-      })
+      }
+      // Desktop mode: let the backend merge and write the data file
+      const result = canImportToFile()
+        ? await importDataToFile(preview.text, options)
+        : importData(preview.data, options)
 
       setTimeout(() => {
         setImporting(false)
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react'
-import { generateMonthlyReview, saveReview } from '../../utils/reviewUtils'
+import { loadMonthlyReview, saveReview } from '../../utils/reviewUtils'
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
 import './MonthlyReview.css'
 
@@ -10,9 +10,13 @@ function MonthlyReview({ review: existingReview = null, onSave }) {
 
   useEffect(() => {
     if (!existingReview) {
-      const newReview = generateMonthlyReview()
-      setReview(newReview)
-      setReflection(newReview.reflection || '')
+      let cancelled = false
+      loadMonthlyReview().then(newReview => {
+        if (cancelled) return
+        setReview(newReview)
+        setReflection(newReview.reflection || '')
+      })
+      return () => { cancelled = true }
     }
   }, [existingReview])
 
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react'
-import { generateWeeklyReview, saveReview } from '../../utils/reviewUtils'
+import { loadWeeklyReview, saveReview } from '../../utils/reviewUtils'
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
 import './WeeklyReview.css'
 
@@ -10,9 +10,13 @@ function WeeklyReview({ review: existingReview = null, onSave }) {
 
   useEffect(() => {
     if (!existingReview) {
-      const newReview = generateWeeklyReview()
-      setReview(newReview)
-      setReflection(newReview.reflection || '')
+      let cancelled = false
+      loadWeeklyReview().then(newReview => {
+        if (cancelled) return
+        setReview(newReview)
+        setReflection(newReview.reflection || '')
+      })
+      return () => { cancelled = true }
     }
   }, [existingReview])
 
@@ -5,6 +5,7 @@
  * - Enable/disable auto-sync
  * - View/change file path
  * - Manually save/load data
+ * - Undo/redo saves and restore an earlier point (with auto-sync)
  * 
  * @module components/settings/StorageSettings
  * @component
@@ -18,7 +19,11 @@ import {
   saveAllDataToDesktop,
   loadAllDataFromDesktop,
   setAutoSyncEnabled,
-  isAutoSyncEnabled
+  isAutoSyncEnabled,
+  getEditHistory,
+  undoEdit,
+  redoEdit,
+  restoreEdit
 } from '../../utils/desktopStorage'
 import './StorageSettings.css'
 
@@ -29,12 +34,26 @@ function StorageSettings() {
   const [isLoading, setIsLoading] = useState(false)
   const [message, setMessage] = useState(null)
   const [isEelAvailable, setIsEelAvailable] = useState(false)
+  const [history, setHistory] = useState(null)
 
   useEffect(() => {
     checkEelAvailability()
     loadSettings()
   }, [])
 
+  // The edit history is kept by the backend for saves to the data file
+  useEffect(() => {
+    if (autoSync) {
+      loadHistory()
+    } else {
+      setHistory(null)
+    }
+  }, [autoSync])
+
+  const loadHistory = async () => {
+    setHistory(await getEditHistory(10))
+  }
+
   const checkEelAvailability = () => {
     const available = typeof window !== 'undefined' && window.eel
     setIsEelAvailable(available)
@@ -133,6 +152,22 @@ function StorageSettings() {
     }
   }
 
+  const handleHistoryAction = async (action, successText) => {
+    setIsLoading(true)
+    try {
+      const result = await action()
+      if (result.success) {
+        setMessage({ type: 'success', text: successText })
+        setTimeout(() => setMessage(null), 3000)
+      } else {
+        setMessage({ type: 'error', text: `❌ Error: ${result.error}` })
+      }
+    } finally {
+      await loadHistory()
+      setIsLoading(false)
+    }
+  }
+
   const handleFilePathChange = async (newPath) => {
     setFilePath(newPath)
     if (newPath) {
@@ -212,6 +247,58 @@ function StorageSettings() {
           </p>
         </div>
 
+        {history && (
+          <div className="setting-item">
+            <label className="setting-label">Edit History:</label>
+            <div className="file-path-actions">
+              <button
+                onClick={() => handleHistoryAction(undoEdit, '↩️ Last change undone')}
+                disabled={isLoading || !history.canUndo}
+                className="storage-btn save-btn"
+              >
+                Undo
+              </button>
+              <button
+                onClick={() => handleHistoryAction(redoEdit, '↪️ Change redone')}
+                disabled={isLoading || !history.canRedo}
+                className="storage-btn load-btn"
+              >
+                Redo
+              </button>
+            </div>
+            {history.entries.length > 0 && (
+              <ul className="history-list">
+                {history.entries.map(entry => (
+                  <li
+                    key={entry.id}
+                    className={`history-entry ${entry.id > history.cursor ? 'undone' : ''}`}
+                  >
+                    <span className="history-time">
+                      {new Date(entry.time).toLocaleString()}
+                    </span>
+                    <span className="history-sections">
+                      {Object.keys(entry.sections).join(', ')}
+                    </span>
+                    <button
+                      onClick={() => handleHistoryAction(
+                        () => restoreEdit(entry.id),
+                        '✅ Data restored to that point'
+                      )}
+                      disabled={isLoading || entry.id === history.cursor}
+                      className="history-restore-btn"
+                    >
+                      {entry.id === history.cursor ? 'Current' : 'Restore'}
+                    </button>
+                  </li>
+                ))}
+              </ul>
+            )}
+            <p className="setting-hint">
+              💡 Saves made this session can be undone, redone or restored to a point.
+            </p>
+          </div>
+        )}
+
         <div className="setting-info">
           <h3>How It Works</h3>
           <ul>
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react'
 import { getAllTodos, saveTodo, deleteTodo } from '../../utils/todoStorage'
-import { calculateNextOccurrence, getRecurrenceLabel } from '../../utils/recurrenceUtils'
+import { calculateNextOccurrence, getRecurrenceLabel, getPausedRecurringIds, setPausedRecurringIds, getDueOccurrences } from '../../utils/recurrenceUtils'
+import { useSyncChanges } from '../../hooks/useDataChanges'
 import ToDoForm from './ToDoForm'
 import './RecurrenceManager.css'
 
@@ -8,12 +9,30 @@ function RecurrenceManager({ onClose }) {
   const [recurringTodos, setRecurringTodos] = useState([])
   const [editingTodo, setEditingTodo] = useState(null)
   const [pausedTodos, setPausedTodos] = useState(new Set())
+  // Next due day per todo id from the backend's expanded window (null = compute locally)
+  const [nextDue, setNextDue] = useState(null)
+  const syncs = useSyncChanges()
 
   useEffect(() => {
     loadRecurringTodos()
     loadPausedState()
   }, [])
 
+  useEffect(() => {
+    let cancelled = false
+    setNextDue(null)
+    getDueOccurrences().then(occurrences => {
+      if (cancelled || !occurrences) return
+      // Occurrences come by date, so the first one per todo is its next
+      const next = {}
+      occurrences.forEach(occurrence => {
+        if (!(occurrence.id in next)) next[occurrence.id] = occurrence.date
+      })
+      setNextDue(next)
+    })
+    return () => { cancelled = true }
+  }, [recurringTodos, pausedTodos, syncs])
+
   const loadRecurringTodos = () => {
     const allTodos = getAllTodos()
     const recurring = allTodos.filter(t => 
@@ -23,18 +42,11 @@ function RecurrenceManager({ onClose }) {
   }
 
   const loadPausedState = () => {
-    try {
-      const paused = localStorage.getItem('paused-recurring-todos')
-      if (paused) {
-        setPausedTodos(new Set(JSON.parse(paused)))
-      }
-    } catch (error) {
-      console.error('Error loading paused state:', error)
-    }
+    setPausedTodos(new Set(getPausedRecurringIds()))
   }
 
   const savePausedState = (pausedSet) => {
-    localStorage.setItem('paused-recurring-todos', JSON.stringify([...pausedSet]))
+    setPausedRecurringIds(pausedSet)
   }
 
   const handlePause = (todoId) => {
@@ -66,6 +78,10 @@ function RecurrenceManager({ onClose }) {
 
   const getNextOccurrence = (todo) => {
     if (pausedTodos.has(todo.id)) return 'Paused'
+    if (nextDue && nextDue[todo.id]) {
+      const [year, month, day] = nextDue[todo.id].split('-').map(Number)
+      return new Date(year, month - 1, day).toLocaleDateString()
+    }
     const next = calculateNextOccurrence(todo)
     return next ? new Date(next).toLocaleDateString() : 'No more occurrences'
   }
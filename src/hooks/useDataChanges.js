@@ -0,0 +1,79 @@
+/**
+ * Custom React Hook for Changes From Other Windows
+ *
+ * In the desktop app every window keeps its own copy of the data in
+ * localStorage. When another window saves, the change is applied to this
+ * window's localStorage and DATA_CHANGED_EVENT is dispatched (see
+ * utils/desktopStorage). Components that hold data in state use this hook
+ * to reload it.
+ *
+ * @module hooks/useDataChanges
+ * @returns {number} Count of changes seen so far
+ */
+
+import { useState, useEffect, useRef } from 'react'
+import { DATA_CHANGED_EVENT, SYNC_STATE_EVENT } from '../utils/desktopStorage'
+
+/**
+ * Custom hook for reacting to data changed by other windows.
+ *
+ * @param {Array<string>} sections - Data sections to watch ('habits', 'todos', ...)
+ * @param {Function} [onChange] - Called with { section, storageKey, revision }
+ *   after a watched section changed
+ * @returns {number} Incremented on every change of a watched section (use
+ *   it as a dependency of memoized values)
+ *
+ * @example
+ * const moodChanges = useDataChanges(['mood'])
+ * const history = useMemo(() => getMoodHistory(start, end), [start, end, moodChanges])
+ *
+ * @example
+ * useDataChanges(['todos'], loadTodos)
+ */
+export const useDataChanges = (sections, onChange = null) => {
+  const [changes, setChanges] = useState(0)
+  const handler = useRef(onChange)
+  const watched = sections.join(',')
+
+  useEffect(() => {
+    handler.current = onChange
+  }, [onChange])
+
+  useEffect(() => {
+    const names = new Set(watched.split(','))
+    const handleChange = (event) => {
+      if (!names.has(event.detail.section)) return
+      setChanges(count => count + 1)
+      if (handler.current) handler.current(event.detail)
+    }
+    window.addEventListener(DATA_CHANGED_EVENT, handleChange)
+    return () => window.removeEventListener(DATA_CHANGED_EVENT, handleChange)
+  }, [watched])
+
+  return changes
+}
+
+/**
+ * Custom hook for reacting to local saves reaching the data file.
+ *
+ * Results computed by the desktop backend don't include saves that are
+ * still waiting to be synced; components fetching such results use this
+ * hook to fetch them again once the saves were written.
+ *
+ * @returns {number} Incremented whenever a save starts waiting or is written
+ *
+ * @example
+ * const syncs = useSyncChanges()
+ * useEffect(() => { getTimeSeries('mood', start, end).then(setSeries) }, [start, end, syncs])
+ */
+export const useSyncChanges = () => {
+  const [syncs, setSyncs] = useState(0)
+
+  useEffect(() => {
+    const handleSyncState = () => setSyncs(count => count + 1)
+    window.addEventListener(SYNC_STATE_EVENT, handleSyncState)
+    return () => window.removeEventListener(SYNC_STATE_EVENT, handleSyncState)
+  }, [])
+
+  return syncs
+}
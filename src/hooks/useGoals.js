@@ -10,6 +10,7 @@
 
 import { useState, useEffect, useCallback } from 'react'
 import { getAllGoals, saveGoal, deleteGoal } from '../utils/goalStorage'
+import { useDataChanges } from './useDataChanges'
 
 /**
  * Custom hook for managing goals.
@@ -60,6 +61,11 @@ export const useGoals = () => {
     loadGoals()
   }, [loadGoals])
 
+  /**
+   * Reload when another window saves goals.
+   */
+  useDataChanges(['goals'], loadGoals)
+
   /**
    * Save a goal (create new or update existing).
    * 
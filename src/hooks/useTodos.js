@@ -18,9 +18,12 @@ import {
   deleteTodo, 
   toggleTodoComplete, 
   getTodosByPriority, 
-  getOverdueTodos 
+  getOverdueTodos,
+  queryTodos
 } from '../utils/todoStorage'
+import { SYNC_STATE_EVENT } from '../utils/desktopStorage'
 import { generateRecurringTodo, shouldGenerateNext } from '../utils/recurrenceUtils'
+import { useDataChanges } from './useDataChanges'
 
 /**
  * Custom hook for managing todos.
@@ -65,6 +68,10 @@ export const useTodos = () => {
   const [showForm, setShowForm] = useState(false)
   const [editingTodo, setEditingTodo] = useState(null)
   const [filter, setFilter] = useState('all') // 'all', 'active', 'completed'
+  // Sorted and overdue lists from the desktop backend (null = compute locally)
+  const [indexed, setIndexed] = useState(null)
+  // Bumped when a local save reaches the data file, so the lists are queried again
+  const [syncVersion, setSyncVersion] = useState(0)
 
   /**
    * Load all todos from storage and update state.
@@ -132,6 +139,38 @@ export const useTodos = () => {
     checkRecurringTodos()
   }, [loadTodos, checkRecurringTodos])
 
+  /**
+   * Reload when another window saves todos.
+   */
+  useDataChanges(['todos'], loadTodos)
+
+  /**
+   * Query the backend again once local saves are written to the data file.
+   */
+  useEffect(() => {
+    const handleSyncState = () => setSyncVersion(version => version + 1)
+    window.addEventListener(SYNC_STATE_EVENT, handleSyncState)
+    return () => window.removeEventListener(SYNC_STATE_EVENT, handleSyncState)
+  }, [])
+
+  /**
+   * Fetch the filtered list and the overdue todos from the backend's todo
+   * indexes instead of filtering and sorting every todo. The queries
+   * return null while the backend doesn't match localStorage.
+   */
+  useEffect(() => {
+    let cancelled = false
+    setIndexed(null)
+    Promise.all([
+      queryTodos({ status: filter, limit: null }),
+      queryTodos({ overdue: true, limit: null })
+    ]).then(([page, overdue]) => {
+      if (cancelled) return
+      setIndexed(page && overdue ? { filter, todos: page.todos, overdue: overdue.todos } : null)
+    })
+    return () => { cancelled = true }
+  }, [todos, filter, syncVersion])
+
   /**
    * Check for recurring todos whenever the todos list changes.
    */
@@ -231,9 +270,13 @@ export const useTodos = () => {
   /**
    * Get filtered and sorted todos based on current filter.
    * 
+   * Uses the backend's list when it was queried for the current todos.
+   * 
    * @returns {Array} Filtered and sorted todos
    */
   const getFilteredTodos = useCallback(() => {
+    if (indexed && indexed.filter === filter) return indexed.todos
+
     let filtered = todos
     
     if (filter === 'active') {
@@ -243,7 +286,7 @@ export const useTodos = () => {
     }
     
     return getTodosByPriority(filtered)
-  }, [todos, filter])
+  }, [todos, filter, indexed])
 
   /**
    * Get overdue todos.
@@ -251,8 +294,9 @@ export const useTodos = () => {
    * @returns {Array} Array of overdue todos
    */
   const getOverdueList = useCallback(() => {
+    if (indexed) return indexed.overdue
     return getOverdueTodos(todos)
-  }, [todos])
+  }, [todos, indexed])
 
   return {
     // State
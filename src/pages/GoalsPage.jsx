@@ -1,6 +1,8 @@
+import { useState, useEffect } from 'react'
 import GoalItem from '../components/goals/GoalItem'
 import GoalForm from '../components/goals/GoalForm'
 import { useGoals } from '../hooks/useGoals'
+import { getGoalProgress } from '../utils/goalStorage'
 import './GoalsPage.css'
 
 /**
@@ -22,7 +24,28 @@ function GoalsPage() {
     handleEdit: handleGoalEdit,
     handleNew: handleNewGoal,
     closeForm,
+    loadGoals,
   } = useGoals()
+  const [goalProgress, setGoalProgress] = useState(null)
+
+  // One bulk request for every goal's progress, refreshed while the page
+  // is open (null outside the desktop app - items compute it themselves)
+  useEffect(() => {
+    let cancelled = false
+    const loadProgress = () => {
+      getGoalProgress().then(result => {
+        if (!cancelled) setGoalProgress(result)
+      })
+    }
+
+    loadProgress()
+    const interval = setInterval(loadProgress, 2000)
+
+    return () => {
+      cancelled = true
+      clearInterval(interval)
+    }
+  }, [goals])
 
   return (
     <>
@@ -55,6 +78,7 @@ function GoalsPage() {
             <GoalItem
               key={goal.id}
               goal={goal}
+              summary={goalProgress?.[goal.id]}
               onUpdate={loadGoals}
               onEdit={handleGoalEdit}
               onDelete={handleGoalDelete}
@@ -13,6 +13,7 @@ import {
   deleteHabitTemplate, 
   initializeDefaultHabits 
 } from '../utils/habitStorage'
+import { useDataChanges } from '../hooks/useDataChanges'
 import '../App.css'
 
 /**
@@ -140,6 +141,19 @@ function HabitsPage() {
     }
   }
 
+  // Today's habits or weight saved by another window. Only reloaded when
+  // they differ from what is shown: reloading saves the day again, which
+  // would otherwise bounce the change back and forth between windows.
+  useDataChanges(['habits'], () => {
+    const savedData = getDayData(getTodayKey())
+    if (!savedData) return
+    const completion = (list) => (list || []).map(h => `${h.id}:${!!h.completed}`).join(',')
+    const savedWeight = savedData.weight === undefined ? null : savedData.weight
+    if (completion(savedData.habits) === completion(habits) && savedWeight === weight) return
+    reloadHabits()
+    setWeight(savedWeight)
+  })
+
   const handleWeightChange = (newWeight) => {
     setWeight(newWeight)
     const todayKey = getTodayKey()
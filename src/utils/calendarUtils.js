@@ -74,6 +74,67 @@ const getHabitCompletionForDate = (dateKey, habitId, allData) => {
   return habit && habit.completed ? 1 : 0
 }
 
+/**
+ * Slot of a date in a yearly heatmap tile (see get_heatmap_year in
+ * start.py): its day of year in a leap year, minus one.
+ */
+const tileSlot = (month, day) => {
+  return Math.round((Date.UTC(2000, month, day) - Date.UTC(2000, 0, 1)) / 86400000)
+}
+
+/**
+ * Fetch the heatmap tile of a whole year from the desktop backend.
+ * One call covers every month of the year.
+ *
+ * The tile is built from the data file, so it is only used with auto-sync
+ * on and when every local save has been written to the file.
+ *
+ * @param {number} year - Calendar year
+ * @returns {Promise<Object|null>} Tile, or null when the local data must
+ *   be used instead
+ */
+export const getHeatmapTile = async (year) => {
+  if (typeof window === 'undefined' || !window.eel) return null
+  try {
+    const { isAutoSyncEnabled, hasUnsyncedChanges } = await import('./desktopStorage')
+    if (!isAutoSyncEnabled() || hasUnsyncedChanges()) return null
+    const tile = await window.eel.get_heatmap_year(year)()
+    return tile && tile.success ? tile : null
+  } catch (error) {
+    console.error('Error loading heatmap tile:', error)
+    return null
+  }
+}
+
+/**
+ * Same result as getHeatmapData, read from a yearly tile instead of
+ * looking up every day in the stored data.
+ *
+ * @param {Object} tile - Tile from getHeatmapTile for this year
+ * @param {number} year - Calendar year
+ * @param {number} month - Month (0-11)
+ * @param {string|number|null} habitId - Only this habit's completion
+ * @returns {Array} Heatmap cells (null for padding)
+ */
+export const getHeatmapDataFromTile = (tile, year, month, habitId = null) => {
+  const habitFlags = habitId
+    ? tile.habits[String(habitId)] || null
+    : undefined
+
+  return getCalendarDays(year, month).map(day => {
+    if (!day) return null
+    const slot = tileSlot(month, day.day)
+    const intensity = habitFlags === undefined
+      ? tile.overall[slot]
+      : (habitFlags ? habitFlags[slot] : 0)
+    return {
+      ...day,
+      intensity,
+      completed: intensity > 0
+    }
+  })
+}
+
 export const getIntensityColor = (intensity) => {
   if (intensity === 0) return '#ebedf0' // gray
   if (intensity < 0.25) return '#c6e48b' // light green
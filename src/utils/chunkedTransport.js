@@ -0,0 +1,160 @@
+/**
+ * Chunked Transport Utilities
+ *
+ * Receives large backend results in compressed chunks instead of one huge
+ * websocket message (see backend/chunked_transport.py). It handles:
+ * - Calling an endpoint through call_chunked()
+ * - Fetching the chunks in sequence order
+ * - Decompressing them as they arrive (DecompressionStream)
+ * - Parsing the result one small part at a time, yielding to the UI
+ *   between chunks
+ *
+ * Small results come back unchanged, so callers can treat callChunked()
+ * like a direct call to the endpoint.
+ *
+ * @module utils/chunkedTransport
+ */
+
+/**
+ * True when the browser can inflate deflate streams itself.
+ * Without it the backend sends the chunks uncompressed.
+ */
+const canDecompress = () => typeof DecompressionStream !== 'undefined'
+
+/**
+ * Decode a base64 chunk into bytes.
+ *
+ * @param {string} data - Base64 text
+ * @returns {Uint8Array} Chunk bytes
+ */
+const decodeChunk = (data) => {
+  const binary = atob(data)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i)
+  }
+  return bytes
+}
+
+/**
+ * Builds the result from parts of the form [path, op, value]:
+ * - "set": put value at path
+ * - "merge": add value's keys to the object at path
+ * - "extend": append value's items to the array at path
+ */
+class PartAssembler {
+  constructor() {
+    this.root = undefined
+  }
+
+  apply([path, op, value]) {
+    if (path.length === 0) {
+      if (op === 'set') {
+        this.root = value
+      } else {
+        this.combine(this.root, op, value)
+      }
+      return
+    }
+    let parent = this.root
+    for (let i = 0; i < path.length - 1; i++) {
+      parent = parent[path[i]]
+    }
+    const key = path[path.length - 1]
+    if (op === 'set') {
+      parent[key] = value
+    } else {
+      this.combine(parent[key], op, value)
+    }
+  }
+
+  combine(target, op, value) {
+    if (op === 'merge') {
+      Object.assign(target, value)
+    } else if (op === 'extend') {
+      for (const item of value) {
+        target.push(item)
+      }
+    } else {
+      throw new Error(`Unknown chunk part operation: ${op}`)
+    }
+  }
+}
+
+/**
+ * Stream of a transfer's chunk bytes, fetched one chunk per pull.
+ *
+ * @param {Object} header - Transfer header from call_chunked()
+ * @returns {ReadableStream<Uint8Array>} Chunk bytes in sequence order
+ */
+const chunkStream = (header) => {
+  let seq = 0
+  return new ReadableStream({
+    async pull(controller) {
+      const chunk = await window.eel.fetch_chunk(header.transferId, seq)()
+      if (!chunk.success || chunk.seq !== seq) {
+        throw new Error(chunk.error || `Chunk ${seq} of ${header.transferId} arrived out of order`)
+      }
+      controller.enqueue(decodeChunk(chunk.data))
+      seq += 1
+      if (chunk.last || seq >= header.chunks) {
+        controller.close()
+      }
+    },
+    cancel() {
+      window.eel.cancel_transfer(header.transferId)()
+    }
+  })
+}
+
+/**
+ * Fetch, decompress and parse a chunked transfer.
+ *
+ * @param {Object} header - Transfer header from call_chunked()
+ * @returns {Promise<*>} The endpoint's result
+ */
+const receiveTransfer = async (header) => {
+  let stream = chunkStream(header)
+  if (header.encoding === 'deflate') {
+    stream = stream.pipeThrough(new DecompressionStream('deflate'))
+  }
+  const reader = stream.pipeThrough(new TextDecoderStream()).getReader()
+
+  const assembler = new PartAssembler()
+  let buffered = ''
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffered += value
+    // Parse every complete part; keep the unfinished last line
+    const lines = buffered.split('\n')
+    buffered = lines.pop()
+    for (const line of lines) {
+      if (line) assembler.apply(JSON.parse(line))
+    }
+  }
+  if (buffered) {
+    assembler.apply(JSON.parse(buffered))
+  }
+  return assembler.root
+}
+
+/**
+ * Call a backend endpoint, receiving a large result in chunks.
+ *
+ * Only endpoints listed in CHUNKABLE_FUNCTIONS (start.py) can be used.
+ *
+ * @param {string} functionName - Endpoint name, e.g. 'load_all_data_from_file'
+ * @param {Array} args - Positional arguments for the endpoint
+ * @returns {Promise<*>} The endpoint's result
+ *
+ * @example
+ * const result = await callChunked('load_journal_files', [journalsDir])
+ */
+export const callChunked = async (functionName, args = []) => {
+  const response = await window.eel.call_chunked(functionName, args, canDecompress())()
+  if (!response || response.chunked !== true) {
+    return response
+  }
+  return receiveTransfer(response)
+}
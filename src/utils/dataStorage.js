@@ -26,6 +26,7 @@
  */
 import { STORAGE_KEY_HABIT_DATA } from '../constants/storageKeys'
 import { TIMING } from '../constants/config'
+import { DATA_CHANGED_EVENT, isAutoSyncEnabled, hasUnsyncedChanges } from './desktopStorage'
 
 // Use CACHE_TTL from config
 const CACHE_TTL = TIMING.CACHE_TTL
@@ -129,6 +130,16 @@ export const clearDataCache = () => {
   cacheTimestamp = null
 }
 
+// Another window's habit changes are written to localStorage directly
+// (see applySectionChange in desktopStorage), behind the cache's back
+if (typeof window !== 'undefined') {
+  window.addEventListener(DATA_CHANGED_EVENT, (event) => {
+    if (event.detail.storageKey === STORAGE_KEY) {
+      clearDataCache()
+    }
+  })
+}
+
 // ============================================================================
 // DATA WRITE OPERATIONS
 // ============================================================================
@@ -479,3 +490,53 @@ export const getAverageWeight = (dataArray) => {
   const sum = weights.reduce((acc, weight) => acc + weight, 0)
   return sum / weights.length
 }
+
+// ============================================================================
+// DESKTOP TIME SERIES
+// ============================================================================
+
+/**
+ * Points per chart requested from the backend (roughly a chart's width in
+ * pixels - more points than that can't be drawn anyway).
+ */
+export const CHART_POINTS = 600
+
+/**
+ * Fetch weight or mood chart data from the desktop backend.
+ * 
+ * The backend keeps prefix sums per series, so the average of any range
+ * is computed without visiting its days, and long ranges are downsampled
+ * to `width` points (see get_time_series in start.py). The series are
+ * built from the data file, so they are only used with auto-sync on and
+ * when every local save has been written to the file.
+ * 
+ * @param {string} series - 'weight' or 'mood'
+ * @param {string} startDate - First day (date key, inclusive)
+ * @param {string} endDate - Last day (date key, inclusive)
+ * @param {number} [width=CHART_POINTS] - Most points to return
+ * @returns {Promise<Object|null>} { points: [{ date: Date, value }], count,
+ *   average, min, max }, or null when the local data must be used instead
+ * 
+ * @example
+ * const series = await getTimeSeries('weight', weekStart.toDateString(), getTodayKey())
+ * const average = series ? series.average : getAverageWeight(getWeekData())
+ */
+export const getTimeSeries = async (series, startDate, endDate, width = CHART_POINTS) => {
+  if (typeof window === 'undefined' || !window.eel) return null
+  if (!isAutoSyncEnabled() || hasUnsyncedChanges()) return null
+  try {
+    const result = await window.eel.get_time_series(series, startDate, endDate, width)()
+    if (!result || !result.success) return null
+    return {
+      ...result,
+      // "YYYY-MM-DD" days, read as local dates like the date keys
+      points: result.points.map(([day, value]) => {
+        const [year, month, date] = day.split('-').map(Number)
+        return { date: new Date(year, month - 1, date), value }
+      })
+    }
+  } catch (error) {
+    console.error('Error loading time series:', error)
+    return null
+  }
+}
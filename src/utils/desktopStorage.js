@@ -11,6 +11,8 @@
  * @module utils/desktopStorage
  */
 
+import { callChunked } from './chunkedTransport'
+
 /**
  * Storage keys - read directly from localStorage to avoid circular dependencies.
  * Storage modules import this module for auto-sync, so we can't import from them.
@@ -26,11 +28,81 @@ const STORAGE_KEYS = {
   STREAKS: 'habit-tracker-streaks'
 }
 
+/**
+ * Data file section name -> storage key.
+ * Must stay in sync with SECTION_STORAGE_KEYS in backend/data_store.py.
+ */
+const SECTION_STORAGE_KEYS = {
+  habits: STORAGE_KEYS.HABITS,
+  todos: STORAGE_KEYS.TODOS,
+  goals: STORAGE_KEYS.GOALS,
+  goalSteps: STORAGE_KEYS.GOAL_STEPS,
+  mood: STORAGE_KEYS.MOOD,
+  journals: STORAGE_KEYS.JOURNALS,
+  reminders: STORAGE_KEYS.REMINDERS,
+  streaks: STORAGE_KEYS.STREAKS
+}
+
+/**
+ * Sections keyed by date, of which only the recent days are loaded at startup.
+ */
+const DAY_SECTIONS = ['habits', 'mood', 'journals']
+
 // Check if Eel is available (only in desktop app mode)
 const isEelAvailable = () => {
   return typeof window !== 'undefined' && window.eel
 }
 
+/**
+ * Random id for this window.
+ * Sent with every save so the backend can tell the other windows which
+ * window made the change (and so this window can ignore its own changes).
+ */
+const CLIENT_ID = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 8)}`
+
+/**
+ * Event dispatched on window after another window's change was applied.
+ * event.detail = { section, storageKey, revision }
+ */
+export const DATA_CHANGED_EVENT = 'desktop-data-changed'
+
+/**
+ * Event dispatched on window when a local save is waiting to be written
+ * to the data file, and again once it was written.
+ * event.detail = { pending }
+ */
+export const SYNC_STATE_EVENT = 'desktop-sync-state'
+
+/**
+ * Last applied revision per section (from change notifications and this
+ * window's own saves).
+ */
+const sectionRevisions = {}
+
+/**
+ * Record the revisions a section reached through this window's own save.
+ * localStorage already holds what was saved, so the next notification of
+ * another window applies as a delta on top of it.
+ * 
+ * @param {Object} revisions - { section: revision }
+ */
+const recordOwnRevisions = (revisions) => {
+  Object.entries(revisions || {}).forEach(([section, revision]) => {
+    sectionRevisions[section] = Math.max(sectionRevisions[section] || 0, revision)
+  })
+}
+
+/**
+ * Time of the oldest local save not written to the data file yet (0 = none).
+ */
+let unsyncedSince = 0
+
+const dispatchSyncState = () => {
+  window.dispatchEvent(new CustomEvent(SYNC_STATE_EVENT, {
+    detail: { pending: unsyncedSince !== 0 }
+  }))
+}
+
 /**
  * Get the desktop path.
  * 
@@ -160,14 +232,21 @@ export const saveAllDataToDesktop = async (filePath = null) => {
     }
     
     // Export all data
+    const exportedAt = Date.now()
     const allData = exportAllData()
     
     // Save to file
-    const result = await window.eel.save_all_data_to_file(dataFilePath, JSON.stringify(allData))()
+    const result = await window.eel.save_all_data_to_file(dataFilePath, JSON.stringify(allData), CLIENT_ID)()
     
     if (result.success) {
+      recordOwnRevisions(result.revisions)
       // Save the file path for future use
       await setDataFilePath(dataFilePath)
+      // Local saves made while this one was in flight are still pending
+      if (unsyncedSince !== 0 && unsyncedSince <= exportedAt) {
+        unsyncedSince = 0
+        dispatchSyncState()
+      }
     }
     
     return result
@@ -199,7 +278,8 @@ export const loadAllDataFromDesktop = async (filePath = null) => {
     }
     
     // Load from file
-    const result = await window.eel.load_all_data_from_file(dataFilePath)()
+    // Large files arrive in compressed chunks (see chunkedTransport.js)
+    const result = await callChunked('load_all_data_from_file', [dataFilePath])
     
     if (!result.success) {
       return result
@@ -215,6 +295,78 @@ export const loadAllDataFromDesktop = async (filePath = null) => {
   }
 }
 
+/**
+ * Replace the days from `since` on in a date-keyed section.
+ * 
+ * @param {Object} records - Section from localStorage
+ * @param {Object} recent - The section's days from `since` on, from the data file
+ * @param {Date} since - First day loaded
+ * @returns {Object} Merged section (older days and non-date keys are kept)
+ */
+const mergeRecentDays = (records, recent, since) => {
+  const merged = {}
+  Object.entries(records).forEach(([key, record]) => {
+    const day = new Date(key)
+    if (isNaN(day) || day < since) {
+      merged[key] = record
+    }
+  })
+  return Object.assign(merged, recent)
+}
+
+/**
+ * Load the recent data from the desktop file at startup.
+ * 
+ * Only the recent days of habits, mood and journals are read - from the
+ * data file's binary snapshot when the backend has one - plus the other
+ * sections whole, so this stays fast however long the history is. Older
+ * days already in localStorage are kept.
+ * 
+ * Skipped unless auto-sync is on (the data file is then the shared copy)
+ * and this window has no saves waiting to be synced.
+ * 
+ * @returns {Promise<Object>} { success, since, sections } - since is the
+ *   first day loaded ("YYYY-MM-DD"), sections the names that changed
+ */
+export const loadRecentDataFromDesktop = async () => {
+  if (!isEelAvailable() || !isAutoSyncEnabled() || hasUnsyncedChanges()) {
+    return { success: false, sections: [] }
+  }
+  
+  try {
+    const result = await callChunked('load_recent_data')
+    if (!result.success) {
+      return { success: false, error: result.error, sections: [] }
+    }
+    
+    const since = new Date(`${result.since}T00:00:00`)
+    const changed = []
+    Object.entries(result.data).forEach(([section, value]) => {
+      const storageKey = SECTION_STORAGE_KEYS[section]
+      if (!storageKey || value === null || value === undefined) {
+        return
+      }
+      const current = localStorage.getItem(storageKey)
+      const next = DAY_SECTIONS.includes(section)
+        ? JSON.stringify(mergeRecentDays(JSON.parse(current || '{}'), value, since))
+        : JSON.stringify(value)
+      if (next === current) {
+        return
+      }
+      localStorage.setItem(storageKey, next)
+      changed.push(section)
+      window.dispatchEvent(new CustomEvent(DATA_CHANGED_EVENT, {
+        detail: { section, storageKey, revision: sectionRevisions[section] || 0 }
+      }))
+    })
+    
+    return { success: true, since: result.since, sections: changed }
+  } catch (error) {
+    console.error('Error loading recent data from desktop:', error)
+    return { success: false, error: error.message, sections: [] }
+  }
+}
+
 /**
  * Import data into localStorage from desktop file data.
  * 
@@ -257,6 +409,155 @@ const importAllData = (data) => {
   // We just need to ensure localStorage is updated
 }
 
+// ============================================================================
+// CHANGE NOTIFICATIONS FROM OTHER WINDOWS
+// ============================================================================
+
+/**
+ * Apply an inline delta to a section stored in localStorage.
+ * 
+ * Dict sections (keyed by date) get { upserts: {key: record}, removals: [key] }.
+ * List sections (todos, goals, ...) get { upserts: [record], removals: [id] }
+ * and are merged by item id.
+ * 
+ * @param {string} storageKey - localStorage key of the section
+ * @param {Object} delta - Delta from the change notification
+ */
+const applyDelta = (storageKey, delta) => {
+  const { upserts, removals } = delta
+  
+  if (Array.isArray(upserts)) {
+    const removed = new Set(removals.map(String))
+    const items = JSON.parse(localStorage.getItem(storageKey) || '[]')
+      .filter(item => !removed.has(String(item.id)))
+    const byId = new Map(items.map((item, index) => [String(item.id), index]))
+    upserts.forEach(record => {
+      const index = byId.get(String(record.id))
+      if (index !== undefined) {
+        items[index] = record
+      } else {
+        items.push(record)
+      }
+    })
+    localStorage.setItem(storageKey, JSON.stringify(items))
+    return
+  }
+  
+  const records = JSON.parse(localStorage.getItem(storageKey) || '{}')
+  removals.forEach(key => { delete records[key] })
+  Object.assign(records, upserts)
+  localStorage.setItem(storageKey, JSON.stringify(records))
+}
+
+/**
+ * Apply one section change from another window.
+ * 
+ * Uses the inline delta when it follows the last applied revision,
+ * otherwise (no delta, or a notification was missed) fetches just that
+ * section from the backend.
+ * 
+ * @param {Object} change - { section, storageKey, revision, delta }
+ * @returns {Promise<void>}
+ */
+const applySectionChange = async (change) => {
+  const { section, storageKey, revision, delta } = change
+  const last = sectionRevisions[section] || 0
+  
+  // Skip stale or duplicate notifications
+  if (last >= revision) {
+    return
+  }
+  
+  if (delta && revision === last + 1) {
+    applyDelta(storageKey, delta)
+  } else {
+    // A delta only applies on top of the revision before it
+    const result = await window.eel.get_section(section)()
+    if (!result.success) {
+      return
+    }
+    if ((sectionRevisions[section] || 0) >= result.revision) {
+      return
+    }
+    localStorage.setItem(result.storageKey, JSON.stringify(result.value))
+    sectionRevisions[section] = result.revision
+    window.dispatchEvent(new CustomEvent(DATA_CHANGED_EVENT, {
+      detail: { section, storageKey: result.storageKey, revision: result.revision }
+    }))
+    return
+  }
+  
+  sectionRevisions[section] = revision
+  window.dispatchEvent(new CustomEvent(DATA_CHANGED_EVENT, {
+    detail: { section, storageKey, revision }
+  }))
+}
+
+/**
+ * Handler called by the backend when any window saves.
+ * Exposed to Python as 'on_data_changed'.
+ * 
+ * @param {Object} payload - { origin, changes: [...] }
+ */
+const onDataChanged = (payload) => {
+  if (!payload) {
+    return
+  }
+  if (payload.origin === CLIENT_ID) {
+    // Already in localStorage - only the revisions move on
+    recordOwnRevisions(Object.fromEntries(
+      payload.changes.map(change => [change.section, change.revision])))
+    return
+  }
+  payload.changes.forEach(change => {
+    applySectionChange(change).catch(error => {
+      console.warn(`Failed to apply change to ${change.section}:`, error)
+    })
+  })
+}
+
+/**
+ * Called by the backend when the app is launched again while this window
+ * is open. Every window receives the call; the one it names focuses.
+ * 
+ * @param {Object} payload - { client }
+ */
+const onFocusRequested = ({ client }) => {
+  if (client === CLIENT_ID) {
+    window.focus()
+  }
+}
+
+/**
+ * Start receiving change notifications from other windows.
+ * Call once on app startup.
+ * 
+ * @returns {Promise<boolean>} True if the window was registered
+ */
+export const startChangeListener = async () => {
+  if (!isEelAvailable()) {
+    return false
+  }
+  
+  try {
+    window.eel.expose(onDataChanged, 'on_data_changed')
+    window.eel.expose(onFocusRequested, 'on_focus_requested')
+    const result = await window.eel.register_client(CLIENT_ID)()
+    if (!result.success) {
+      return false
+    }
+    Object.assign(sectionRevisions, result.revisions)
+    
+    window.addEventListener('beforeunload', () => {
+      window.eel.unregister_client(CLIENT_ID)
+    })
+    return true
+  } catch (error) {
+    console.warn('Could not register for change notifications:', error)
+    return false
+  }
+}
+
 /**
  * Auto-sync: Save to desktop file whenever data changes.
  * Call this after any save operation.
@@ -270,6 +571,12 @@ export const autoSyncToDesktop = async () => {
     return
   }
   
+  // The data file is behind localStorage until the next save succeeds
+  if (unsyncedSince === 0) {
+    unsyncedSince = Date.now()
+    dispatchSyncState()
+  }
+  
   // Debounce: Only sync every 2 seconds max
   const lastSync = localStorage.getItem('desktop-last-sync-time')
   const now = Date.now()
@@ -307,3 +614,98 @@ export const isAutoSyncEnabled = () => {
   return localStorage.getItem('desktop-auto-sync-enabled') === 'true'
 }
 
+/**
+ * Check if this window saved data that isn't in the data file yet.
+ * Results computed by the backend don't include those saves.
+ * 
+ * @returns {boolean} True if a local save is waiting to be synced
+ */
+export const hasUnsyncedChanges = () => {
+  return unsyncedSince !== 0
+}
+
+/**
+ * Get the random id of this window.
+ * The backend names a window with it when only one window should act on
+ * a message (e.g. a due reminder).
+ * 
+ * @returns {string} This window's client id
+ */
+export const getClientId = () => {
+  return CLIENT_ID
+}
+
+
+/**
+ * Get the newest entries of the backend's undo/redo history.
+ * 
+ * @param {number} limit - Most entries to return
+ * @returns {Promise<Object|null>} { entries, cursor, oldest, canUndo, canRedo },
+ *   or null outside the desktop app
+ */
+export const getEditHistory = async (limit = 50) => {
+  if (!isEelAvailable()) {
+    return null
+  }
+  
+  try {
+    const result = await window.eel.get_edit_history(limit)()
+    return result.success ? result : null
+  } catch (error) {
+    console.error('Error loading edit history:', error)
+    return null
+  }
+}
+
+/**
+ * Call one of the history endpoints that change data.
+ * 
+ * The restored sections reach localStorage through the on_data_changed
+ * notification every window receives (see startChangeListener). Local
+ * saves that auto-sync hasn't written yet are saved first, so they are
+ * part of the history instead of being replaced by the restored sections.
+ * 
+ * @param {string} name - Endpoint name
+ * @param {Array} args - Endpoint arguments
+ * @returns {Promise<Object>} { success, sections, error }
+ */
+const callHistory = async (name, args = []) => {
+  if (!isEelAvailable()) {
+    return { success: false, error: 'Desktop storage not available' }
+  }
+  
+  try {
+    if (hasUnsyncedChanges()) {
+      const saved = await saveAllDataToDesktop()
+      if (!saved.success) {
+        return { success: false, error: `Could not save latest changes first: ${saved.error}` }
+      }
+    }
+    return await window.eel[name](...args)()
+  } catch (error) {
+    console.error(`Error calling ${name}:`, error)
+    return { success: false, error: error.message }
+  }
+}
+
+/**
+ * Undo the latest save.
+ * 
+ * @returns {Promise<Object>} { success, sections, error }
+ */
+export const undoEdit = () => callHistory('undo_edit')
+
+/**
+ * Redo the latest undone save.
+ * 
+ * @returns {Promise<Object>} { success, sections, error }
+ */
+export const redoEdit = () => callHistory('redo_edit')
+
+/**
+ * Move the data to a point in the edit history.
+ * 
+ * @param {number} entryId - History entry id (from getEditHistory)
+ * @returns {Promise<Object>} { success, sections, error }
+ */
+export const restoreEdit = (entryId) => callHistory('restore_edit', [entryId])
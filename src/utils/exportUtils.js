@@ -3,6 +3,7 @@
 import { getAllStoredData, getAllDates } from './dataStorage'
 import { getAllTodos } from './todoStorage'
 import { getAllGoals, getAllGoalSteps } from './goalStorage'
+import { isAutoSyncEnabled, hasUnsyncedChanges, saveAllDataToDesktop } from './desktopStorage'
 
 const EXPORT_VERSION = '1.0.0'
 
@@ -129,3 +130,36 @@ export const downloadData = (data, filename, format = 'json') => {
   URL.revokeObjectURL(url)
 }
 
+/**
+ * Whether exports can be streamed to disk by the Python backend.
+ * 
+ * Requires desktop mode and auto-sync, so the backend's copy of the
+ * data is current.
+ * 
+ * @returns {boolean}
+ */
+export const canExportToFile = () => {
+  return typeof window !== 'undefined' && !!window.eel && isAutoSyncEnabled()
+}
+
+/**
+ * Export data straight to a file through the Python backend.
+ * 
+ * The backend streams the export row by row, so large exports never
+ * exist as one string in the browser. It exports its copy of the data
+ * file, so local saves auto-sync hasn't written yet (it skips saves
+ * within 2 seconds of the last one) are written first.
+ * 
+ * @param {string} format - 'json' or 'csv'
+ * @param {Object|null} dateRange - Optional { start, end } (YYYY-MM-DD)
+ * @returns {Promise<Object>} { success, path, counts, bytes, seconds } or { success: false, error }
+ */
+export const exportDataToFile = async (format = 'json', dateRange = null) => {
+  if (hasUnsyncedChanges()) {
+    const saved = await saveAllDataToDesktop()
+    if (!saved.success) {
+      return { success: false, error: `Could not save latest changes before exporting: ${saved.error}` }
+    }
+  }
+  return window.eel.export_data_to_file(null, format, dateRange)()
+}
@@ -47,6 +47,13 @@ export const deleteGoal = (goalId) => {
   // Also delete all steps for this goal
   const steps = getAllGoalSteps().filter(s => s.goalId !== goalId)
   localStorage.setItem(GOAL_STEPS_STORAGE_KEY, JSON.stringify(steps))
+  
+  // Auto-sync to desktop file if enabled (background, non-blocking)
+  if (typeof window !== 'undefined' && window.eel) {
+    import('./desktopStorage').then(module => {
+      module.autoSyncToDesktop().catch(() => {})
+    }).catch(() => {})
+  }
 }
 
 export const getAllGoalSteps = () => {
@@ -89,6 +96,13 @@ export const saveGoalStep = (step) => {
 export const deleteGoalStep = (stepId) => {
   const steps = getAllGoalSteps().filter(s => s.id !== stepId)
   localStorage.setItem(GOAL_STEPS_STORAGE_KEY, JSON.stringify(steps))
+  
+  // Auto-sync to desktop file if enabled (background, non-blocking)
+  if (typeof window !== 'undefined' && window.eel) {
+    import('./desktopStorage').then(module => {
+      module.autoSyncToDesktop().catch(() => {})
+    }).catch(() => {})
+  }
 }
 
 export const completeStep = (stepId, dateKey = null) => {
@@ -205,15 +219,21 @@ export const isStepCompleted = (step, dateKey = null) => {
  * Get completed todos count for a goal.
  * 
  * This function dynamically imports todoStorage to avoid circular dependencies.
- * It counts how many todos linked to this goal have been completed.
+ * It counts how many todos linked to this goal have been completed, using
+ * the desktop backend's counts when they match localStorage (auto-sync on,
+ * nothing left to sync) and counting locally otherwise.
  * 
  * @param {string} goalId - ID of the goal
- * @returns {number} Count of completed todos linked to this goal
+ * @returns {Promise<number>} Count of completed todos linked to this goal
  */
 export const getGoalCompletedTodosCount = async (goalId) => {
   try {
     // Dynamic import to avoid circular dependency
-    const { getCompletedTodosCountForGoal } = await import('./todoStorage')
+    const { getCompletedTodosCountForGoal, getTodoCounts } = await import('./todoStorage')
+    const counts = await getTodoCounts()
+    if (counts) {
+      return counts.byGoal[goalId]?.completed || 0
+    }
     return getCompletedTodosCountForGoal(goalId)
   } catch (error) {
     // Fallback: return stored count from goal object
@@ -230,7 +250,7 @@ export const getGoalCompletedTodosCount = async (goalId) => {
  * to ensure accuracy.
  * 
  * @param {string} goalId - ID of the goal
- * @returns {number} Count of completed todos linked to this goal
+ * @returns {Promise<number>} Count of completed todos linked to this goal
  */
 export const getGoalCompletedTodosCountSync = (goalId) => {
   try {
@@ -284,3 +304,27 @@ export const calculateGoalProgress = (goal) => {
     percentage: Math.round((completedSteps.length / steps.length) * 100)
   }
 }
+
+/**
+ * Get step and todo progress for goals from the desktop backend.
+ * 
+ * The backend caches each goal's progress and recomputes only goals
+ * whose steps or linked todos changed, so one call covers the whole
+ * goals page. Needs auto-sync, so the data file matches localStorage.
+ * 
+ * @param {string[]|null} goalIds - Goals to report (null = all goals)
+ * @returns {Promise<Object|null>} { [goalId]: { progress, total, percentage,
+ *   todos, completedTodos } }, or null outside the desktop app
+ */
+export const getGoalProgress = async (goalIds = null) => {
+  if (typeof window === 'undefined' || !window.eel) return null
+  try {
+    const { isAutoSyncEnabled } = await import('./desktopStorage')
+    if (!isAutoSyncEnabled()) return null
+    const result = await window.eel.get_goal_progress(goalIds)()
+    return result && result.success ? result.goals : null
+  } catch (error) {
+    console.error('Error loading goal progress:', error)
+    return null
+  }
+}
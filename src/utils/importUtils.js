@@ -19,7 +19,82 @@ import {
   saveGoalStep
 } from './goalStorage'
 
-const CURRENT_VERSION = '1.0.0'
+import {
+  isAutoSyncEnabled,
+  hasUnsyncedChanges,
+  saveAllDataToDesktop,
+  loadAllDataFromDesktop
+} from './desktopStorage'
+
+// Data files are 2.x: their habits section may be normalized (see
+// backend/habit_schema.py). Files from a newer major version are refused.
+const CURRENT_VERSION = '2.0.0'
+const NORMALIZED_HABITS_SCHEMA = 'normalized/1'
+
+const parseVersion = (version) => {
+  const parts = String(version).split('.').slice(0, 3).map(part => parseInt(part, 10) || 0)
+  while (parts.length < 3) parts.push(0)
+  return parts
+}
+
+const isNewerVersion = (version, current) => {
+  const a = parseVersion(version)
+  const b = parseVersion(current)
+  for (let i = 0; i < 3; i++) {
+    if (a[i] !== b[i]) return a[i] > b[i]
+  }
+  return false
+}
+
+/**
+ * Converts a habits section to the {dateKey: dayData} shape.
+ * 
+ * Data files store habits normalized - each definition once, days holding
+ * definition refs plus one completion bit per habit - as
+ * denormalize_habits() in backend/habit_schema.py reads them. Sections
+ * that aren't normalized are returned unchanged.
+ * 
+ * @param {Object} habits - Habits section of an import file
+ * @returns {Object} Habits keyed by date
+ * @throws {Error} If the section uses an unknown schema or a day refers
+ *                 to a definition that doesn't exist
+ */
+export const denormalizeHabits = (habits) => {
+  if (!habits || typeof habits !== 'object' || typeof habits.schema !== 'string') {
+    return habits
+  }
+  if (habits.schema !== NORMALIZED_HABITS_SCHEMA) {
+    throw new Error(`Unsupported habits format: ${habits.schema}`)
+  }
+  
+  const definitions = (habits.definitions || []).map(entry => entry.habit)
+  const days = {}
+  Object.entries(habits.days || {}).forEach(([key, record]) => {
+    if (!record || typeof record !== 'object' || !('refs' in record)) {
+      days[key] = record
+      return
+    }
+    const done = record.done || ''
+    if (done.length !== record.refs.length) {
+      throw new Error(`Habit completion bits don't match habits on ${key}`)
+    }
+    const day = {}
+    Object.entries(record).forEach(([name, value]) => {
+      if (name === 'refs') {
+        day.habits = value.map((ref, i) => {
+          if (!definitions[ref]) {
+            throw new Error(`Unknown habit definition on ${key}`)
+          }
+          return { ...definitions[ref], completed: done[i] === '1' }
+        })
+      } else if (name !== 'done') {
+        day[name] = value
+      }
+    })
+    days[key] = day
+  })
+  return days
+}
 
 export const validateImportData = (data) => {
   try {
@@ -32,7 +107,13 @@ export const validateImportData = (data) => {
     }
     
     // Check version compatibility
-    if (data.version && data.version !== CURRENT_VERSION) {
+    if (data.version && parseVersion(data.version)[0] > parseVersion(CURRENT_VERSION)[0]) {
+      return {
+        valid: false,
+        error: `Data version ${data.version} is newer than this app supports (${CURRENT_VERSION})`
+      }
+    }
+    if (data.version && isNewerVersion(data.version, CURRENT_VERSION)) {
       return { 
         valid: true, 
         warning: `Data version ${data.version} may not be fully compatible with current version ${CURRENT_VERSION}` 
@@ -75,16 +156,18 @@ export const importData = (importData, options = {}) => {
     throw new Error('Invalid import data structure')
   }
   
+  const habits = denormalizeHabits(data.data.habits)
+  
   if (merge) {
     // Merge data
-    mergeHabitsData(data.data.habits || {})
+    mergeHabitsData(habits || {})
     mergeTodos(data.data.todos || [])
     mergeGoals(data.data.goals || [])
     mergeGoalSteps(data.data.goalSteps || [])
   } else {
     // Replace data
-    if (data.data.habits) {
-      localStorage.setItem(STORAGE_KEY, JSON.stringify(data.data.habits))
+    if (habits) {
+      localStorage.setItem(STORAGE_KEY, JSON.stringify(habits))
     }
     if (data.data.todos) {
       localStorage.setItem(TODOS_STORAGE_KEY, JSON.stringify(data.data.todos))
@@ -100,6 +183,54 @@ export const importData = (importData, options = {}) => {
   return { success: true, warning: validation.warning }
 }
 
+/**
+ * Whether imports can be handled by the Python backend.
+ * 
+ * Requires desktop mode and auto-sync (so the data file is the source
+ * of truth the backend merges into).
+ * 
+ * @returns {boolean}
+ */
+export const canImportToFile = () => {
+  return typeof window !== 'undefined' && !!window.eel && isAutoSyncEnabled()
+}
+
+/**
+ * Import data through the Python backend's indexed merge engine.
+ * 
+ * The backend validates and merges in one pass using id/date indexes,
+ * writes the data file atomically, and the result is then loaded back
+ * into localStorage. Local saves that auto-sync hasn't written yet are
+ * saved first, so the merge includes them instead of the reload
+ * dropping them.
+ * 
+ * @param {string} importText - Raw contents of the import file
+ * @param {Object} options - { merge = false, backup = true, policy = 'theirs' }
+ * @returns {Promise<Object>} Backend import report ({ success, sections, timings, ... })
+ */
+export const importDataToFile = async (importText, options = {}) => {
+  const { merge = false, backup = true, policy = 'theirs' } = options
+  
+  if (backup) {
+    createBackup()
+  }
+  
+  if (hasUnsyncedChanges()) {
+    const saved = await saveAllDataToDesktop()
+    if (!saved.success) {
+      throw new Error(`Could not save latest changes before importing: ${saved.error}`)
+    }
+  }
+  
+  const result = await window.eel.import_data(importText, merge ? 'merge' : 'replace', policy)()
+  if (!result.success) {
+    throw new Error(result.error)
+  }
+  
+  await loadAllDataFromDesktop()
+  return result
+}
+
 const mergeHabitsData = (importedHabits) => {
   const existingHabits = getAllStoredData()
   const merged = { ...existingHabits, ...importedHabits }
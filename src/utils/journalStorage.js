@@ -24,6 +24,7 @@
  */
 
 import { STORAGE_KEY_JOURNALS } from '../constants/storageKeys'
+import { callChunked } from './chunkedTransport'
 
 /**
  * Get the current date string in the same format used throughout the app.
@@ -229,10 +230,28 @@ export const exportJournalsToJSON = () => {
   return JSON.stringify(allJournals, null, 2)
 }
 
+// Journals directory from Python, looked up once instead of on every save
+let journalsDirPromise = null
+
+const getJournalsDir = () => {
+  if (!journalsDirPromise) {
+    journalsDirPromise = window.eel.get_app_data_path()()
+      .then(dataPath => dataPath.replace(/\\/g, '/') + '/journals')
+      .catch(error => {
+        journalsDirPromise = null
+        throw error
+      })
+  }
+  return journalsDirPromise
+}
+
 /**
  * Save journal entry to file system via Eel (if available).
  * This is a background operation that doesn't block the UI.
  * 
+ * Python keeps only the latest content per day and writes it at most
+ * every few seconds, so calling this on every autosave is cheap.
+ * 
  * @param {Object} journalEntry - Journal entry object to save
  * @returns {Promise} Promise that resolves when file is saved (or rejects if Eel not available)
  */
@@ -243,16 +262,13 @@ const saveJournalToFileSystem = async (journalEntry) => {
   }
   
   try {
-    // Get app data directory path from Python
-    const dataPath = await window.eel.get_app_data_path()()
-    const journalsDir = dataPath.replace(/\\/g, '/') + '/journals'
+    const journalsDir = await getJournalsDir()
     
-    // Create journal entry file path
+    // Create journal entry file name
     const fileName = journalEntry.date.replace(/\s+/g, '_') + '.json'
-    const filePath = journalsDir + '/' + fileName
     
-    // Save to file system
-    const result = await window.eel.save_journal_file(journalsDir, fileName, JSON.stringify(journalEntry, null, 2))()
+    // Queue the write in Python (returns immediately)
+    const result = await window.eel.save_journal_file(journalsDir, fileName, JSON.stringify(journalEntry))()
     
     if (!result.success) {
       throw new Error(result.error || 'Failed to save journal file')
@@ -272,9 +288,11 @@ const saveJournalToFileSystem = async (journalEntry) => {
  * Get all journal entries from file system via Eel (if available).
  * Falls back to localStorage if file system is not accessible.
  * 
+ * @param {string|null} since - Only load entries from this day on
+ *   ("YYYY-MM-DD") - older months aren't read at all
  * @returns {Promise<Array>} Promise that resolves to array of journal entries
  */
-export const loadJournalsFromFileSystem = async () => {
+export const loadJournalsFromFileSystem = async (since = null) => {
   // Check if Eel is available
   if (typeof window === 'undefined' || !window.eel) {
     // Fall back to localStorage
@@ -282,10 +300,9 @@ export const loadJournalsFromFileSystem = async () => {
   }
   
   try {
-    const dataPath = await window.eel.get_app_data_path()()
-    const journalsDir = dataPath.replace(/\\/g, '/') + '/journals'
+    const journalsDir = await getJournalsDir()
     
-    const result = await window.eel.load_journal_files(journalsDir)()
+    const result = await callChunked('load_journal_files', [journalsDir, since])
     
     if (result.success && result.entries) {
       // Merge file system entries with localStorage
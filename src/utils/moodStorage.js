@@ -68,8 +68,9 @@ export const getMoodHistory = (startDate, endDate) => {
   return history.sort((a, b) => new Date(a.date) - new Date(b.date))
 }
 
-export const getAverageMood = (startDate, endDate) => {
-  const history = getMoodHistory(startDate, endDate)
+export const getAverageMood = (startDate, endDate, history = null) => {
+  // Reuse a history the caller already loaded for the same range
+  history = history || getMoodHistory(startDate, endDate)
   if (history.length === 0) return null
   
   const sum = history.reduce((acc, mood) => acc + mood.mood, 0)
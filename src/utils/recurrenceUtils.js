@@ -1,5 +1,74 @@
 // Recurring todo utilities
 
+const PAUSED_KEY = 'paused-recurring-todos'
+
+// Parsed paused-recurring-todos, re-parsed only when the stored value changes
+let pausedCache = { raw: null, ids: new Set() }
+
+/**
+ * Ids of the paused recurring todos.
+ *
+ * @returns {Set} Paused todo ids (don't modify - use setPausedRecurringIds)
+ */
+export const getPausedRecurringIds = () => {
+  let raw = null
+  try {
+    raw = localStorage.getItem(PAUSED_KEY)
+  } catch (e) {
+    return pausedCache.ids
+  }
+  if (raw !== pausedCache.raw) {
+    let ids = new Set()
+    try {
+      ids = new Set(raw ? JSON.parse(raw) : [])
+    } catch (e) {
+      // Ignore errors
+    }
+    pausedCache = { raw, ids }
+  }
+  return pausedCache.ids
+}
+
+/**
+ * Store the paused recurring todos.
+ *
+ * @param {Set|Array} ids - Paused todo ids
+ */
+export const setPausedRecurringIds = (ids) => {
+  const raw = JSON.stringify([...ids])
+  localStorage.setItem(PAUSED_KEY, raw)
+  pausedCache = { raw, ids: new Set(ids) }
+}
+
+/**
+ * Occurrences of recurring todos within a date range, from the desktop
+ * backend's expanded 90-day window (see get_due_occurrences in start.py).
+ *
+ * The window is expanded from the data file, so it is only used with
+ * auto-sync on and when every local save has been written to the file.
+ *
+ * @param {string} startDate - First day, 'YYYY-MM-DD' (optional - today)
+ * @param {string} endDate - Last day, 'YYYY-MM-DD' (optional - 90 days ahead)
+ * @returns {Promise<Array|null>} [{ id, title, date }], or null when the
+ *   local todos must be used instead
+ *
+ * @example
+ * const thisWeek = await getDueOccurrences('2024-12-01', '2024-12-07')
+ */
+export const getDueOccurrences = async (startDate = null, endDate = null) => {
+  if (typeof window === 'undefined' || !window.eel) return null
+  try {
+    const { isAutoSyncEnabled, hasUnsyncedChanges } = await import('./desktopStorage')
+    if (!isAutoSyncEnabled() || hasUnsyncedChanges()) return null
+    const paused = [...getPausedRecurringIds()]
+    const result = await window.eel.get_due_occurrences(startDate, endDate, paused)()
+    return result && result.success ? result.occurrences : null
+  } catch (error) {
+    console.error('Error loading recurring todos:', error)
+    return null
+  }
+}
+
 export const calculateNextOccurrence = (todo) => {
   if (!todo.isRecurring || !todo.recurrencePattern) {
     return null
@@ -56,15 +125,7 @@ export const shouldGenerateNext = (todo) => {
   if (!todo.isRecurring || !todo.recurrencePattern) return false
   
   // Check paused state
-  try {
-    const paused = localStorage.getItem('paused-recurring-todos')
-    if (paused) {
-      const pausedSet = new Set(JSON.parse(paused))
-      if (pausedSet.has(todo.id)) return false
-    }
-  } catch (e) {
-    // Ignore errors
-  }
+  if (getPausedRecurringIds().has(todo.id)) return false
   
   const now = new Date()
   now.setHours(0, 0, 0, 0)
@@ -1,8 +1,9 @@
 // Reminder scheduling logic
 
-import { getActiveReminders, shouldRemindToday, isHabitCompletedToday, getNextReminderTime } from './reminderStorage'
+import { getActiveReminders, shouldRemindToday, isHabitCompletedToday, getNextReminderTime, getReminder, syncRemindersToBackend } from './reminderStorage'
 import { createHabitReminderNotification } from './notificationUtils'
 import { getAllStoredData } from './dataStorage'
+import { getClientId } from './desktopStorage'
 
 let reminderInterval = null
 let scheduledReminders = new Map()
@@ -11,6 +12,14 @@ export const startReminderScheduler = () => {
   // Clear any existing interval
   stopReminderScheduler()
   
+  // Desktop mode: the Python backend keeps a heap of upcoming reminders
+  // and calls onReminderDue when one is due - no polling needed here
+  if (typeof window !== 'undefined' && window.eel) {
+    window.eel.expose(onReminderDue, 'on_reminder_due')
+    syncRemindersToBackend()
+    return
+  }
+  
   // Check for reminders every minute
   reminderInterval = setInterval(() => {
     checkAndTriggerReminders()
@@ -68,6 +77,19 @@ export const checkAndTriggerReminders = () => {
   })
 }
 
+// Called by the Python backend when a reminder is due. Every window
+// receives the call, but only the one it names shows the notification.
+const onReminderDue = ({ habitId, client }) => {
+  if (client && client !== getClientId()) {
+    return
+  }
+  const reminder = getReminder(habitId)
+  if (!reminder || isHabitCompletedToday(reminder.habitId)) {
+    return
+  }
+  triggerReminder(reminder)
+}
+
 export const triggerReminder = async (reminder) => {
   // Get habit details
   const allData = getAllStoredData()
@@ -15,6 +15,7 @@ export const saveReminder = (habitId, reminderConfig) => {
     ...reminderConfig
   }
   localStorage.setItem(REMINDER_STORAGE_KEY, JSON.stringify(reminders))
+  syncRemindersToBackend()
   return reminders[habitId]
 }
 
@@ -37,6 +38,13 @@ export const deleteReminder = (habitId) => {
   const reminders = getAllReminders()
   delete reminders[habitId]
   localStorage.setItem(REMINDER_STORAGE_KEY, JSON.stringify(reminders))
+  syncRemindersToBackend()
+}
+
+// In desktop mode the Python backend schedules reminders; keep it in sync
+export const syncRemindersToBackend = () => {
+  if (typeof window === 'undefined' || !window.eel) return
+  window.eel.sync_reminders(getAllReminders())().catch(() => {})
 }
 
 export const isReminderEnabled = (habitId) => {
@@ -1,23 +1,183 @@
 // Review generation utilities
 
-import { getWeekData, getMonthData, getAllStoredData } from './dataStorage'
+import { getWeekData, getMonthData } from './dataStorage'
 import { getAllHabitStreaks } from './streaksStorage'
 import { getAverageMood } from './moodStorage'
 import { getAllTodos } from './todoStorage'
 import { getAllGoals } from './goalStorage'
 
-export const generateWeeklyReview = () => {
-  const weekData = getWeekData()
+// ============================================================================
+// REVIEW STATISTICS
+// ============================================================================
+// A review is built from a report: the numbers of one period, in the same
+// shape get_current_review / get_review_history return from the desktop
+// backend (see backend/reviews.py). Outside the desktop app the report is
+// computed here from localStorage.
+
+const completionRate = (day) => {
+  return day.totalCount > 0 ? (day.completedCount / day.totalCount) * 100 : 0
+}
+
+const computeReport = (period, days, startDate, endDate) => {
+  const totalHabits = days.reduce((sum, day) => sum + (day.totalCount || 0), 0)
+  const completedHabits = days.reduce((sum, day) => sum + (day.completedCount || 0), 0)
+
+  const report = {
+    period,
+    startDate: startDate.toDateString(),
+    endDate: endDate.toDateString(),
+    closed: false,
+    statistics: {
+      daysTracked: days.length,
+      totalHabitsCompleted: completedHabits,
+      totalHabitsAvailable: totalHabits,
+      averageCompletionRate: totalHabits > 0 ? Math.round((completedHabits / totalHabits) * 100) : 0,
+      averageMood: getAverageMood(startDate.toDateString(), endDate.toDateString())
+    },
+    bestDay: null,
+    worstDay: null,
+    mostConsistent: null
+  }
+
+  if (days.length === 0) {
+    return report
+  }
+
+  // Find best/worst days
+  const dayCompletions = days.map(day => ({ date: day.date, rate: completionRate(day) }))
+  report.bestDay = dayCompletions.reduce((best, day) => day.rate > best.rate ? day : best, dayCompletions[0])
+  report.worstDay = dayCompletions.reduce((worst, day) => day.rate < worst.rate ? day : worst, dayCompletions[0])
+
+  // Find most consistent habit
+  const habitStats = {}
+  days.forEach(day => {
+    if (day.habits) {
+      day.habits.forEach(habit => {
+        if (!habitStats[habit.id]) {
+          habitStats[habit.id] = { id: habit.id, name: habit.name, completed: 0, total: 0 }
+        }
+        habitStats[habit.id].total++
+        if (habit.completed) {
+          habitStats[habit.id].completed++
+        }
+      })
+    }
+  })
+
+  report.mostConsistent = Object.values(habitStats)
+    .filter(h => h.total > 0)
+    .sort((a, b) => (b.completed / b.total) - (a.completed / a.total))[0] || null
+
+  return report
+}
+
+const computeWeeklyReport = () => {
   const today = new Date()
   const weekStart = new Date(today)
   weekStart.setDate(today.getDate() - today.getDay())
-  
-  const weekEnd = new Date(today)
-  
+  return computeReport('week', getWeekData(), weekStart, today)
+}
+
+const computeMonthlyReport = () => {
+  const monthData = getMonthData()
+  const today = new Date()
+  const monthStart = new Date(today.getFullYear(), today.getMonth(), 1)
+  const report = computeReport('month', monthData, monthStart, today)
+
+  // Calculate weekly breakdown
+  const weeks = []
+  let currentWeek = []
+  monthData.forEach(day => {
+    const dayDate = new Date(day.date)
+    if (dayDate.getDay() === 0 && currentWeek.length > 0) {
+      weeks.push([...currentWeek])
+      currentWeek = [day]
+    } else {
+      currentWeek.push(day)
+    }
+  })
+  if (currentWeek.length > 0) {
+    weeks.push(currentWeek)
+  }
+
+  report.weeklyBreakdown = weeks.map((week, index) => {
+    const weekHabits = week.reduce((sum, day) => sum + (day.totalCount || 0), 0)
+    const weekCompleted = week.reduce((sum, day) => sum + (day.completedCount || 0), 0)
+    return {
+      week: index + 1,
+      completionRate: weekHabits > 0 ? Math.round((weekCompleted / weekHabits) * 100) : 0,
+      daysTracked: week.length
+    }
+  })
+
+  report.statistics.todosCompleted = getAllTodos().filter(t => {
+    if (!t.completedAt) return false
+    const completedDate = new Date(t.completedAt)
+    return completedDate >= monthStart && completedDate <= today
+  }).length
+
+  return report
+}
+
+/**
+ * Fetch the report of the current week or month from the desktop backend.
+ *
+ * The backend reads the data file, so its report is only used with
+ * auto-sync on and when every local save has been written to the file.
+ *
+ * @param {string} period - 'week' or 'month'
+ * @returns {Promise<Object|null>} Report, or null when it must be
+ *   computed locally
+ */
+export const getReviewReport = async (period) => {
+  if (typeof window === 'undefined' || !window.eel) return null
+  try {
+    const { isAutoSyncEnabled, hasUnsyncedChanges } = await import('./desktopStorage')
+    if (!isAutoSyncEnabled() || hasUnsyncedChanges()) return null
+    const result = await window.eel.get_current_review(period)()
+    return result && result.success ? result.review : null
+  } catch (error) {
+    console.error('Error loading review:', error)
+    return null
+  }
+}
+
+/**
+ * Fetch the reports of every week or month in a date range. Closed
+ * periods are summarized once by the backend and kept on disk.
+ *
+ * @param {string} period - 'week' or 'month'
+ * @param {string} startDate - First day, 'YYYY-MM-DD' (optional)
+ * @param {string} endDate - Last day, 'YYYY-MM-DD' (optional)
+ * @returns {Promise<Array>} Reports, oldest first (empty outside the desktop
+ *   app or without auto-sync)
+ *
+ * @example
+ * const weeks = await getReviewHistory('week', '2022-01-01')
+ * const reviews = weeks.map(buildWeeklyReview)
+ */
+export const getReviewHistory = async (period, startDate = null, endDate = null) => {
+  if (typeof window === 'undefined' || !window.eel) return []
+  try {
+    const { isAutoSyncEnabled } = await import('./desktopStorage')
+    if (!isAutoSyncEnabled()) return []
+    const result = await window.eel.get_review_history(period, startDate, endDate)()
+    return result && result.success ? result.reviews : []
+  } catch (error) {
+    console.error('Error loading review history:', error)
+    return []
+  }
+}
+
+// ============================================================================
+// REVIEW GENERATION
+// ============================================================================
+
+export const buildWeeklyReview = (report) => {
   const review = {
     period: 'week',
-    startDate: weekStart.toDateString(),
-    endDate: weekEnd.toDateString(),
+    startDate: report.startDate,
+    endDate: report.endDate,
     generatedAt: new Date().toISOString(),
     statistics: {},
     highlights: [],
@@ -25,38 +185,21 @@ export const generateWeeklyReview = () => {
     reflection: null
   }
   
-  if (weekData.length === 0) {
+  if (report.statistics.daysTracked === 0) {
     return review
   }
   
-  // Calculate statistics
-  const totalDays = weekData.length
-  const totalHabits = weekData.reduce((sum, day) => sum + (day.totalCount || 0), 0)
-  const completedHabits = weekData.reduce((sum, day) => sum + (day.completedCount || 0), 0)
-  const avgCompletion = totalHabits > 0 ? (completedHabits / totalHabits) * 100 : 0
-  
+  const { bestDay, worstDay, mostConsistent } = report
+  const { totalHabitsCompleted, totalHabitsAvailable } = report.statistics
+  const avgCompletion = totalHabitsAvailable > 0 ? (totalHabitsCompleted / totalHabitsAvailable) * 100 : 0
   review.statistics = {
-    daysTracked: totalDays,
-    totalHabitsCompleted: completedHabits,
-    totalHabitsAvailable: totalHabits,
+    daysTracked: report.statistics.daysTracked,
+    totalHabitsCompleted: report.statistics.totalHabitsCompleted,
+    totalHabitsAvailable: report.statistics.totalHabitsAvailable,
     averageCompletionRate: Math.round(avgCompletion),
-    averageMood: getAverageMood(weekStart.toDateString(), weekEnd.toDateString())
+    averageMood: report.statistics.averageMood
   }
   
-  // Find best/worst days
-  const dayCompletions = weekData.map(day => ({
-    date: day.date,
-    rate: day.totalCount > 0 ? (day.completedCount / day.totalCount) * 100 : 0
-  }))
-  
-  const bestDay = dayCompletions.reduce((best, day) => 
-    day.rate > best.rate ? day : best, dayCompletions[0] || { date: '', rate: 0 }
-  )
-  
-  const worstDay = dayCompletions.reduce((worst, day) => 
-    day.rate < worst.rate ? day : worst, dayCompletions[0] || { date: '', rate: 100 }
-  )
-  
   // Calculate streaks
   const streaks = getAllHabitStreaks()
   const activeStreaks = Object.values(streaks).filter(s => s.currentStreak > 0)
@@ -64,26 +207,6 @@ export const generateWeeklyReview = () => {
     ? Math.max(...activeStreaks.map(s => s.currentStreak))
     : 0
   
-  // Find most consistent habit
-  const habitStats = {}
-  weekData.forEach(day => {
-    if (day.habits) {
-      day.habits.forEach(habit => {
-        if (!habitStats[habit.id]) {
-          habitStats[habit.id] = { name: habit.name, completed: 0, total: 0 }
-        }
-        habitStats[habit.id].total++
-        if (habit.completed) {
-          habitStats[habit.id].completed++
-        }
-      })
-    }
-  })
-  
-  const mostConsistent = Object.values(habitStats)
-    .filter(h => h.total > 0)
-    .sort((a, b) => (b.completed / b.total) - (a.completed / a.total))[0]
-  
   // Generate highlights
   if (bestDay.rate >= 80) {
     review.highlights.push({
@@ -125,16 +248,11 @@ export const generateWeeklyReview = () => {
   return review
 }
 
-export const generateMonthlyReview = () => {
-  const monthData = getMonthData()
-  const today = new Date()
-  const monthStart = new Date(today.getFullYear(), today.getMonth(), 1)
-  const monthEnd = new Date(today)
-  
+export const buildMonthlyReview = (report) => {
   const review = {
     period: 'month',
-    startDate: monthStart.toDateString(),
-    endDate: monthEnd.toDateString(),
+    startDate: report.startDate,
+    endDate: report.endDate,
     generatedAt: new Date().toISOString(),
     statistics: {},
     highlights: [],
@@ -143,53 +261,20 @@ export const generateMonthlyReview = () => {
     weeklyBreakdown: []
   }
   
-  if (monthData.length === 0) {
+  if (report.statistics.daysTracked === 0) {
     return review
   }
   
-  // Calculate overall statistics
-  const totalDays = monthData.length
-  const totalHabits = monthData.reduce((sum, day) => sum + (day.totalCount || 0), 0)
-  const completedHabits = monthData.reduce((sum, day) => sum + (day.completedCount || 0), 0)
-  const avgCompletion = totalHabits > 0 ? (completedHabits / totalHabits) * 100 : 0
-  
-  // Calculate weekly breakdown
-  const weeks = []
-  let currentWeek = []
-  monthData.forEach(day => {
-    const dayDate = new Date(day.date)
-    if (dayDate.getDay() === 0 && currentWeek.length > 0) {
-      weeks.push([...currentWeek])
-      currentWeek = [day]
-    } else {
-      currentWeek.push(day)
-    }
-  })
-  if (currentWeek.length > 0) {
-    weeks.push(currentWeek)
-  }
-  
-  review.weeklyBreakdown = weeks.map((week, index) => {
-    const weekHabits = week.reduce((sum, day) => sum + (day.totalCount || 0), 0)
-    const weekCompleted = week.reduce((sum, day) => sum + (day.completedCount || 0), 0)
-    return {
-      week: index + 1,
-      completionRate: weekHabits > 0 ? Math.round((weekCompleted / weekHabits) * 100) : 0,
-      daysTracked: week.length
-    }
-  })
-  
+  const { totalHabitsCompleted, totalHabitsAvailable } = report.statistics
+  const avgCompletion = totalHabitsAvailable > 0 ? (totalHabitsCompleted / totalHabitsAvailable) * 100 : 0
+  review.weeklyBreakdown = report.weeklyBreakdown
   review.statistics = {
-    daysTracked: totalDays,
-    totalHabitsCompleted: completedHabits,
-    totalHabitsAvailable: totalHabits,
+    daysTracked: report.statistics.daysTracked,
+    totalHabitsCompleted: report.statistics.totalHabitsCompleted,
+    totalHabitsAvailable: report.statistics.totalHabitsAvailable,
     averageCompletionRate: Math.round(avgCompletion),
-    averageMood: getAverageMood(monthStart.toDateString(), monthEnd.toDateString()),
-    todosCompleted: getAllTodos().filter(t => {
-      if (!t.completedAt) return false
-      const completedDate = new Date(t.completedAt)
-      return completedDate >= monthStart && completedDate <= monthEnd
-    }).length,
+    averageMood: report.statistics.averageMood,
+    todosCompleted: report.statistics.todosCompleted,
     goalsActive: getAllGoals().length
   }
   
@@ -239,6 +324,32 @@ export const generateMonthlyReview = () => {
   return review
 }
 
+export const generateWeeklyReview = () => buildWeeklyReview(computeWeeklyReport())
+
+export const generateMonthlyReview = () => buildMonthlyReview(computeMonthlyReport())
+
+/**
+ * Generate the current weekly review, with statistics from the desktop
+ * backend when available (computed locally otherwise).
+ *
+ * @returns {Promise<Object>} Weekly review
+ */
+export const loadWeeklyReview = async () => {
+  const report = await getReviewReport('week')
+  return buildWeeklyReview(report || computeWeeklyReport())
+}
+
+/**
+ * Generate the current monthly review, with statistics from the desktop
+ * backend when available (computed locally otherwise).
+ *
+ * @returns {Promise<Object>} Monthly review
+ */
+export const loadMonthlyReview = async () => {
+  const report = await getReviewReport('month')
+  return buildMonthlyReview(report || computeMonthlyReport())
+}
+
 export const saveReview = (review) => {
   const reviews = getReviews()
   review.id = Date.now().toString()
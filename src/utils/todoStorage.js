@@ -79,6 +79,13 @@ export const saveTodo = (todo) => {
 export const deleteTodo = (todoId) => {
   const todos = getAllTodos().filter(t => t.id !== todoId)
   localStorage.setItem(TODOS_STORAGE_KEY, JSON.stringify(todos))
+  
+  // Auto-sync to desktop file if enabled (background, non-blocking)
+  if (typeof window !== 'undefined' && window.eel) {
+    import('./desktopStorage').then(module => {
+      module.autoSyncToDesktop().catch(() => {})
+    }).catch(() => {})
+  }
 }
 
 /**
@@ -260,3 +267,71 @@ export const getCompletedTodosCountForGoal = (goalId) => {
   const todos = getTodosForGoal(goalId)
   return todos.filter(t => t.completed).length
 }
+
+/**
+ * Check whether the desktop backend's todo indexes match localStorage.
+ * 
+ * They are built from the data file, so auto-sync must be on and this
+ * window's latest saves must already be written.
+ * 
+ * @returns {Promise<boolean>} True if backend todo queries can be used
+ */
+const canQueryBackend = async () => {
+  if (typeof window === 'undefined' || !window.eel) return false
+  const { isAutoSyncEnabled, hasUnsyncedChanges } = await import('./desktopStorage')
+  return isAutoSyncEnabled() && !hasUnsyncedChanges()
+}
+
+/**
+ * Query one page of todos from the desktop backend's todo indexes.
+ * 
+ * Sorted like getTodosByPriority, without loading and sorting every todo.
+ * 
+ * @param {Object} options - Query options
+ * @param {string} [options.status='all'] - 'all', 'active' or 'completed'
+ * @param {string} [options.priority] - 'now', 'next' or 'later'
+ * @param {string} [options.goalId] - Only todos linked to this goal
+ * @param {boolean} [options.overdue=false] - Only overdue todos
+ * @param {number} [options.offset=0] - Todos to skip
+ * @param {number|null} [options.limit=50] - Page size (null = all remaining)
+ * @returns {Promise<Object|null>} { todos, total, offset, limit }, or null when
+ *   the backend can't answer (outside the desktop app, auto-sync off or
+ *   local saves not synced yet)
+ * 
+ * @example
+ * const page = await queryTodos({ status: 'active', priority: 'now', limit: 20 })
+ */
+export const queryTodos = async ({
+  status = 'all',
+  priority = null,
+  goalId = null,
+  overdue = false,
+  offset = 0,
+  limit = 50
+} = {}) => {
+  try {
+    if (!(await canQueryBackend())) return null
+    const result = await window.eel.query_todos(status, priority, goalId, overdue, offset, limit)()
+    return result && result.success ? result : null
+  } catch (error) {
+    console.error('Error querying todos:', error)
+    return null
+  }
+}
+
+/**
+ * Get todo counts per status, priority and goal from the desktop backend.
+ * 
+ * @returns {Promise<Object|null>} { total, active, completed, overdue, byPriority, byGoal },
+ *   or null when the backend can't answer (see queryTodos)
+ */
+export const getTodoCounts = async () => {
+  try {
+    if (!(await canQueryBackend())) return null
+    const result = await window.eel.get_todo_counts()()
+    return result && result.success ? result : null
+  } catch (error) {
+    console.error('Error loading todo counts:', error)
+    return null
+  }
+}
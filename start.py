@@ -31,37 +31,56 @@ For packaging as standalone executable:
 @version 1.0.0
 """
 
-import eel
+import time
+
+# Reference point for the startup timing printed once the server is ready
+STARTUP_STARTED = time.perf_counter()
+
 import os
 import sys
 import json
+import threading
 from pathlib import Path
 
+# The backend modules (and the state built from them below) are loaded
+# by init_backend() in main(), after a second launch had the chance to
+# hand off to the running instance.
+
+# Eel pulls in gevent, bottle and greenlet, so it isn't imported until
+# main() has found the venv (see load_eel()). Importing this module only
+# defines functions; the shared state below is created by main().
+eel = None
+
 # ============================================================================
 # VIRTUAL ENVIRONMENT AUTO-ACTIVATION
 # ============================================================================
 
-def activate_virtual_environment():
+# File inside venv/ remembering where its site-packages directory is, so
+# later launches skip scanning venv/lib
+VENV_CACHE_FILE = '.site-packages-path'
+
+def find_venv_site_packages(venv_path):
     """
-    Automatically activate virtual environment if it exists.
+    Locates the site-packages directory of a virtual environment.
     
-    This function checks for a virtual environment in the project directory
-    and activates it if found. This allows the app to run without manually
-    activating the venv first.
+    The result is cached in venv/.site-packages-path; the directory scan
+    only runs again if the cached path no longer exists (e.g. the venv was
+    recreated with a different Python version).
     
-    The venv is activated by adding its site-packages to sys.path, which
-    allows importing packages installed in the venv.
+    Args:
+        venv_path (str): Path to the venv directory
     
     Returns:
-        bool: True if venv was found and activated, False otherwise
+        str: Path to site-packages (may not exist)
     """
-    # Get the directory containing this script
-    script_dir = os.path.abspath(os.path.dirname(__file__))
-    venv_path = os.path.join(script_dir, 'venv')
-    
-    # Check if venv exists
-    if not os.path.exists(venv_path):
-        return False
+    cache_file = os.path.join(venv_path, VENV_CACHE_FILE)
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = f.read().strip()
+        if cached and os.path.isdir(cached):
+            return cached
+    except OSError:
+        pass
     
     # Determine the site-packages path based on platform
     if sys.platform == 'win32':
@@ -82,6 +101,42 @@ def activate_virtual_environment():
                             site_packages = alt_site_packages
                             break
     
+    if os.path.isdir(site_packages):
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                f.write(site_packages)
+        except OSError:
+            pass  # Read-only venv - just scan again next time
+    return site_packages
+
+def activate_virtual_environment():
+    """
+    Automatically activate virtual environment if it exists.
+    
+    This function checks for a virtual environment in the project directory
+    and activates it if found. This allows the app to run without manually
+    activating the venv first.
+    
+    The venv is activated by adding its site-packages to sys.path, which
+    allows importing packages installed in the venv.
+    
+    Returns:
+        bool: True if venv was found and activated, False otherwise
+    """
+    # Packaged builds carry their own dependencies
+    if getattr(sys, 'frozen', False):
+        return False
+    
+    # Get the directory containing this script
+    script_dir = os.path.abspath(os.path.dirname(__file__))
+    venv_path = os.path.join(script_dir, 'venv')
+    
+    # Check if venv exists
+    if not os.path.exists(venv_path):
+        return False
+    
+    site_packages = find_venv_site_packages(venv_path)
+    
     # Add to Python path if it exists
     if os.path.exists(site_packages):
         if site_packages not in sys.path:
@@ -94,9 +149,6 @@ def activate_virtual_environment():
     
     return False
 
-# Auto-activate venv on import
-activate_virtual_environment()
-
 # ============================================================================
 # PATH RESOLUTION
 # ============================================================================
@@ -137,12 +189,91 @@ def get_resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
-# Get the correct path to web directory (contains built React app)
-web_path = get_resource_path('web')
+# Path to the web directory (contains built React app) and, for packaged
+# onedir builds made with 'package.py --web-archive', the memory-mapped
+# archive that replaces it (see backend/web_archive.py). Set by
+# resolve_web_assets().
+web_path = None
+web_archive = None
+
+def resolve_web_assets():
+    """
+    Finds the built React app: the web directory, or web.zip if there is none.
+    
+    Side Effects:
+        Sets the module-level web_path and web_archive
+    """
+    global web_path, web_archive
+    web_path = get_resource_path('web')
+    if os.path.isdir(web_path):
+        return
+    
+    from backend.web_archive import WEB_ARCHIVE_NAME, WebArchive
+    archive_path = get_resource_path(WEB_ARCHIVE_NAME)
+    if os.path.isfile(archive_path):
+        web_archive = WebArchive(archive_path)
+
+def register_archive_js_functions(archive):
+    """
+    Makes the JavaScript functions exposed inside the archive callable.
+    
+    eel.init() finds eel.expose(...) calls by scanning the web directory on
+    disk. With an archive there is nothing to scan, so the archive is
+    scanned instead and the names are registered the same way eel.init()
+    registers them.
+    
+    Args:
+        archive (WebArchive): The opened web archive
+    """
+    names = archive.exposed_js_functions()
+    eel._js_functions = sorted(set(eel._js_functions) | names)
+    for name in names:
+        eel._mock_js_function(name)
+
+def archive_routes(archive):
+    """
+    Builds Bottle routes that answer "/" and app files from the archive.
+    
+    Args:
+        archive (WebArchive): The opened web archive
+    
+    Returns:
+        dict: {rule: (callback, route options)}, the shape of
+              eel.BOTTLE_ROUTES
+    """
+    import bottle
+    
+    def archive_file(path):
+        body = archive.read(path)
+        if body is None:
+            return bottle.HTTPResponse(status=404)
+        return bottle.HTTPResponse(body=body, headers={
+            'Content-Type': archive.content_type(path),
+            'Cache-Control': 'no-store'
+        })
+    
+    def archive_root():
+        return archive_file('index.html')
+    
+    return {'/': (archive_root, {}), '/<path:path>': (archive_file, {})}
 
-# Initialize Eel with the web directory
-# This tells Eel where to find the HTML/CSS/JS files to serve
-eel.init(web_path)
+def serve_web_archive(archive):
+    """
+    Serves index.html and assets/* straight from the web archive.
+    
+    eel.start() registers every entry of eel.BOTTLE_ROUTES on the app it
+    serves, and Bottle replaces a route when the same rule is added again,
+    so a route registered beforehand would be overwritten by Eel's static
+    handler. Instead, Eel's "/" and "/<path:path>" entries are replaced
+    with handlers that slice the archive's memory mapping; /eel.js and the
+    /eel websocket are still handled by Eel.
+    
+    Must be called before eel.start().
+    
+    Args:
+        archive (WebArchive): The opened web archive
+    """
+    eel.BOTTLE_ROUTES.update(archive_routes(archive))
 
 # ============================================================================
 # APPLICATION CONFIGURATION
@@ -152,6 +283,19 @@ APP_NAME = "Personal Tracker"
 APP_VERSION = "1.0.0"
 WINDOW_SIZE = (1400, 900)  # Width x Height in pixels
 
+# Title of the app window (the <title> in index.html) - used to find the
+# window when a second launch asks for it to be brought to the front
+APP_WINDOW_TITLE = "Daily Habit Tracker"
+
+# Use a fixed port so we can launch browser manually
+# Port 8080 is commonly used for development servers
+FIXED_PORT = 8080
+
+# Set by package.py's startup harness: when present, the app starts without
+# a browser, writes a startup report to this path once the server accepts
+# connections, and exits (see report_server_ready())
+READY_REPORT_ENV = "PERSONAL_TRACKER_READY_REPORT"
+
 # ============================================================================
 # PYTHON FUNCTIONS EXPOSED TO JAVASCRIPT
 # ============================================================================
@@ -159,7 +303,194 @@ WINDOW_SIZE = (1400, 900)  # Width x Height in pixels
 # These functions can be called from JavaScript using: eel.function_name()()
 # They provide a bridge between the React frontend and Python backend
 
-@eel.expose
+# Functions marked with @expose; init_eel() hands them to eel.expose()
+# once Eel is loaded
+_exposed_functions = []
+
+def expose(function):
+    """
+    Marks a function as callable from JavaScript.
+    
+    Works like @eel.expose, but only records the function so this module
+    can be imported without loading Eel. init_eel() does the registration.
+    """
+    _exposed_functions.append(function)
+    return function
+
+# ============================================================================
+# SHARED BACKEND STATE
+# ============================================================================
+
+def _push_to_frontend(function_name, payload):
+    """
+    Calls a JavaScript function exposed by the frontend in every open window.
+    
+    The frontend registers handlers with window.eel.expose(fn, 'name').
+    Eel only knows about those names once the web files have been scanned,
+    so a missing handler is ignored rather than treated as an error.
+    
+    Args:
+        function_name (str): Name the handler was exposed under
+        payload: JSON-serializable argument for the handler
+    
+    Returns:
+        bool: True if the call was dispatched
+    """
+    js_function = getattr(eel, function_name, None)
+    if js_function is None:
+        return False
+    try:
+        js_function(payload)
+        return True
+    except Exception as e:
+        print(f"Warning: could not push {function_name} to frontend: {e}")
+        return False
+
+# Shared backend state, created by init_backend() (None until then)
+
+# Latest saved copy of every data-file section (see backend/data_store.py)
+data_store = None
+
+# Notifies other open windows when one of them saves
+change_broadcaster = None
+
+# Per-section checksums stored next to the data file (see backend/integrity.py)
+section_checksums = None
+
+# Detects edits made to the data file / journals outside the app
+change_watcher = None
+
+# Sorted ordinal-day indexes of the date-keyed sections (query_range())
+day_indexes = None
+
+# Weight and mood series with prefix sums (get_time_series())
+time_series = None
+
+# Per-year calendar heatmaps, updated as days are saved (get_heatmap_year())
+heatmap_tiles = None
+
+# Weekly/monthly review summaries, closed periods saved next to the data file
+review_engine = None
+
+# Occurrences of recurring todos over the next 90 days (get_due_occurrences())
+recurrence_engine = None
+
+# Due-date, priority, goal and completion indexes over todos (query_todos())
+todo_index = None
+
+# Per-goal step/todo progress, recomputed only for goals whose steps or
+# linked todos changed (get_goal_progress())
+goal_progress = None
+
+# Undo/redo history of every save, with periodic checkpoints (undo_edit())
+edit_history = None
+
+# Memory-mapped binary copy of the data file, written on every save and
+# load, so the startup load and queries before the first full load
+# decode only what they ask for (see backend/snapshot.py)
+snapshots = None
+
+def init_backend():
+    """
+    Imports the backend modules and creates the shared backend state.
+    
+    Called once by main() before the endpoints can be reached; calling it
+    again does nothing. Keeping this out of module import keeps
+    'import start' (and a second launch that only hands off to the
+    running instance) cheap.
+    """
+    global data_store, change_broadcaster, section_checksums, change_watcher
+    global day_indexes, time_series, heatmap_tiles, review_engine
+    global recurrence_engine, todo_index, goal_progress, edit_history, snapshots
+    global journal_writer, reminder_scheduler, chunked_transfers
+    if data_store is not None:
+        return
+    
+    from backend.data_store import DataStore
+    from backend.change_broadcast import ChangeBroadcaster
+    from backend.file_watcher import ChangeWatcher
+    from backend.integrity import SectionChecksums
+    from backend.day_index import DayIndexes
+    from backend.time_series import TimeSeries
+    from backend.heatmap_tiles import HeatmapTiles
+    from backend.reviews import ReviewEngine
+    from backend.recurrence import RecurrenceEngine
+    from backend.todo_index import TodoIndex
+    from backend.goal_progress import GoalProgress
+    from backend.history import EditHistory
+    from backend.snapshot import SnapshotFiles
+    from backend.journal_writer import JournalWriter
+    from backend.reminder_scheduler import ReminderScheduler
+    from backend.chunked_transport import TransferStore
+    
+    data_store = DataStore()
+    change_broadcaster = ChangeBroadcaster(
+        send=lambda payload: _push_to_frontend('on_data_changed', payload)
+    )
+    data_store.subscribe(change_broadcaster.on_changes)
+    section_checksums = SectionChecksums(data_store.get_digest, data_store.digest_stats)
+    data_store.set_read_hook(section_checksums.verify)
+    change_watcher = ChangeWatcher()
+    day_indexes = DayIndexes(data_store)
+    time_series = TimeSeries(data_store, day_indexes)
+    heatmap_tiles = HeatmapTiles(data_store, day_indexes)
+    review_engine = ReviewEngine(data_store, day_indexes)
+    recurrence_engine = RecurrenceEngine(data_store)
+    todo_index = TodoIndex(data_store)
+    goal_progress = GoalProgress(data_store)
+    edit_history = EditHistory(data_store)
+    snapshots = SnapshotFiles(data_store)
+    journal_writer = JournalWriter(write=write_journal_entry,
+                                   interval=JOURNAL_FLUSH_INTERVAL_SECONDS)
+    reminder_scheduler = ReminderScheduler(fire=fire_reminder)
+    data_store.subscribe(update_reminder_completions)
+    chunked_transfers = TransferStore()
+
+# Month-sharded journal directories, one store per directory
+# (see backend/journal_store.py). The lock keeps the Eel greenlet, the
+# journal writer and the compaction thread from each creating a store
+# (with its own lock) for the same directory.
+_journal_stores = {}
+_journal_stores_lock = threading.Lock()
+
+# Closed journal months are packed this long after startup, then at
+# this interval
+JOURNAL_COMPACTION_DELAY_SECONDS = 30
+JOURNAL_COMPACTION_INTERVAL_SECONDS = 6 * 60 * 60
+
+def get_journal_store(journals_dir):
+    """Returns the (shared) JournalStore for a journals directory."""
+    journals_dir = os.path.abspath(journals_dir)
+    with _journal_stores_lock:
+        store = _journal_stores.get(journals_dir)
+        if store is None:
+            from backend.journal_store import JournalStore
+            store = _journal_stores[journals_dir] = JournalStore(journals_dir)
+    return store
+
+# Seconds between journal writes while an entry keeps being saved (e.g.
+# autosave with the journaling timer running)
+JOURNAL_FLUSH_INTERVAL_SECONDS = 5.0
+
+def write_journal_entry(journals_dir, filename, content):
+    """Writes one journal entry to disk (called by journal_writer)."""
+    store = get_journal_store(journals_dir)
+    change_watcher.watch_journals_dir(journals_dir)
+    with change_watcher.own_write(store.entry_path(filename), content):
+        store.save(filename, content)
+
+# Keeps the latest content per journal file and writes it at most once
+# per interval (see backend/journal_writer.py)
+journal_writer = None
+
+# Seconds between external-change polls (each poll is just os.stat calls
+# unless a file actually changed)
+WATCH_INTERVAL_SECONDS = 2.0
+
+# Origin used for changes that did not come from an app window
+EXTERNAL_ORIGIN = "external"
+
+@expose
 def get_app_info():
     """
     Returns application information.
@@ -183,7 +514,7 @@ def get_app_info():
         "platform": sys.platform
     }
 
-@eel.expose
+@expose
 def get_app_data_path():
     """
     Returns the path where app data should be stored.
@@ -227,7 +558,7 @@ def get_app_data_path():
     os.makedirs(app_data, exist_ok=True)
     return app_data
 
-@eel.expose
+@expose
 def save_file_dialog(default_filename="habit-tracker-backup.json"):
     """
     Opens a file save dialog (placeholder - not fully implemented).
@@ -254,7 +585,7 @@ def save_file_dialog(default_filename="habit-tracker-backup.json"):
     # This is a placeholder for future enhancement
     return {"success": False, "message": "File dialogs not implemented yet"}
 
-@eel.expose
+@expose
 def read_file(file_path):
     """
     Reads a file and returns its contents (for data import).
@@ -284,7 +615,7 @@ def read_file(file_path):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@eel.expose
+@expose
 def write_file(file_path, content):
     """
     Writes content to a file (for data export).
@@ -319,13 +650,19 @@ def write_file(file_path, content):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@eel.expose
+@expose
 def save_journal_file(journals_dir, filename, content):
     """
     Saves a journal entry to the file system.
     
-    Creates the journals directory if it doesn't exist, then saves
-    the journal entry as a JSON file.
+    Returns immediately: the content is handed to the coalescing journal
+    writer, which writes the latest version of each entry at most once
+    every JOURNAL_FLUSH_INTERVAL_SECONDS (temp file + rename), right away
+    when an entry for another day arrives, and on shutdown.
+    
+    Entries are sharded by month: the file goes to journals/YYYY/MM/
+    (created if needed). Closed months are later packed into a single
+    segment file by compact_journals().
     
     Args:
         journals_dir (str): Directory path where journals should be saved
@@ -336,7 +673,7 @@ def save_journal_file(journals_dir, filename, content):
         dict: Result object
             - success (bool): True if save succeeded, False otherwise
             - error (str): Error message (if failure)
-            - path (str): Full path to saved file (if success)
+            - path (str): Full path the file is written to (if success)
     
     Example (JavaScript):
         const result = await eel.save_journal_file('/path/to/journals', 'entry.json', jsonContent)()
@@ -345,15 +682,9 @@ def save_journal_file(journals_dir, filename, content):
         # Normalize directory path (handle both forward and backslashes)
         journals_dir = journals_dir.replace('\\', '/')
         
-        # Create directory if it doesn't exist
-        os.makedirs(journals_dir, exist_ok=True)
-        
-        # Construct full file path
-        file_path = os.path.join(journals_dir, filename)
-        
-        # Write file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Queue the write (as bytes so the watcher can recognize our own write)
+        journal_writer.submit(journals_dir, filename, content.encode('utf-8'))
+        file_path = get_journal_store(journals_dir).entry_path(filename)
         
         return {
             "success": True,
@@ -365,16 +696,20 @@ def save_journal_file(journals_dir, filename, content):
             "error": str(e)
         }
 
-@eel.expose
-def load_journal_files(journals_dir):
+@expose
+def load_journal_files(journals_dir, since=None):
     """
     Loads all journal entries from the file system.
     
-    Scans the journals directory for JSON files and reads them.
-    Returns all journal entries found.
+    Reads the packed segment of every closed month (one file read per
+    month) and the loose files of the open month, plus any files still in
+    the old flat layout. Returns all journal entries found, or with since
+    only the recent ones - older months aren't opened at all.
     
     Args:
         journals_dir (str): Directory path where journals are stored
+        since (str): First day to load - "YYYY-MM-DD", ISO timestamp or
+                     date key (optional - defaults to every entry)
     
     Returns:
         dict: Result object
@@ -388,6 +723,8 @@ def load_journal_files(journals_dir):
             const entries = result.entries
         }
     """
+    from backend.dates import parse_date
+    
     try:
         # Normalize directory path
         journals_dir = journals_dir.replace('\\', '/')
@@ -399,22 +736,10 @@ def load_journal_files(journals_dir):
                 "entries": []
             }
         
-        entries = []
-        
-        # Scan directory for JSON files
-        for filename in os.listdir(journals_dir):
-            if filename.endswith('.json'):
-                file_path = os.path.join(journals_dir, filename)
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        entry = json.loads(content)
-                        entries.append(entry)
-                except Exception as e:
-                    # Skip files that can't be read/parsed
-                    print(f"Warning: Could not read journal file {filename}: {e}")
-                    continue
+        change_watcher.watch_journals_dir(journals_dir)
+        # Entries still waiting in the writer must be on disk first
+        journal_writer.flush()
+        entries = get_journal_store(journals_dir).load_entries(parse_date(since))
         
         return {
             "success": True,
@@ -427,7 +752,7 @@ def load_journal_files(journals_dir):
             "entries": []
         }
 
-@eel.expose
+@expose
 def show_notification(title, message):
     """
     Shows a system notification (placeholder - not fully implemented).
@@ -455,7 +780,7 @@ def show_notification(title, message):
 # DESKTOP FILE STORAGE FUNCTIONS
 # ============================================================================
 
-@eel.expose
+@expose
 def get_desktop_path():
     """
     Returns the user's Desktop path.
@@ -484,19 +809,27 @@ def get_desktop_path():
             "error": str(e)
         }
 
-@eel.expose
-def save_all_data_to_file(file_path, data_json):
+@expose
+def save_all_data_to_file(file_path, data_json, client_id=None):
     """
     Saves all app data to a JSON file.
     
+    After writing, the saved sections are diffed against the in-memory
+    data store. Other open windows are notified about the sections that
+    actually changed (see register_client).
+    
     Args:
         file_path (str): Full path to the data file
         data_json (str): JSON string of all app data
+        client_id (str): Id of the window that is saving (optional)
     
     Returns:
         dict: Result object
             - success (bool): True if save succeeded
             - path (str): Full path to saved file (if success)
+            - revisions (dict): {section: revision} of the saved sections
+              right after the save, so the window can apply the next
+              change notifications as deltas (if success)
             - error (str): Error message (if failure)
     
     Example (JavaScript):
@@ -504,21 +837,20 @@ def save_all_data_to_file(file_path, data_json):
         const result = await eel.save_all_data_to_file('/path/to/data.json', JSON.stringify(allData))()
     """
     try:
-        # Ensure directory exists
-        directory = os.path.dirname(file_path)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-        
-        # Parse and pretty-print JSON
+        # Parse and write with pretty formatting
         data = json.loads(data_json)
+        write_data_document(file_path, data)
         
-        # Write file with pretty formatting
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Update the in-memory copy and notify other windows
+        data_store.apply_document(data, origin=client_id)
+        revisions = data_store.revisions()
+        record_checksums(file_path, data.get("data") or {})
         
         return {
             "success": True,
-            "path": file_path
+            "path": file_path,
+            "revisions": {name: revisions[name] for name in (data.get("data") or {})
+                          if name in revisions}
         }
     except Exception as e:
         return {
@@ -526,7 +858,63 @@ def save_all_data_to_file(file_path, data_json):
             "error": str(e)
         }
 
-@eel.expose
+def write_data_document(file_path, data):
+    """
+    Writes a data file document atomically and pretty-printed.
+    
+    The file is replaced in one rename, so a crash or a sync client never
+    sees a half-written file, and the write is recorded with the change
+    watcher so it isn't reported back as an external change.
+    
+    The habits section is written normalized: each habit definition is
+    stored once instead of on every day (see backend/habit_schema.py).
+    It is normalized from the data store's compact copy of the section,
+    so only the days that changed since the last save are converted; the
+    save's apply_sections() then reuses that copy.
+    
+    Args:
+        file_path (str): Full path to the data file
+        data (dict): Document to write ({"version", "lastUpdated", "data"})
+    """
+    from backend.fileio import atomic_write
+    from backend.habit_schema import normalize_document
+    
+    habits = (data.get("data") or {}).get("habits")
+    if habits is not None:
+        habits = data_store.preview_section("habits", habits)
+    document = normalize_document(data, habits)
+    content = json.dumps(document, indent=2, ensure_ascii=False)
+    change_watcher.watch_data_file(file_path)
+    with change_watcher.own_write(file_path, content):
+        atomic_write(file_path, content)
+
+def record_checksums(file_path, sections):
+    """
+    Updates the checksum sidecar after the data file was written.
+    
+    Uses the data store's section digests, which are only recomputed for
+    sections that changed. The review summaries and the binary snapshot
+    are saved alongside, so they stay valid for the file just written. A
+    failure here never fails the save itself.
+    
+    Args:
+        file_path (str): Full path to the data file
+        sections (iterable): Names of the sections that were written
+    """
+    try:
+        section_checksums.save(file_path, sections)
+    except OSError as e:
+        print(f"Warning: could not write checksums for {file_path}: {e}")
+    try:
+        review_engine.save(file_path)
+    except OSError as e:
+        print(f"Warning: could not write review summaries for {file_path}: {e}")
+    try:
+        snapshots.save(file_path)
+    except OSError as e:
+        print(f"Warning: could not write snapshot for {file_path}: {e}")
+
+@expose
 def load_all_data_from_file(file_path):
     """
     Loads all app data from a JSON file.
@@ -546,6 +934,8 @@ def load_all_data_from_file(file_path):
             const data = result.data
         }
     """
+    from backend.habit_schema import denormalize_document
+    
     try:
         if not os.path.exists(file_path):
             return {
@@ -554,7 +944,27 @@ def load_all_data_from_file(file_path):
             }
         
         with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            # Habits may be stored normalized - hand out the usual shape
+            data = denormalize_document(json.load(f))
+        
+        change_watcher.watch_data_file(file_path)
+        
+        # The first load only seeds the data store; later loads that
+        # differ from it are real changes the other windows should see
+        data_store.apply_document(data, notify=data_store.is_loaded)
+        set_reminder_completions((data.get('data') or {}).get('habits') or {})
+        
+        # Sections are compared with these checksums when first read
+        section_checksums.load(file_path)
+        
+        # Summaries of closed review periods, if saved for this data
+        review_engine.attach(file_path)
+        
+        # Give the next process a snapshot of what was just loaded
+        try:
+            snapshots.ensure(file_path)
+        except OSError as e:
+            print(f"Warning: could not write snapshot for {file_path}: {e}")
         
         return {
             "success": True,
@@ -566,7 +976,7 @@ def load_all_data_from_file(file_path):
             "error": str(e)
         }
 
-@eel.expose
+@expose
 def set_data_file_path(file_path):
     """
     Saves the chosen data file path to a config file.
@@ -589,11 +999,12 @@ def set_data_file_path(file_path):
         with open(config_path, 'w') as f:
             json.dump(config, f, indent=2)
         
+        change_watcher.watch_data_file(file_path)
         return {"success": True}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@eel.expose
+@expose
 def get_data_file_path():
     """
     Gets the saved data file path from config.
@@ -626,105 +1037,1681 @@ def get_data_file_path():
         return {"success": False, "error": str(e)}
 
 # ============================================================================
-# VALIDATION FUNCTIONS
+# BACKEND DATA ACCESS
 # ============================================================================
 
-def check_web_directory():
+def ensure_data_loaded():
     """
-    Verifies that the web directory exists and contains the built React app.
+    Makes sure the in-memory data store holds the saved data.
     
-    This function checks:
-    1. That the 'web' directory exists
-    2. That 'web/index.html' exists (entry point for the React app)
+    The data store is normally filled by the frontend's first load or
+    save. Backend features that run before that (exports, queries) load
+    the configured data file themselves.
     
     Returns:
-        bool: True if web directory is valid, False otherwise
-    
-    Side Effects:
-        Prints error messages to console if validation fails
+        bool: True if the data store has data
     """
-    web_dir = Path(web_path)
-    index_file = web_dir / 'index.html'
-    
-    if not web_dir.exists():
-        print(f"ERROR: 'web' directory not found at {web_dir}!")
-        print("Please run 'npm run build' first to build the React app.")
-        return False
-    
-    if not index_file.exists():
-        print(f"ERROR: 'web/index.html' not found at {index_file}!")
-        print("Please run 'npm run build' first to build the React app.")
-        return False
+    if data_store.is_loaded:
+        return True
+    config = get_data_file_path()
+    if config.get("success") and config.get("path"):
+        load_all_data_from_file(config["path"])
+    return data_store.is_loaded
+
+def current_sections():
+    """
+    Returns the current value of every known data section.
     
-    return True
+    Returns:
+        dict: {section_name: value} (sections never saved are omitted)
+    """
+    from backend.data_store import SECTION_STORAGE_KEYS
+    
+    ensure_data_loaded()
+    sections = {}
+    for name in SECTION_STORAGE_KEYS:
+        value = data_store.get_section(name)
+        if value is not None:
+            sections[name] = value
+    return sections
 
 # ============================================================================
-# MAIN APPLICATION ENTRY POINT
+# DATE RANGE QUERIES
 # ============================================================================
 
-def check_eel_available():
+@expose
+def query_range(section, start=None, end=None, descending=False):
     """
-    Verifies that Eel is available and can be imported.
+    Returns the records of a date-keyed section within a date range.
+    
+    Backed by a sorted ordinal-day index (see backend/day_index.py), so a
+    query costs two bisections plus the matching records - no parsing or
+    sorting of every date key like getDateRange()/getMoodHistory() do.
+    
+    Before the data file was loaded (right after a cold start), the days
+    are read from the data file's binary snapshot instead, decoding only
+    the matching records (see backend/snapshot.py).
+    
+    Args:
+        section (str): "habits", "mood" or "journals"
+        start (str): First day, inclusive - "YYYY-MM-DD", ISO timestamp or
+                     date key (optional - defaults to the earliest day)
+        end (str): Last day, inclusive, same formats (optional - defaults
+                   to the latest day)
+        descending (bool): Newest first instead of oldest first
     
     Returns:
-        bool: True if Eel is available, False otherwise
+        dict: Result object
+            - success (bool): True if the query ran
+            - section (str): Section name
+            - revision (int): Section revision the result reflects
+            - dates (list): Date keys of the matching days, in order
+            - records (list): Records for those days, in the same order
+            - error (str): Error message (if failure)
     
-    Side Effects:
-        Prints error messages to console if Eel is not available
+    Example (JavaScript):
+        const result = await eel.query_range('mood', '2024-12-01', '2024-12-31')()
+        if (result.success) {
+            result.dates.forEach((dateKey, i) => console.log(dateKey, result.records[i]))
+        }
     """
+    from backend.day_index import DAY_INDEXED_SECTIONS
+    
+    if section not in DAY_INDEXED_SECTIONS:
+        return {"success": False, "error": f"Section is not keyed by date: {section}"}
+    
     try:
-        import eel
-        return True
-    except ImportError:
-        print("ERROR: Eel library not found!")
-        print("")
-        print("Please install Eel:")
-        print("  1. Activate virtual environment: source venv/bin/activate")
-        print("  2. Install dependencies: pip install -r requirements.txt")
-        print("")
-        print("Or if venv doesn't exist, create it first:")
-        print("  python3 -m venv venv")
-        print("  source venv/bin/activate")
-        print("  pip install -r requirements.txt")
-        return False
+        pairs = None
+        if not data_store.is_loaded:
+            config = get_data_file_path()
+            if config.get("success") and config.get("path"):
+                pairs = snapshots.read_days(config["path"], section, start, end, descending)
+        if pairs is None:
+            ensure_data_loaded()
+            pairs = day_indexes.query_range(section, start, end, descending)
+        return {
+            "success": True,
+            "section": section,
+            "revision": data_store.get_revision(section),
+            "dates": [date_key for date_key, _ in pairs],
+            "records": [record for _, record in pairs]
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
-def main():
+# Days of the date-keyed sections the app loads at startup
+# (load_recent_data())
+STARTUP_DAYS = 62
+
+@expose
+def load_recent_data(days=STARTUP_DAYS):
     """
-    Main entry point for the desktop application.
+    Loads what the app needs at startup: the recent days of the
+    date-keyed sections (habits, mood, journals) and every other section.
     
-    This function:
-    1. Validates that the web directory exists
-    2. Checks that Eel is available
-    3. Detects available browser (Edge or Chrome)
-    4. Launches the browser in app mode
-    5. Starts the Eel server
+    Before the data file was loaded, this is read from the data file's
+    binary snapshot, decoding only the recent days, so it takes about the
+    same time however long the history is. Without a valid snapshot (or
+    once the data is loaded) it comes from the data store.
     
-    The app runs in standalone mode (no browser UI) using Chrome/Edge's
-    --app flag. Safari is not supported because it doesn't support app mode.
+    Args:
+        days (int): Days to load, ending today
     
-    Raises:
-        SystemExit: Exits with code 1 if web directory is missing,
-                   if Eel is not available, or if no supported browser is found
+    Returns:
+        dict: Result object
+            - success (bool): True if the data was loaded
+            - since (str): First day loaded ("YYYY-MM-DD")
+            - source (str): "snapshot" or "store"
+            - data (dict): {section: value} - date-keyed sections only
+              hold the days since `since`
+            - error (str): Error message (if failure)
     
-    Side Effects:
-        - Starts a local web server on port 8080
-        - Launches Chrome/Edge in app mode
-        - Blocks until the application is closed
+    Example (JavaScript):
+        const result = await eel.load_recent_data()()
+        if (result.success) {
+            Object.assign(moodData, result.data.mood)
+        }
     """
-    # Check Eel availability first
-    if not check_eel_available():
-        sys.exit(1)
-    
-    # Validate web directory before proceeding
-    if not check_web_directory():
-        sys.exit(1)
-    
-    print(f"Starting {APP_NAME} v{APP_VERSION}...")
-    print(f"Window size: {WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}")
+    from datetime import date, timedelta
+    from backend.data_store import SECTION_NAMES
+    from backend.day_index import DAY_INDEXED_SECTIONS
     
-    # ========================================================================
-    # BROWSER DETECTION
-    # ========================================================================
+    try:
+        since = date.today() - timedelta(days=max(int(days), 1) - 1)
+        sections, source = None, "snapshot"
+        if not data_store.is_loaded:
+            config = get_data_file_path()
+            if config.get("success") and config.get("path"):
+                sections = snapshots.read_recent(config["path"], since)
+        if sections is None:
+            if not ensure_data_loaded():
+                return {"success": False, "error": "No data file loaded"}
+            sections, source = {}, "store"
+            for name in SECTION_NAMES:
+                if data_store.get_revision(name) == 0:
+                    continue
+                if name in DAY_INDEXED_SECTIONS:
+                    sections[name] = dict(day_indexes.query_range(name, since))
+                else:
+                    sections[name] = data_store.get_section(name)
+        return {
+            "success": True,
+            "since": since.isoformat(),
+            "source": source,
+            "data": sections
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def get_time_series(series, start=None, end=None, width=None, window=None):
+    """
+    Returns chart data for weight or mood, downsampled to a chart width.
+    
+    Averages come from prefix sums (constant time for any range), and the
+    points are reduced with LTTB, which keeps the shape of the line. A
+    multi-year chart ships at most `width` points instead of one per day
+    (see backend/time_series.py).
+    
+    Args:
+        series (str): "weight" or "mood"
+        start (str): First day, inclusive - "YYYY-MM-DD", ISO timestamp or
+                     date key (optional - defaults to the earliest day)
+        end (str): Last day, inclusive, same formats (optional - defaults
+                   to the latest day)
+        width (int): Maximum number of points, e.g. the chart width in
+                     pixels (optional - defaults to every point)
+        window (int): Also return a trailing moving average over this many
+                      days (optional)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the query ran
+            - series (str): Series name
+            - points (list): [["YYYY-MM-DD", value], ...] oldest first
+            - movingAverage (list): Same format (only with window)
+            - count (int): Days with a value in the range
+            - average (float|None): Mean over the range (all days, not
+              just the returned points)
+            - min, max (float|None): Extremes over the range
+            - revision (int): Section revision the result reflects
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const chart = await eel.get_time_series('weight', '2020-01-01', null, 600, 7)()
+        if (chart.success) {
+            drawLine(chart.points)
+            drawLine(chart.movingAverage)
+        }
+    """
+    from backend.time_series import SERIES_FIELDS
+    
+    if series not in SERIES_FIELDS:
+        return {"success": False, "error": f"Unknown series: {series}"}
+    
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data file loaded"}
+        result = time_series.chart(series, start, end, width, window)
+        result.update({"success": True, "series": series})
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def get_heatmap_year(year):
+    """
+    Returns the calendar heatmap of a whole year in one call.
+    
+    Tiles are kept per year and updated when a day is saved, so the
+    calendar can page through months (and years) without recomputing
+    anything (see backend/heatmap_tiles.py).
+    
+    Slots follow a leap-year calendar: slot = day of year in a leap year
+    minus one, so Mar 1 is always slot 60 and slot 59 (Feb 29) stays 0
+    in common years.
+    
+    Args:
+        year (int): Calendar year
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the tile was returned (False when
+              no data file is loaded - the frontend computes locally)
+            - year (int): The year
+            - overall (list): 366 completion intensities (0-1)
+            - habits (dict): {habit id: 366 flags (0 or 1)}
+            - revision (int): Habits section revision the tile reflects
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const tile = await eel.get_heatmap_year(2024)()
+        const dec1 = tile.overall[334]
+    """
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data file loaded"}
+        result = heatmap_tiles.tile(year)
+        result["success"] = True
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# REVIEWS
+# ============================================================================
+
+@expose
+def get_current_review(period='week'):
+    """
+    Returns the statistics of the current week or month (up to today).
+    
+    Only the days saved since the last call are read again; the rest
+    comes from cached per-day totals (see backend/reviews.py). The
+    frontend words highlights and insights from these numbers.
+    
+    Args:
+        period (str): "week" (starting Sunday) or "month"
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the review was computed (False when
+              no data file is loaded - the frontend computes locally)
+            - review (dict): {"period", "startDate", "endDate", "closed",
+              "statistics", "bestDay", "worstDay", "mostConsistent",
+              "weeklyBreakdown" (months only)}
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.get_current_review('week')()
+        if (result.success) {
+            console.log(result.review.statistics.averageCompletionRate)
+        }
+    """
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data file loaded"}
+        return {"success": True, "review": review_engine.current(period)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def get_review_history(period='week', start=None, end=None):
+    """
+    Returns the reviews of every week or month in a date range.
+    
+    Closed periods are summarized once and saved next to the data file,
+    so years of reviews come back without recomputing them.
+    
+    Args:
+        period (str): "week" or "month"
+        start (str): First day, "YYYY-MM-DD" or date key (optional -
+                     defaults to the first tracked day)
+        end (str): Last day (optional - defaults to today)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the reviews were computed (False
+              when no data file is loaded)
+            - reviews (list): Reviews as in get_current_review, oldest first
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.get_review_history('week', '2022-01-01')()
+        const rates = result.reviews.map(r => r.statistics.averageCompletionRate)
+    """
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data file loaded"}
+        reviews = review_engine.history(period, start, end)
+        if review_engine.unsaved:
+            try:
+                review_engine.save()
+            except OSError as e:
+                print(f"Warning: could not write review summaries: {e}")
+        return {"success": True, "reviews": reviews}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# TODO QUERIES
+# ============================================================================
+
+@expose
+def query_todos(status='all', priority=None, goal_id=None, overdue=False,
+                offset=0, limit=50):
+    """
+    Returns one page of a filtered todo list, sorted like getTodosByPriority.
+    
+    Todos are kept in secondary indexes (due date, priority, goal,
+    completion) that are updated per todo on every save, so a page is
+    sliced out of them instead of sorting all todos (see
+    backend/todo_index.py).
+    
+    Args:
+        status (str): "all", "active" or "completed"
+        priority (str): "now", "next" or "later" (optional)
+        goal_id (str): Only todos linked to this goal (optional)
+        overdue (bool): Only incomplete todos due before today
+        offset (int): Todos to skip
+        limit (int): Page size (defaults to DEFAULT_PAGE_SIZE in
+                     backend/todo_index.py; null = all remaining)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the query succeeded
+            - todos (list): The page of todos
+            - total (int): Todos matching the filters
+            - offset (int), limit (int): The page that was returned
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const page = await eel.query_todos('active', 'now', null, false, 0, 20)()
+        console.log(`${page.todos.length} of ${page.total}`)
+    """
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data file loaded"}
+        result = todo_index.query(status, priority, goal_id, bool(overdue), offset, limit)
+        result["success"] = True
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def get_todo_counts():
+    """
+    Returns todo counts per status, priority and goal.
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the counts were computed
+            - total, active, completed, overdue (int): Todo counts
+            - byPriority (dict): {"now" | "next" | "later": active todos}
+            - byGoal (dict): {goal id: {"total", "completed"}}
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const counts = await eel.get_todo_counts()()
+        const done = counts.byGoal[goal.id]?.completed || 0
+    """
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data file loaded"}
+        result = todo_index.counts()
+        result["success"] = True
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# GOAL PROGRESS
+# ============================================================================
+
+@expose
+def get_goal_progress(goal_ids=None):
+    """
+    Returns the step and todo progress of many goals in one call.
+    
+    Goals are indexed by the steps and todos that link to them, and each
+    goal's progress is cached until one of its own steps or todos is
+    saved (see backend/goal_progress.py), so the goals page doesn't
+    rescan every step and todo per goal.
+    
+    Args:
+        goal_ids (list): Goal ids (optional - defaults to every goal)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the progress was computed
+            - goals (dict): {goal id: {"progress": completed steps,
+              "total": steps, "percentage", "todos": linked todos,
+              "completedTodos"}}
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.get_goal_progress()()
+        const { percentage } = result.goals[goal.id]
+    """
+    try:
+        ensure_data_loaded()
+        return {"success": True, "goals": goal_progress.progress(goal_ids)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# RECURRING TODOS
+# ============================================================================
+
+@expose
+def get_due_occurrences(start=None, end=None, paused=None):
+    """
+    Returns the occurrences of recurring todos within a date range.
+    
+    Recurring todos are kept expanded over the next 90 days and re-expanded
+    one at a time when they are saved, paused or resumed (see
+    backend/recurrence.py), so a range inside that window costs a lookup
+    instead of evaluating every rule.
+    
+    Args:
+        start (str): First day, "YYYY-MM-DD" (optional - defaults to today)
+        end (str): Last day, "YYYY-MM-DD" (optional - defaults to 90 days
+                   from today)
+        paused (list): Ids in paused-recurring-todos (optional - defaults
+                       to the ids sent last)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the query succeeded
+            - occurrences (list): [{"id", "title", "date": "YYYY-MM-DD"}],
+              by date
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.get_due_occurrences('2024-12-01', '2024-12-07', ['1733000000000'])()
+        result.occurrences.forEach(o => console.log(o.date, o.title))
+    """
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data file loaded"}
+        if paused is not None:
+            recurrence_engine.set_paused(paused)
+        return {"success": True, "occurrences": recurrence_engine.due(start, end)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# DATA EXPORT
+# ============================================================================
+
+@expose
+def export_data_to_file(output_path=None, export_format='json', date_range=None):
+    """
+    Exports all data to a JSON or CSV file, streaming it record by record.
+    
+    Unlike the in-browser export (exportAllData + downloadData), the
+    export is never held in memory as one string - records are read from
+    the data store a batch at a time and written to disk in 64 KB chunks,
+    so exporting years of data uses constant memory.
+    
+    Args:
+        output_path (str): Destination file (optional - defaults to
+                           ~/Desktop/habit-tracker-export-YYYY-MM-DD.<ext>)
+        export_format (str): "json" or "csv"
+        date_range (dict): Optional {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the export was written
+            - path (str): Path of the export file (if success)
+            - counts (dict): Rows written per section (if success)
+            - bytes (int): File size in bytes (if success)
+            - seconds (float): Time taken (if success)
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.export_data_to_file(null, 'csv', { start: '2024-01-01', end: '2024-12-31' })()
+        if (result.success) {
+            console.log(`Exported to ${result.path}`)
+        }
+    """
+    from backend.export_writer import export_to_file
+    
+    try:
+        if not ensure_data_loaded():
+            return {"success": False, "error": "No data loaded to export"}
+        
+        if not output_path:
+            from datetime import date
+            extension = 'csv' if export_format == 'csv' else 'json'
+            output_path = str(Path.home() / 'Desktop' /
+                              f"habit-tracker-export-{date.today().isoformat()}.{extension}")
+        
+        result = export_to_file(output_path, data_store, export_format, date_range)
+        return {"success": True, **result}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# DATA IMPORT
+# ============================================================================
+
+@expose
+def import_data(import_json, mode='merge', policy='theirs', file_path=None):
+    """
+    Imports a backup/export file into the data file.
+    
+    Validation, indexing and merging happen in one pass per section using
+    hash indexes on date keys and ids (see backend/import_engine.py), so
+    merging is linear in the number of records. The merged result is
+    written to the data file atomically and every open window receives
+    on_data_changed notifications for the sections that changed.
+    
+    Args:
+        import_json (str): Contents of the file being imported
+        mode (str): "replace" or "merge"
+        policy (str): Conflict policy for merge mode - "theirs" (imported
+                      record wins), "ours" (existing record wins) or
+                      "newest" (later updatedAt/timestamp wins)
+        file_path (str): Data file to import into (optional - defaults to
+                         the configured data file)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the import was written
+            - warning (str): Version compatibility warning (if any)
+            - sections (dict): {"added", "updated", "kept", "invalid"} per section
+            - invalid (int): Total records skipped as invalid
+            - problems (list): Descriptions of the first skipped records
+            - timings (dict): Seconds spent parsing, merging and writing
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.import_data(fileText, 'merge', 'newest')()
+        if (result.success) {
+            console.log(result.sections.todos)  // { added: 12, updated: 3, kept: 0, invalid: 0 }
+        }
+    """
+    from backend.habit_schema import DOCUMENT_VERSION, denormalize_document
+    from backend.import_engine import ImportValidationError, merge_import
+    
+    try:
+        if not file_path:
+            config = get_data_file_path()
+            file_path = config.get("path") if config.get("success") else None
+        if not file_path:
+            return {"success": False, "error": "No data file path configured"}
+        
+        started = time.perf_counter()
+        # A copy of the data file holds the habits section normalized
+        document = denormalize_document(json.loads(import_json))
+        parsed = time.perf_counter()
+        
+        merged, report, warning = merge_import(current_sections(), document, mode, policy)
+        
+        write_started = time.perf_counter()
+        from datetime import datetime, timezone
+        write_data_document(file_path, {
+            "version": DOCUMENT_VERSION,
+            "lastUpdated": datetime.now(timezone.utc).isoformat(),
+            "data": merged
+        })
+        data_store.apply_sections(merged, origin="import")
+        record_checksums(file_path, merged)
+        finished = time.perf_counter()
+        
+        report["timings"]["parse"] = round(parsed - started, 4)
+        report["timings"]["write"] = round(finished - write_started, 4)
+        report["timings"]["total"] = round(finished - started, 4)
+        return {"success": True, "warning": warning, **report}
+    except ImportValidationError as e:
+        return {"success": False, "error": str(e)}
+    except ValueError as e:
+        return {"success": False, "error": f"Parse error: {e}"}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# EDIT HISTORY
+# ============================================================================
+
+def save_history_sections(sections):
+    """
+    Writes sections reconstructed by the edit history to the data file.
+    
+    Saved with HISTORY_ORIGIN, so every open window (including the one
+    that asked) is notified and the history doesn't record the save as
+    a new edit.
+    
+    Args:
+        sections (dict): {section_name: value} to replace
+    
+    Raises:
+        ValueError: If no data file path is configured
+    """
+    config = get_data_file_path()
+    file_path = config.get("path") if config.get("success") else None
+    if not file_path:
+        raise ValueError("No data file path configured")
+    from datetime import datetime, timezone
+    from backend.habit_schema import DOCUMENT_VERSION
+    from backend.history import HISTORY_ORIGIN
+    data = {**current_sections(), **sections}
+    write_data_document(file_path, {
+        "version": DOCUMENT_VERSION,
+        "lastUpdated": datetime.now(timezone.utc).isoformat(),
+        "data": data
+    })
+    data_store.apply_sections(sections, origin=HISTORY_ORIGIN)
+    record_checksums(file_path, data)
+
+@expose
+def get_edit_history(limit=50):
+    """
+    Returns the newest entries of the undo/redo history.
+    
+    Every save is recorded as the records it changed per section, with a
+    checkpoint of the edited sections every 100 entries, so thousands of
+    steps fit in memory (see backend/history.py).
+    
+    Args:
+        limit (int): Most entries to return (null = all)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the history was read
+            - entries (list): [{"id", "time", "origin",
+              "sections": {section: {"upserted", "removed"}}}], newest first
+            - cursor (int): Entry id the data is at (entries above it were undone)
+            - oldest (int): Oldest position that can be restored
+            - canUndo (bool), canRedo (bool)
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const history = await eel.get_edit_history(20)()
+        undoButton.disabled = !history.canUndo
+    """
+    try:
+        ensure_data_loaded()
+        result = edit_history.entries(limit)
+        result["success"] = True
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def undo_edit():
+    """
+    Reverts the latest save that wasn't undone yet.
+    
+    The affected sections are reconstructed from the nearest checkpoint
+    and written to the data file; open windows receive on_data_changed
+    notifications for them.
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the save was reverted
+            - sections (list): Sections that were changed
+            - error (str): Error message (if failure, e.g. nothing to undo)
+    
+    Example (JavaScript):
+        const result = await eel.undo_edit()()
+        if (!result.success) console.log(result.error)
+    """
+    try:
+        ensure_data_loaded()
+        return {"success": True, "sections": edit_history.undo(save_history_sections)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def redo_edit():
+    """
+    Re-applies the latest undone save.
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the save was re-applied
+            - sections (list): Sections that were changed
+            - error (str): Error message (if failure, e.g. nothing to redo)
+    
+    Example (JavaScript):
+        const result = await eel.redo_edit()()
+    """
+    try:
+        ensure_data_loaded()
+        return {"success": True, "sections": edit_history.redo(save_history_sections)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def restore_edit(entry_id):
+    """
+    Moves the data to any point in the history, backwards or forwards.
+    
+    Args:
+        entry_id (int): Entry to restore (the state right after it was
+                        saved); the "oldest" position restores the state
+                        before the oldest entry
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the data was restored
+            - sections (list): Sections that were changed
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const history = await eel.get_edit_history()()
+        await eel.restore_edit(history.entries[5].id)()
+    """
+    try:
+        ensure_data_loaded()
+        return {"success": True, "sections": edit_history.restore(entry_id, save_history_sections)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def get_history_state(entry_id, sections=None):
+    """
+    Reconstructs sections as they were at a point in the history,
+    without changing any data (e.g. to preview a restore).
+    
+    Args:
+        entry_id (int): Entry id (the state right after that entry)
+        sections (list): Sections to return (optional - defaults to every
+                         section edited during the session)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the state was reconstructed
+            - sections (dict): {section: value}
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const past = await eel.get_history_state(42, ['todos'])()
+        console.log(past.sections.todos.length)
+    """
+    try:
+        ensure_data_loaded()
+        return {"success": True, "sections": edit_history.state_at(entry_id, sections)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# ============================================================================
+# CHANGE BROADCAST BETWEEN WINDOWS
+# ============================================================================
+
+@expose
+def register_client(client_id):
+    """
+    Registers an open window so it receives change notifications.
+    
+    Every window calls this once on startup with a random client id.
+    Whenever a window saves, the others receive a compact notification
+    through their exposed on_data_changed handler listing the changed
+    sections, their new revisions and (for small edits) the changed
+    records themselves.
+    
+    Args:
+        client_id (str): Random id generated by the window
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if registered
+            - revisions (dict): Current revision of every known section
+    
+    Example (JavaScript):
+        window.eel.expose(onDataChanged, 'on_data_changed')
+        await window.eel.register_client(clientId)()
+    """
+    try:
+        change_broadcaster.register_client(client_id)
+        return {"success": True, "revisions": data_store.revisions()}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@expose
+def unregister_client(client_id):
+    """
+    Unregisters a window (called from its beforeunload handler).
+    
+    Args:
+        client_id (str): Id passed to register_client
+    
+    Returns:
+        dict: Always returns {"success": True}
+    """
+    change_broadcaster.unregister_client(client_id)
+    return {"success": True}
+
+@expose
+def get_section(section):
+    """
+    Returns the latest saved value of a single data section.
+    
+    Windows call this when a change notification arrives without an
+    inline delta, so only the affected section is transferred instead of
+    reloading the whole data file.
+    
+    Args:
+        section (str): Section name (e.g. "habits", "todos", "mood")
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the section is known
+            - section (str): Section name
+            - storageKey (str): localStorage key for the section
+            - revision (int): Current revision of the section
+            - integrity (str): "ok", "mismatch" or "unknown" - the section
+              checked against the data file's saved checksums
+            - value: Section value (if success)
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await window.eel.get_section('todos')()
+        if (result.success) {
+            localStorage.setItem(result.storageKey, JSON.stringify(result.value))
+        }
+    """
+    from backend.data_store import SECTION_STORAGE_KEYS
+    
+    if section not in SECTION_STORAGE_KEYS:
+        return {"success": False, "error": f"Unknown section: {section}"}
+    
+    value = data_store.get_section(section)
+    if value is None:
+        return {"success": False, "error": "Section not loaded"}
+    
+    return {
+        "success": True,
+        "section": section,
+        "storageKey": SECTION_STORAGE_KEYS[section],
+        "revision": data_store.get_revision(section),
+        "integrity": section_checksums.verify(section),
+        "value": value
+    }
+
+# ============================================================================
+# EXTERNAL CHANGE DETECTION
+# ============================================================================
+
+@expose
+def check_external_changes():
+    """
+    Checks the data file and journals directory for edits made elsewhere.
+    
+    Runs every WATCH_INTERVAL_SECONDS from a background loop, and can also
+    be called from JavaScript to check immediately (e.g. when a window
+    regains focus). Unchanged files cost one os.stat each; changed files
+    are hashed and only parsed if their content really differs from what
+    the app last read or wrote.
+    
+    Changed sections go through the data store, so every window receives
+    the usual on_data_changed notification (with origin "external")
+    listing only the sections that changed.
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the check ran
+            - sections (list): Names of the sections that changed
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.check_external_changes()()
+        console.log(result.sections)  // ["mood", "todos"]
+    """
+    from backend.habit_schema import denormalize_document
+    
+    try:
+        changes = []
+        
+        document = change_watcher.poll_data_file()
+        if document is not None:
+            document = denormalize_document(document)
+            changes += data_store.apply_document(document, origin=EXTERNAL_ORIGIN)
+            # A synced edit brings its own checksums (or leaves ours stale);
+            # the changed sections are checked against them when read
+            section_checksums.load(change_watcher.data_path)
+            try:
+                snapshots.ensure(change_watcher.data_path)
+            except OSError as e:
+                print(f"Warning: could not write snapshot: {e}")
+        
+        entries = change_watcher.poll_journals()
+        if entries:
+            journals = dict(data_store.get_section('journals') or {})
+            for entry in entries:
+                if isinstance(entry, dict) and entry.get('date'):
+                    journals[entry['date']] = entry
+            changes += data_store.apply_sections({'journals': journals}, origin=EXTERNAL_ORIGIN)
+        
+        return {
+            "success": True,
+            "sections": [change.section for change in changes]
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e), "sections": []}
+
+def watch_for_external_changes():
+    """
+    Background loop that polls for external changes.
+    
+    Started with eel.spawn() so it runs cooperatively alongside the Eel
+    server; eel.sleep() yields to the server between polls.
+    """
+    while True:
+        eel.sleep(WATCH_INTERVAL_SECONDS)
+        result = check_external_changes()
+        if result["success"] and result["sections"]:
+            print(f"External change detected in: {', '.join(result['sections'])}")
+        elif not result["success"]:
+            print(f"Warning: external change check failed: {result['error']}")
+
+# ============================================================================
+# REMINDER SCHEDULER
+# ============================================================================
+
+def fire_reminder(reminder, fire_at):
+    """
+    Delivers a due reminder.
+    
+    Shows a system notification and tells one open window (the one open
+    longest), which shows a browser notification with complete/snooze
+    actions (see onReminderDue in src/utils/reminderScheduler.js). The
+    payload is sent to every window, but names the one that should act
+    on it, so the notification isn't shown once per window.
+    
+    Args:
+        reminder (dict): Reminder config ({"habitId", "time", "days", ...})
+        fire_at (datetime): Scheduled fire time
+    """
+    from backend.dates import format_date_key
+    
+    habit_id = str(reminder.get('habitId'))
+    habit = {}
+    today = data_store.get_record('habits', format_date_key(fire_at.date())) or {}
+    for entry in today.get('habits') or []:
+        if str(entry.get('id')) == habit_id:
+            habit = entry
+            break
+    
+    name = habit.get('name', 'Habit')
+    show_notification(f"{habit.get('emoji', '📝')} {name}", f"Time for: {name}")
+    client = change_broadcaster.primary_client()
+    if client is None:
+        return
+    _push_to_frontend('on_reminder_due', {
+        "client": client,
+        "habitId": reminder.get('habitId'),
+        "time": reminder.get('time'),
+        "firedAt": fire_at.isoformat()
+    })
+
+# Min-heap of upcoming reminder times (see backend/reminder_scheduler.py)
+reminder_scheduler = None
+
+def set_reminder_completions(habits):
+    """
+    Tells the scheduler which habits are done today.
+    
+    Args:
+        habits (dict): Date-keyed habits section (plain or compact)
+    """
+    from datetime import date
+    from backend.dates import format_date_key
+    day = habits.get(format_date_key(date.today())) or {}
+    completed = [h.get('id') for h in day.get('habits') or [] if h.get('completed')]
+    reminder_scheduler.set_completed(date.today(), completed)
+
+def update_reminder_completions(changes, origin):
+    """
+    Data store listener - tells the scheduler which habits are done today.
+    
+    Only reacts when today's day record changed, so the reminder heap is
+    touched only when completions actually change. The first load doesn't
+    notify listeners; load_all_data_from_file() seeds the scheduler itself.
+    """
+    from datetime import date
+    from backend.dates import format_date_key
+    today_key = format_date_key(date.today())
+    for change in changes:
+        if change.section == 'habits' and today_key in change.upserted:
+            set_reminder_completions(change.new_value)
+
+@expose
+def sync_reminders(reminders):
+    """
+    Hands the current reminder settings to the backend scheduler.
+    
+    Called by the frontend on startup and whenever a reminder is saved or
+    deleted. Only reminders that actually changed are rescheduled.
+    
+    Args:
+        reminders (dict): {habitId: reminder} as stored by reminderStorage.js
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the reminders were scheduled
+            - scheduled (int): Number of reminders with an upcoming fire time
+            - next (str): ISO time of the next reminder (or None)
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        await eel.sync_reminders(getAllReminders())()
+    """
+    try:
+        reminder_scheduler.sync_reminders(reminders)
+        upcoming = reminder_scheduler.upcoming()
+        return {
+            "success": True,
+            "scheduled": len(upcoming),
+            "next": upcoming[0][0].isoformat() if upcoming else None
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def run_reminder_scheduler():
+    """
+    Background loop that fires reminders.
+    
+    Sleeps until the earliest reminder is due (or indefinitely when there
+    are none) and wakes early only when reminders or completions change,
+    so it uses no CPU between reminders. Started with eel.spawn().
+    """
+    from gevent.event import Event
+    
+    wakeup = Event()
+    reminder_scheduler.on_change = wakeup.set
+    while True:
+        reminder_scheduler.run_due()
+        wakeup.wait(timeout=reminder_scheduler.seconds_until_next())
+        wakeup.clear()
+
+# ============================================================================
+# JOURNAL WRITES AND COMPACTION
+# ============================================================================
+
+def run_journal_writer():
+    """
+    Background loop that writes queued journal entries.
+    
+    Runs in a daemon thread; sleeps until the journal writer has a flush
+    due, writes it, and stops once the writer is closed at shutdown.
+    """
+    while True:
+        if journal_writer.wait():
+            journal_writer.flush()
+        elif journal_writer.closed:
+            return
+
+@expose
+def compact_journals(journals_dir=None):
+    """
+    Packs every closed journal month into a single segment file.
+    
+    Files still in the old flat layout are moved into their month first.
+    The open month is left as loose files. Runs automatically in the
+    background (run_journal_compaction()); exposed for manual use.
+    
+    Args:
+        journals_dir (str): Journals directory (optional - defaults to
+                            the app data journals directory)
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if compaction ran
+            - moved (int): Flat files moved into month directories
+            - months (int): Months packed
+            - entries (int): Entries in the packed months
+            - error (str): Error message (if failure)
+    
+    Example (JavaScript):
+        const result = await eel.compact_journals()()
+    """
+    try:
+        if not journals_dir:
+            journals_dir = os.path.join(get_app_data_path(), 'journals')
+        stats = get_journal_store(journals_dir).compact()
+        return {"success": True, **stats}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def run_journal_compaction():
+    """
+    Background loop that packs closed journal months.
+    
+    Runs in a daemon thread so the file I/O never blocks the Eel server:
+    once shortly after startup (a new month may have begun since the
+    last run), then every few hours.
+    """
+    time.sleep(JOURNAL_COMPACTION_DELAY_SECONDS)
+    while True:
+        result = compact_journals()
+        if not result["success"]:
+            print(f"Warning: journal compaction failed: {result['error']}")
+        elif result["months"]:
+            print(f"Packed {result['entries']} journal entries in {result['months']} month(s)")
+        time.sleep(JOURNAL_COMPACTION_INTERVAL_SECONDS)
+
+# ============================================================================
+# CHUNKED RESPONSES
+# ============================================================================
+
+# Endpoints whose results may be sent through call_chunked()
+CHUNKABLE_FUNCTIONS = ("load_all_data_from_file", "load_journal_files", "load_recent_data")
+
+# Large results waiting to be fetched chunk by chunk
+# (see backend/chunked_transport.py)
+chunked_transfers = None
+
+@expose
+def call_chunked(function_name, args=None, compress=True):
+    """
+    Calls an endpoint and sends a large result in compressed chunks.
+    
+    Results under the size threshold are returned unchanged, exactly as
+    calling the endpoint directly. Larger results are kept on the backend
+    and only a transfer header is returned; the window then fetches the
+    chunks one message at a time with fetch_chunk().
+    
+    Args:
+        function_name (str): Endpoint to call (see CHUNKABLE_FUNCTIONS)
+        args (list): Positional arguments for the endpoint
+        compress (bool): Deflate-compress the chunks (the window passes
+                         False when it has no DecompressionStream)
+    
+    Returns:
+        dict: The endpoint's result, or a transfer header:
+            - chunked (bool): True
+            - transferId (str): Id to pass to fetch_chunk()
+            - chunks (int): Number of chunks
+            - encoding (str): "deflate" or "identity"
+            - bytes (int): Size of the uncompressed part stream
+            - encodedBytes (int): Size of all chunks together
+    
+    Example (JavaScript):
+        // Use callChunked() from src/utils/chunkedTransport.js
+        const result = await callChunked('load_all_data_from_file', [path])
+    """
+    if function_name not in CHUNKABLE_FUNCTIONS:
+        return {
+            "success": False,
+            "error": f"{function_name} can't be called in chunks"
+        }
+    result = globals()[function_name](*(args or []))
+    try:
+        header = chunked_transfers.create(result, compress=bool(compress))
+    except (TypeError, ValueError) as e:
+        print(f"Warning: could not chunk {function_name} result: {e}")
+        return result
+    return header or result
+
+@expose
+def fetch_chunk(transfer_id, seq):
+    """
+    Returns one chunk of a transfer started by call_chunked().
+    
+    Args:
+        transfer_id (str): Id from the transfer header
+        seq (int): Chunk sequence number, from 0
+    
+    Returns:
+        dict: Result object
+            - success (bool): True if the chunk exists
+            - seq (int): Sequence number of the chunk
+            - data (str): Base64 chunk bytes
+            - last (bool): True for the final chunk (the transfer is
+              released after it)
+            - error (str): Error message (if failure)
+    """
+    try:
+        chunk = chunked_transfers.chunk(transfer_id, int(seq))
+    except (KeyError, ValueError, TypeError):
+        return {
+            "success": False,
+            "error": f"Unknown or expired chunk {seq} of transfer {transfer_id}"
+        }
+    chunk["success"] = True
+    return chunk
+
+@expose
+def cancel_transfer(transfer_id):
+    """Releases a transfer the window stopped fetching."""
+    chunked_transfers.cancel(transfer_id)
+    return {"success": True}
+
+# ============================================================================
+# PERFORMANCE STATS
+# ============================================================================
+
+@expose
+def get_perf_stats():
+    """
+    Reports timings of backend work.
+    
+    Returns:
+        dict: Result object
+            - success (bool): Always True
+            - integrity (dict): Checksum verification
+                - sections (dict): {section: "ok" | "mismatch" | "unknown"}
+                - verified (int): Sections verified so far
+                - verifyMs (float): Time spent comparing digests
+                - loadMs (float): Time spent reading the checksum file
+                - digested (int): Section values hashed by the data store
+                - digestMs (float): Time spent hashing them (the bulk of
+                  the verification cost, paid when a section is first read
+                  or saved)
+            - recurrence (dict): Recurring todo expansion
+                - windowDays (int): Days kept expanded
+                - todos (int): Recurring todos
+                - occurrences (int): Occurrences in the window
+                - expanded (int): Todo expansions computed so far
+            - goals (dict): Goal progress cache
+                - cached (int): Goals with cached progress
+                - steps (int), linkedTodos (int): Indexed steps and todos
+                - computed (int): Goal progresses computed so far
+            - history (dict): Undo/redo history
+                - entries (int), checkpoints (int): History size
+                - cursor (int): Entry id the data is at
+                - sections (list): Sections edited this session
+            - snapshot (dict): Binary snapshot writes
+                - encoded (int): Sections encoded so far
+                - reused (int): Unchanged sections copied as they were
+                - open (bool): Whether a snapshot is mapped
+    
+    Example (JavaScript):
+        const stats = await eel.get_perf_stats()()
+        console.log(`Hashing took ${stats.integrity.digestMs} ms`)
+    """
+    return {
+        "success": True,
+        "integrity": section_checksums.stats(),
+        "recurrence": recurrence_engine.stats(),
+        "goals": goal_progress.stats(),
+        "history": edit_history.stats(),
+        "snapshot": snapshots.stats()
+    }
+
+# ============================================================================
+# VALIDATION FUNCTIONS
+# ============================================================================
+
+def check_web_directory():
+    """
+    Verifies that the web directory exists and contains the built React app.
+    
+    This function checks:
+    1. That the 'web' directory exists
+    2. That 'web/index.html' exists (entry point for the React app)
+    
+    Returns:
+        bool: True if web directory is valid, False otherwise
+    
+    Side Effects:
+        Prints error messages to console if validation fails
+    """
+    if web_archive is not None:
+        if 'index.html' not in web_archive:
+            print(f"ERROR: 'index.html' not found in {web_archive.path}!")
+            return False
+        return True
+    
+    web_dir = Path(web_path)
+    index_file = web_dir / 'index.html'
+    
+    if not web_dir.exists():
+        print(f"ERROR: 'web' directory not found at {web_dir}!")
+        print("Please run 'npm run build' first to build the React app.")
+        return False
+    
+    if not index_file.exists():
+        print(f"ERROR: 'web/index.html' not found at {index_file}!")
+        print("Please run 'npm run build' first to build the React app.")
+        return False
+    
+    return True
+
+# ============================================================================
+# SINGLE INSTANCE
+# ============================================================================
+
+# Lock + command channel of this process once it's the running instance
+# (see backend/single_instance.py)
+app_instance = None
+
+# Browser the running instance opens windows with (set by main())
+app_browser_path = None
+
+# How long a second launch keeps trying to reach an instance that holds
+# the lock but may still be starting up
+HANDOFF_RETRY_SECONDS = 5.0
+
+def claim_single_instance(app_data=None):
+    """
+    Makes this process the running instance, or hands off to the existing one.
+    
+    Runs before Eel is imported, so a second launch only costs the lock
+    attempt and one loopback round trip: it asks the running instance to
+    open/focus a window and then exits.
+    
+    Args:
+        app_data (str): Directory holding the lock (optional - defaults to
+                        the app data directory)
+    
+    Returns:
+        bool: True if this process should continue starting up
+    
+    Side Effects:
+        - Sets the module-level app_instance
+        - Writes instance.lock / instance.json to the app data directory
+    """
+    global app_instance
+    from backend.single_instance import InstanceLock, send_command
+    
+    app_data = app_data or get_app_data_path()
+    instance = InstanceLock(app_data)
+    if instance.acquire():
+        instance.listen()
+        app_instance = instance
+        return True
+    
+    # Windows only lets the foreground process (this one, just launched by
+    # the user) pass the foreground on - allow the running instance to
+    # raise its window
+    if sys.platform == "win32":
+        import ctypes
+        ASFW_ANY = -1
+        ctypes.windll.user32.AllowSetForegroundWindow(ASFW_ANY)
+    
+    # The running instance may still be starting and not listening yet
+    deadline = time.perf_counter() + HANDOFF_RETRY_SECONDS
+    while time.perf_counter() < deadline:
+        if send_command(app_data, "focus"):
+            print(f"{APP_NAME} is already running - switched to its window")
+            return False
+        time.sleep(0.05)
+    
+    print(f"ERROR: {APP_NAME} is already running but not responding.")
+    return False
+
+def run_instance_listener():
+    """
+    Answers commands from later launches of the app.
+    
+    Started with eel.spawn(); waits on the command socket cooperatively,
+    so it costs nothing until a second launch connects.
+    """
+    from gevent.select import select
+    
+    while app_instance is not None and app_instance.listener is not None:
+        select([app_instance.listener], [], [])
+        try:
+            message = app_instance.accept_command(wait=select)
+        except OSError:
+            continue
+        if message and message.get("command") == "focus":
+            focus_app_window()
+
+def focus_app_window():
+    """
+    Brings the open app window to the front, or opens one if none is open.
+    
+    A window counts as open while its page is connected to Eel. The window
+    open longest is asked to focus itself (window.focus() in
+    onFocusRequested, src/utils/desktopStorage.js) and the OS is asked to
+    raise it, since browsers may ignore window.focus() for a window they
+    didn't open from script.
+    """
+    if not getattr(eel, '_websockets', None):
+        if app_browser_path:
+            launch_app_window(app_browser_path)
+        return
+    
+    client = change_broadcaster.primary_client()
+    if client is not None:
+        _push_to_frontend('on_focus_requested', {"client": client})
+    raise_app_window()
+
+def raise_app_window():
+    """
+    Asks the OS to bring the app window to the front (best effort).
+    
+    - Windows: finds the window by its title (the second launch allowed
+      this process to take the foreground, see claim_single_instance())
+    - macOS: raises the browser window with the app's title via AppleScript
+    - Linux: uses wmctrl when it's installed
+    """
+    import shutil
+    import subprocess
+    
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            SW_RESTORE = 9
+            user32 = ctypes.windll.user32
+            window = user32.FindWindowW(None, APP_WINDOW_TITLE)
+            if window:
+                if user32.IsIconic(window):
+                    user32.ShowWindow(window, SW_RESTORE)
+                user32.SetForegroundWindow(window)
+        elif sys.platform == "darwin":
+            if app_browser_path and '.app/' in app_browser_path:
+                # ".../Google Chrome.app/Contents/MacOS/Google Chrome" -> "Google Chrome"
+                browser = os.path.basename(app_browser_path.split('.app/')[0])
+                subprocess.Popen(['osascript',
+                                  '-e', f'tell application "{browser}"',
+                                  '-e', f'set index of (first window whose title is "{APP_WINDOW_TITLE}") to 1',
+                                  '-e', 'activate',
+                                  '-e', 'end tell'],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elif shutil.which('wmctrl'):
+            subprocess.Popen(['wmctrl', '-a', APP_WINDOW_TITLE])
+    except Exception as e:
+        print(f"Warning: could not bring the app window to the front: {e}")
+
+# ============================================================================
+# STARTUP REPORT
+# ============================================================================
+
+def report_server_ready(report_path, port):
+    """
+    Writes a startup report once the server accepts connections, then exits.
+    
+    Used by package.py to time packaged builds and to trace which modules a
+    real run imports (so unused ones can be left out of the bundle). Every
+    backend module is imported before the module list is taken, so modules
+    that are only imported lazily still end up in the trace.
+    
+    Args:
+        report_path (str): JSON file to write
+        port (int): Port the Eel server listens on
+    
+    Side Effects:
+        - Writes {"readyMs": ..., "modules": [...]} to report_path
+        - Terminates the process
+    """
+    import importlib
+    import pkgutil
+    import socket
+    import backend
+    
+    while True:
+        try:
+            socket.create_connection(('localhost', port), timeout=0.5).close()
+            break
+        except OSError:
+            eel.sleep(0.01)
+    ready_ms = (time.perf_counter() - STARTUP_STARTED) * 1000
+    
+    for module in pkgutil.iter_modules(backend.__path__):
+        importlib.import_module(f'backend.{module.name}')
+    
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'readyMs': round(ready_ms, 1), 'modules': sorted(sys.modules)}, f)
+    os._exit(0)
+
+# ============================================================================
+# MAIN APPLICATION ENTRY POINT
+# ============================================================================
+
+def check_eel_available():
+    """
+    Verifies that Eel is available and imports it.
+    
+    This is the first point at which Eel - and with it gevent, bottle and
+    greenlet - is imported.
+    
+    Returns:
+        bool: True if Eel is available, False otherwise
+    
+    Side Effects:
+        - Sets the module-level eel
+        - Prints error messages to console if Eel is not available
+    """
+    global eel
+    try:
+        import eel as eel_module
+        eel = eel_module
+        return True
+    except ImportError:
+        print("ERROR: Eel library not found!")
+        print("")
+        print("Please install Eel:")
+        print("  1. Activate virtual environment: source venv/bin/activate")
+        print("  2. Install dependencies: pip install -r requirements.txt")
+        print("")
+        print("Or if venv doesn't exist, create it first:")
+        print("  python3 -m venv venv")
+        print("  source venv/bin/activate")
+        print("  pip install -r requirements.txt")
+        return False
+
+def launch_app_window(browser_path, delay=0.0):
+    """
+    Launch Edge/Chrome in app mode pointing to the Eel server.
+    
+    Called from a separate thread at startup to avoid blocking: it waits
+    a short time for the Eel server to start, then launches the browser
+    with the --app flag for standalone mode. Also called when a second
+    launch asks the running instance for a window.
+    
+    Browser flags:
+    - --app: Run in app mode (no browser UI)
+    - --window-size: Set window dimensions
+    - --disable-web-security: Allow local file access (dev only)
+    - --disable-features=TranslateUI: Disable translation UI
+    - --disable-background-networking: Reduce background processes
+    - --no-first-run: Skip first-run dialogs
+    - --no-default-browser-check: Don't prompt to set as default
+    
+    Args:
+        browser_path (str): Edge/Chrome executable
+        delay (float): Seconds to wait before launching
+    """
+    import subprocess
+    
+    # Give Eel server time to start (reduced from 1s for faster startup)
+    if delay:
+        time.sleep(delay)
+    
+    # Construct the URL to the React app
+    url = f'http://localhost:{FIXED_PORT}/index.html'
+    
+    # Build command-line arguments for browser launch
+    app_args = [
+        browser_path,                   # Browser executable path
+        '--app=' + url,                 # App mode with URL
+        '--window-size={},{}'.format(WINDOW_SIZE[0], WINDOW_SIZE[1]),
+        '--disable-web-security',       # Allow local file access
+        '--disable-features=TranslateUI',  # Disable translation
+        '--disable-background-networking',  # Reduce background processes
+        '--no-first-run',               # Skip first-run dialogs
+        '--no-default-browser-check'    # Don't prompt for default browser
+    ]
+    
+    # Launch browser in a separate process
+    subprocess.Popen(app_args)
+
+def init_eel():
+    """
+    Points Eel at the web assets and registers the exposed functions.
+    
+    Registers every @expose function with eel.expose() and, for archive
+    builds, the JavaScript functions found inside the archive and the
+    routes that serve it.
+    """
+    # Tells Eel where to find the HTML/CSS/JS files to serve
+    eel.init(web_path)
+    for function in _exposed_functions:
+        eel.expose(function)
+    if web_archive is not None:
+        register_archive_js_functions(web_archive)
+        serve_web_archive(web_archive)
+
+def start_background_tasks():
+    """
+    Starts the external-change watcher, the reminder scheduler, the
+    journal writer and journal compaction.
+    
+    The first two run as greenlets alongside the Eel server (eel.spawn());
+    journal writes and compaction run in daemon threads.
+    """
+    
+    # Watch the configured data file and journals directory for edits
+    # made by sync clients or other machines
+    config = get_data_file_path()
+    if config.get("success") and config.get("path"):
+        change_watcher.watch_data_file(config["path"])
+    change_watcher.watch_journals_dir(os.path.join(get_app_data_path(), 'journals'))
+    eel.spawn(watch_for_external_changes)
+    eel.spawn(run_reminder_scheduler)
+    if app_instance is not None:
+        eel.spawn(run_instance_listener)
+    threading.Thread(target=run_journal_writer, daemon=True).start()
+    threading.Thread(target=run_journal_compaction, daemon=True).start()
+
+def main():
+    """
+    Main entry point for the desktop application.
+    
+    Startup sequence (each step only runs once the previous one succeeded):
+    0. Hands off to an already running instance and exits, if there is one
+    1. Activates the project venv (site-packages location is cached) and
+       creates the backend state (init_backend())
+    2. Checks that Eel is available and imports it
+    3. Finds the web assets (web/ or web.zip) and validates them
+    4. Registers the exposed functions with Eel
+    5. Detects available browser (Edge or Chrome)
+    6. Starts background tasks, launches the browser in app mode and
+       starts the Eel server
+    
+    The app runs in standalone mode (no browser UI) using Chrome/Edge's
+    --app flag. Safari is not supported because it doesn't support app mode.
+    
+    Raises:
+        SystemExit: Exits with code 1 if web directory is missing,
+                   if Eel is not available, or if no supported browser is found;
+                   exits with code 0 after handing off to a running instance
+    
+    Side Effects:
+        - Starts a local web server on port 8080
+        - Launches Chrome/Edge in app mode
+        - Blocks until the application is closed
+    """
+    global app_browser_path
+    
+    # Startup harness runs (package.py) don't open a window
+    ready_report = os.environ.get(READY_REPORT_ENV)
+    
+    # A second launch only asks the running instance for a window.
+    # Startup reports take a lock of their own next to the report, so a
+    # traced run also goes through the instance listener.
+    if ready_report:
+        claim_single_instance(os.path.dirname(os.path.abspath(ready_report)))
+    elif not claim_single_instance():
+        sys.exit(0)
+    
+    # Make venv packages importable before anything imports them
+    activate_virtual_environment()
+    init_backend()
+    
+    # Check Eel availability first
+    if not check_eel_available():
+        sys.exit(1)
+    
+    # Validate web directory before proceeding
+    resolve_web_assets()
+    if not check_web_directory():
+        sys.exit(1)
+    
+    init_eel()
+    
+    print(f"Starting {APP_NAME} v{APP_VERSION}...")
+    print(f"Window size: {WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}")
+    
+    # ========================================================================
+    # BROWSER DETECTION
+    # ========================================================================
     
     # Check for Edge or Chrome on macOS - REQUIRED for app mode
     # Safari doesn't support app mode, so we need Chrome or Edge
@@ -735,7 +2722,9 @@ def main():
     browser_name = None
     
     # Prefer Edge (better on macOS), fall back to Chrome
-    if os.path.exists(edge_path):
+    if ready_report:
+        browser_name = "no browser (startup report)"
+    elif os.path.exists(edge_path):
         chrome_path_param = edge_path
         browser_name = "Microsoft Edge"
         print(f"✓ Found {browser_name}")
@@ -754,63 +2743,28 @@ def main():
         print("Safari does not support app mode. Please install Edge or Chrome.")
         sys.exit(1)
     
+    app_browser_path = chrome_path_param
+    
     # ========================================================================
     # APPLICATION LAUNCH
     # ========================================================================
     
     try:
-        import subprocess
-        import threading
-        import time
-        
-        # Use a fixed port so we can launch browser manually
-        # Port 8080 is commonly used for development servers
-        FIXED_PORT = 8080
-        
-        def launch_browser():
-            """
-            Launch Edge/Chrome in app mode pointing to the Eel server.
-            
-            This function runs in a separate thread to avoid blocking.
-            It waits a short time for the Eel server to start, then
-            launches the browser with the --app flag for standalone mode.
-            
-            Browser flags:
-            - --app: Run in app mode (no browser UI)
-            - --window-size: Set window dimensions
-            - --disable-web-security: Allow local file access (dev only)
-            - --disable-features=TranslateUI: Disable translation UI
-            - --disable-background-networking: Reduce background processes
-            - --no-first-run: Skip first-run dialogs
-            - --no-default-browser-check: Don't prompt to set as default
-            """
-            # Give Eel server time to start (reduced from 1s for faster startup)
-            time.sleep(0.2)
-            
-            # Construct the URL to the React app
-            url = f'http://localhost:{FIXED_PORT}/index.html'
             
-            # Build command-line arguments for browser launch
-            app_args = [
-                chrome_path_param,              # Browser executable path
-                '--app=' + url,                 # App mode with URL
-                '--window-size={},{}'.format(WINDOW_SIZE[0], WINDOW_SIZE[1]),
-                '--disable-web-security',       # Allow local file access
-                '--disable-features=TranslateUI',  # Disable translation
-                '--disable-background-networking',  # Reduce background processes
-                '--no-first-run',               # Skip first-run dialogs
-                '--no-default-browser-check'    # Don't prompt for default browser
-            ]
-            
-            # Launch browser in a separate process
-            subprocess.Popen(app_args)
-        
         print(f"Starting app in {browser_name} (standalone mode)...")
         
-        # Launch browser in a separate thread (non-blocking)
-        # Daemon thread means it will exit when main thread exits
-        browser_thread = threading.Thread(target=launch_browser, daemon=True)
-        browser_thread.start()
+        start_background_tasks()
+        
+        print(f"Startup took {(time.perf_counter() - STARTUP_STARTED) * 1000:.0f} ms")
+        
+        if ready_report:
+            eel.spawn(report_server_ready, ready_report, FIXED_PORT)
+        else:
+            # Launch browser in a separate thread (non-blocking)
+            # Daemon thread means it will exit when main thread exits
+            browser_thread = threading.Thread(target=launch_app_window,
+                                              args=(chrome_path_param, 0.2), daemon=True)
+            browser_thread.start()
         
         # Start Eel server without auto-opening browser (mode=False)
         # We launch the browser manually for better control
@@ -835,6 +2789,11 @@ def main():
         print("2. Run 'npm run build' to build the React app")
         print("3. Check that 'web' directory contains index.html")
         sys.exit(1)
+    finally:
+        # Write journal entries still waiting for their flush interval
+        journal_writer.close()
+        if app_instance is not None:
+            app_instance.release()
 
 # ============================================================================
 # SCRIPT ENTRY POINT
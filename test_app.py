@@ -7,6 +7,14 @@ Tests that all components are in place without launching the GUI.
 import sys
 from pathlib import Path
 
+# Longest 'import start' may take (python -X importtime, cumulative).
+# Importing start.py must stay cheap: Eel, gevent, bottle and the backend
+# package are only loaded by main().
+IMPORT_TIME_BUDGET_MS = 200
+
+# Modules that must not be imported by 'import start'
+DEFERRED_MODULES = ("eel", "gevent", "bottle", "greenlet", "backend")
+
 def test_web_directory():
     """Tests that the web directory exists and has required files."""
     print("Testing web directory...")
@@ -92,6 +100,1405 @@ def test_build_output():
         print(f"  ⚠️  Could not read index.html: {e}")
         return True  # Still count as pass if file exists
 
+def test_web_archive_serving():
+    """Tests that "/" and assets are served from the web archive through Eel's routes."""
+    print("\nTesting web archive serving...")
+    import shutil
+    import tempfile
+    import time
+    from io import BytesIO
+    from wsgiref.util import setup_testing_defaults
+    try:
+        import bottle
+        import eel
+    except ImportError:
+        print("  ⚠️  Eel is not installed - skipped")
+        return True
+    import start
+    from backend.web_archive import WebArchive, build_web_archive
+    
+    def fetch(app, path):
+        environ = {"PATH_INFO": path, "wsgi.input": BytesIO()}
+        setup_testing_defaults(environ)
+        status = []
+        body = b"".join(app(environ, lambda code, headers, exc_info=None: status.append(code)))
+        return status[0], body
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # A build shaped like Vite's output: index.html plus hashed assets
+        web_dir = Path(tmp) / "web"
+        (web_dir / "assets").mkdir(parents=True)
+        index = b'<!doctype html><script type="module" src="/assets/index-1.js"></script>'
+        (web_dir / "index.html").write_bytes(index)
+        for i in range(60):
+            (web_dir / "assets" / f"index-{i}.js").write_text(
+                f"eel.expose(onDataChanged{i}, 'on_data_changed_{i}');" + "x" * 20000)
+        archive_path = str(Path(tmp) / "web.zip")
+        build_web_archive(str(web_dir), archive_path)
+        
+        # Startup work that differs between the modes: eel.init() scanning
+        # the loose files vs opening and scanning the archive
+        started = time.perf_counter()
+        eel.init(str(web_dir))
+        disk_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        archive = WebArchive(archive_path)
+        names = archive.exposed_js_functions()
+        archive_ms = (time.perf_counter() - started) * 1000
+        
+        # Packaged archive builds have no web/ for Eel's static handler
+        expected_asset = (web_dir / "assets" / "index-1.js").read_bytes()
+        shutil.rmtree(web_dir)
+        
+        saved_routes, saved_eel = dict(eel.BOTTLE_ROUTES), start.eel
+        try:
+            start.eel = eel
+            start.register_archive_js_functions(archive)
+            start.serve_web_archive(archive)
+            # What eel.start() does with the app it serves
+            app = bottle.Bottle()
+            eel.register_eel_routes(app)
+            root, asset = fetch(app, "/"), fetch(app, "/assets/index-1.js")
+            missing = fetch(app, "/assets/missing.js")
+        finally:
+            eel.BOTTLE_ROUTES.clear()
+            eel.BOTTLE_ROUTES.update(saved_routes)
+            start.eel = saved_eel
+        archive.close()
+    
+    if root != ("200 OK", index) or asset != ("200 OK", expected_asset):
+        print(f"  ❌ Archive not served: / -> {root[0]}, asset -> {asset[0]}")
+        return False
+    if not missing[0].startswith("404") or len(names) != 60:
+        print(f"  ❌ Unexpected 404 handling or exposed names: {missing[0]}, {len(names)}")
+        return False
+    
+    print(f"  ✅ / and assets served from the archive; startup scan {disk_ms:.1f} ms "
+          f"from web/ -> {archive_ms:.1f} ms from web.zip")
+    return True
+
+def test_change_broadcast():
+    """Tests that saves notify the other windows with per-section deltas."""
+    print("\nTesting change broadcast...")
+    from backend.data_store import DataStore
+    from backend.change_broadcast import ChangeBroadcaster
+    
+    sent = []
+    store = DataStore()
+    broadcaster = ChangeBroadcaster(send=sent.append)
+    store.subscribe(broadcaster.on_changes)
+    broadcaster.register_client("window-a")
+    broadcaster.register_client("window-b")
+    
+    store.apply_document({"data": {"mood": {}, "todos": []}}, notify=False)
+    store.apply_document({"data": {
+        "mood": {"Mon Dec 01 2024": {"mood": 4}},
+        "todos": [],
+    }}, origin="window-a")
+    
+    if len(sent) != 1 or len(sent[0]["changes"]) != 1:
+        print(f"  ❌ Expected one mood notification, got {sent}")
+        return False
+    change = sent[0]["changes"][0]
+    if change["section"] != "mood" or change["revision"] != 2:
+        print(f"  ❌ Unexpected change: {change}")
+        return False
+    if "Mon Dec 01 2024" not in change["delta"]["upserts"]:
+        print(f"  ❌ Delta is missing the changed day: {change['delta']}")
+        return False
+    
+    print("  ✅ Only the changed section was broadcast")
+    return True
+
+def test_external_change_watcher():
+    """Tests that only real external edits to the data file are reported."""
+    print("\nTesting external change watcher...")
+    import json
+    import os
+    import tempfile
+    from backend.file_watcher import ChangeWatcher
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "personal-tracker-data.json")
+        own = json.dumps({"data": {"mood": {}}})
+        Path(path).write_text(own)
+        
+        watcher = ChangeWatcher()
+        watcher.watch_data_file(path)
+        own = json.dumps({"data": {"mood": {"Sun Nov 30 2024": {"mood": 3}}}})
+        with watcher.own_write(path, own):
+            Path(path).write_text(own)
+            os.utime(path, ns=(0, 5 * 10**8))
+            # A poll between the rename and the end of the write
+            if watcher.poll_data_file() is not None:
+                print("  ❌ App's own write was reported while it was being written")
+                return False
+        if watcher.poll_data_file() is not None:
+            print("  ❌ App's own write was reported as external")
+            return False
+        
+        Path(path).write_text(json.dumps({"data": {"mood": {"Mon Dec 01 2024": {"mood": 5}}}}))
+        os.utime(path, ns=(0, 10**9))  # make sure the mtime differs
+        document = watcher.poll_data_file()
+        if not document or "Mon Dec 01 2024" not in document["data"]["mood"]:
+            print("  ❌ External edit was not detected")
+            return False
+        if watcher.poll_data_file() is not None:
+            print("  ❌ Unchanged file was reported twice")
+            return False
+    
+    print("  ✅ External edits detected, own writes ignored")
+    return True
+
+def test_reminder_scheduler():
+    """Tests that reminders fire in order and skip completed habits."""
+    print("\nTesting reminder scheduler...")
+    from datetime import datetime
+    from backend.reminder_scheduler import ReminderScheduler
+    
+    clock = [datetime(2024, 12, 2, 8, 0)]  # a Monday
+    fired = []
+    scheduler = ReminderScheduler(fire=lambda reminder, at: fired.append(reminder["habitId"]),
+                                  now=lambda: clock[0])
+    scheduler.sync_reminders({
+        "read": {"habitId": "read", "enabled": True, "time": "09:00", "days": [1]},
+        "run": {"habitId": "run", "enabled": True, "time": "08:30", "days": [1]},
+    })
+    
+    if scheduler.seconds_until_next() != 30 * 60:
+        print(f"  ❌ Expected to sleep 30 minutes, got {scheduler.seconds_until_next()}s")
+        return False
+    
+    scheduler.set_completed(clock[0].date(), ["run"])
+    clock[0] = datetime(2024, 12, 2, 9, 0)
+    scheduler.run_due()
+    if fired != ["read"]:
+        print(f"  ❌ Expected only 'read' to fire, got {fired}")
+        return False
+    
+    # The first load seeds today's completions, and a due reminder is
+    # addressed to one window
+    import json
+    import tempfile
+    from datetime import date, datetime as clock_time
+    import start
+    from backend.dates import format_date_key
+    start.init_backend()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "personal-tracker-data.json"
+        today = {"habits": [{"id": "run", "name": "Run", "completed": True}]}
+        path.write_text(json.dumps({"data": {"habits": {format_date_key(date.today()): today}}}))
+        start.load_all_data_from_file(str(path))
+    if start.reminder_scheduler._completed != (date.today(), {"run"}):
+        print(f"  ❌ Load didn't seed completions: {start.reminder_scheduler._completed}")
+        return False
+    
+    pushed = []
+    push = start._push_to_frontend
+    start._push_to_frontend = lambda name, payload: pushed.append(payload)
+    try:
+        start.change_broadcaster.register_client("window-a")
+        start.change_broadcaster.register_client("window-b")
+        start.fire_reminder({"habitId": "run", "time": "09:00"}, clock_time.now())
+    finally:
+        start._push_to_frontend = push
+        start.change_broadcaster.unregister_client("window-a")
+        start.change_broadcaster.unregister_client("window-b")
+    if [payload["client"] for payload in pushed] != ["window-a"]:
+        print(f"  ❌ Expected one reminder for window-a, got {pushed}")
+        return False
+    
+    print("  ✅ Reminders fire on time and skip completed habits")
+    return True
+
+def test_single_instance():
+    """Tests that a second launch is refused the lock and hands off a command."""
+    print("\nTesting single-instance handoff...")
+    import socket
+    import tempfile
+    import threading
+    from backend.single_instance import InstanceLock, send_command
+    
+    with tempfile.TemporaryDirectory() as app_data:
+        running = InstanceLock(app_data)
+        if not running.acquire():
+            print("  ❌ First instance couldn't take the lock")
+            return False
+        running.listen()
+        
+        second = InstanceLock(app_data)
+        if second.acquire():
+            print("  ❌ Second instance also got the lock")
+            return False
+        
+        received = []
+        listener = threading.Thread(target=lambda: received.append(running.accept_command()))
+        listener.start()
+        delivered = send_command(app_data, "focus")
+        listener.join(5)
+        
+        # A client that connects but stays silent mustn't block the other
+        # greenlets while the listener waits for its message
+        import gevent
+        from gevent.select import select
+        ticks = []
+        ticker = gevent.spawn(lambda: [ticks.append(gevent.sleep(0.01)) for _ in range(10)])
+        silent = socket.create_connection(running.listener.getsockname())
+        silent_message = running.accept_command(timeout=0.3, wait=select)
+        silent.close()
+        ticker.kill()
+        running.release()
+        
+        if not delivered or received != [{"command": "focus"}]:
+            print(f"  ❌ Handoff failed (delivered={delivered}, received={received})")
+            return False
+        if silent_message is not None or len(ticks) < 5:
+            print(f"  ❌ Silent client blocked the listener (ticks={len(ticks)})")
+            return False
+        if not second.acquire():
+            print("  ❌ Lock wasn't released")
+            return False
+        second.release()
+    
+    # "focus" raises the open window; a new one only opens when none is
+    import start
+    from types import SimpleNamespace
+    start.init_backend()
+    calls = []
+    saved = (start.eel, start.app_browser_path, start.launch_app_window,
+             start.raise_app_window, start._push_to_frontend)
+    start.app_browser_path = "chrome"
+    start.launch_app_window = lambda path: calls.append("launch")
+    start.raise_app_window = lambda: calls.append("raise")
+    start._push_to_frontend = lambda name, payload: calls.append((name, payload["client"]))
+    try:
+        start.change_broadcaster.register_client("window-a")
+        start.eel = SimpleNamespace(_websockets=[("index.html", object())])
+        start.focus_app_window()
+        start.eel = SimpleNamespace(_websockets=[])
+        start.focus_app_window()
+    finally:
+        (start.eel, start.app_browser_path, start.launch_app_window,
+         start.raise_app_window, start._push_to_frontend) = saved
+        start.change_broadcaster.unregister_client("window-a")
+    if calls != [("on_focus_requested", "window-a"), "raise", "launch"]:
+        print(f"  ❌ Unexpected focus handling: {calls}")
+        return False
+    
+    print("  ✅ Second launch hands off to the running instance")
+    return True
+
+def test_day_index():
+    """Tests that range queries return the right days and follow saves."""
+    print("\nTesting ordinal-day index...")
+    from backend.data_store import DataStore
+    from backend.day_index import DayIndexes
+    
+    store = DataStore()
+    indexes = DayIndexes(store)
+    store.apply_sections({"mood": {
+        "Mon Dec 02 2024": {"mood": 4},
+        "Sun Dec 01 2024": {"mood": 3},
+        "Wed Jan 01 2025": {"mood": 5},
+    }})
+    
+    dates = [key for key, _ in indexes.query_range("mood", "2024-12-01", "2024-12-31")]
+    if dates != ["Sun Dec 01 2024", "Mon Dec 02 2024"]:
+        print(f"  ❌ Unexpected December days: {dates}")
+        return False
+    
+    store.apply_sections({"mood": {
+        "Sun Dec 01 2024": {"mood": 3},
+        "Tue Dec 31 2024": {"mood": 2},
+        "Wed Jan 01 2025": {"mood": 5},
+    }})
+    dates = [key for key, _ in indexes.query_range("mood", "2024-12-01", "2024-12-31", descending=True)]
+    if dates != ["Tue Dec 31 2024", "Sun Dec 01 2024"]:
+        print(f"  ❌ Index didn't follow the save: {dates}")
+        return False
+    
+    print("  ✅ Range queries follow saves")
+    return True
+
+def test_journal_compaction():
+    """Tests that closed journal months are packed and still readable."""
+    print("\nTesting journal compaction...")
+    import json
+    import os
+    import tempfile
+    from datetime import date
+    from backend.journal_store import JournalStore
+    
+    with tempfile.TemporaryDirectory() as journals_dir:
+        store = JournalStore(journals_dir)
+        for date_key in ("Sun Dec 01 2024", "Mon Dec 02 2024", "Wed Jan 01 2025"):
+            entry = json.dumps({"date": date_key, "content": date_key})
+            store.save(date_key.replace(" ", "_") + ".json", entry.encode("utf-8"))
+        
+        stats = store.compact(today=date(2025, 1, 15))
+        if stats["months"] != 1 or stats["entries"] != 2:
+            print(f"  ❌ Expected December to be packed, got {stats}")
+            return False
+        if os.path.exists(os.path.join(journals_dir, "2024", "12")):
+            print("  ❌ Packed month still has loose files")
+            return False
+        if not os.path.exists(os.path.join(journals_dir, "2025", "01", "Wed_Jan_01_2025.json")):
+            print("  ❌ Open month was packed")
+            return False
+        
+        entry = store.read_entry("Mon Dec 02 2024")
+        if not entry or entry["content"] != "Mon Dec 02 2024":
+            print(f"  ❌ Couldn't read a packed entry: {entry}")
+            return False
+        if len(store.load_entries()) != 3:
+            print("  ❌ Entries missing after compaction")
+            return False
+        recent = [entry["date"] for entry in store.load_entries(since=date(2024, 12, 2))]
+        if sorted(recent) != ["Mon Dec 02 2024", "Wed Jan 01 2025"]:
+            print(f"  ❌ Unexpected recent entries: {recent}")
+            return False
+        
+        # The Eel greenlet, writer and compaction threads share one store
+        import threading
+        import start
+        barrier = threading.Barrier(8)
+        stores = []
+        def get_store():
+            barrier.wait()
+            stores.append(start.get_journal_store(journals_dir))
+        threads = [threading.Thread(target=get_store) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        start._journal_stores.clear()
+        if len({id(store) for store in stores}) != 1:
+            print("  ❌ Concurrent callers got separate journal stores")
+            return False
+    
+    print("  ✅ Closed months packed, entries still readable")
+    return True
+
+def test_journal_writer():
+    """Tests that repeated journal saves are coalesced into one write."""
+    print("\nTesting coalesced journal writes...")
+    from backend.journal_writer import JournalWriter
+    
+    clock = [100.0]
+    writes = []
+    writer = JournalWriter(write=lambda d, name, content: writes.append((name, content)),
+                           interval=5.0, clock=lambda: clock[0])
+    
+    for text in (b"a", b"ab", b"abc"):
+        writer.submit("/journals", "Mon_Dec_02_2024.json", text)
+    if writer.seconds_until_flush() != 5.0:
+        print(f"  ❌ Expected a flush in 5s, got {writer.seconds_until_flush()}")
+        return False
+    
+    clock[0] += 5.0
+    writer.wait(timeout=0)
+    writer.flush()
+    if writes != [("Mon_Dec_02_2024.json", b"abc")]:
+        print(f"  ❌ Expected one write of the latest content, got {writes}")
+        return False
+    
+    writer.submit("/journals", "Mon_Dec_02_2024.json", b"late night")
+    writer.submit("/journals", "Tue_Dec_03_2024.json", b"next day")
+    if writer.seconds_until_flush() != 0.0:
+        print("  ❌ Switching days didn't flush right away")
+        return False
+    writer.close()
+    if len(writes) != 3:
+        print(f"  ❌ close() didn't write pending entries: {writes}")
+        return False
+    
+    print("  ✅ Saves coalesced, day change and shutdown flush")
+    return True
+
+def test_section_checksums():
+    """Tests that a damaged section is pinpointed by its checksum."""
+    print("\nTesting section checksums...")
+    import os
+    import tempfile
+    from backend.data_store import DataStore
+    from backend.integrity import SectionChecksums
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "personal-tracker-data.json")
+        
+        saved = DataStore()
+        saved.apply_sections({"mood": {"Mon Dec 02 2024": {"mood": 4}}, "todos": [{"id": 1}]})
+        SectionChecksums(saved.get_digest).save(data_path, ["mood", "todos"])
+        
+        # The file as read back later - mood was changed behind our back
+        loaded = DataStore()
+        checksums = SectionChecksums(loaded.get_digest, loaded.digest_stats)
+        loaded.set_read_hook(checksums.verify)
+        loaded.apply_sections({"mood": {"Mon Dec 02 2024": {"mood": 1}}, "todos": [{"id": 1}]})
+        if not checksums.load(data_path):
+            print("  ❌ Checksum file not found")
+            return False
+        if checksums.stats()["digested"] != 0:
+            print("  ❌ Sections were hashed before being read")
+            return False
+        
+        # Reading a section verifies it; the other one stays unchecked
+        loaded.get_records("mood", ["Mon Dec 02 2024"])
+        stats = checksums.stats()
+        if stats["sections"] != {"mood": "mismatch"} or stats["digested"] != 1:
+            print(f"  ❌ Expected only mood to be verified on read, got {stats}")
+            return False
+        damaged = checksums.damaged(["mood", "todos"])
+        if damaged != ["mood"]:
+            print(f"  ❌ Expected only mood to be damaged, got {damaged}")
+            return False
+        
+        # A save with one changed section only hashes that section
+        loaded.apply_sections({"mood": {"Mon Dec 02 2024": {"mood": 4}}, "todos": [{"id": 1}]})
+        checksums.save(data_path, ["mood", "todos"])
+        stats = checksums.stats()
+        if stats["verified"] != 2 or stats["digested"] != 3 or checksums.verify("mood") != "ok":
+            print(f"  ❌ Unexpected verification stats: {stats}")
+            return False
+    
+    print("  ✅ Damaged section pinpointed")
+    return True
+
+def test_chunked_transport():
+    """Tests that a large result survives compression, chunking and reassembly."""
+    print("\nTesting chunked transport...")
+    import base64
+    import json
+    import zlib
+    from backend.chunked_transport import TransferStore
+    
+    result = {
+        "success": True,
+        "data": {"data": {
+            "mood": {f"Day {i}": {"mood": i % 5, "note": "x" * 40} for i in range(3000)},
+            "todos": [{"id": i, "text": "y" * 60} for i in range(3000)],
+        }},
+    }
+    transfers = TransferStore(threshold=64 * 1024, chunk_size=4 * 1024, part_size=8 * 1024)
+    if transfers.create({"success": True}) is not None:
+        print("  ❌ Small result was chunked")
+        return False
+    
+    header = transfers.create(result)
+    chunks = [transfers.chunk(header["transferId"], seq) for seq in range(header["chunks"])]
+    if [c["seq"] for c in chunks] != list(range(header["chunks"])) or not chunks[-1]["last"]:
+        print("  ❌ Chunks not numbered in sequence")
+        return False
+    
+    # Same reassembly as PartAssembler in src/utils/chunkedTransport.js
+    stream = zlib.decompress(b"".join(base64.b64decode(c["data"]) for c in chunks))
+    root = None
+    for line in stream.decode("utf-8").splitlines():
+        path, op, value = json.loads(line)
+        if not path and op == "set":
+            root = value
+            continue
+        holder, key = {"root": root}, "root"
+        for step in path:
+            holder, key = holder[key], step
+        if op == "set":
+            holder[key] = value
+        elif op == "merge":
+            holder[key].update(value)
+        else:
+            holder[key].extend(value)
+    
+    if root != result:
+        print("  ❌ Reassembled result differs from the original")
+        return False
+    print(f"  ✅ {header['bytes']} bytes sent as {header['chunks']} chunks "
+          f"({header['encodedBytes']} bytes compressed)")
+    return True
+
+def test_time_series():
+    """Tests prefix-sum averages and LTTB downsampling of the weight series."""
+    print("\nTesting time series...")
+    from datetime import date, timedelta
+    from backend.data_store import DataStore
+    from backend.dates import format_date_key
+    from backend.day_index import DayIndexes
+    from backend.time_series import TimeSeries
+    
+    store = DataStore()
+    first_day = date(2015, 1, 1)
+    habits = {}
+    for offset in range(3650):
+        # A single spike in an otherwise flat line
+        weight = 200.0 if offset == 1234 else 150.0 + (offset % 3)
+        habits[format_date_key(first_day + timedelta(days=offset))] = {"habits": [], "weight": weight}
+    habits[format_date_key(first_day + timedelta(days=4000))] = {"habits": []}  # no weight
+    store.apply_sections({"habits": habits})
+    charts = TimeSeries(store, DayIndexes(store))
+    
+    chart = charts.chart("weight", width=300, window=7)
+    if len(chart["points"]) != 300 or chart["count"] != 3650:
+        print(f"  ❌ Expected 300 of 3650 points, got {len(chart['points'])} of {chart['count']}")
+        return False
+    spike = (first_day + timedelta(days=1234)).isoformat()
+    if [spike, 200.0] not in chart["points"]:
+        print("  ❌ Downsampling dropped the spike")
+        return False
+    
+    average = charts.average("weight", "2015-01-01", "2015-01-03")
+    if average != 151.0:
+        print(f"  ❌ Expected an average of 151.0 over three days, got {average}")
+        return False
+    if chart["movingAverage"][0] != ["2015-01-01", 150.0] or len(chart["movingAverage"]) != 300:
+        print(f"  ❌ Unexpected moving average: {chart['movingAverage'][:2]}")
+        return False
+    
+    print(f"  ✅ 3650 days charted as {len(chart['points'])} points, spike kept")
+    return True
+
+def test_habit_schema():
+    """Tests that normalized habit days round-trip and intern definitions."""
+    print("\nTesting normalized habit schema...")
+    import json
+    from datetime import date, timedelta
+    from backend.dates import format_date_key
+    from backend.habit_schema import (DOCUMENT_VERSION, denormalize_document, denormalize_habits,
+                                      normalize_document, normalize_habits)
+    from backend.import_engine import ImportValidationError, merge_import
+    
+    def habit(habit_id, name, completed):
+        return {"id": habit_id, "name": name, "emoji": "✅",
+                "category": {"name": "Health", "color": "#4caf50"},
+                "completed": completed, "timeOfDay": "morning"}
+    
+    days = {}
+    for offset in range(365):
+        key = format_date_key(date(2024, 1, 1) + timedelta(days=offset))
+        # Habit 2 is renamed halfway through the year
+        name = "Run" if offset < 180 else "Run 5k"
+        habits = [habit(1, "Meditate", offset % 2 == 0), habit(2, name, offset % 3 == 0)]
+        days[key] = {"date": key, "habits": habits, "completedCount": 1, "totalCount": 2,
+                     "weight": 150.5, "timestamp": "2024-01-01T10:30:00.000Z"}
+    days["Mon Dec 30 2024"]["habits"].append({"id": 3, "name": "Legacy"})  # no completed flag
+    
+    normalized = normalize_habits(days)
+    versions = [(entry["habit"]["id"], entry["version"]) for entry in normalized["definitions"]]
+    if versions != [(1, 1), (2, 1), (2, 2)]:
+        print(f"  ❌ Unexpected definitions: {versions}")
+        return False
+    if denormalize_habits(normalized) != days:
+        print("  ❌ Denormalized section differs from the original")
+        return False
+    
+    before, after = len(json.dumps(days)), len(json.dumps(normalized))
+    if after * 2 > before:
+        print(f"  ❌ Normalized section is not much smaller ({after} vs {before} bytes)")
+        return False
+    
+    # Saves write the section from the data store's compact copy, which
+    # keeps the definition table and normalizes only the changed days
+    from backend.data_store import DataStore
+    store = DataStore()
+    store.apply_sections({"habits": days})
+    first = normalize_document({"data": {"habits": days}}, store.preview_section("habits", days))
+    edited = dict(days)
+    edited["Sun Dec 29 2024"] = {**days["Sun Dec 29 2024"],
+                                 "habits": [habit(1, "Meditate", True), habit(2, "Run 10k", True)]}
+    preview = store.preview_section("habits", edited)
+    second = normalize_document({"data": {"habits": edited}}, preview)["data"]["habits"]
+    store.apply_sections({"habits": edited})
+    if store._sections["habits"] is not preview:
+        print("  ❌ Applying the save compacted the section again")
+        return False
+    if denormalize_habits(second) != edited:
+        print("  ❌ Section written from the data store doesn't round-trip")
+        return False
+    versions = [(entry["habit"]["id"], entry["version"]) for entry in second["definitions"]]
+    if versions != [(1, 1), (2, 1), (2, 2), (2, 3)] or \
+            second["definitions"][:3] != first["data"]["habits"]["definitions"]:
+        print(f"  ❌ Definition table wasn't kept and versioned: {versions}")
+        return False
+    reused = [key for key in days if second["days"][key] is first["data"]["habits"]["days"][key]]
+    if len(reused) != len(days) - 1 or "Sun Dec 29 2024" in reused:
+        print(f"  ❌ Expected only the edited day to be normalized again ({len(reused)} reused)")
+        return False
+    
+    # A copy of the data file imports with its habit days intact
+    data_file = normalize_document({"version": "1.0.0", "data": {"habits": days}})
+    if data_file["version"] != DOCUMENT_VERSION:
+        print(f"  ❌ Data file written as version {data_file['version']}")
+        return False
+    merged, report, _ = merge_import({"habits": {}}, denormalize_document(data_file), "replace")
+    if merged["habits"] != days or report["invalid"]:
+        print(f"  ❌ Importing a data file lost habit days: {report['problems'][:3]}")
+        return False
+    try:
+        merge_import({}, {"version": "3.0.0", "data": {}})
+        print("  ❌ A newer major version was imported")
+        return False
+    except ImportValidationError:
+        pass
+    
+    print(f"  ✅ Round trip exact, {before} -> {after} bytes, data file imports intact")
+    return True
+
+def test_compact_model():
+    """Tests that the compact data store is lossless and diffs like the dict one."""
+    print("\nTesting compact data model...")
+    import copy
+    import json
+    from backend.data_store import DataStore
+    
+    habit = {"id": 1, "name": "Meditate", "emoji": "🧘",
+             "category": {"name": "Health", "color": "#4caf50"}, "timeOfDay": "morning"}
+    sections = {
+        "habits": {
+            "Mon Dec 02 2024": {"date": "Mon Dec 02 2024", "habits": [{**habit, "completed": True}],
+                                "completedCount": 1, "totalCount": 1, "weight": 150.3,
+                                "timestamp": "2024-12-02T10:30:00.000Z"},
+            # Values that don't fit the columns exactly
+            "Tue Dec 03 2024": {"date": "elsewhere", "habits": [{**habit, "completed": 1}],
+                                "weight": 150.123456789, "timestamp": "yesterday", "note": "x"},
+            "Wed Dec 04 2024": {"weight": 151, "habits": []},
+            "Thu Dec 05 2024": None,
+        },
+        "mood": {"Mon Dec 02 2024": {"date": "Mon Dec 02 2024", "mood": 4, "notes": "",
+                                     "timestamp": "2024-12-02T10:30:00.000Z", "energy": 3}},
+        "todos": [{"id": "1", "title": "Call", "priority": "now", "completed": False}, "stray"],
+        "goals": [{"id": "g1", "title": "Run", "targetAmount": 100, "unit": "km"}],
+    }
+    compact, plain = DataStore(), DataStore(compact=False)
+    for store in (compact, plain):
+        store.apply_sections(copy.deepcopy(sections))
+    
+    for name, value in sections.items():
+        restored = compact.get_section(name)
+        if restored != value or json.dumps(restored, sort_keys=True) != json.dumps(value, sort_keys=True):
+            print(f"  ❌ {name} changed in the compact model: {restored}")
+            return False
+    
+    edited = copy.deepcopy(sections)
+    edited["habits"]["Mon Dec 02 2024"]["habits"][0]["completed"] = False
+    edited["habits"]["Tue Dec 03 2024"]["note"] = "y"
+    del edited["habits"]["Wed Dec 04 2024"]
+    edited["todos"][0]["title"] = "Call back"
+    diffs = []
+    for store in (compact, plain):
+        changes = store.apply_sections(copy.deepcopy(edited))
+        diffs.append({c.section: (sorted(c.upserted), c.removed) for c in changes})
+    if diffs[0] != diffs[1]:
+        print(f"  ❌ Compact diff {diffs[0]} differs from dict diff {diffs[1]}")
+        return False
+    if compact.get_record("habits", "Mon Dec 02 2024") != edited["habits"]["Mon Dec 02 2024"]:
+        print("  ❌ Edited day not stored")
+        return False
+    
+    print("  ✅ Sections round-trip exactly and diff the same as plain dicts")
+    return True
+
+def test_heatmap_tiles():
+    """Tests yearly heatmap tiles and their update when a day is saved."""
+    print("\nTesting heatmap tiles...")
+    from datetime import date, timedelta
+    from backend.data_store import DataStore
+    from backend.dates import format_date_key
+    from backend.day_index import DayIndexes
+    from backend.heatmap_tiles import HeatmapTiles, tile_slot
+    
+    def day_record(completed):
+        habits = [{"id": 1, "name": "Meditate", "completed": completed},
+                  {"id": 2, "name": "Run", "completed": False}]
+        return {"habits": habits, "completedCount": int(completed), "totalCount": 2}
+    
+    store = DataStore()
+    habits = {format_date_key(date(2023, 12, 1) + timedelta(days=offset)): day_record(offset % 2 == 0)
+              for offset in range(120)}
+    store.apply_sections({"habits": habits})
+    tiles = HeatmapTiles(store, DayIndexes(store))
+    
+    tile = tiles.tile(2024)
+    jan_2, mar_1 = date(2024, 1, 2), date(2024, 3, 1)
+    if len(tile["overall"]) != 366 or tile["overall"][tile_slot(jan_2)] != 0.5:
+        print(f"  ❌ Unexpected overall intensity: {tile['overall'][:3]}")
+        return False
+    if tile["habits"]["1"][tile_slot(jan_2)] != 1 or "2" in tile["habits"]:
+        print("  ❌ Unexpected per-habit completion flags")
+        return False
+    
+    # Saving a day updates the built tile instead of rebuilding it
+    built = tiles._tiles[2024]
+    store.apply_sections({"habits": {**habits, format_date_key(mar_1): {**day_record(True), "completedCount": 2,
+        "habits": [{"id": 1, "completed": True}, {"id": 2, "completed": True}]}}})
+    tile = tiles.tile(2024)
+    if tiles._tiles[2024] is not built:
+        print("  ❌ Tile was rebuilt instead of updated")
+        return False
+    if tile["overall"][tile_slot(mar_1)] != 1.0 or tile["habits"]["2"][tile_slot(mar_1)] != 1:
+        print(f"  ❌ Saved day not reflected: {tile['overall'][tile_slot(mar_1)]}")
+        return False
+    if tile_slot(date(2023, 3, 1)) != tile_slot(mar_1) or any(tiles.tile(2023)["overall"][:tile_slot(date(2023, 12, 1))]):
+        print("  ❌ Slots differ between leap and common years")
+        return False
+    
+    print("  ✅ Tiles built per year and updated in place")
+    return True
+
+def test_review_engine():
+    """Tests cached closed-period reviews and incremental current reviews."""
+    print("\nTesting review engine...")
+    import os
+    import tempfile
+    from datetime import date, timedelta
+    from backend.data_store import DataStore
+    from backend.dates import format_date_key
+    from backend.day_index import DayIndexes
+    from backend.reviews import ReviewEngine
+    
+    def day_record(key, completed):
+        habits = [{"id": 1, "name": "Read", "completed": completed >= 1},
+                  {"id": 2, "name": "Walk", "completed": completed >= 2}]
+        return {"date": key, "habits": habits, "completedCount": completed, "totalCount": 2}
+    
+    habits, mood = {}, {}
+    for offset in range(70):
+        key = format_date_key(date(2024, 10, 1) + timedelta(days=offset))
+        habits[key] = day_record(key, offset % 3)
+        mood[key] = {"date": key, "mood": 4}
+    todos = [{"id": "1", "completed": True, "completedAt": "2024-11-15T12:00:00"}]
+    
+    store = DataStore()
+    store.apply_sections({"habits": habits, "mood": mood, "todos": todos})
+    today = lambda: date(2024, 12, 9)   # a Monday
+    engine = ReviewEngine(store, DayIndexes(store), today=today)
+    
+    weeks = engine.history("week", "2024-11-01")
+    november = engine.history("month", "2024-11-01", "2024-11-30")[0]
+    if len(weeks) != 7 or not weeks[0]["closed"] or weeks[-1]["closed"]:
+        print(f"  ❌ Expected 7 weeks, the last one open: {[w['startDate'] for w in weeks]}")
+        return False
+    stats = november["statistics"]
+    if (stats["daysTracked"], stats["averageCompletionRate"], stats["todosCompleted"]) != (30, 50, 1):
+        print(f"  ❌ Unexpected November statistics: {stats}")
+        return False
+    if weeks[-1]["endDate"] != "Mon Dec 09 2024" or weeks[-1]["statistics"]["daysTracked"] != 2:
+        print(f"  ❌ Current week should end today: {weeks[-1]}")
+        return False
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "personal-tracker-data.json")
+        engine.save(data_path)
+        
+        # A fresh engine reuses the saved summaries without reading days
+        reloaded = ReviewEngine(store, DayIndexes(store), today=today)
+        if not reloaded.attach(data_path) or reloaded.history("week", "2024-11-01") != weeks:
+            print("  ❌ Saved summaries were not reused")
+            return False
+        
+        # Changing a closed day only drops its own week and month
+        key = format_date_key(date(2024, 11, 6))
+        store.apply_sections({"habits": {**habits, key: day_record(key, 2)}})
+        cached = dict(reloaded._summaries["week"])
+        if len(cached) != 5 or date(2024, 11, 3).toordinal() in cached:
+            print(f"  ❌ Expected only the changed week to be dropped, have {len(cached)}")
+            return False
+        november = reloaded.history("month", "2024-11-01", "2024-11-30")[0]
+        if november["statistics"]["totalHabitsCompleted"] != stats["totalHabitsCompleted"] + 2:
+            print(f"  ❌ Changed day not reflected: {november['statistics']}")
+            return False
+        
+        # The sidecar is ignored once the data no longer matches it
+        store.apply_sections({"mood": {}})
+        stale = ReviewEngine(store, DayIndexes(store), today=today)
+        stale.attach(data_path)
+        stale.current("week")
+        if stale._summaries["week"]:
+            print("  ❌ Stale summaries were used")
+            return False
+    
+    print(f"  ✅ {len(weeks)} weekly reviews, closed periods reused after reload")
+    return True
+
+def test_recurrence_engine():
+    """Tests windowed recurrence expansion and per-todo invalidation."""
+    print("\nTesting recurrence engine...")
+    from datetime import date
+    from backend.data_store import DataStore
+    from backend.recurrence import RecurrenceEngine
+    
+    def recurring(todo_id, pattern, due, interval=1, **fields):
+        return {"id": todo_id, "title": f"Todo {todo_id}", "isRecurring": True,
+                "recurrencePattern": pattern, "recurrenceInterval": interval,
+                "dueDate": due, "completed": False, **fields}
+    
+    todos = [
+        recurring("1", "daily", "2024-12-01", interval=2),
+        recurring("2", "monthly", "2024-01-31"),
+        recurring("3", "weekly", "2024-11-28", recurrenceEndDate="2024-12-10"),
+        {"id": "4", "title": "One-off", "dueDate": "2024-12-02"},
+    ]
+    store = DataStore()
+    store.apply_sections({"todos": todos})
+    engine = RecurrenceEngine(store, window_days=90, today=lambda: date(2024, 12, 1))
+    
+    def due(start, end):
+        return [(o["id"], o["date"]) for o in engine.due(start, end)]
+    
+    week = due("2024-12-01", "2024-12-07")
+    if week != [("1", "2024-12-03"), ("1", "2024-12-05"), ("3", "2024-12-05"), ("1", "2024-12-07")]:
+        print(f"  ❌ Unexpected occurrences: {week}")
+        return False
+    # Crosses the end of the window; Jan 31 falls on the last day of February
+    monthly = [d for todo_id, d in due("2025-02-01", "2025-04-30") if todo_id == "2"]
+    if monthly != ["2025-02-28", "2025-03-31", "2025-04-30"]:
+        print(f"  ❌ Unexpected monthly occurrences: {monthly}")
+        return False
+    if due("2024-12-11", "2024-12-31").count(("3", "2024-12-12")):
+        print("  ❌ Occurrence after the recurrence end date")
+        return False
+    
+    # Completing a todo only re-expands that todo; pausing one drops it
+    expanded = engine.stats()["expanded"]
+    todos[0] = {**todos[0], "completed": True, "completedAt": "2024-12-02"}
+    store.apply_sections({"todos": todos})
+    engine.set_paused(["2"])
+    week = due("2024-12-01", "2024-12-07")
+    if engine.stats()["expanded"] != expanded + 1:
+        print(f"  ❌ Expected 1 re-expansion, got {engine.stats()['expanded'] - expanded}")
+        return False
+    if week != [("1", "2024-12-04"), ("3", "2024-12-05"), ("1", "2024-12-06")] or due("2024-12-31", "2024-12-31"):
+        print(f"  ❌ Completion or pause not reflected: {week}")
+        return False
+    
+    print(f"  ✅ {engine.stats()['occurrences']} occurrences indexed, todos re-expanded one at a time")
+    return True
+
+def test_todo_index():
+    """Tests todo index ordering, pagination and per-todo updates."""
+    print("\nTesting todo index...")
+    from datetime import date
+    from backend.data_store import DataStore
+    from backend.todo_index import TodoIndex
+    
+    def todo(todo_id, priority, due=None, completed=False, goal=None, created="2024-11-01T10:00:00.000Z"):
+        return {"id": todo_id, "title": f"Todo {todo_id}", "priority": priority, "dueDate": due,
+                "completed": completed, "linkedGoalId": goal, "createdAt": created}
+    
+    todos = [
+        todo("a", "later"),
+        todo("b", "now", due="2024-12-10"),
+        todo("c", "now", due="2024-11-20", goal="g1"),
+        todo("d", "next", created="2024-11-05T10:00:00.000Z"),
+        todo("e", "now", completed=True, goal="g1"),
+        todo("f", "next", created="2024-11-02T10:00:00.000Z"),
+        todo("g", "next", due="2024-11-30"),
+    ]
+    store = DataStore()
+    store.apply_sections({"todos": todos})
+    index = TodoIndex(store, today=lambda: date(2024, 12, 1))
+    
+    def ids(**query):
+        return [t["id"] for t in index.query(**query)["todos"]]
+    
+    # Incomplete first, then now > next > later, due dates soonest first,
+    # todos without one newest first
+    expected = ["c", "b", "g", "d", "f", "a", "e"]
+    if ids(limit=None) != expected:
+        print(f"  ❌ Unexpected order: {ids(limit=None)}")
+        return False
+    pages = ids(limit=3) + ids(offset=3, limit=3) + ids(offset=6, limit=3)
+    if pages != expected or index.query(limit=3)["total"] != 7:
+        print(f"  ❌ Pages don't add up: {pages}")
+        return False
+    if ids(status="active", priority="next", offset=1, limit=1) != ["d"]:
+        print(f"  ❌ Unexpected filtered page: {ids(status='active', priority='next')}")
+        return False
+    if ids(overdue=True) != ["c", "g"] or ids(goal_id="g1") != ["c", "e"]:
+        print(f"  ❌ Unexpected overdue/goal views: {ids(overdue=True)} {ids(goal_id='g1')}")
+        return False
+    
+    # Completing a todo moves it between indexes without a rebuild
+    buckets = index._buckets
+    todos[2] = {**todos[2], "completed": True}
+    store.apply_sections({"todos": todos})
+    counts = index.counts()
+    if index._buckets is not buckets or ids(overdue=True) != ["g"]:
+        print("  ❌ Index was rebuilt or overdue todo not updated")
+        return False
+    if counts["byGoal"]["g1"] != {"total": 2, "completed": 2} or counts["byPriority"].get("now") != 1:
+        print(f"  ❌ Unexpected counts: {counts}")
+        return False
+    
+    print(f"  ✅ {counts['total']} todos paged in priority order, updated per todo")
+    return True
+
+def test_goal_progress():
+    """Tests goal progress against isStepCompleted() and per-goal invalidation."""
+    print("\nTesting goal progress...")
+    from datetime import date
+    from backend.data_store import DataStore
+    from backend.goal_progress import GoalProgress
+    
+    def step(step_id, goal, frequency, *days):
+        return {"id": step_id, "goalId": goal, "frequency": frequency,
+                "completions": [{"date": day, "timestamp": ""} for day in days]}
+    
+    # Today is Wednesday Dec 4 2024; its week started Sunday Dec 1
+    steps = [
+        step("s1", "g1", "daily", "Wed Dec 04 2024"),
+        step("s2", "g1", "daily", "Tue Dec 03 2024"),
+        step("s3", "g1", "weekly", "Sun Dec 01 2024"),
+        step("s4", "g1", "monthly", "Sat Nov 30 2024"),
+        step("s5", "g1", "one-time", "Fri Nov 01 2024"),
+        step("s6", "g2", "weekly", "Sat Nov 30 2024"),
+    ]
+    todos = [
+        {"id": "t1", "linkedGoalId": "g1", "completed": True},
+        {"id": "t2", "linkedGoalId": "g1", "completed": False},
+        {"id": "t3", "linkedGoalId": "g2", "completed": False},
+        {"id": "t4", "completed": True},
+    ]
+    goals = [{"id": "g1"}, {"id": "g2"}, {"id": "g3"}]
+    store = DataStore()
+    store.apply_sections({"goals": goals, "goalSteps": steps, "todos": todos})
+    engine = GoalProgress(store, today=lambda: date(2024, 12, 4))
+    
+    progress = engine.progress()
+    expected = {
+        "g1": {"progress": 3, "total": 5, "percentage": 60, "todos": 2, "completedTodos": 1},
+        "g2": {"progress": 0, "total": 1, "percentage": 0, "todos": 1, "completedTodos": 0},
+        "g3": {"progress": 0, "total": 0, "percentage": 0, "todos": 0, "completedTodos": 0},
+    }
+    if progress != expected:
+        print(f"  ❌ Unexpected progress: {progress}")
+        return False
+    
+    # Completing a g2 todo recomputes only g2; moving a step touches both goals
+    computed = engine.stats()["computed"]
+    todos = todos[:2] + [{**todos[2], "completed": True}] + todos[3:]
+    store.apply_sections({"todos": todos})
+    progress = engine.progress()
+    if engine.stats()["computed"] != computed + 1 or progress["g2"]["completedTodos"] != 1:
+        print(f"  ❌ Expected one recomputed goal: {engine.stats()}")
+        return False
+    store.apply_sections({"goalSteps": [{**steps[0], "goalId": "g2"}] + steps[1:]})
+    progress = engine.progress()
+    if engine.stats()["computed"] != computed + 3:
+        print(f"  ❌ Expected two recomputed goals: {engine.stats()}")
+        return False
+    if (progress["g1"]["percentage"], progress["g2"]["percentage"]) != (50, 50):
+        print(f"  ❌ Step move not reflected: {progress}")
+        return False
+    
+    print(f"  ✅ {len(progress)} goals, recomputed only where steps or todos changed")
+    return True
+
+def test_edit_history():
+    """Tests undo/redo, point-in-time restore and the history bound."""
+    print("\nTesting edit history...")
+    from backend.compact_model import is_compact
+    from backend.data_store import DataStore
+    from backend.history import HISTORY_ORIGIN, EditHistory
+    
+    store = DataStore()
+    history = EditHistory(store, max_entries=20, checkpoint_interval=5)
+    save = lambda sections: store.apply_sections(sections, origin=HISTORY_ORIGIN)
+    
+    # The initial load isn't an edit; then 30 saves, one todo each (the
+    # first one also edits mood)
+    todos = [{"id": "t0", "title": "Todo 0", "completed": False}]
+    store.apply_sections({"todos": todos, "mood": {"Mon Dec 01 2024": {"mood": 3}}})
+    for i in range(1, 31):
+        todos = todos + [{"id": f"t{i}", "title": f"Todo {i}", "completed": False}]
+        sections = {"todos": todos, "mood": {"Mon Dec 01 2024": {"mood": 4}}}
+        store.apply_sections(sections, origin="window")
+    state = history.entries()
+    if state["cursor"] != 30 or not 20 <= len(history._entries) < 25 or state["oldest"] % 5:
+        print(f"  ❌ History not bounded at a checkpoint: {history.stats()}")
+        return False
+    
+    # Checkpoints reference the store's compact snapshots (untouched
+    # sections shared), and entries hold encoded records, not dicts
+    first, last = history._checkpoints[state["oldest"]], history._checkpoints[30]
+    if first["mood"] is not last["mood"] or not is_compact(last["todos"]):
+        print("  ❌ Checkpoints don't share the stored snapshots")
+        return False
+    upserts = [data for entry in history._entries for edit in entry.edits
+               for data in edit.upserts.values()]
+    if not all(isinstance(data, bytes) for data in upserts):
+        print("  ❌ History entries hold parsed records")
+        return False
+    
+    history.undo(save)
+    history.undo(save)
+    history.redo(save)
+    if len(store.get_section("todos")) != 30 or not history.entries()["canRedo"]:
+        print(f"  ❌ Unexpected todos after undo/redo: {len(store.get_section('todos'))}")
+        return False
+    if len(history.state_at(state["oldest"] + 3)["todos"]) != state["oldest"] + 4:
+        print("  ❌ Point-in-time state has the wrong todos")
+        return False
+    
+    # Restoring an old point brings back edited and removed records, in order
+    history.restore(30, save)
+    edited = [{**todos[1], "completed": True}] + todos[3:]
+    store.apply_sections({"todos": edited}, origin="window")
+    history.restore(30, save)
+    ids = [todo["id"] for todo in store.get_section("todos")]
+    if ids != [todo["id"] for todo in todos] or store.get_section("todos")[1]["completed"]:
+        print(f"  ❌ Restore didn't reconstruct the todos: {ids[:4]}")
+        return False
+    if history.entries()["cursor"] != 30 or not history.entries()["canRedo"]:
+        print(f"  ❌ Unexpected cursor: {history.entries()['cursor']}")
+        return False
+    
+    # A new edit after undoing discards the undone entries
+    store.apply_sections({"mood": {}}, origin="window")
+    if history.entries()["canRedo"] or history.entries()["cursor"] != 31:
+        print("  ❌ Redo entries survived a new edit")
+        return False
+    
+    print(f"  ✅ {history.stats()['entries']} entries kept, undo/redo and restore reconstructed")
+    return True
+
+def test_binary_snapshot():
+    """Tests snapshot range reads, staleness checks and section reuse."""
+    print("\nTesting binary snapshot...")
+    import json
+    import tempfile
+    from datetime import date, timedelta
+    from backend.data_store import DataStore
+    from backend.dates import format_date_key
+    from backend.snapshot import SnapshotFiles
+    
+    first = date(2022, 1, 1)
+    habits = {format_date_key(first + timedelta(days=i)): {"completedCount": i % 4, "totalCount": 3}
+              for i in range(1000)}
+    habits["not a date"] = {"completedCount": 0}
+    sections = {"habits": habits, "mood": {}, "todos": [{"id": "1", "title": "Ünïcode todo"}]}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = str(Path(tmp) / "personal-tracker-data.json")
+        Path(data_path).write_text(json.dumps({"data": sections}), encoding="utf-8")
+        store = DataStore()
+        store.apply_sections(sections)
+        writer = SnapshotFiles(store)
+        if writer.read_days(data_path, "habits") is not None:
+            print("  ❌ Snapshot read before one was written")
+            return False
+        # A load writes the snapshot if there is none, without hashing
+        if not writer.ensure(data_path) or store.digest_stats()["digested"] != 0:
+            print("  ❌ Snapshot not written on load")
+            return False
+        
+        # A cold process reads a week without loading anything else
+        cold = SnapshotFiles(DataStore())
+        week = cold.read_days(data_path, "habits", "2024-09-20", "2024-09-26", descending=True)
+        expected = [(format_date_key(date(2024, 9, 26) - timedelta(days=i)),
+                     habits[format_date_key(date(2024, 9, 26) - timedelta(days=i))]) for i in range(7)]
+        if week != expected:
+            print(f"  ❌ Unexpected range: {week[:2]}")
+            return False
+        if cold.read_section(data_path, "habits") != habits or cold.read_section(data_path, "todos") != sections["todos"]:
+            print("  ❌ Sections don't round-trip")
+            return False
+        
+        # The startup load: recent days plus the other sections whole
+        recent = cold.read_recent(data_path, "2024-09-25")
+        if (list(recent["habits"]) != [format_date_key(date(2024, 9, 25)), format_date_key(date(2024, 9, 26))]
+                or recent["todos"] != sections["todos"] or recent["mood"] != {}):
+            print(f"  ❌ Unexpected startup load: {list(recent['habits'])}")
+            return False
+        
+        # Loading a file with a valid snapshot keeps its sections, so a
+        # save only encodes the changed one
+        saver = SnapshotFiles(store)
+        if saver.ensure(data_path):
+            print("  ❌ Valid snapshot written again")
+            return False
+        store.apply_sections({"mood": {"Mon Dec 02 2024": {"mood": 4}}})
+        saver.save(data_path)
+        if saver.stats()["encoded"] != 1:
+            print(f"  ❌ Unchanged sections were encoded again: {saver.stats()}")
+            return False
+        if cold.read_days(data_path, "mood") != [("Mon Dec 02 2024", {"mood": 4})]:
+            print("  ❌ New snapshot not picked up")
+            return False
+        
+        # A data file changed behind our back invalidates the snapshot
+        with open(data_path, "a", encoding="utf-8") as f:
+            f.write(" ")
+        if cold.read_days(data_path, "habits") is not None:
+            print("  ❌ Stale snapshot was used")
+            return False
+        cold._close()
+    
+    print(f"  ✅ {len(week)} of {len(habits)} days decoded from the snapshot")
+    return True
+
+def test_package_excludes():
+    """Tests that traced and allow-listed modules are never excluded."""
+    print("\nTesting package excludes...")
+    import package
+    
+    traced = {"start", "xml.etree.ElementTree", "unittest"}
+    excludes = package.generate_excludes(
+        traced, candidates=["xml", "unittest", "tkinter", "gevent.server", "gevent"],
+        keep=["gevent.select"])
+    if excludes != ["tkinter", "gevent.server"]:
+        print(f"  ❌ Unexpected excludes: {excludes}")
+        return False
+    
+    # An empty trace must still leave every allow-listed module in
+    excluded = package.generate_excludes(set())
+    dropped = [name for name in package.KEEP_MODULES
+               if any(name == e or name.startswith(e + ".") for e in excluded)]
+    if dropped or excluded != [c for c in package.EXCLUDE_CANDIDATES if c not in dropped]:
+        print(f"  ❌ Allow-listed modules excluded: {dropped}")
+        return False
+    
+    print(f"  ✅ {len(excluded)} of {len(package.EXCLUDE_CANDIDATES)} candidates excludable")
+    return True
+
+def test_build_cache():
+    """Tests that cached build steps are skipped until an input changes."""
+    print("\nTesting build cache...")
+    import os
+    import tempfile
+    import build
+    
+    commands = []
+    saved_cwd, saved_run = os.getcwd(), build.run_command
+    build.run_command = lambda command, *args, **kwargs: commands.append(command) or True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            Path("package-lock.json").write_text('{"lockfileVersion": 3}')
+            Path("node_modules").mkdir()
+            
+            def run(force=False):
+                cache = build.load_cache(force=force)
+                build.check_node_modules(cache)
+                build.save_cache(cache)
+                return commands.pop() if commands else None
+            
+            if run() != "npm install" or run() is not None:
+                print("  ❌ Step not skipped with unchanged inputs")
+                return False
+            Path("package-lock.json").write_text('{"lockfileVersion": 3, "packages": {}}')
+            if run() != "npm install" or run() is not None:
+                print("  ❌ Step not rerun after its input changed")
+                return False
+            if run(force=True) != "npm install":
+                print("  ❌ --force didn't rerun the step")
+                return False
+            
+            # A changed requirements.txt installs it, even with Eel present
+            Path("requirements.txt").write_text("eel==0.18.1\n")
+            Path("venv").mkdir()
+            def install():
+                cache = build.load_cache()
+                build.check_python_env(cache)
+                build.save_cache(cache)
+                installs = [c for c in commands if "pip install -r requirements.txt" in c]
+                commands.clear()
+                return len(installs)
+            install()
+            Path("requirements.txt").write_text("eel==0.18.1\nplyer==2.1.0\n")
+            if install() != 1 or install() != 0:
+                print("  ❌ Changed requirements.txt wasn't installed exactly once")
+                return False
+            Path("node_modules").rmdir()
+            if run() != "npm install":
+                print("  ❌ Step skipped although its output is missing")
+                return False
+            
+            # Directory inputs: renames and new files change the hash too
+            Path("src").mkdir()
+            Path("src/a.js").write_text("export const a = 1")
+            before = build.hash_inputs(["src"])
+            Path("src/a.js").rename("src/b.js")
+            renamed = build.hash_inputs(["src"])
+            Path("src/c.js").write_text("")
+            if len({before, renamed, build.hash_inputs(["src"])}) != 3:
+                print("  ❌ Renaming or adding a file kept the hash")
+                return False
+    finally:
+        os.chdir(saved_cwd)
+        build.run_command = saved_run
+    
+    print("  ✅ Steps rerun only after an edit, a missing output or --force")
+    return True
+
+def test_import_merge():
+    """Tests import modes, conflict policies and skipped invalid records."""
+    print("\nTesting import merge...")
+    from backend.import_engine import ImportValidationError, merge_import
+    
+    current = {
+        "todos": [{"id": 1, "title": "Old", "updatedAt": "2024-12-01T00:00:00.000Z"},
+                  {"id": 2, "title": "Mine", "updatedAt": "2024-12-05T00:00:00.000Z"}],
+        "mood": {"Sun Dec 01 2024": {"mood": 2, "timestamp": "2024-12-01T20:00:00.000Z"}},
+    }
+    document = {"version": "2.0.0", "data": {
+        "todos": [{"id": "1", "title": "New", "updatedAt": "2024-12-03T00:00:00.000Z"},
+                  {"id": 2, "title": "Theirs", "updatedAt": "2024-12-04T00:00:00.000Z"},
+                  {"id": 3, "title": "Added"},
+                  {"title": "No id"}, "not a record"],
+        "mood": {"Sun Dec 01 2024": {"mood": 5, "timestamp": "2024-12-02T08:00:00.000Z"},
+                 "Mon Dec 02 2024": {"mood": 3}, "yesterday": {"mood": 1}},
+    }}
+    
+    def titles(merged):
+        return [todo["title"] for todo in merged["todos"]]
+    
+    merged, report, _ = merge_import(current, document, "merge", "theirs")
+    if titles(merged) != ["New", "Theirs", "Added"] or merged["mood"]["Sun Dec 01 2024"]["mood"] != 5:
+        print(f"  ❌ theirs: {titles(merged)}")
+        return False
+    if report["sections"]["todos"] != {"added": 1, "updated": 2, "kept": 0, "invalid": 2} \
+            or report["sections"]["mood"]["invalid"] != 1 or report["invalid"] != 3:
+        print(f"  ❌ Unexpected report: {report['sections']}")
+        return False
+    
+    merged, report, _ = merge_import(current, document, "merge", "ours")
+    if titles(merged) != ["Old", "Mine", "Added"] or report["sections"]["todos"]["kept"] != 2:
+        print(f"  ❌ ours: {titles(merged)}")
+        return False
+    
+    # The later updatedAt/timestamp wins, per record
+    merged, _, _ = merge_import(current, document, "merge", "newest")
+    if titles(merged) != ["New", "Mine", "Added"] or merged["mood"]["Sun Dec 01 2024"]["mood"] != 5:
+        print(f"  ❌ newest: {titles(merged)}")
+        return False
+    
+    merged, report, _ = merge_import(current, document, "replace", "ours")
+    if titles(merged) != ["New", "Theirs", "Added"] or sorted(merged["mood"]) != ["Mon Dec 02 2024", "Sun Dec 01 2024"]:
+        print(f"  ❌ replace: {titles(merged)}")
+        return False
+    if current["todos"][0]["title"] != "Old":
+        print("  ❌ Current sections were modified")
+        return False
+    
+    for bad in ({"data": {}, "version": "3.0.0"}, {"version": "2.0.0"}, []):
+        try:
+            merge_import(current, bad)
+        except ImportValidationError:
+            continue
+        print(f"  ❌ Accepted an invalid document: {bad!r}")
+        return False
+    
+    print("  ✅ Modes, policies and invalid records handled")
+    return True
+
+def test_data_export():
+    """Tests the streamed JSON and CSV exports and their date range filter."""
+    print("\nTesting data export...")
+    import csv
+    import json
+    import tempfile
+    from backend.data_store import DataStore
+    from backend.export_writer import export_to_file
+    
+    sections = {
+        "habits": {
+            "Sun Dec 01 2024": {"habits": [{"name": "Read", "emoji": "📚", "completed": True,
+                                            "category": {"name": "Learning"}}], "weight": 150.5},
+            "Mon Dec 02 2024": {"habits": [{"name": "Run, far", "completed": False}]},
+            "Sat Nov 30 2024": {"habits": [{"name": "Read", "completed": True}], "weight": 151},
+        },
+        "todos": [{"id": "1", "title": 'Say "hi"', "createdAt": "2024-12-01T10:00:00.000Z",
+                   "timeToCompletion": 1.5}],
+        "goals": [{"id": "g1", "title": "Fitness", "createdAt": "2024-11-01T10:00:00.000Z"}],
+        "goalSteps": [{"goalId": "g1", "title": "Walk", "frequency": "daily"}],
+        "mood": {"Sun Dec 01 2024": {"mood": 4, "notes": "Good\nday"},
+                 "Sat Nov 30 2024": {"mood": 2}},
+    }
+    december = {"start": "2024-12-01", "end": "2024-12-31"}
+    store = DataStore()
+    store.apply_sections(sections)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # A tiny chunk size makes every record cross a flush
+        json_path = str(Path(tmp) / "export.json")
+        result = export_to_file(json_path, store, "json", december, chunk_size=16)
+        with open(json_path, encoding="utf-8") as f:
+            exported = json.load(f)
+        if sorted(exported["data"]["habits"]) != ["Mon Dec 02 2024", "Sun Dec 01 2024"]:
+            print(f"  ❌ Date range not applied: {sorted(exported['data']['habits'])}")
+            return False
+        if exported["data"]["todos"] != sections["todos"] or exported["data"]["goals"] != sections["goals"]:
+            print("  ❌ JSON sections don't round-trip")
+            return False
+        # Same sections and metadata as the browser's exportAllData()
+        if sorted(exported["data"]) != ["goalSteps", "goals", "habits", "todos"] \
+                or "totalMoodEntries" in exported["metadata"]:
+            print(f"  ❌ JSON export doesn't match the browser export: {sorted(exported['data'])}")
+            return False
+        if exported["metadata"]["totalDays"] != 2 or result["counts"]["days"] != 2:
+            print(f"  ❌ Unexpected counts: {exported['metadata']}, {result['counts']}")
+            return False
+        if result["bytes"] != Path(json_path).stat().st_size:
+            print("  ❌ Reported size doesn't match the file")
+            return False
+        
+        csv_path = str(Path(tmp) / "export.csv")
+        result = export_to_file(csv_path, store, "csv", december, chunk_size=16)
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        if ["Sun Dec 01 2024", "Read", "📚", "Learning", "Yes"] not in rows \
+                or ["Mon Dec 02 2024", "Run, far", "", "Unknown", "No"] not in rows:
+            print("  ❌ Habit rows missing or misquoted")
+            return False
+        if ['Say "hi"', "", "", "", "", "12/1/2024", "", "1.50"] not in rows:
+            print("  ❌ Todo row missing or misquoted")
+            return False
+        if ["Sun Dec 01 2024", "4", "Good\nday"] not in rows or ["Sat Nov 30 2024", "2", ""] in rows:
+            print("  ❌ Mood rows not filtered or not quoted")
+            return False
+        if result["counts"] != {"habitCompletions": 2, "todos": 1, "goals": 1, "goalSteps": 1,
+                                "weights": 1, "mood": 1}:
+            print(f"  ❌ Unexpected counts: {result['counts']}")
+            return False
+        if any(path.suffix == ".tmp" for path in Path(tmp).iterdir()):
+            print("  ❌ Temporary file left behind")
+            return False
+    
+    print("  ✅ JSON and CSV exports match the data")
+    return True
+
+def test_startup_import_time():
+    """Tests that importing start.py stays within the import-time budget."""
+    print("\nTesting start.py import time...")
+    import subprocess
+    
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import start"],
+        cwd=Path(__file__).parent, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"  ❌ 'import start' failed: {result.stderr.strip().splitlines()[-1:]}")
+        return False
+    
+    # Lines look like: "import time:  self [us] | cumulative | name"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line[len("import time:"):].split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total)
+    
+    eager = [name for name in DEFERRED_MODULES if name in cumulative]
+    if eager:
+        print(f"  ❌ Imported eagerly: {', '.join(eager)}")
+        return False
+    
+    import_ms = cumulative.get("start", 0) / 1000
+    if import_ms > IMPORT_TIME_BUDGET_MS:
+        print(f"  ❌ 'import start' took {import_ms:.0f} ms (budget {IMPORT_TIME_BUDGET_MS} ms)")
+        return False
+    
+    print(f"  ✅ 'import start' took {import_ms:.0f} ms (budget {IMPORT_TIME_BUDGET_MS} ms)")
+    return True
+
 def main():
     """Run all tests."""
     print("="*60)
@@ -103,6 +1510,31 @@ def main():
         ("Python Dependencies", test_python_dependencies),
         ("Start Script", test_start_script),
         ("Build Output", test_build_output),
+        ("Web Archive Serving", test_web_archive_serving),
+        ("Change Broadcast", test_change_broadcast),
+        ("External Change Watcher", test_external_change_watcher),
+        ("Reminder Scheduler", test_reminder_scheduler),
+        ("Single Instance", test_single_instance),
+        ("Day Index", test_day_index),
+        ("Journal Compaction", test_journal_compaction),
+        ("Journal Writer", test_journal_writer),
+        ("Section Checksums", test_section_checksums),
+        ("Chunked Transport", test_chunked_transport),
+        ("Time Series", test_time_series),
+        ("Habit Schema", test_habit_schema),
+        ("Compact Model", test_compact_model),
+        ("Heatmap Tiles", test_heatmap_tiles),
+        ("Review Engine", test_review_engine),
+        ("Recurrence Engine", test_recurrence_engine),
+        ("Todo Index", test_todo_index),
+        ("Goal Progress", test_goal_progress),
+        ("Edit History", test_edit_history),
+        ("Binary Snapshot", test_binary_snapshot),
+        ("Build Cache", test_build_cache),
+        ("Package Excludes", test_package_excludes),
+        ("Import Merge", test_import_merge),
+        ("Data Export", test_data_export),
+        ("Startup Import Time", test_startup_import_time),
     ]
     
     results = []